@@ -0,0 +1,17 @@
+import tkinter as tk  # Import the tkinter library for images
+
+_images = {}  # Decoded images by file path, kept for the lifetime of the process
+
+
+def get_image(path):
+    """
+    Get a decoded image, decoding the file only on the first request.
+    Args:
+        path (str): The file path of the image.
+    Returns:
+        tk.PhotoImage: The decoded image.
+    """
+    image = _images.get(path)  # Look up the decoded image
+    if image is None:  # Decode the image once per process
+        image = _images[path] = tk.PhotoImage(file=path)
+    return image  # Return the decoded image
@@ -0,0 +1,320 @@
+import argparse  # Import the argparse module for the command line interface
+import json  # Import the JSON module for the deck files and the machine-readable results
+import math  # Import the math module for the scaling exponents
+import os  # Import the os module for paths
+import platform  # Import the platform module to describe the machine
+import random  # Import the random module for the synthetic decks
+import subprocess  # Import the subprocess module to measure every size in a fresh interpreter
+import sys  # Import the sys module for the interpreter path
+import tempfile  # Import the tempfile module for the generated decks
+import time  # Import the time module for the measurements
+
+try:
+    import resource  # Import the resource module for the peak memory use (Unix only)
+except ImportError:
+    resource = None
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))  # Directory with the deck modules
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)  # Number of flashcards per run; 10,000,000 is available on request
+BACKENDS = ("json", "compact", "snapshot", "sqlite")  # Deck representations that can be measured
+METRICS = ("load_s", "lookup_us", "session_s", "draw_us", "answer_us", "save_s", "reset_topic_s", "reset_all_s",
+           "peak_rss_mb")  # Measured values, in the order they are reported
+WORDS = ("the", "of", "capital", "river", "theorem", "protein", "function", "element", "war", "painter", "novel",
+         "equation", "planet", "language", "cell", "empire", "symphony", "algorithm", "mountain", "reaction")
+
+
+# Function to generate a synthetic deck
+def generate_deck(path, cards, topics=100, text_length=40, seed=0):
+    """
+    Write a synthetic deck in the flash.json layout. The file is written flashcard by flashcard,
+    so decks with millions of flashcards never have to fit in memory.
+    Args:
+        path (str): The file path of the new deck.
+        cards (int): Number of flashcards.
+        topics (int): Number of topics; the flashcards are spread evenly.
+        text_length (int): Approximate length of the front and back texts in characters.
+        seed (int): Seed of the random texts and progress values.
+    """
+    rng = random.Random(seed)  # Reproducible decks
+    topics = max(1, min(topics, cards))  # Every topic gets at least one flashcard
+
+    def text(prefix):
+        words = [prefix]  # Start with a unique prefix so that fronts never repeat
+        length = len(prefix)
+        while length < text_length:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    with open(path, 'w', encoding="utf-8") as fp:
+        fp.write("{")
+        number = 0  # Number of the next flashcard
+        for topic in range(topics):
+            count = cards // topics + (1 if topic < cards % topics else 0)  # Flashcards of this topic
+            fp.write(("," if topic else "") + json.dumps(f"Topic {topic}") + ": {")
+            for index in range(count):
+                card = [text("answer"), rng.randint(0, 3)]  # Back text and progress
+                fp.write(("," if index else "") + json.dumps(text(f"q{number}")) + ": " + json.dumps(card))
+                number += 1
+            fp.write("}")
+        fp.write("}")
+
+
+# Function to open a deck with a backend
+def open_backend(path, backend):
+    """
+    Open a generated deck with one of the backends.
+    Args:
+        path (str): The file path of the deck ('.json' for the JSON backends, '.db' for SQLite).
+        backend (str): 'json', 'compact', 'snapshot' (JSON deck opened from its binary snapshot) or 'sqlite'.
+    Returns:
+        Deck or SQLiteDeck: The opened deck.
+    """
+    if backend == "sqlite":
+        from sqlite_deck import SQLiteDeck  # Imported lazily like in initialize.open_deck
+        return SQLiteDeck(path)
+    from deck import Deck
+    return Deck(path, compact_topics=backend == "compact", snapshot=backend == "snapshot")
+
+
+# Function to get the peak memory use of this process
+def peak_rss_mb():
+    """
+    Get the peak resident memory of this process.
+    Returns:
+        float or None: The peak memory in MB, or None where it cannot be measured (Windows).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Function to measure one deck; runs in a fresh interpreter
+def measure_deck(path, backend, operations=10000, seed=0):
+    """
+    Measure the operations of the review loop on one deck.
+    Args:
+        path (str): The file path of the deck.
+        backend (str): 'json', 'compact', 'snapshot' or 'sqlite'.
+        operations (int): Number of lookups, draws and answers.
+        seed (int): Seed of the random choices.
+    Returns:
+        dict: The measured values (see METRICS).
+    """
+    from learn_topic import LearnTopic  # Imported here so the import time is not part of the load
+    rng = random.Random(seed)
+    results = {}
+    start = time.perf_counter()
+    deck = open_backend(path, backend)  # Parse the deck
+    results["load_s"] = time.perf_counter() - start
+    topics = deck.get_topic_list
+    names = [rng.choice(topics).upper() for _ in range(operations)]  # Case-insensitive lookups
+    start = time.perf_counter()
+    for name in names:
+        deck.topic_exists(name)
+    results["lookup_us"] = (time.perf_counter() - start) / operations * 1e6
+    topic = topics[0]  # The topic that is reviewed
+    start = time.perf_counter()
+    learn = LearnTopic(deck.get_topic_dictionary(topic), deck, topic)  # Open the topic and build the scheduler
+    results["session_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(operations):
+        learn.choose_card()
+    results["draw_us"] = (time.perf_counter() - start) / operations * 1e6
+    answer_time = 0.0  # Time spent in update_card_progress only
+    answers = 0  # Number of timed answers
+    while answers < operations:
+        key, _ = learn.choose_card()
+        if key is None:  # Everything is finished; start the topic over so that every answer is timed
+            deck.reset_progress(topic)
+            learn = LearnTopic(deck.get_topic_dictionary(topic), deck, topic)
+            if not learn.still_has_flashcards():  # An empty topic
+                break
+            continue
+        start = time.perf_counter()
+        learn.update_card_progress(key, rng.random() < 0.7)
+        answer_time += time.perf_counter() - start
+        answers += 1
+    results["answer_us"] = answer_time / max(answers, 1) * 1e6
+    start = time.perf_counter()
+    deck.save_deck_json()  # Write the whole deck
+    results["save_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    deck.reset_progress(topic)
+    results["reset_topic_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    deck.reset_all_progress()
+    results["reset_all_s"] = time.perf_counter() - start
+    results["peak_rss_mb"] = peak_rss_mb()
+    deck.close()
+    return results  # Return the measured values
+
+
+# Function to estimate how a value grows with the deck size
+def scaling_exponent(sizes, values):
+    """
+    Fit value = c * size^k by least squares on the logarithms: k = 1 means linear growth, 0 constant time.
+    Args:
+        sizes (list): The deck sizes.
+        values (list): The measured values; sizes without a positive value are skipped.
+    Returns:
+        float or None: The exponent k, or None with fewer than two usable points.
+    """
+    points = [(math.log(size), math.log(value)) for size, value in zip(sizes, values) if value and value > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / variance, 3)
+
+
+# Function to describe the code and machine that were measured
+def environment():
+    """
+    Describe the measured code and machine, so that results of different commits can be compared.
+    Returns:
+        dict: Commit, Python version, platform and time of the run.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIRECTORY, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None  # Not a git checkout
+    return {"commit": commit, "python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+# Function to run the benchmark
+def run_benchmark(sizes=DEFAULT_SIZES, backends=("json",), topics=100, text_length=40, operations=10000, seed=0):
+    """
+    Generate a deck of every size and measure it with every backend, each in a fresh interpreter.
+    Args:
+        sizes (list): Numbers of flashcards.
+        backends (list): Backends to measure.
+        topics (int): Number of topics of the generated decks.
+        text_length (int): Length of the card texts.
+        operations (int): Number of lookups, draws and answers per run.
+        seed (int): Seed of the generated decks and random choices.
+    Returns:
+        dict: The environment, the settings, the runs and the scaling exponent of every metric per backend.
+    """
+    runs = []  # One entry per size and backend
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            json_path = os.path.join(directory, f"deck_{size}.json")
+            generate_deck(json_path, size, topics, text_length, seed)
+            for backend in backends:
+                path = json_path
+                if backend == "sqlite":  # Import the generated deck into a database first (not measured)
+                    path = os.path.join(directory, f"deck_{size}.db")
+                    subprocess.run([sys.executable, "-c", "import sys; from deck_io import import_cards; "
+                                    "from sqlite_deck import SQLiteDeck; deck = SQLiteDeck(sys.argv[2]); "
+                                    "import_cards(deck, sys.argv[1]); deck.close()", json_path, path],
+                                   cwd=PROJECT_DIRECTORY, check=True)
+                copy = path + f".{backend}"  # Every backend starts from the same file
+                with open(path, 'rb') as source, open(copy, 'wb') as target:
+                    target.write(source.read())
+                if backend == "snapshot":  # Write the binary snapshot of the copy first (not measured)
+                    subprocess.run([sys.executable, "-c", "import sys; from deck import Deck; Deck(sys.argv[1])", copy],
+                                   cwd=PROJECT_DIRECTORY, check=True)
+                result = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", copy,
+                                         "--backend", backend, "--operations", str(operations), "--seed", str(seed)],
+                                        cwd=PROJECT_DIRECTORY, capture_output=True, text=True)
+                try:
+                    measurement = json.loads(result.stdout.strip().splitlines()[-1])  # Printed by the child
+                except (IndexError, json.JSONDecodeError):
+                    measurement = {"error": result.stderr.strip()[-500:] or "no output"}
+                runs.append(dict(measurement, cards=size, backend=backend))
+                print(format_run(runs[-1]), flush=True)
+                for leftover in os.listdir(directory):  # Remove the files of this run
+                    if leftover.startswith(os.path.basename(copy)):
+                        os.remove(os.path.join(directory, leftover))
+            for leftover in os.listdir(directory):  # Remove the deck of this size
+                os.remove(os.path.join(directory, leftover))
+    exponents = {}  # Scaling exponent per backend and metric
+    for backend in backends:
+        measured = [run for run in runs if run["backend"] == backend and "error" not in run]
+        exponents[backend] = {metric: scaling_exponent([run["cards"] for run in measured],
+                                                       [run.get(metric) for run in measured]) for metric in METRICS}
+    return {"environment": environment(),
+            "settings": {"topics": topics, "text_length": text_length, "operations": operations, "seed": seed},
+            "runs": runs, "scaling_exponents": exponents}
+
+
+# Function to format one run
+def format_run(run):
+    """
+    Format one run as a line of the report.
+    Args:
+        run (dict): The measured values of one size and backend.
+    Returns:
+        str: The formatted line.
+    """
+    if "error" in run:
+        return f"{run['backend']:>8} {run['cards']:>10,}  failed: {run['error']}"
+    rss = f"{run['peak_rss_mb']:8.0f} MB" if run.get("peak_rss_mb") is not None else "       - MB"
+    return (f"{run['backend']:>8} {run['cards']:>10,}  load {run['load_s']:8.3f} s  lookup {run['lookup_us']:6.2f} us"
+            f"  session {run['session_s']:7.3f} s  draw {run['draw_us']:7.2f} us  answer {run['answer_us']:7.2f} us"
+            f"  save {run['save_s']:8.3f} s  reset {run['reset_topic_s']:7.4f}/{run['reset_all_s']:7.3f} s  {rss}")
+
+
+# Function to compare two result files
+def compare(old, new):
+    """
+    Compare the runs of two result files, e.g. of two commits.
+    Args:
+        old (dict): The earlier results.
+        new (dict): The later results.
+    Returns:
+        list: Lines with the ratio new/old of every metric; above 1 means slower or larger.
+    """
+    lines = [f"{old['environment'].get('commit')} -> {new['environment'].get('commit')} (ratio new/old)"]
+    earlier = {(run["backend"], run["cards"]): run for run in old["runs"] if "error" not in run}
+    for run in new["runs"]:
+        before = earlier.get((run["backend"], run["cards"]))
+        if before is None or "error" in run:
+            continue
+        ratios = [f"{metric} {run[metric] / before[metric]:.2f}" for metric in METRICS
+                  if run.get(metric) and before.get(metric)]
+        lines.append(f"{run['backend']:>8} {run['cards']:>10,}  " + "  ".join(ratios))
+    return lines  # Return the lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Deck and LearnTopic on synthetic decks (no Tk needed).")
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")],
+                        default=list(DEFAULT_SIZES), help="Comma-separated numbers of flashcards, up to 10000000")
+    parser.add_argument("--backends", type=lambda text: text.split(","), default=["json"],
+                        help=f"Comma-separated backends: {', '.join(BACKENDS)}")
+    parser.add_argument("--topics", type=int, default=100, help="Number of topics of the generated decks")
+    parser.add_argument("--text-length", type=int, default=40, help="Length of the card texts in characters")
+    parser.add_argument("--operations", type=int, default=10000, help="Lookups, draws and answers per run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated decks")
+    parser.add_argument("--json", metavar="FILE", help="Write the results to this JSON file")
+    parser.add_argument("--compare", metavar="FILE", help="Compare with the results of an earlier run")
+    parser.add_argument("--measure", metavar="DECK", help=argparse.SUPPRESS)  # Used for the fresh interpreters
+    parser.add_argument("--backend", default="json", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:  # Measure one deck and print the results for the parent process
+        print(json.dumps(measure_deck(args.measure, args.backend, args.operations, args.seed)))
+        raise SystemExit
+    unknown = [backend for backend in args.backends if backend not in BACKENDS]
+    if unknown:
+        parser.error(f"Unknown backends: {', '.join(unknown)}")
+    results = run_benchmark(args.sizes, args.backends, args.topics, args.text_length, args.operations, args.seed)
+    print("Scaling exponents (1 = linear in the number of flashcards, 0 = independent of it):")
+    for backend, exponents in results["scaling_exponents"].items():
+        print(f"{backend:>8}  " + "  ".join(f"{metric} {value}" for metric, value in exponents.items()
+                                            if value is not None))
+    if args.json:  # Write the machine-readable results
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+    if args.compare:  # Compare with an earlier run
+        with open(args.compare, encoding="utf-8") as json_file:
+            print("\n".join(compare(json.load(json_file), results)))
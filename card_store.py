@@ -0,0 +1,484 @@
+import sys  # Import the sys module for the command line measurement
+from array import array  # Import the array type for the typed columns
+from collections.abc import MutableMapping  # Import the mapping base class for the dict-like adapter
+
+EMPTY_SLOT = -1  # Hash table slot that was never used
+DELETED_SLOT = -2  # Hash table slot of a deleted flashcard
+SCHEDULE_FIELDS = ("ease", "interval", "reps", "due")  # Scheduling fields stored in typed columns
+
+
+# Define the CompactTopic class: the flashcards of one topic stored in contiguous tables
+class CompactTopic(MutableMapping):
+    def __init__(self, cards=None):
+        """
+        Initialize the CompactTopic, optionally with the flashcards of a topic dictionary.
+        Card texts are stored as UTF-8 in two contiguous byte tables, progress and scheduling
+        fields in typed arrays indexed by card id. It behaves like the {front: [back, progress]}
+        dictionary that LearnTopic and FlashcardApp use.
+        Args:
+            cards (dict, optional): Flashcards to add, {card_front: [card_back, progress, ...]}.
+        """
+        self._text = bytearray()  # UTF-8 text of all fronts and backs
+        self._front_start = array('Q')  # Start offset of each front in the text table
+        self._front_end = array('Q')  # End offset of each front in the text table
+        self._back_start = array('Q')  # Start offset of each back in the text table
+        self._back_end = array('Q')  # End offset of each back in the text table
+        self._hashes = array('q')  # Hash of each front, used by the hash table
+        self.progress = array('B')  # Progress of each card (0 to 255)
+        self.alive = array('B')  # 1 for existing cards, 0 for deleted ones
+        self._has_fields = array('B')  # 1 if the card has scheduling fields
+        self._ease = array('f')  # Ease factor of each card
+        self._interval = array('f')  # Interval of each card in days
+        self._reps = array('H')  # Repetition count of each card
+        self._due = array('d')  # Due timestamp of each card
+        self._extra = {}  # Other card fields (rarely used), by card id
+        self._slots = array('q', [EMPTY_SLOT] * 8)  # Open addressing hash table mapping fronts to card ids
+        self._used_slots = 0  # Number of slots that are not empty (including deleted ones)
+        self._count = 0  # Number of existing cards
+        for card_front, card in (cards or {}).items():  # Add the given flashcards
+            self[card_front] = card
+
+    # Private method to append text to the text table
+    def _store_text(self, text):
+        """
+        Append a text to the text table.
+        Args:
+            text (str): The text to store.
+        Returns:
+            tuple: The start and end offset of the stored text.
+        """
+        start = len(self._text)  # Offset of the new text
+        self._text += text.encode("utf-8")  # Append the encoded text
+        return start, len(self._text)  # Return the offsets
+
+    # Private method to find the hash table slot of a front
+    def _find_slot(self, card_front):
+        """
+        Find the hash table slot of a front, or the slot where it would be inserted.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Returns:
+            tuple: The slot number and the card id (or None if the front is not stored).
+        """
+        front_hash = hash(card_front)  # Hash of the front
+        mask = len(self._slots) - 1  # Table sizes are powers of two
+        slot = front_hash & mask  # First slot to probe
+        free_slot = None  # First deleted slot seen, reused for insertion
+        encoded = None  # Front encoded as UTF-8, only computed when hashes collide
+        while True:
+            card_id = self._slots[slot]  # Card id stored in the slot
+            if card_id == EMPTY_SLOT:  # The front is not stored
+                return (free_slot if free_slot is not None else slot), None
+            if card_id == DELETED_SLOT:  # Remember the first reusable slot
+                if free_slot is None:
+                    free_slot = slot
+            elif self._hashes[card_id] == front_hash:  # Compare the text only if the hashes match
+                if encoded is None:
+                    encoded = card_front.encode("utf-8")
+                if self._text[self._front_start[card_id]:self._front_end[card_id]] == encoded:
+                    return slot, card_id  # Return the slot and the card id
+            slot = (slot + 1) & mask  # Probe the next slot
+
+    # Private method to grow the hash table
+    def _grow(self):
+        """
+        Double the hash table and reinsert all existing cards.
+        """
+        self._slots = array('q', [EMPTY_SLOT] * (len(self._slots) * 2))  # Larger, empty table
+        mask = len(self._slots) - 1  # Table sizes are powers of two
+        for card_id, front_hash in enumerate(self._hashes):  # Reinsert the existing cards
+            if self.alive[card_id]:
+                slot = front_hash & mask
+                while self._slots[slot] != EMPTY_SLOT:  # Linear probing
+                    slot = (slot + 1) & mask
+                self._slots[slot] = card_id
+        self._used_slots = self._count  # Deleted slots are gone
+
+    # Public method to get the card id of a front
+    def card_id(self, card_front):
+        """
+        Get the card id of a front.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Returns:
+            int or None: The card id, or None if the flashcard does not exist.
+        """
+        return self._find_slot(card_front)[1]  # Return the card id
+
+    # Public method to get the front text of a card id
+    def front(self, card_id):
+        """
+        Decode the front text of a card.
+        Args:
+            card_id (int): The card id.
+        Returns:
+            str: The front text.
+        """
+        return self._text[self._front_start[card_id]:self._front_end[card_id]].decode("utf-8")
+
+    # Public method to get the back text of a card id
+    def back(self, card_id):
+        """
+        Decode the back text of a card.
+        Args:
+            card_id (int): The card id.
+        Returns:
+            str: The back text.
+        """
+        return self._text[self._back_start[card_id]:self._back_end[card_id]].decode("utf-8")
+
+    # Public method to replace the back text of a card id
+    def set_back(self, card_id, card_back):
+        """
+        Replace the back text of a card. The old text stays in the table until the topic is rebuilt.
+        Args:
+            card_id (int): The card id.
+            card_back (str): The new back text.
+        """
+        self._back_start[card_id], self._back_end[card_id] = self._store_text(card_back)  # Store the new text
+
+    # Public method to get the scheduling and other fields of a card id
+    def fields(self, card_id):
+        """
+        Get the fields of a card as a new dictionary (a copy; assign card[2] to change it).
+        Args:
+            card_id (int): The card id.
+        Returns:
+            dict or None: The fields, or None if the card has no fields.
+        """
+        if not self._has_fields[card_id]:  # The card is still in the [back, progress] format
+            return None
+        fields = {"ease": round(self._ease[card_id], 4), "interval": int(self._interval[card_id])
+                  if self._interval[card_id].is_integer() else self._interval[card_id],
+                  "reps": self._reps[card_id], "due": self._due[card_id]}  # Read the typed columns
+        fields.update(self._extra.get(card_id, {}))  # Add the other fields
+        return fields  # Return the fields
+
+    # Public method to replace the fields of a card id
+    def set_fields(self, card_id, fields):
+        """
+        Replace the fields of a card.
+        Args:
+            card_id (int): The card id.
+            fields (dict or None): The new fields, or None to remove them.
+        """
+        if fields is None:  # Back to the [back, progress] format
+            self._has_fields[card_id] = 0
+            self._extra.pop(card_id, None)
+            return
+        self._has_fields[card_id] = 1  # The card has fields
+        self._ease[card_id] = fields.get("ease", 2.5)  # Store the scheduling fields in the columns
+        self._interval[card_id] = fields.get("interval", 0)
+        self._reps[card_id] = fields.get("reps", 0)
+        self._due[card_id] = fields.get("due", 0.0)
+        extra = {name: value for name, value in fields.items() if name not in SCHEDULE_FIELDS}  # Other fields
+        if extra:
+            self._extra[card_id] = extra
+        else:
+            self._extra.pop(card_id, None)
+
+    # Public method to reset the progress of all cards
+    def reset_progress(self):
+        """
+        Reset the progress of all cards to 0 and drop their scheduling fields.
+        """
+        self.progress = array('B', bytes(len(self.progress)))  # Zero the whole column at once
+        self._has_fields = array('B', bytes(len(self._has_fields)))  # Drop all scheduling fields at once
+        self._extra.clear()  # Drop the other fields
+
+    # Public method to count the cards per progress level
+    def progress_counts(self):
+        """
+        Count the existing cards per progress level. Runs at C speed over the progress column.
+        Returns:
+            list: The number of cards for each progress level, starting at 0.
+        """
+        data = bytes(self.progress)  # Progress column as bytes
+        counts = [data.count(level) for level in range(max(data, default=0) + 1)]  # One pass per used level
+        counts[0] -= len(self.alive) - self._count  # Deleted cards are kept at progress 0
+        return counts  # Return the counts
+
+    # Public method to map every progress value through a table
+    def map_progress(self, table):
+        """
+        Replace every progress value p by table[p] in one pass over the progress column.
+        Args:
+            table (bytes): 256 bytes mapping each old progress value to the new one.
+        """
+        self.progress = array('B', bytes(self.progress).translate(table))  # Map the whole column at once
+        if self._count < len(self.alive):  # Keep deleted cards at progress 0
+            alive = bytes(self.alive)  # Alive column as bytes
+            card_id = alive.find(0)  # First deleted card
+            while card_id != -1:
+                self.progress[card_id] = 0
+                card_id = alive.find(0, card_id + 1)  # Next deleted card
+
+    def __getitem__(self, card_front):
+        """
+        Get a card by its front text.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Returns:
+            CompactCard: A list-like view of the card.
+        Raises:
+            KeyError: If the flashcard does not exist.
+        """
+        card_id = self._find_slot(card_front)[1]  # Look up the card id
+        if card_id is None:  # Check if the flashcard exists
+            raise KeyError(card_front)
+        return CompactCard(self, card_id)  # Return a view of the card
+
+    def __setitem__(self, card_front, card):
+        """
+        Add or replace a card.
+        Args:
+            card_front (str): The front text of the flashcard.
+            card (list): The card value, [card_back, progress] or [card_back, progress, fields].
+        """
+        card = list(card)  # Accept lists and CompactCard views alike
+        slot, card_id = self._find_slot(card_front)  # Look up the card id
+        if card_id is None:  # Add a new card
+            card_id = len(self._hashes)  # Next free card id
+            start, end = self._store_text(card_front)  # Store the front text
+            self._front_start.append(start)
+            self._front_end.append(end)
+            self._back_start.append(0)
+            self._back_end.append(0)
+            self._hashes.append(hash(card_front))
+            for column in (self.progress, self._has_fields, self._reps):  # Extend the integer columns
+                column.append(0)
+            for column in (self._ease, self._interval, self._due):  # Extend the floating point columns
+                column.append(0.0)
+            self.alive.append(1)
+            if self._slots[slot] == EMPTY_SLOT:  # Reusing a deleted slot does not use up a new one
+                self._used_slots += 1
+            self._slots[slot] = card_id  # Insert the card into the hash table
+            self._count += 1
+            if self._used_slots * 3 >= len(self._slots) * 2:  # Keep the table at most two thirds full
+                self._grow()
+        self.set_back(card_id, card[0])  # Store the back text
+        self.progress[card_id] = min(max(card[1], 0), 255) if isinstance(card[1], int) else 0  # Store the progress
+        self.set_fields(card_id, card[2] if len(card) > 2 and isinstance(card[2], dict) else None)  # Store fields
+
+    def __delitem__(self, card_front):
+        """
+        Delete a card.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Raises:
+            KeyError: If the flashcard does not exist.
+        """
+        slot, card_id = self._find_slot(card_front)  # Look up the card id
+        if card_id is None:  # Check if the flashcard exists
+            raise KeyError(card_front)
+        self._slots[slot] = DELETED_SLOT  # Mark the slot as deleted
+        self.alive[card_id] = 0  # Mark the card as deleted
+        self.progress[card_id] = 0  # Deleted cards do not count in statistics
+        self._extra.pop(card_id, None)  # Drop the other fields
+        self._count -= 1
+
+    def __contains__(self, card_front):
+        """
+        Check if a card exists.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True if the flashcard exists.
+        """
+        return isinstance(card_front, str) and self._find_slot(card_front)[1] is not None
+
+    def __iter__(self):
+        """
+        Iterate over the fronts of all existing cards in insertion order.
+        Yields:
+            str: The front text of each flashcard.
+        """
+        for card_id in range(len(self.alive)):  # Iterate through the card ids
+            if self.alive[card_id]:
+                yield self.front(card_id)
+
+    def __len__(self):
+        """
+        Get the number of existing cards.
+        Returns:
+            int: The number of flashcards.
+        """
+        return self._count  # Return the number of flashcards
+
+    def __repr__(self):
+        """
+        Describe the topic.
+        Returns:
+            str: The number of cards and the size of the text table.
+        """
+        return f"CompactTopic({self._count} cards, {len(self._text)} bytes of text)"
+
+    # Public method to convert the topic into a plain dictionary
+    def to_json(self):
+        """
+        Convert the topic into a plain dictionary, e.g. for json.dump.
+        Returns:
+            dict: {card_front: [card_back, progress, ...]} for all existing cards.
+        """
+        return {self.front(card_id): CompactCard(self, card_id).to_json()
+                for card_id in range(len(self.alive)) if self.alive[card_id]}
+
+
+# Define the CompactCard class: a list-like view of one card in a CompactTopic
+class CompactCard:
+    __slots__ = ("_topic", "_card_id")  # Views are created per access; keep them small
+
+    def __init__(self, topic, card_id):
+        """
+        Initialize the view.
+        Args:
+            topic (CompactTopic): The topic storing the card.
+            card_id (int): The card id.
+        """
+        self._topic = topic  # Store the topic
+        self._card_id = card_id  # Store the card id
+
+    def __len__(self):
+        """
+        Get the number of card elements.
+        Returns:
+            int: 3 if the card has fields, otherwise 2.
+        """
+        return 3 if self._topic._has_fields[self._card_id] else 2
+
+    def __getitem__(self, index):
+        """
+        Get a card element: 0 is the back text, 1 the progress, 2 the fields (a copy).
+        Args:
+            index (int or slice): The element index.
+        Returns:
+            object: The card element.
+        """
+        if isinstance(index, slice):  # Support slicing like a list
+            return self.to_json()[index]
+        if index < 0:  # Support negative indices like a list
+            index += len(self)
+        if index == 0:
+            return self._topic.back(self._card_id)
+        if index == 1:
+            return self._topic.progress[self._card_id]
+        if index == 2 and len(self) == 3:
+            return self._topic.fields(self._card_id)
+        raise IndexError("card index out of range")
+
+    def __setitem__(self, index, value):
+        """
+        Set a card element: 0 is the back text, 1 the progress, 2 the fields.
+        Args:
+            index (int): The element index.
+            value (object): The new value.
+        """
+        if index == 0:
+            self._topic.set_back(self._card_id, value)
+        elif index == 1:
+            self._topic.progress[self._card_id] = min(max(value, 0), 255)
+        elif index == 2 and len(self) == 3:
+            self._topic.set_fields(self._card_id, value)
+        else:
+            raise IndexError("card assignment index out of range")
+
+    def __delitem__(self, index):
+        """
+        Delete card elements; only the fields can be deleted, e.g. del card[2:].
+        Args:
+            index (int or slice): The element index.
+        """
+        if index in (2, -1) and len(self) == 3 or (isinstance(index, slice) and (index.start or 0) <= 2
+                                                     and index.stop is None):
+            self._topic.set_fields(self._card_id, None)  # Drop the fields
+        elif not isinstance(index, slice):
+            raise IndexError("cannot delete the back text or the progress of a card")
+
+    def append(self, fields):
+        """
+        Add fields to a card in the [back, progress] format.
+        Args:
+            fields (dict): The fields to add.
+        """
+        if len(self) == 3 or not isinstance(fields, dict):  # Only one fields dictionary is supported
+            raise ValueError("a card can only hold one fields dictionary")
+        self._topic.set_fields(self._card_id, fields)
+
+    def __iter__(self):
+        """
+        Iterate over the card elements.
+        Returns:
+            iterator: The card elements.
+        """
+        return iter(self.to_json())
+
+    def __eq__(self, other):
+        """
+        Compare the card with a list or another view.
+        Args:
+            other (object): The other card.
+        Returns:
+            bool: True if both cards have the same elements.
+        """
+        return list(self) == list(other) if isinstance(other, (list, CompactCard)) else NotImplemented
+
+    def __repr__(self):
+        """
+        Describe the card like a list.
+        Returns:
+            str: The card elements.
+        """
+        return repr(self.to_json())
+
+    # Public method to convert the card into a plain list
+    def to_json(self):
+        """
+        Convert the card into a plain list, e.g. for json.dump.
+        Returns:
+            list: [card_back, progress] or [card_back, progress, fields].
+        """
+        card = [self._topic.back(self._card_id), self._topic.progress[self._card_id]]  # Back text and progress
+        if self._topic._has_fields[self._card_id]:  # Add the fields if present
+            card.append(self._topic.fields(self._card_id))
+        return card  # Return the card
+
+
+# Function to build a progress mapping table
+def progress_table(function):
+    """
+    Build a table for CompactTopic.map_progress from a function of the progress value.
+    Args:
+        function (callable): Maps an old progress value (0-255) to the new one.
+    Returns:
+        bytes: 256 bytes with the new value for each old value, clamped to 0-255.
+    """
+    return bytes(min(max(int(function(level)), 0), 255) for level in range(256))  # Evaluate every level once
+
+
+# Function to measure the memory used by both topic representations
+def measure_memory(card_count=100000):
+    """
+    Measure the memory used by a plain topic dictionary and a CompactTopic with the same cards.
+    Args:
+        card_count (int): The number of synthetic cards.
+    Returns:
+        tuple: Bytes used by the dictionary and bytes used by the CompactTopic.
+    """
+    import tracemalloc  # Imported here; it is slow to import and only needed for measurements
+    results = []  # Memory of both representations
+    for factory in (dict, CompactTopic):
+        tracemalloc.start()  # Measure allocations from now on
+        topic = factory()  # Create the empty topic
+        for number in range(card_count):  # Add synthetic cards
+            topic[f"Question number {number}?"] = [f"Answer number {number}", number % 4]
+        results.append(tracemalloc.get_traced_memory()[0])  # Memory still in use
+        tracemalloc.stop()
+        del topic  # Free the topic before measuring the next one
+    return tuple(results)  # Return both measurements
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000  # Number of synthetic cards
+    dict_bytes, compact_bytes = measure_memory(count)  # Measure both representations
+    print(f"dict:         {dict_bytes / count:7.1f} bytes per card")
+    print(f"CompactTopic: {compact_bytes / count:7.1f} bytes per card ({compact_bytes / dict_bytes:.0%})")
@@ -0,0 +1,556 @@
+import argparse  # Import the argparse module for the command line interface
+import json  # Import the JSON module to read single topics and answer files
+import mmap  # Import the mmap module to find a topic without reading the whole deck
+import os  # Import the os module to recognize deck directories
+import re  # Import the re module to find topic keys case-insensitively
+import sys  # Import the sys module for the exit code and the terminal streams
+
+from deck import Deck  # Import the Deck class for its topic key and the maintenance commands
+from deck_snapshot import close_snapshot, open_snapshot  # Import the binary snapshot to find a topic through its directory
+from deck_validation import clean_deck, format_problem  # Import the validation of deck files
+from initialize import DECK_PATH, open_deck  # Import the deck location and opener
+from learn_topic import LearnTopic  # Import the LearnTopic class for the review logic
+from review_journal import ReviewJournal  # Import the journal that answers of a single topic are appended to
+from scheduler import MASTERY_THRESHOLD, SCHEDULERS, create_scheduler  # Import the learning models
+
+COMPACT_EVERY = 500  # Journal records after which the CLI folds the journal into the deck file, like Deck
+TOPIC_KEY_END = re.compile(rb'"\s*:\s*\{')  # End of a topic key: the closing quote followed by ': {'
+ANSWERS = {"y": True, "yes": True, "1": True, "true": True, "n": False, "no": False, "0": False, "false": False}
+
+
+# Function to read a single topic of a JSON deck
+def read_topic(path, topic, chunk_size=1 << 20):
+    """
+    Read a single topic of a JSON deck without parsing the other topics. If the deck has a binary snapshot
+    that matches the deck file, the topic is looked up in its topic directory and only its block is read.
+    Otherwise the deck file is mapped into
+    memory and searched for the topic name as an object key followed by an object ('"Topic": {'), which
+    can only be a topic: flashcards are followed by lists, and quotes inside texts are escaped. Only the
+    topic's own object is decoded, in growing chunks. If the exact name is not found, the topic keys are
+    compared case-insensitively.
+    Args:
+        path (str): The file path of the JSON deck.
+        topic (str): The name of the topic.
+        chunk_size (int): Number of bytes decoded first; doubled until the topic object fits.
+    Returns:
+        tuple or None: (actual topic name, flashcards), or None if the topic does not exist.
+    """
+    found = _read_snapshot_topic(path, topic)  # The fast path through the topic directory
+    if found is not None:
+        return found
+    try:
+        with open(path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Deck writes ASCII escapes; other tools may write UTF-8
+            for key in dict.fromkeys((json.dumps(topic).encode("ascii"),
+                                      json.dumps(topic, ensure_ascii=False).encode("utf-8"))):
+                position = data.find(key)
+                while position != -1:
+                    cards = _decode_topic(data, position, len(key), chunk_size)
+                    if cards is not None:
+                        return topic, cards
+                    position = data.find(key, position + 1)  # The name appeared elsewhere
+            wanted = Deck._topic_key(topic)
+            for match in TOPIC_KEY_END.finditer(data):  # Compare every topic key case-insensitively
+                end = match.start() + 1  # After the closing quote
+                start = _opening_quote(data, end - 1)
+                try:
+                    name = json.loads(data[start:end])
+                except ValueError:
+                    continue
+                if isinstance(name, str) and Deck._topic_key(name) == wanted:
+                    cards = _decode_topic(data, start, end - start, chunk_size)
+                    if cards is not None:
+                        return name, cards
+    except (OSError, ValueError):  # Missing or empty file
+        return None
+    return None  # Return None if the topic was not found
+
+
+# Function to read a single topic from the binary snapshot of a JSON deck
+def _read_snapshot_topic(path, topic):
+    """
+    Look up a topic in the topic directory of the deck's binary snapshot (see deck_snapshot.py).
+    Args:
+        path (str): The file path of the JSON deck.
+        topic (str): The name of the topic.
+    Returns:
+        tuple or None: (actual topic name, flashcards), or None if there is no matching snapshot or the topic
+            is not in it.
+    """
+    try:
+        status = os.stat(path)  # The snapshot must belong to this version of the deck file
+    except OSError:
+        return None
+    opened = open_snapshot(path + ".snapshot", (status.st_ino, status.st_size, status.st_mtime_ns), path)
+    if opened is None:  # Missing, damaged or older than the deck file
+        return None
+    topics, data = opened
+    try:
+        if topic not in topics:  # Compare the names case-insensitively
+            key = Deck._topic_key(topic)
+            topic = next((name for name in topics if Deck._topic_key(name) == key), None)
+            if topic is None:
+                return None
+        return topic, {card_front: list(card) for card_front, card in topics[topic].items()}  # Plain lists
+    finally:
+        close_snapshot(data, topics.values())  # Release the mapped file
+
+
+# Function to find the start of a JSON string
+def _opening_quote(data, closing):
+    """
+    Find the quote opening the JSON string that ends at the given quote.
+    Args:
+        data (mmap.mmap): The mapped deck file.
+        closing (int): The position of the closing quote.
+    Returns:
+        int: The position of the opening quote, or 0 if there is none.
+    """
+    position = data.rfind(b'"', 0, closing)
+    while position > 0:
+        backslashes = 0  # A quote after an odd number of backslashes is part of the text
+        while position - backslashes > 0 and data[position - backslashes - 1] == ord("\\"):
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return position
+        position = data.rfind(b'"', 0, position)
+    return max(position, 0)  # Return the position of the opening quote
+
+
+# Function to decode the topic object following a key
+def _decode_topic(data, position, key_length, chunk_size):
+    """
+    Decode the topic object if the key at the given position is a topic key.
+    Args:
+        data (mmap.mmap): The mapped deck file.
+        position (int): The position of the quoted key.
+        key_length (int): The length of the quoted key in bytes.
+        chunk_size (int): Number of bytes decoded first.
+    Returns:
+        dict or None: The flashcards, or None if the key is not a topic key.
+    """
+    if not data[max(0, position - 64):position].rstrip().endswith((b"{", b",")):  # Not a key of the deck object
+        return None
+    start = position + key_length  # After the key
+    head = data[start:start + 64].lstrip()  # Expect ': {'
+    if not head.startswith(b":") or not head[1:].lstrip().startswith(b"{"):
+        return None
+    start = data.find(b"{", start)  # Start of the topic object
+    decoder = json.JSONDecoder()
+    while True:
+        chunk = data[start:start + chunk_size]  # Decode the object from a growing chunk
+        try:
+            cards, _ = decoder.raw_decode(chunk.decode("utf-8", errors="ignore"))
+            break
+        except ValueError:
+            if start + chunk_size >= len(data):  # The whole rest of the file does not decode
+                return None
+            chunk_size *= 2  # The topic object is longer than the chunk
+    if not isinstance(cards, dict):  # A flashcard whose value is an object, not a topic
+        return None
+    deck_dict, _ = clean_deck({"": cards})  # The same repairs as Deck; cards that cannot be repaired are left out
+    return deck_dict[""]  # Return the flashcards
+
+
+# Define the JournalTopic class: one topic of a JSON deck, reviewed without loading the deck
+class JournalTopic:
+    def __init__(self, path, topic, cards):
+        """
+        Initialize the JournalTopic. Answers are appended to the deck's review journal as journal-only records.
+        Deck folds them into the deck file the next time the deck is opened, or before it clears the journal
+        if it is open in another process (e.g. the application).
+        Args:
+            path (str): The file path of the JSON deck.
+            topic (str): The name of the topic.
+            cards (dict): The flashcards of the topic.
+        """
+        self._path = path  # Store the deck path
+        self.topic = topic  # Store the topic name
+        self.cards = cards  # Store the flashcards
+        self._journal = ReviewJournal(path + ".journal", journal_only=True)  # The journal of the deck
+        key = Deck._topic_key(topic)
+        for record_topic, card_front, card in self._journal.replay():  # Answers not yet in the deck file
+            if Deck._topic_key(record_topic) == key and isinstance(card, list) and len(card) > 1:
+                cards[card_front] = card
+
+    # Public method to record an answered card
+    def record_card(self, topic, card_front):
+        """
+        Append the current state of a flashcard to the review journal.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True if the card was recorded, False otherwise.
+        """
+        return self._journal.append(self.topic, card_front, list(self.cards[card_front]))  # Journal the card
+
+    # Public method called by LearnTopic when no topic is known
+    def save_deck_json(self):
+        """
+        Do nothing; answers are journaled.
+        Returns:
+            bool: True.
+        """
+        return True  # Return True
+
+    # Public method to close the journal
+    def close(self):
+        """
+        Close the journal and fold it into the deck file once it has grown large.
+        Returns:
+            bool: True if everything was written, False otherwise.
+        """
+        self._journal.close()  # Release the journal
+        if self._journal.record_count >= COMPACT_EVERY:  # Rarely pay for a full load
+            return Deck(self._path).close()
+        return True  # Return True
+
+
+# Function to open the flashcards of one topic
+def open_topic(path, topic):
+    """
+    Open one topic for reviewing, loading as little of the deck as possible: SQLite decks load only the
+    topic anyway, JSON decks are searched for the topic (see read_topic), directories are loaded as a
+    DeckCollection.
+    Args:
+        path (str): The file path of the deck, or a directory of deck files.
+        topic (str): The name of the topic.
+    Returns:
+        tuple or None: (deck used by LearnTopic, actual topic name, flashcards), or None if the topic does not exist.
+    """
+    if path.endswith((".db", ".sqlite")) or os.path.isdir(path):  # SQLiteDeck reads only the topic list at start
+        deck = open_deck(path)
+        cards = deck.get_topic_dictionary(topic)
+        return (deck, deck._get_actual_topic_name(topic), cards) if deck.topic_exists(topic) else None
+    found = read_topic(path, topic)  # Only the topic is decoded
+    if found is None:
+        return None
+    actual_topic, cards = found
+    return JournalTopic(path, actual_topic, cards), actual_topic, cards
+
+
+# Function to print the summary of a session
+def print_summary(learn):
+    """
+    Print the counters of a session.
+    Args:
+        learn (LearnTopic): The finished session.
+    """
+    finished = sum(1 for card in learn.dict.values() if card[1] >= MASTERY_THRESHOLD)  # Finished flashcards
+    print(f"{learn.correct_answers} correct, {learn.wrong_answers} wrong, {learn.finished_cards} finished "
+          f"in this session; {finished} of {learn.numberofcards} flashcards of '{learn.topic}' finished.")
+
+
+# Function to review a topic interactively
+def review(args):
+    """
+    Review a topic in the terminal: Enter shows the answer, then 'y' or 'n' records it, 'q' quits.
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'topic', 'scheduler', 'seed', 'record').
+    Returns:
+        int: The exit code.
+    """
+    opened = open_topic(args.deck, args.topic)
+    if opened is None:
+        print(f"Topic '{args.topic}' does not exist.", file=sys.stderr)
+        return 1
+    deck, topic, cards = opened
+    recorder = None
+    if args.record:  # Record the answers for session_analysis.py
+        from session_recorder import SessionRecorder
+        recorder = SessionRecorder(args.deck + ".sessions")
+    options = {"seed": args.seed} if args.scheduler == "weighted" else {}  # Reproducible weighted sessions
+    learn = LearnTopic(cards, deck, topic, create_scheduler(args.scheduler, cards, **options), recorder=recorder)
+    try:
+        while learn.still_has_flashcards():
+            card_front, card_back = learn.choose_card()
+            if card_front is None:
+                break
+            print(f"\n[{learn.dict[card_front][1]}/{MASTERY_THRESHOLD}] {card_front}")
+            if input("  (Enter: show answer, q: quit) ").strip().lower() == "q":
+                break
+            print(f"  {card_back}")
+            answer = ""
+            while answer not in ANSWERS and answer != "q":
+                answer = input("  Did you know it? [y/n/q] ").strip().lower()
+            if answer == "q":
+                break
+            learn.update_card_progress(card_front, ANSWERS[answer])
+        else:
+            print(f"\nYou have completed the topic '{topic}'.")
+    except (EOFError, KeyboardInterrupt):
+        print()  # End the session on Ctrl+D or Ctrl+C
+    finally:
+        if recorder is not None:
+            recorder.close()
+        print_summary(learn)  # Read the flashcards before the deck is closed
+        deck.close()  # Write the answers
+    return 0  # Return success
+
+
+# Function to read recorded answers
+def read_answers(path, topic):
+    """
+    Read recorded answers for a topic.
+    Args:
+        path (str): A session log written by session_recorder.py ('.sessions'), a file of JSON lines
+            {"front": ..., "knew": true}, or a file of 'front<TAB>y|n' lines; '-' reads standard input.
+        topic (str): The topic; answers of other topics in a session log are skipped.
+    Returns:
+        list: (front, knew) pairs in the recorded order.
+    """
+    if path.endswith(".sessions"):  # A binary session log
+        from session_recorder import read_events
+        key = Deck._topic_key(topic)
+        return [(event.front, event.knew) for event in read_events(path) if Deck._topic_key(event.topic) == key]
+    answers = []
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in source:
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+            if line.lstrip().startswith("{"):  # A JSON line
+                record = json.loads(line)
+                answers.append((record["front"], bool(record["knew"])))
+            else:  # front<TAB>answer
+                card_front, _, answer = line.rpartition("\t")
+                if answer.strip().lower() in ANSWERS:
+                    answers.append((card_front, ANSWERS[answer.strip().lower()]))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return answers  # Return the answers
+
+
+# Function to replay recorded answers
+def replay(args):
+    """
+    Apply recorded answers to a topic without any interaction, e.g. answers given on paper or on another device.
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'topic', 'answers', 'scheduler').
+    Returns:
+        int: The exit code.
+    """
+    try:
+        answers = read_answers(args.answers, args.topic)
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Cannot read the answers: {error}", file=sys.stderr)
+        return 1
+    opened = open_topic(args.deck, args.topic)
+    if opened is None:
+        print(f"Topic '{args.topic}' does not exist.", file=sys.stderr)
+        return 1
+    deck, topic, cards = opened
+    learn = LearnTopic(cards, deck, topic, create_scheduler(args.scheduler, cards))
+    skipped = 0  # Answers to flashcards that do not exist
+    for card_front, knew in answers:
+        if card_front in learn.dict:
+            learn.update_card_progress(card_front, knew)
+        else:
+            skipped += 1
+    print(f"Replayed {len(answers) - skipped} answers ({skipped} skipped).")
+    print_summary(learn)  # Read the flashcards before the deck is closed
+    deck.close()  # Write the answers
+    return 0  # Return success
+
+
+# Function to list the topics with their progress
+def stats(args):
+    """
+    Print the progress of one or all topics.
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'topic').
+    Returns:
+        int: The exit code.
+    """
+    deck = open_deck(args.deck)
+    if args.topic and not deck.topic_exists(args.topic):
+        print(f"Topic '{args.topic}' does not exist.", file=sys.stderr)
+        return 1
+    for topic, summary in deck.topic_statistics(args.topic).items():
+        print(f"{topic}: {summary['finished']} of {summary['cards']} finished ({summary['completion']:.0f}%), "
+              f"progress levels {summary['histogram']}")
+    deck.close()
+    return 0  # Return success
+
+
+# Function to reset progress
+def reset(args):
+    """
+    Reset the progress of one or all topics.
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'topic', 'all').
+    Returns:
+        int: The exit code.
+    """
+    if not args.all and not args.topic:
+        print("Name a topic or use --all.", file=sys.stderr)
+        return 1
+    deck = open_deck(args.deck)
+    if args.all:
+        print(f"Reset {deck.reset_all_progress()} topics.")
+    elif deck.reset_progress(args.topic):
+        print(f"Reset the progress of '{args.topic}'.")
+    else:
+        print(f"Topic '{args.topic}' does not exist.", file=sys.stderr)
+        deck.close()
+        return 1
+    deck.save_deck_json()
+    deck.close()
+    return 0  # Return success
+
+
+# Function to import flashcards
+def import_file(args):
+    """
+    Import flashcards from a file (see deck_io.py).
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'file', 'format').
+    Returns:
+        int: The exit code.
+    """
+    from deck_io import import_cards
+    deck = open_deck(args.deck)
+    try:
+        report = import_cards(deck, args.file, args.format)
+    except (OSError, ValueError) as error:
+        print(f"Import failed: {error}", file=sys.stderr)
+        deck.close()
+        return 1
+    deck.close()
+    print(f"Imported {report}")
+    for problem in report.problems:  # List the repaired and skipped rows
+        print(format_problem(problem))
+    return 0  # Return success
+
+
+# Function to export flashcards
+def export_file(args):
+    """
+    Export all flashcards to a file (see deck_io.py).
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'file', 'format').
+    Returns:
+        int: The exit code.
+    """
+    from deck_io import export_cards
+    deck = open_deck(args.deck)
+    try:
+        report = export_cards(deck, args.file, args.format)
+    except (OSError, ValueError) as error:
+        print(f"Export failed: {error}", file=sys.stderr)
+        return 1
+    finally:
+        deck.close()
+    print(f"Exported {report}")
+    return 0  # Return success
+
+
+# Function to search flashcards
+def search(args):
+    """
+    Print the flashcards best matching a query.
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'query', 'limit').
+    Returns:
+        int: The exit code.
+    """
+    deck = open_deck(args.deck)
+    for topic, card_front, _ in deck.search(" ".join(args.query), args.limit):
+        card = deck.get_topic_dictionary(topic).get(card_front)
+        print(f"{topic}: {card_front} -> {card[0] if card is not None else ''}")
+    deck.close()
+    return 0  # Return success
+
+
+# Function to sync the deck with other machines
+def sync(args):
+    """
+    Send the changes of the deck to a hub and merge the changes of other machines (see deck_sync.py).
+    Args:
+        args (argparse.Namespace): The parsed arguments ('deck', 'hub').
+    Returns:
+        int: The exit code.
+    """
+    from deck_sync import sync_deck
+    deck = open_deck(args.deck)
+    try:
+        report = sync_deck(deck, args.deck.rstrip("/\\") + ".sync", args.hub)
+    except OSError as error:
+        print(f"Sync failed: {error}. Changes that were not sent are sent with the next sync.", file=sys.stderr)
+        return 1
+    finally:
+        deck.close()
+    print(f"Sent {report.sent} changes, received {report.received} changes, wrote {report.written} flashcards.")
+    return 0  # Return success
+
+
+# Function to build the argument parser
+def build_parser():
+    """
+    Build the argument parser with one sub-command per task.
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(description="Review and maintain a Flash Genius deck in the terminal.")
+    parser.add_argument("--deck", default=DECK_PATH, help="The deck file (.json, or .db/.sqlite for SQLite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("review", help="Review a topic interactively")
+    command.add_argument("topic", help="The topic to review")
+    command.add_argument("--scheduler", default="counter", choices=tuple(SCHEDULERS), help="The learning model")
+    command.add_argument("--seed", type=int, help="Seed of the weighted learning model, for reproducible sessions")
+    command.add_argument("--no-record", dest="record", action="store_false",
+                         help="Do not add the answers to the session log")
+    command.set_defaults(function=review)
+
+    command = commands.add_parser("replay", help="Apply recorded answers to a topic")
+    command.add_argument("topic", help="The topic of the answers")
+    command.add_argument("answers", help="A .sessions log, JSON lines or 'front<TAB>y|n' lines ('-' for stdin)")
+    command.add_argument("--scheduler", default="counter", choices=tuple(SCHEDULERS), help="The learning model")
+    command.set_defaults(function=replay)
+
+    command = commands.add_parser("stats", help="Show the progress of one or all topics")
+    command.add_argument("topic", nargs="?", help="The topic; all topics if omitted")
+    command.set_defaults(function=stats)
+
+    command = commands.add_parser("reset", help="Reset the progress of a topic")
+    command.add_argument("topic", nargs="?", help="The topic to reset")
+    command.add_argument("--all", action="store_true", help="Reset all topics")
+    command.set_defaults(function=reset)
+
+    for name, function, help_text in (("import", import_file, "Import flashcards from a file"),
+                                      ("export", export_file, "Export all flashcards to a file")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("file", help="The file (.json, .jsonl, .csv or .tsv)")
+        command.add_argument("--format", choices=("json", "jsonl", "csv", "tsv"), help="Overrides the extension")
+        command.set_defaults(function=function)
+
+    command = commands.add_parser("search", help="Search the fronts and backs of all flashcards")
+    command.add_argument("query", nargs="+", help="The words to search for")
+    command.add_argument("--limit", type=int, default=10, help="Number of results")
+    command.set_defaults(function=search)
+
+    command = commands.add_parser("sync", help="Exchange changes with other machines through a hub")
+    command.add_argument("hub", help="The hub: a directory, or the address of 'python deck_sync.py HUB_DIRECTORY'")
+    command.set_defaults(function=sync)
+    return parser  # Return the parser
+
+
+# Function to run the command line interface
+def main(argv=None):
+    """
+    Run the command line interface.
+    Args:
+        argv (list, optional): The arguments; sys.argv if omitted.
+    Returns:
+        int: The exit code.
+    """
+    args = build_parser().parse_args(argv)
+    return args.function(args)  # Run the command
+
+
+if __name__ == "__main__":
+    sys.exit(main())
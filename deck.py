@@ -1,15 +1,128 @@
 import json  # Import the JSON module for handling JSON data
+import os  # Import the os module for atomic file replacement
+import threading  # Import the threading module to guard the dictionary against concurrent saves
+import unicodedata  # Import the unicodedata module for Unicode normalization of topic names
+import zlib  # Import the zlib module to keep the last known deck file compressed
+from itertools import chain  # Import chain to walk the flashcards of two versions of a topic
+from card_store import CompactTopic, progress_table  # Import the compact topic representation
+from deck_batch import BatchHistory  # Import the undo history of batches
+from deck_io import iter_nested_json  # Import the streaming reader for the compact loading path
+from deck_merge import merge_decks  # Import the three-way merge for concurrent writers
+from deck_validation import DeckProblem, clean_card, clean_deck  # Import the validation of loaded deck files
+from deck_snapshot import (SnapshotTopic, build_snapshot, close_snapshot, open_snapshot,  # Import the binary snapshot
+                           write_snapshot)
+from deck_writer import DeckWriter  # Import the DeckWriter class for background saves
+from file_lock import FileLock, keep_file_mode  # Import the advisory lock shared by all writers of the deck file
+from review_journal import ReviewJournal  # Import the ReviewJournal class for recording answers
+from scheduler import MASTERY_THRESHOLD  # Import the progress at which a flashcard counts as finished
+from search_index import SearchIndex, read_signature, write_signature  # Import the full-text search index
 
 # Define the Deck class to manage the flashcard deck
 class Deck:
-    def __init__(self, path):
+    def __init__(self, path, compact_every=500, compact_topics=False, snapshot=True, loaded=None):
         """
         Initialize the Deck with the given JSON file path.
+        If the file cannot be parsed or has entries that cannot be loaded (see `problems`), the deck is opened
+        read-only (`read_only`): it can be reviewed, but the deck file is never replaced, so no data is dropped.
         Args:
             path (str): The file path to the JSON deck file.
+            compact_every (int): Number of journal records after which the journal is compacted into the deck file.
+            compact_topics (bool): Store each topic as a CompactTopic (contiguous text tables and typed
+                columns) instead of a dictionary of lists. Uses much less memory for large decks.
+            snapshot (bool): Keep a binary snapshot of the deck in 'flash.json.snapshot' and open the deck from
+                it while it matches the JSON file (see deck_snapshot.py). Topics are then SnapshotTopic objects
+                that are read from the mapped file on demand.
+            loaded (tuple, optional): (cleaned deck dictionary, compressed file content, file identity) of the deck
+                file parsed elsewhere, e.g. by a worker process of deck_collection.py; the file is not read again.
         """
         self._path = path  # Store the file path
+        self._compact_topics = compact_topics  # Store the topic representation
+        self._compact_every = compact_every  # Store the compaction interval
+        self._lock = threading.RLock()  # Guards the dictionary while a snapshot is taken for saving
+        self._write_lock = threading.Lock()  # Serializes writes of the deck file
+        self._snapshot_number = 0  # Number of the most recent snapshot taken for saving
+        self._written_snapshot = 0  # Number of the most recent snapshot written to disk
+        self._writer = DeckWriter(self.compact)  # Background thread that saves the deck after changes
+        self._file_lock = FileLock(path + ".lock")  # Keeps other processes out while the deck file is replaced
+        self._base = None  # The deck file as last read or written by this process, compressed
+        self._base_identity = None  # Inode, size and modification time of that deck file
+        self._snapshot_path = path + ".snapshot" if snapshot else None  # Binary snapshot of the deck file
+        self._base_snapshot = None  # The topics of the snapshot the deck was opened from, for merging
+        self._snapshot_data = None  # The mapping of that snapshot, released by close()
+        self._snapshot_topics = ()  # The topics that read from the mapping
+        self.merges = 0  # Number of saves that merged changes written by another process
+        self.merge_conflicts = 0  # Number of flashcards that both processes changed
+        self.problems = []  # Problems found while loading the deck file, as DeckProblem tuples
+        self._loaded = loaded  # Deck parsed elsewhere, used instead of reading the file
         self._deck_dictionary = self._json_to_dict()  # Load the JSON data into a dictionary
+        self._loaded = None  # The dictionary owns the parsed deck now
+        # A deck file with entries that could not be loaded is never written, so saving cannot drop them
+        self.read_only = any(problem.action == "skipped" for problem in self.problems)
+        if (self._snapshot_path is not None and self._base_snapshot is None and self._base_identity is not None
+                and not self.read_only):
+            self._write_binary_snapshot(build_snapshot(self._deck_dictionary), self._base_identity)  # Next open is fast
+        self._topic_index = {}  # Maps the casefolded topic name to the actual topic name
+        for topic in self._deck_dictionary:  # Index every loaded topic
+            self._topic_index.setdefault(self._topic_key(topic), topic)
+        self._search = None  # Full-text search index, loaded or built on the first search
+        self._text_version = 0  # Number of changes to card texts and topic names since the deck was loaded
+        # Text version stored in the search index file, or None if the file does not match the deck file
+        self._search_file_version = 0 if read_signature(self._search_path) == self._deck_signature() else None
+        self._batch_history = BatchHistory(self, self._lock)  # Undo and redo of the last batch
+        self._journal = ReviewJournal(path + ".journal")  # Journal of answers recorded since the last save
+        if self._replay_journal():  # Apply answers that were recorded but not yet saved (e.g. after a crash)
+            self.compact()  # Fold the replayed answers into the deck file
+
+    # Private method to apply the journal records to the loaded dictionary
+    def _replay_journal(self):
+        """
+        Apply the records stored in the journal to the loaded dictionary, including renamed and deleted topics.
+        A card recorded under a topic that is missing from the deck file belongs to the name the topic got by a
+        later rename (the deck file was saved after the rename), or is dropped if the topic was deleted later.
+        Returns:
+            int: The number of records that were replayed.
+        """
+        records = self._journal.replay()  # Read the records from the journal
+        self._apply_journal_records(records)  # Apply them to the loaded dictionary
+        return len(records)  # Return the number of replayed records
+
+    # Private method to apply journal records to the dictionary
+    def _apply_journal_records(self, records):
+        """
+        Apply journal records to the dictionary in the order they were written. Must be called while holding
+        the lock (or before the deck is shared).
+        Args:
+            records (list): (topic, card_front, card) tuples returned by the journal.
+        """
+        final_names = [None] * len(records)  # Name each card's topic has after the later renames; None if deleted
+        later = {}  # Final name (None if deleted) by the key of a topic name that is renamed or deleted later
+        for number in range(len(records) - 1, -1, -1):  # Walk backwards to know the later renames of each record
+            topic, card_front, card = records[number]
+            if card_front is None:  # A renamed or deleted topic
+                later[self._topic_key(topic)] = later.get(self._topic_key(card), card) if card is not None else None
+            else:
+                final_names[number] = later.get(self._topic_key(topic), topic)
+        for (topic, card_front, card), final_name in zip(records, final_names):  # In the order they were written
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if card_front is None:  # Follow the renaming or deletion if the deck file does not have it yet
+                if actual_topic is not None and card is None:
+                    self._remove_topic(actual_topic)
+                elif actual_topic is not None and self._get_actual_topic_name(card) in (None, actual_topic):
+                    self._move_topic(actual_topic, card)
+                continue
+            if not isinstance(card, list) or len(card) < 2:  # Skip records that do not hold a valid card
+                continue
+            if actual_topic is None:  # Missing from the deck file
+                if final_name is None:  # Deleted later
+                    continue
+                actual_topic = self._get_actual_topic_name(final_name)  # Saved after a later rename
+            if actual_topic is None:  # Recreate a topic that is missing from the deck file
+                actual_topic = topic
+                self._add_topic(topic)
+            old_back = self._back_text(actual_topic, card_front)  # Back of the flashcard that is replaced
+            self._deck_dictionary[actual_topic][card_front] = card  # Restore the recorded card
+            if old_back != card[0]:  # A new flashcard or a changed back text
+                self._texts_changed(actual_topic, card_front, card, old_back)
 
     # Private method to load JSON data from the file into a dictionary
     def _json_to_dict(self):
@@ -18,15 +131,74 @@ class Deck:
         Returns:
             dict: The deck data loaded from the JSON file.
         """
+        if self._loaded is not None:  # Parsed and cleaned elsewhere
+            deck_dict, self._base, self._base_identity = self._loaded
+            return deck_dict  # Return the parsed deck
+        if self._snapshot_path is not None:  # Open the binary snapshot if it matches the deck file
+            identity = self._file_identity()
+            opened = open_snapshot(self._snapshot_path, identity, self._path)
+            if opened is not None:
+                topics, self._snapshot_data = opened  # Keep the mapping to release it
+                self._snapshot_topics = list(topics.values())
+                self._base_snapshot, self._base_identity = topics, identity  # The snapshot holds the base for merging
+                return dict(topics)  # Return the topics of the snapshot
+        if self._compact_topics:  # Stream the file straight into compact topics
+            return self._json_to_compact_dict()
         try:
-            # Open the JSON file for reading with UTF-8 encoding
-            with open(self._path, 'r', encoding="utf-8") as fp:
-                deck_dict = json.load(fp)  # Load JSON data from the file into a dictionary
+            # Open the JSON file for reading; json.loads detects the UTF-8 encoding
+            with open(self._path, 'rb') as fp:
+                data = fp.read()  # Read the deck file
+                identity = self._file_identity(os.fstat(fp.fileno()))  # The file that was actually read
+            deck_dict = json.loads(data)  # Load JSON data from the file into a dictionary
+            self._base, self._base_identity = zlib.compress(data, 1), identity  # Remember it for merging
             cleaned_deck_dict = self._validate_and_clean_data(deck_dict)  # Validate and clean the loaded data
             return cleaned_deck_dict  # Return the cleaned data
-        except (IOError, OSError, FileNotFoundError, PermissionError):
+        except FileNotFoundError:
+            return {}  # Return an empty dictionary for a new deck
+        except (IOError, OSError, PermissionError) as error:
+            self.problems.append(DeckProblem(self._path, None, None, f"file could not be read: {error}", "skipped"))
+            return {}  # Return an empty dictionary on error
+        except json.JSONDecodeError as error:
+            self.problems.append(DeckProblem(self._path, None, None, f"invalid JSON at line {error.lineno} column "
+                                                                     f"{error.colno}: {error.msg}", "skipped"))
+            return {}  # Return an empty dictionary on error
+
+    # Private method to stream JSON data from the file into compact topics
+    def _json_to_compact_dict(self):
+        """
+        Stream the JSON data from the file into a dictionary of CompactTopic objects.
+        The file is never held in memory as a whole; invalid progress values become 0.
+        Returns:
+            dict: The deck data loaded from the JSON file.
+        """
+        deck_dict = {}  # Topics loaded so far
+        try:
+            with open(self._path, 'rb') as fp:  # Remember the deck file for merging, compressed chunk by chunk
+                identity = self._file_identity(os.fstat(fp.fileno()))
+                compressor = zlib.compressobj(1)
+                parts = [compressor.compress(chunk) for chunk in iter(lambda: fp.read(1 << 20), b"")]
+                parts.append(compressor.flush())
+                base = b"".join(parts)
+            for topic, card_front, card in iter_nested_json(self._path):  # Stream the flashcards
+                cards = deck_dict.get(topic)  # Topic the flashcard belongs to
+                if cards is None:  # Create the topic on its first flashcard
+                    cards = deck_dict[topic] = CompactTopic()
+                if card_front is None:  # An empty topic
+                    continue
+                cleaned, problems, action = clean_card(card)  # Repair what can be repaired
+                self.problems.extend(DeckProblem(self._path, topic, card_front, problem, action) for problem in problems)
+                if cleaned is not None:
+                    cards[card_front] = cleaned
+            if self._file_identity() == identity:  # The streamed file is the one remembered for merging
+                self._base, self._base_identity = base, identity
+            return deck_dict  # Return the loaded data
+        except FileNotFoundError:
+            return {}  # Return an empty dictionary for a new deck
+        except (IOError, OSError, PermissionError) as error:
+            self.problems.append(DeckProblem(self._path, None, None, f"file could not be read: {error}", "skipped"))
             return {}  # Return an empty dictionary on error
-        except json.JSONDecodeError:
+        except ValueError as error:  # json.JSONDecodeError is a ValueError
+            self.problems.append(DeckProblem(self._path, None, None, f"invalid JSON: {error}", "skipped"))
             return {}  # Return an empty dictionary on error
 
     # Private method to validate and clean the JSON data
@@ -38,11 +210,34 @@ class Deck:
         Returns:
             dict: The cleaned deck data.
         """
-        for topic, cards in deck_dict.items():  # Iterate through each topic and its cards in the dictionary
-            for question, answer in cards.items():  # Iterate through each question and its answer in the topic
-                if not isinstance(answer[1], int):  # Check if the progress value is not an integer
-                    answer[1] = 0  # Reset the progress value to 0 if it's invalid
-        return deck_dict  # Return the cleaned dictionary
+        cleaned_deck_dict, problems = clean_deck(deck_dict, self._path)  # Repair what can be repaired
+        self.problems.extend(problems)  # Report the repaired and skipped entries
+        return cleaned_deck_dict  # Return the cleaned dictionary
+
+    # Private method to build the case-insensitive lookup key of a topic name
+    @staticmethod
+    def _topic_key(topic):
+        """
+        Build the case-insensitive lookup key of a topic name.
+        Uses Unicode casefolding instead of lower(), so e.g. 'Straße' matches 'STRASSE'.
+        The Turkish capital 'İ' is matched with 'i'; the dotless 'ı' stays a separate letter.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            str: The normalized, casefolded topic name.
+        """
+        key = unicodedata.normalize("NFKC", topic).casefold()  # Fold composed and decomposed forms alike
+        return unicodedata.normalize("NFKC", key.replace("i\u0307", "i"))  # 'İ' casefolds to 'i' + combining dot
+
+    # Private method to add a new empty topic and index it
+    def _add_topic(self, topic):
+        """
+        Add a new empty topic to the dictionary and the topic index.
+        Args:
+            topic (str): The name of the new topic.
+        """
+        self._deck_dictionary[topic] = CompactTopic() if self._compact_topics else {}  # Create a new empty topic
+        self._topic_index[self._topic_key(topic)] = topic  # Index the new topic
 
     # Private method to check if a topic exists in the dictionary (case-insensitive)
     def _topic_exists(self, topic):
@@ -53,7 +248,7 @@ class Deck:
         Returns:
             bool: True if the topic exists, False otherwise.
         """
-        return topic.lower() in (t.lower() for t in self._deck_dictionary)  # Return True if the topic exists
+        return self._topic_key(topic) in self._topic_index  # Return True if the topic exists
 
     # Private method to get the actual topic name matching the case-insensitive input
     def _get_actual_topic_name(self, topic):
@@ -64,25 +259,414 @@ class Deck:
         Returns:
             str or None: The actual topic name if found, otherwise None.
         """
-        for t in self._deck_dictionary:  # Iterate through the topics in the dictionary
-            if t.lower() == topic.lower():  # Check if the topic matches the input (case-insensitive)
-                return t  # Return the actual topic name
-        return None  # Return None if the topic is not found
+        return self._topic_index.get(self._topic_key(topic))  # Return the actual topic name or None
 
     # Public method to save the current state of the dictionary back to the JSON file
     def save_deck_json(self):
         """
         Save the current state of the dictionary back to the JSON file.
+        The file is replaced atomically, so a crash during the save never leaves a truncated deck.
         Returns:
             bool: True if the save was successful, False otherwise.
         """
+        with self._lock:
+            snapshot = self._take_snapshot()  # Serialize the dictionary while no other thread changes it
+        return self._write_snapshot(*snapshot)  # Write the serialized deck to the JSON file
+
+    # Private method to serialize the dictionary for saving
+    def _take_snapshot(self):
+        """
+        Serialize the dictionary. Must be called while holding the lock.
+        Returns:
+            tuple: The snapshot number, the serialized deck, its text version and the encoded binary snapshot
+                (None if binary snapshots are off).
+        """
+        self._snapshot_number += 1  # Number the snapshot so that older snapshots are never written last
+        binary = build_snapshot(self._deck_dictionary) if self._snapshot_path is not None else None
+        # Return the serialized deck; compact topics and cards convert themselves to dictionaries and lists
+        return (self._snapshot_number, json.dumps(self._deck_dictionary, indent=4, default=lambda value: value.to_json()),
+                self._text_version, binary)
+
+    # Private method to write a serialized deck atomically
+    def _write_snapshot(self, number, text, text_version, binary=None):
+        """
+        Write a serialized deck to a temporary file, flush it to disk and rename it over the deck file.
+        Other processes are kept out by an advisory lock on 'flash.json.lock' while the file is replaced.
+        If another process saved the deck file since this process last read or wrote it, both versions
+        are merged first (see deck_merge.py) and the loaded deck takes over the other process's changes.
+        Args:
+            number (int): The snapshot number returned by _take_snapshot.
+            text (str): The serialized deck.
+            text_version (int): The text version of the snapshot, used to keep the search index file in sync.
+            binary (list, optional): The encoded binary snapshot, written next to the deck file unless the
+                deck was merged (the next save writes the merged deck then).
+        Returns:
+            bool: True if the save was successful, False otherwise (also for a read-only deck).
+        """
+        if self.read_only:  # Entries of the deck file could not be loaded; keep the file as it is
+            return False
+        import tempfile  # Imported on first save (on the writer thread) to keep the start of the application fast
+        with self._write_lock:
+            if number < self._written_snapshot:  # A newer snapshot is already on disk
+                return True  # Nothing to do
+            directory = os.path.dirname(os.path.abspath(self._path))  # Directory of the deck file
+            temp_path = None  # Path of the temporary file
+            if not self._file_lock.acquire():  # Another process holds the deck file too long
+                return False
+            try:
+                merged = self._merge_with_file(text, text_version)  # Changes saved by other processes in the meantime
+                if merged is not None:  # Write the merged deck instead of the snapshot
+                    text, text_version = merged
+                # Create the temporary file next to the deck so that the rename stays on the same file system
+                fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self._path) + ".", suffix=".tmp",
+                                                 dir=directory)
+                with os.fdopen(fd, 'w', encoding="utf-8") as fp:
+                    fp.write(text)  # Write the serialized deck
+                    fp.flush()  # Flush Python's buffer
+                    os.fsync(fp.fileno())  # Make sure the data is on disk before the rename
+                keep_file_mode(temp_path, self._path)  # Keep the permissions of the deck file
+                os.replace(temp_path, self._path)  # Atomically replace the deck file
+                temp_path = None  # The temporary file is now the deck file
+                self._fsync_directory(directory)  # Make the rename itself durable
+                self._base, self._base_identity = zlib.compress(text.encode("utf-8"), 1), self._file_identity()
+                self._base_snapshot = None  # The written text is the base from now on
+                if binary is not None and merged is None:  # Keep the binary snapshot in step with the deck file
+                    self._write_binary_snapshot(binary, self._base_identity)
+                self._written_snapshot = number  # Remember the snapshot that is on disk
+                self._update_search_file(text_version)  # Move the search index file to the new deck file
+                return True  # Return True if the save was successful
+            except (IOError, OSError, FileNotFoundError, PermissionError):
+                return False  # Return False on error
+            finally:
+                self._file_lock.release()  # Let other processes save
+                if temp_path is not None and os.path.exists(temp_path):  # Clean up after a failed save
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass  # A leftover temporary file does not affect the deck file
+
+    # Private method to identify the deck file on disk
+    def _file_identity(self, status=None):
+        """
+        Identify the deck file by inode, size and modification time. Every save replaces the file with a
+        new inode, so a save by another process changes the identity even within the same timestamp.
+        Args:
+            status (os.stat_result, optional): The status of an open deck file; the path is checked if omitted.
+        Returns:
+            tuple or None: The identity, or None if the deck file does not exist.
+        """
+        if status is None:
+            try:
+                status = os.stat(self._path)  # Status of the current deck file
+            except OSError:
+                return None  # Return None if the deck file does not exist
+        return status.st_ino, status.st_size, status.st_mtime_ns  # Return the identity
+
+    # Private method to merge the deck file saved by another process into a snapshot
+    def _merge_with_file(self, text, text_version):
+        """
+        Check whether another process saved the deck file since this process last read or wrote it, and
+        if so, merge both versions. Must be called while holding the file lock.
+        Args:
+            text (str): The serialized snapshot that is about to be written.
+            text_version (int): The text version of the snapshot.
+        Returns:
+            tuple or None: (merged text, text version for the search index file), or None if the deck file
+                is unchanged and the snapshot can be written as it is.
+        """
+        identity = self._file_identity()  # The deck file on disk now
+        if identity == self._base_identity:  # Nobody else wrote the deck file
+            return None
         try:
-            # Open the JSON file for writing with UTF-8 encoding
-            with open(self._path, 'w', encoding="utf-8") as fp:
-                json.dump(self._deck_dictionary, fp, indent=4)  # Save the dictionary to the JSON file with indentation
-            return True  # Return True if the save was successful
-        except (IOError, OSError, FileNotFoundError, PermissionError):
-            return False  # Return False on error
+            with open(self._path, 'rb') as fp:  # Read the other process's version
+                data = fp.read()
+            if self._base is not None:  # The common version
+                base = zlib.decompress(self._base)
+                if data == base:  # The file was rewritten with the same content
+                    return None
+                base = json.loads(base)
+            elif self._base_snapshot is not None:  # Opened from the binary snapshot, which matched the deck file
+                base = {topic: cards.base_json() for topic, cards in self._base_snapshot.items()}
+            else:
+                base = {}
+            theirs = json.loads(data)  # The deck as saved by the other process
+            if not isinstance(theirs, dict):
+                return None  # Not a deck; the snapshot replaces it
+            ours = json.loads(text)  # The snapshot as plain dictionaries
+            merged, conflicts = merge_decks(base, ours, theirs, self._topic_key)
+        except (OSError, ValueError, zlib.error):  # Missing or damaged file: the snapshot replaces it
+            return None
+        self.merges += 1  # Count the merge
+        self.merge_conflicts += conflicts
+        texts_changed = self._apply_merge(ours, merged)  # Take over the other process's changes
+        # The search index file only matches the merged deck if no card texts came from the other process
+        return json.dumps(merged, indent=4), (-1 if texts_changed else text_version)
+
+    # Private method to take over the changes of another process after a merge
+    def _apply_merge(self, ours, merged):
+        """
+        Apply the difference between the snapshot and the merged deck to the loaded dictionary. Flashcards
+        that changed again since the snapshot was taken keep their newer value; the next save merges them.
+        Args:
+            ours (dict): The snapshot that was merged.
+            merged (dict): The merged deck.
+        Returns:
+            bool: True if the merged deck differs from the snapshot in topics or card texts.
+        """
+        texts_changed = False  # Whether topics, fronts or backs differ from the snapshot
+        with self._lock:
+            for topic in chain(ours, (topic for topic in merged if topic not in ours)):
+                our_cards, merged_cards = ours.get(topic), merged.get(topic)
+                if our_cards == merged_cards:  # The other process did not change this topic
+                    continue
+                texts_changed = texts_changed or our_cards is None or merged_cards is None
+                actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+                if actual_topic is None:  # Added by the other process, or deleted here since the snapshot
+                    if our_cards is not None or merged_cards is None:
+                        continue
+                    actual_topic = topic
+                    self._add_topic(topic)  # Create the topic of the other process
+                    self._texts_changed(topic)
+                cards = self._deck_dictionary[actual_topic]  # Flashcards of the loaded topic
+                our_cards, merged_cards_or_empty = our_cards or {}, merged_cards or {}
+                for card_front in chain(our_cards, (front for front in merged_cards_or_empty if front not in our_cards)):
+                    before, after = our_cards.get(card_front), merged_cards_or_empty.get(card_front)
+                    if before == after:  # Unchanged flashcard
+                        continue
+                    current = cards.get(card_front)  # The loaded flashcard
+                    current = list(current) if current is not None else None  # Plain list, also for compact topics
+                    text_changed = before is None or after is None or before[0] != after[0]
+                    texts_changed = texts_changed or text_changed
+                    if current != before:  # Changed here since the snapshot; the newer value is kept
+                        continue
+                    if after is None:  # Deleted by the other process
+                        del cards[card_front]
+                    else:  # Added or changed by the other process
+                        cards[card_front] = after
+                    if text_changed:  # Update the search index
+                        self._texts_changed(actual_topic, card_front, after, current[0] if current else None)
+                if merged_cards is None and not cards:  # Topic deleted by the other process
+                    del self._deck_dictionary[actual_topic]
+                    del self._topic_index[self._topic_key(actual_topic)]
+                    self._texts_changed(actual_topic)
+        return texts_changed  # Return whether card texts changed
+
+    # Private method to write the binary snapshot
+    def _write_binary_snapshot(self, binary, identity):
+        """
+        Write the binary snapshot for the deck file with the given identity.
+        Args:
+            binary (list or None): The encoded snapshot returned by build_snapshot; None skips the write.
+            identity (tuple): The identity of the deck file the snapshot matches.
+        Returns:
+            bool: True if the snapshot was written, False otherwise.
+        """
+        if binary is None or identity is None:  # Not supported here, or no deck file yet
+            return False
+        if self._snapshot_data is not None and os.name == "nt":  # Windows cannot replace a mapped file
+            binary[:] = [(topic[0], bytes(topic[1])) + topic[2:] for topic in binary]  # Copy the mapped blocks
+            self._release_snapshot(keep=True)  # The topics read from a copy in memory from now on
+        return write_snapshot(self._snapshot_path, binary, identity)  # Return whether the snapshot was written
+
+    # Private method to release the mapping of the snapshot the deck was opened from
+    def _release_snapshot(self, keep):
+        """
+        Close the mapping of the snapshot the deck was opened from.
+        Args:
+            keep (bool): Keep the topics usable by copying the snapshot into memory.
+        """
+        if self._snapshot_data is None:  # Not opened from a snapshot, or released already
+            return
+        close_snapshot(self._snapshot_data, self._snapshot_topics, keep)
+        self._snapshot_data, self._snapshot_topics = None, ()  # Forget the mapping
+
+    # Private method to flush a directory entry to disk
+    @staticmethod
+    def _fsync_directory(directory):
+        """
+        Flush the directory entry to disk where the operating system supports it (not on Windows).
+        Args:
+            directory (str): The directory containing the deck file.
+        """
+        if not hasattr(os, "O_DIRECTORY"):  # Directories cannot be opened on Windows
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)  # Open the directory
+            try:
+                os.fsync(fd)  # Flush the directory entry
+            finally:
+                os.close(fd)  # Close the directory
+        except OSError:
+            pass  # The rename already happened; durability of the entry is best effort
+
+    @property  # Define a property method to get the search index file path
+    def _search_path(self):
+        """
+        Get the file path of the search index.
+        Returns:
+            str: The file path of the search index next to the deck file.
+        """
+        return self._path + ".search"  # Return the search index file path
+
+    # Private method to identify the version of the deck file on disk
+    def _deck_signature(self):
+        """
+        Identify the version of the deck file on disk by its size and modification time.
+        Returns:
+            str or None: The signature, or None if the deck file does not exist.
+        """
+        try:
+            status = os.stat(self._path)  # Size and modification time of the deck file
+        except OSError:
+            return None  # Return None if the deck file does not exist
+        return f"{status.st_size}:{status.st_mtime_ns}"  # Return the signature
+
+    # Private method to keep the search index file in sync with the deck file
+    def _update_search_file(self, text_version):
+        """
+        Keep the search index file in sync after the deck file was written.
+        If the card texts are unchanged, only the signature of the index file is updated; if the loaded
+        index matches the written texts, it is saved. Otherwise the index file no longer matches and is
+        rebuilt on the next search.
+        Args:
+            text_version (int): The text version of the written snapshot.
+        """
+        with self._lock:
+            signature = self._deck_signature()  # Signature of the new deck file
+            if self._search_file_version == text_version:  # The index file already holds these texts
+                if write_signature(self._search_path, signature):
+                    return
+            elif self._search is not None and self._text_version == text_version:  # The loaded index holds them
+                if self._search.save(self._search_path, signature):
+                    self._search_file_version = text_version
+                    return
+            self._search_file_version = None  # The index file belongs to an older deck file
+
+    # Private method to get the search index
+    def _search_index(self):
+        """
+        Get the search index, loading it from its file or building it on first use. Must be called
+        while holding the lock.
+        Returns:
+            SearchIndex: The search index.
+        """
+        if self._search is None:  # Load or build the index on the first search
+            if self._search_file_version == self._text_version:  # The index file matches the card texts
+                self._search = SearchIndex.load(self._search_path, self._deck_signature())
+            if self._search is None:  # Build the index from the flashcards
+                self._search = SearchIndex.from_cards(self.iter_cards())
+                self._search_file_version = None
+                self.request_save()  # Store the index with the next save
+        return self._search  # Return the search index
+
+    # Private method to record a change of card texts for the search index
+    def _texts_changed(self, topic, card_front=None, card=None, old_back=None):
+        """
+        Record a change of card texts and update the search index if it is loaded. Must be called
+        while holding the lock.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str, optional): The front text of the added, replaced or deleted flashcard.
+            card (list, optional): The new card value; None if the flashcard was deleted.
+            old_back (str, optional): The back text of the replaced or deleted flashcard.
+        """
+        self._text_version += 1  # The search index file no longer matches the card texts
+        if self._search is None or card_front is None:  # Only a loaded index is kept up to date
+            return
+        if card is None:  # Deleted flashcard
+            self._search.remove(topic, card_front, old_back)
+        else:
+            self._search.add(topic, card_front, card[0], old_back)
+
+    # Private method to get the back text of a flashcard
+    def _back_text(self, topic, card_front):
+        """
+        Get the back text of a flashcard. Must be called while holding the lock.
+        Args:
+            topic (str): The actual name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            str or None: The back text, or None if the flashcard does not exist.
+        """
+        card = self._deck_dictionary[topic].get(card_front)  # The flashcard, if it exists
+        return card[0] if card is not None else None  # Return the back text
+
+    # Public method to record a single card change without rewriting the whole deck
+    def record_card(self, topic, card_front):
+        """
+        Record the current state of a single flashcard in the review journal.
+        The journal is compacted into the deck file every `compact_every` records.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True if the card was recorded, False if the card does not exist or could not be written.
+        """
+        with self._lock:
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if actual_topic is None or card_front not in self._deck_dictionary[actual_topic]:  # Check if the card exists
+                return False  # Return False if the card does not exist
+            card = list(self._deck_dictionary[actual_topic][card_front])  # Plain list, also for compact topics
+            if not self._journal.append(actual_topic, card_front, card):
+                self.request_save()  # Fall back to a full save if the journal cannot be written
+            elif self._journal.record_count >= self._compact_every:  # Check if the journal has grown large enough
+                self.request_save()  # Fold the journal into the deck file in the background
+        return True  # Return True if the card was recorded
+
+    # Public method to fold the review journal into the deck file
+    def compact(self):
+        """
+        Save the deck and clear the review journal.
+        Answers recorded while the deck is being written go to a fresh journal and are kept. Answers that a
+        journal-only writer in another process (cli.JournalTopic) appended are applied first, so they are saved
+        instead of being discarded with the journal.
+        A read-only deck keeps its journal, so the answers are replayed once the deck file is repaired.
+        Returns:
+            bool: True if the deck was saved and the journal cleared, False otherwise.
+        """
+        if self.read_only:  # The deck file is not written; keep the journaled answers
+            return False
+        with self._lock:
+            self._journal.rotate()  # Move the journaled records aside; new answers start a fresh journal
+            self._apply_journal_records(self._journal.read_journal_only())  # Answers of other processes
+            snapshot = self._take_snapshot()  # Serialize the deck including all journaled changes
+        if self._write_snapshot(*snapshot):  # Write the deck file atomically
+            return self._journal.discard_rotated()  # Drop the records once they are in the deck file
+        return False  # Keep the records if the deck could not be saved
+
+    # Public method to schedule a save on the background writer thread
+    def request_save(self):
+        """
+        Schedule a save of the deck on the background writer thread. Returns immediately;
+        bursts of requests are written only once.
+        """
+        self._writer.mark_dirty()  # Notify the writer thread
+
+    # Public method to wait for all scheduled saves
+    def flush(self, timeout=None):
+        """
+        Block until all scheduled saves have been written.
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+        Returns:
+            bool: True if all saves were successful, False otherwise.
+        """
+        return self._writer.flush(timeout)  # Wait for the writer thread
+
+    # Public method to compact the journal and release the file handle
+    def close(self):
+        """
+        Compact the review journal and close it, e.g. when the application exits. The mapping of the binary
+        snapshot is released as well, so the topics of the deck must not be read after close().
+        Returns:
+            bool: True if the deck was saved, False otherwise.
+        """
+        self.flush()  # Wait for saves that are already scheduled
+        saved = self.compact()  # Save the deck and clear the journal
+        self._journal.close()  # Release the journal file handle
+        with self._write_lock:
+            self._release_snapshot(keep=False)  # Release the mapped snapshot file
+        return saved  # Return whether the deck was saved
 
     @property  # Define a property method to get the list of available topics
     def get_topic_list(self):
@@ -127,11 +711,83 @@ class Deck:
         Returns:
             bool: True if the topic was created, False if it already exists.
         """
-        if self._topic_exists(topic):  # Check if the topic already exists
-            return False  # Return False if the topic exists
-        else:
-            self._deck_dictionary[topic] = {}  # Create a new empty topic
-            return True  # Return True if the topic was created
+        with self._lock:
+            if self._topic_exists(topic):  # Check if the topic already exists
+                return False  # Return False if the topic exists
+            else:
+                self._add_topic(topic)  # Create a new empty topic
+                return True  # Return True if the topic was created
+
+    # Public method to rename an existing topic
+    def rename_topic(self, topic, new_topic):
+        """
+        Rename an existing topic. The renaming is journaled, so answers journaled under the old name are
+        replayed into the renamed topic after a crash.
+        Args:
+            topic (str): The current name of the topic.
+            new_topic (str): The new name of the topic.
+        Returns:
+            bool: True if the topic was renamed, False if it does not exist or the new name is taken.
+        """
+        with self._lock:
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if actual_topic is None:  # Check if the topic exists
+                return False  # Return False if the topic does not exist
+            owner = self._get_actual_topic_name(new_topic)  # Topic that already uses the new name
+            if owner is not None and owner != actual_topic:  # A different topic already has this name
+                return False  # Return False if the new name is taken
+            self._move_topic(actual_topic, new_topic)  # Store the cards under the new name
+            if not self._journal.append_topic_change(actual_topic, new_topic):
+                self.request_save()  # Fall back to a full save if the journal cannot be written
+            return True  # Return True if the topic was renamed
+
+    # Private method to move a topic to a new name
+    def _move_topic(self, actual_topic, new_topic):
+        """
+        Store the flashcards of a topic under a new name. Must be called while holding the lock.
+        Args:
+            actual_topic (str): The actual name of the topic.
+            new_topic (str): The new name of the topic.
+        """
+        cards = self._deck_dictionary.pop(actual_topic)  # Remove the topic under its old name
+        del self._topic_index[self._topic_key(actual_topic)]  # Remove the old name from the index
+        self._deck_dictionary[new_topic] = cards  # Store the cards under the new name
+        self._topic_index[self._topic_key(new_topic)] = new_topic  # Index the new name
+        self._texts_changed(new_topic)  # Search results show the topic name
+        if self._search is not None:
+            self._search.rename_topic(actual_topic, new_topic)
+
+    # Public method to delete a topic and all of its flashcards
+    def delete_topic(self, topic):
+        """
+        Delete a topic and all of its flashcards. The deletion is journaled, so answers journaled earlier do
+        not bring the topic back after a crash.
+        Args:
+            topic (str): The name of the topic to delete.
+        Returns:
+            bool: True if the topic was deleted, False if it does not exist.
+        """
+        with self._lock:
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if actual_topic is None:  # Check if the topic exists
+                return False  # Return False if the topic does not exist
+            self._remove_topic(actual_topic)  # Remove the topic and its flashcards
+            if not self._journal.append_topic_change(actual_topic, None):
+                self.request_save()  # Fall back to a full save if the journal cannot be written
+            return True  # Return True if the topic was deleted
+
+    # Private method to remove a topic
+    def _remove_topic(self, actual_topic):
+        """
+        Remove a topic and its flashcards. Must be called while holding the lock.
+        Args:
+            actual_topic (str): The actual name of the topic.
+        """
+        cards = self._deck_dictionary.pop(actual_topic)  # Remove the topic and its flashcards
+        del self._topic_index[self._topic_key(actual_topic)]  # Remove the topic from the index
+        self._texts_changed(actual_topic)  # The flashcards are no longer searchable
+        if self._search is not None:
+            self._search.remove_topic(actual_topic, cards)
 
     # Public method to update the flashcards and progress for an existing topic
     def update_topic_dictionary(self, topic, card_front, card_back):
@@ -144,14 +800,17 @@ class Deck:
         Returns:
             bool: True if the topic was updated, False if the topic does not exist.
         """
-        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
-        if actual_topic:  # Check if the topic exists
-            if actual_topic not in self._deck_dictionary:  # Check if the topic is not in the dictionary
-                self._deck_dictionary[actual_topic] = {}  # Initialize an empty dictionary for the topic
-            # Add or update the flashcard with progress 0
-            self._deck_dictionary[actual_topic][card_front] = [card_back, 0]
-            return True  # Return True if the topic was updated
-        return False  # Return False if the topic does not exist
+        with self._lock:
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if actual_topic:  # Check if the topic exists
+                if actual_topic not in self._deck_dictionary:  # Check if the topic is not in the dictionary
+                    self._deck_dictionary[actual_topic] = {}  # Initialize an empty dictionary for the topic
+                old_back = self._back_text(actual_topic, card_front)  # Back of the flashcard that is replaced
+                # Add or update the flashcard with progress 0
+                self._deck_dictionary[actual_topic][card_front] = [card_back, 0]
+                self._texts_changed(actual_topic, card_front, [card_back, 0], old_back)  # Update the search index
+                return True  # Return True if the topic was updated
+            return False  # Return False if the topic does not exist
 
     # Public method to add a new flashcard to a topic
     def add_new_flashcard(self, topic, card_front, card_back):
@@ -164,6 +823,164 @@ class Deck:
         """
         self.update_topic_dictionary(topic, card_front, card_back)  # Update the topic with the new flashcard
 
+    # Public method to set or delete a single flashcard exactly
+    def set_card(self, topic, card_front, card):
+        """
+        Set the complete value of a flashcard (including progress and scheduling fields), or delete it.
+        Used by batches and their undo.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card (list or None): The card value, e.g. [card_back, progress], or None to delete the flashcard.
+        Returns:
+            bool: True if the flashcard was set or deleted, False if the topic does not exist.
+        """
+        with self._lock:
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if actual_topic is None:  # Check if the topic exists
+                return False  # Return False if the topic does not exist
+            cards = self._deck_dictionary[actual_topic]  # Flashcards of the topic
+            old_back = self._back_text(actual_topic, card_front)  # Back of the current flashcard
+            if card is None:  # Delete the flashcard
+                if old_back is None:
+                    return True  # Nothing to delete
+                del cards[card_front]
+            else:
+                cards[card_front] = list(card)  # Store a copy of the card value
+            self._texts_changed(actual_topic, card_front, card, old_back)  # Update the search index
+            return True  # Return True if the flashcard was set or deleted
+
+    # Public method to start a batch of changes
+    def batch(self):
+        """
+        Start a batch of changes that is validated as a whole and saved once:
+
+            with deck.batch() as batch:
+                batch.add("Math", "2 + 2", "4")
+                batch.delete("Math", "1 + 1")
+
+        Returns:
+            DeckBatch: The batch; after the with block, `batch.errors` lists the reasons if nothing was applied.
+        """
+        return self._batch_history.begin()  # Return a new batch
+
+    # Public method to undo the last batch
+    def undo_batch(self):
+        """
+        Undo the last committed batch.
+        Returns:
+            bool: True if the batch was undone, False if there is nothing to undo or the deck changed since.
+        """
+        return self._batch_history.undo()  # Undo the batch
+
+    # Public method to redo the last undone batch
+    def redo_batch(self):
+        """
+        Apply the last undone batch again.
+        Returns:
+            bool: True if the batch was redone, False if there is nothing to redo or the deck changed since.
+        """
+        return self._batch_history.redo()  # Redo the batch
+
+    # Public method to add or replace many flashcards at once
+    def import_batch(self, rows):
+        """
+        Add or replace many flashcards at once, creating missing topics.
+        Args:
+            rows (list): A list of (topic, card_front, card) tuples, where card is [card_back, progress, ...].
+        Returns:
+            int: The number of imported flashcards.
+        """
+        with self._lock:
+            for topic, card_front, card in rows:  # Iterate through the flashcards of the batch
+                actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+                if actual_topic is None:  # Create missing topics
+                    actual_topic = topic
+                    self._add_topic(topic)
+                old_back = self._back_text(actual_topic, card_front)  # Back of the flashcard that is replaced
+                self._deck_dictionary[actual_topic][card_front] = card  # Add or replace the flashcard
+                self._texts_changed(actual_topic, card_front, card, old_back)  # Update the search index
+        return len(rows)  # Return the number of imported flashcards
+
+    # Public method to iterate over all flashcards of the deck
+    def iter_cards(self):
+        """
+        Iterate over all flashcards of the deck, topic by topic.
+        Yields:
+            tuple: (topic, card_front, card) for every flashcard.
+        """
+        for topic in self.get_topic_list:  # Iterate through a copy of the topic names
+            for card_front, card in list(self._deck_dictionary.get(topic, {}).items()):  # Iterate through the cards
+                yield topic, card_front, card
+
+    # Public method to search the fronts and backs of all flashcards
+    def search(self, query, limit=10, topic=None):
+        """
+        Find the flashcards containing all words of a query in their front or back, best match first.
+        The search index is loaded (or built) on the first search and kept up to date afterwards.
+        Args:
+            query (str): The words to search for.
+            limit (int): Maximum number of results.
+            topic (str, optional): Only search the flashcards of this topic.
+        Returns:
+            list: (topic, card_front, score) tuples.
+        """
+        with self._lock:
+            actual_topic = None
+            if topic is not None:  # Restrict the search to one topic
+                actual_topic = self._get_actual_topic_name(topic)
+                if actual_topic is None:
+                    return []  # Return no results if the topic does not exist
+            return self._search_index().search(query, limit, actual_topic)  # Return the ranked results
+
+    # Public method to find flashcards with the same front
+    def find_duplicates(self, card_front, limit=5):
+        """
+        Find flashcards in any topic whose front has the same words as the given front,
+        ignoring case and punctuation.
+        Args:
+            card_front (str): The front text to check, e.g. of a flashcard that is about to be added.
+            limit (int): Maximum number of results.
+        Returns:
+            list: (topic, card_front) tuples of the flashcards with the same front.
+        """
+        with self._lock:
+            return self._search_index().duplicates(card_front, limit)  # Return the duplicates
+
+    # Public method to load or build the search index ahead of the first search
+    def prepare_search(self):
+        """
+        Load the search index from its file or build it, so that the first search answers at once. Meant for a
+        loader thread: the lock is only held while the flashcards of one topic are copied, so answers and edits
+        on other threads are not held up. If card texts change meanwhile, the index is built again under the lock.
+        Returns:
+            bool: True once the search index is ready.
+        """
+        with self._lock:
+            if self._search is not None:  # Ready already
+                return True
+            version, file_matches = self._text_version, self._search_file_version == self._text_version
+        index = SearchIndex.load(self._search_path, self._deck_signature()) if file_matches else None
+        built = index is None  # The index file is missing or does not match
+        if built:  # Build the index from the flashcards, one topic at a time
+
+            def cards():
+                for topic in self.get_topic_list:  # Iterate through a copy of the topic names
+                    with self._lock:  # Copy the flashcards of the topic while no other thread changes them
+                        items = list(self._deck_dictionary.get(topic, {}).items())
+                    for card_front, card in items:
+                        yield topic, card_front, card
+
+            index = SearchIndex.from_cards(cards())
+        with self._lock:
+            if self._search is None and self._text_version == version:  # No card texts changed meanwhile
+                self._search = index
+                if built:
+                    self._search_file_version = None
+                    self.request_save()  # Store the index with the next save
+            self._search_index()  # Otherwise build it again, now under the lock
+        return True  # Return True once the index is ready
+
     # Public method to reset the progress of all flashcards in a topic
     def reset_progress(self, topic):
         """
@@ -173,9 +990,141 @@ class Deck:
         Returns:
             bool: True if the progress was reset, False if the topic does not exist.
         """
+        with self._lock:
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if actual_topic and isinstance(self._deck_dictionary[actual_topic], (CompactTopic, SnapshotTopic)):
+                self._deck_dictionary[actual_topic].reset_progress()  # Reset the whole progress column at once
+                return True  # Return True if the progress was reset
+            if actual_topic:  # Check if the topic exists
+                for key in self._deck_dictionary[actual_topic]:  # Iterate through each flashcard in the topic
+                    self._deck_dictionary[actual_topic][key][1] = 0  # Reset progress to 0 for all flashcards
+                    del self._deck_dictionary[actual_topic][key][2:]  # Forget the spaced-repetition schedule
+                return True  # Return True if the progress was reset
+            return False  # Return False if the topic does not exist
+
+    # Private method to resolve the topic argument of the bulk operations
+    def _bulk_topics(self, topic):
+        """
+        Get the actual topic names a bulk operation applies to.
+        Args:
+            topic (str or None): The name of a topic, or None for all topics.
+        Returns:
+            list: The actual topic names.
+        """
+        if topic is None:  # All topics
+            return list(self._deck_dictionary)
         actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
-        if actual_topic:  # Check if the topic exists
-            for key in self._deck_dictionary[actual_topic]:  # Iterate through each flashcard in the topic
-                self._deck_dictionary[actual_topic][key][1] = 0  # Reset progress to 0 for all flashcards
-            return True  # Return True if the progress was reset
-        return False  # Return False if the topic does not exist
+        return [actual_topic] if actual_topic else []  # Return the topic if it exists
+
+    # Private method to map the progress of all flashcards of the given topics
+    def _map_progress(self, topic, function):
+        """
+        Replace the progress p of every flashcard by function(p). Compact topics are mapped
+        in one pass over their progress column; dictionary topics card by card. Progress values
+        outside 0-255 are left unchanged.
+        Args:
+            topic (str or None): The name of a topic, or None for all topics.
+            function (callable): Maps an old progress value to the new one.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        table = progress_table(function)  # Evaluate the function once per progress level
+        changed = 0  # Number of changed flashcards
+        with self._lock:
+            for actual_topic in self._bulk_topics(topic):  # Iterate through the topics
+                cards = self._deck_dictionary[actual_topic]
+                if isinstance(cards, CompactTopic):  # Map the whole column at once
+                    counts = cards.progress_counts()
+                    changed += sum(count for level, count in enumerate(counts) if table[level] != level)
+                    cards.map_progress(table)
+                else:
+                    for card in cards.values():  # Map card by card
+                        if not 0 <= card[1] <= 255:  # Outside the table; left as it is
+                            continue
+                        new_progress = table[card[1]]
+                        if new_progress != card[1]:
+                            card[1] = new_progress
+                            changed += 1
+        return changed  # Return the number of changed flashcards
+
+    # Public method to reset the progress of all topics
+    def reset_all_progress(self):
+        """
+        Reset the progress of all flashcards in all topics.
+        Returns:
+            int: The number of reset topics.
+        """
+        topics = self._bulk_topics(None)  # All topics
+        for topic in topics:  # Reset each topic
+            self.reset_progress(topic)
+        return len(topics)  # Return the number of reset topics
+
+    # Public method to set the progress of many flashcards at once
+    def set_progress(self, value, topic=None, predicate=None):
+        """
+        Set the progress of the flashcards whose current progress matches a predicate.
+        Args:
+            value (int): The new progress.
+            topic (str, optional): The name of a topic; all topics if omitted.
+            predicate (callable, optional): Receives the current progress and returns True for the
+                flashcards to change. All flashcards if omitted.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        return self._map_progress(topic, lambda level: value if predicate is None or predicate(level) else level)
+
+    # Public method to lower the progress of many flashcards at once
+    def decay_progress(self, amount=1, topic=None, predicate=None):
+        """
+        Lower the progress of the flashcards whose current progress matches a predicate, never below 0.
+        Args:
+            amount (int): The number of points to take away.
+            topic (str, optional): The name of a topic; all topics if omitted.
+            predicate (callable, optional): Receives the current progress and returns True for the
+                flashcards to change. All flashcards if omitted.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        return self._map_progress(topic, lambda level: max(level - amount, 0)
+                                  if predicate is None or predicate(level) else level)
+
+    # Public method to count the flashcards per progress level
+    def progress_histogram(self, topic=None):
+        """
+        Count the flashcards per progress level.
+        Args:
+            topic (str, optional): The name of a topic; all topics if omitted.
+        Returns:
+            list: The number of flashcards with progress 0, 1, ..., MASTERY_THRESHOLD
+                (higher progress values are counted as finished).
+        """
+        histogram = [0] * (MASTERY_THRESHOLD + 1)  # One bucket per progress level
+        with self._lock:
+            for actual_topic in self._bulk_topics(topic):  # Iterate through the topics
+                cards = self._deck_dictionary[actual_topic]
+                if isinstance(cards, (CompactTopic, SnapshotTopic)):  # Count the whole column at once
+                    counts = enumerate(cards.progress_counts())
+                else:
+                    counts = ((card[1], 1) for card in cards.values())  # Count card by card
+                for level, count in counts:
+                    histogram[min(max(level, 0), MASTERY_THRESHOLD)] += count
+        return histogram  # Return the counts
+
+    # Public method to summarize the progress of each topic
+    def topic_statistics(self, topic=None):
+        """
+        Summarize the progress of one or all topics.
+        Args:
+            topic (str, optional): The name of a topic; all topics if omitted.
+        Returns:
+            dict: {topic: {"cards": int, "finished": int, "completion": float, "histogram": list}}
+                where completion is the finished share in percent.
+        """
+        statistics = {}  # Statistics per topic
+        for actual_topic in self._bulk_topics(topic):  # Iterate through the topics
+            histogram = self.progress_histogram(actual_topic)  # Counts per progress level
+            cards = sum(histogram)  # Number of flashcards
+            statistics[actual_topic] = {"cards": cards, "finished": histogram[-1],
+                                        "completion": 100.0 * histogram[-1] / cards if cards else 0.0,
+                                        "histogram": histogram}
+        return statistics  # Return the statistics
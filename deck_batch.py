@@ -0,0 +1,524 @@
+from contextlib import nullcontext  # Import nullcontext for decks without a lock
+
+
+# Define the DeckBatch class: many staged changes that are validated together and saved once
+class DeckBatch:
+    def __init__(self, deck, history, lock=None):
+        """
+        Initialize an empty batch. Use Deck.batch() instead of creating batches directly:
+
+            with deck.batch() as batch:
+                batch.add("Math", "2 + 2", "4")
+                batch.rename_topic("Math", "Arithmetic")
+            if batch.errors: ...
+
+        Nothing changes in the deck until the batch is committed. If any staged change is invalid,
+        no change is applied and the reasons are listed in `errors`.
+        Args:
+            deck (Deck or SQLiteDeck): The deck to change.
+            history (BatchHistory): The undo history of the deck.
+            lock (optional): Lock of the deck (threading.RLock), or the transaction of an SQLiteDeck, held while
+                the batch is applied.
+        """
+        self._deck = deck  # Store the deck
+        self._history = history  # Store the undo history
+        self._lock = lock if lock is not None else nullcontext()  # Store the lock
+        self._operations = []  # Staged changes in the order they were made
+        self.errors = []  # Reasons why the batch could not be committed
+        self.changes = []  # Applied changes, used for undo and redo
+        self.committed = False  # True once the batch was applied
+
+    def __len__(self):
+        """
+        Get the number of staged changes.
+        Returns:
+            int: The number of staged changes.
+        """
+        return len(self._operations)  # Return the number of staged changes
+
+    def __enter__(self):
+        """
+        Start staging changes.
+        Returns:
+            DeckBatch: The batch.
+        """
+        return self  # Return the batch
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Commit the staged changes, or drop them if the block raised an exception.
+        """
+        if exc_type is None:  # The block finished normally
+            self.commit()
+        else:
+            self.discard()  # Apply nothing if the block failed
+        return False  # Do not suppress the exception
+
+    # Public method to stage a new flashcard
+    def add(self, topic, card_front, card_back):
+        """
+        Stage a new flashcard. The topic must exist (or be created earlier in the batch)
+        and must not contain a flashcard with this front yet.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str): The back text of the flashcard.
+        """
+        self._operations.append(("add", topic, card_front, card_back))  # Stage the change
+
+    # Public method to stage an edit of a flashcard
+    def edit(self, topic, card_front, new_front=None, new_back=None):
+        """
+        Stage an edit of an existing flashcard. The progress of the flashcard is kept.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The current front text of the flashcard.
+            new_front (str, optional): The new front text.
+            new_back (str, optional): The new back text.
+        """
+        self._operations.append(("edit", topic, card_front, new_front, new_back))  # Stage the change
+
+    # Public method to stage the deletion of a flashcard
+    def delete(self, topic, card_front):
+        """
+        Stage the deletion of a flashcard.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        """
+        self._operations.append(("delete", topic, card_front))  # Stage the change
+
+    # Public method to stage a new topic
+    def create_topic(self, topic):
+        """
+        Stage a new, empty topic.
+        Args:
+            topic (str): The name of the new topic.
+        """
+        self._operations.append(("create_topic", topic))  # Stage the change
+
+    # Public method to stage the renaming of a topic
+    def rename_topic(self, topic, new_topic):
+        """
+        Stage the renaming of a topic.
+        Args:
+            topic (str): The current name of the topic.
+            new_topic (str): The new name of the topic.
+        """
+        self._operations.append(("rename_topic", topic, new_topic))  # Stage the change
+
+    # Public method to stage the deletion of a topic
+    def delete_topic(self, topic):
+        """
+        Stage the deletion of a topic and all of its flashcards.
+        Args:
+            topic (str): The name of the topic.
+        """
+        self._operations.append(("delete_topic", topic))  # Stage the change
+
+    # Public method to check all staged changes
+    def validate(self):
+        """
+        Check all staged changes in order, as if the earlier ones were already applied.
+        Returns:
+            list: One message per invalid change; empty if the batch can be committed.
+        """
+        return _Simulation(self._deck).run(self._operations)  # Return the problems
+
+    # Public method to apply the staged changes
+    def commit(self):
+        """
+        Validate the staged changes and apply all of them, or none if any is invalid.
+        The deck is saved once afterwards.
+        Returns:
+            bool: True if the changes were applied, False otherwise.
+        """
+        if self.committed:  # A batch is applied only once
+            return False
+        with self._lock:
+            self.errors = self.validate()  # Check everything before changing anything
+            if self.errors:
+                return False  # Return False if any change is invalid
+            for operation in self._operations:  # Apply the changes in order
+                self._apply(*operation)
+            self._operations = []
+            self.committed = True
+            self._history.record(self)  # Make the batch undoable
+        if self.changes:
+            self._deck.request_save()  # Save all changes at once
+        return True  # Return True if the changes were applied
+
+    # Public method to drop the staged changes
+    def discard(self):
+        """
+        Drop all staged changes without applying them.
+        """
+        self._operations = []
+
+    # Private method to change one flashcard and remember the change
+    def _set_card(self, topic, card_front, card):
+        """
+        Set or delete a flashcard and record the change.
+        Args:
+            topic (str): The actual name of the topic.
+            card_front (str): The front text of the flashcard.
+            card (list or None): The new card value, or None to delete the flashcard.
+        """
+        old_card = self._deck.get_topic_dictionary(topic).get(card_front)  # Current card value
+        old_card = list(old_card) if old_card is not None else None  # Copy, also for compact topics
+        self._deck.set_card(topic, card_front, card)
+        self.changes.append(("card", topic, card_front, old_card, card))
+
+    # Private method to apply one validated change
+    def _apply(self, action, topic, *arguments):
+        """
+        Apply one staged change to the deck.
+        Args:
+            action (str): The kind of change.
+            topic (str): The name of the topic.
+            *arguments: The other arguments of the change.
+        """
+        actual_topic = self._deck._get_actual_topic_name(topic)  # Get the actual topic name
+        if action == "add":
+            card_front, card_back = arguments
+            self._set_card(actual_topic, card_front, [card_back, 0])
+        elif action == "edit":
+            card_front, new_front, new_back = arguments
+            card = list(self._deck.get_topic_dictionary(actual_topic)[card_front])  # Keep progress and fields
+            if new_back is not None:
+                card[0] = new_back
+            if new_front is not None and new_front != card_front:  # Move the flashcard to its new front
+                self._set_card(actual_topic, card_front, None)
+                card_front = new_front
+            self._set_card(actual_topic, card_front, card)
+        elif action == "delete":
+            self._set_card(actual_topic, arguments[0], None)
+        elif action == "create_topic":
+            self._deck.new_topic_dictionary(topic)
+            self.changes.append(("topic", None, topic))
+        elif action == "rename_topic":
+            self._deck.rename_topic(actual_topic, arguments[0])
+            self.changes.append(("topic", actual_topic, arguments[0]))
+        elif action == "delete_topic":
+            for card_front in list(self._deck.get_topic_dictionary(actual_topic)):  # Remember every flashcard
+                self._set_card(actual_topic, card_front, None)
+            self._deck.delete_topic(actual_topic)
+            self.changes.append(("topic", actual_topic, None))
+
+
+# Define the _Simulation class: checks staged changes without touching the deck
+class _Simulation:
+    def __init__(self, deck):
+        """
+        Initialize the simulation on top of the current state of a deck.
+        Args:
+            deck (Deck or SQLiteDeck): The deck the changes will be applied to.
+        """
+        self._deck = deck  # Store the deck
+        self._topics = {}  # Staged topic names by key; None for deleted topics
+        self._origins = {}  # Maps a staged topic name to the deck topic holding its flashcards (None if new)
+        self._cards = {}  # Staged existence of flashcards by (staged topic name, front)
+
+    # Private method to resolve a topic name
+    def _topic(self, topic):
+        """
+        Get the staged name of a topic.
+        Args:
+            topic (str): The name of the topic, in any case.
+        Returns:
+            str or None: The staged topic name, or None if the topic does not exist.
+        """
+        key = self._key(topic)  # Case-insensitive lookup key
+        if key in self._topics:  # Created, renamed or deleted in this batch
+            return self._topics[key]
+        actual_topic = self._deck._get_actual_topic_name(topic)  # Topic of the deck
+        if actual_topic is not None:
+            self._origins.setdefault(actual_topic, actual_topic)
+        return actual_topic  # Return the topic name
+
+    # Private method to check whether a flashcard exists
+    def _has_card(self, topic, card_front):
+        """
+        Check whether a flashcard exists after the changes simulated so far.
+        Args:
+            topic (str): The staged topic name.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True if the flashcard exists.
+        """
+        if (topic, card_front) in self._cards:  # Added or deleted in this batch
+            return self._cards[(topic, card_front)]
+        origin = self._origins.get(topic)  # Deck topic holding the flashcards
+        return origin is not None and card_front in self._deck.get_topic_dictionary(origin)
+
+    # Public method to check staged changes
+    def run(self, operations):
+        """
+        Check staged changes in order.
+        Args:
+            operations (list): The staged changes.
+        Returns:
+            list: One message per invalid change.
+        """
+        errors = []  # Problems found
+        for number, (action, topic, *arguments) in enumerate(operations, start=1):
+            problem = getattr(self, "_check_" + action)(topic, *arguments)  # Check the change
+            if problem:
+                errors.append(f"Change {number}: {problem}")
+        return errors  # Return the problems
+
+    # Private method to check a staged new flashcard
+    def _check_add(self, topic, card_front, card_back):
+        """
+        Check a staged new flashcard.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str): The back text of the flashcard.
+        Returns:
+            str or None: A description of the problem, or None if the change is valid.
+        """
+        staged_topic = self._topic(topic)
+        if staged_topic is None:
+            return f"topic '{topic}' does not exist"
+        if not str(card_front).strip() or not str(card_back).strip():
+            return "front and back must not be empty"
+        if self._has_card(staged_topic, card_front):
+            return f"'{card_front}' already exists in '{staged_topic}'"
+        self._cards[(staged_topic, card_front)] = True
+        return None
+
+    # Private method to check a staged edit of a flashcard
+    def _check_edit(self, topic, card_front, new_front, new_back):
+        """
+        Check a staged edit of a flashcard.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The current front text of the flashcard.
+            new_front (str or None): The new front text.
+            new_back (str or None): The new back text.
+        Returns:
+            str or None: A description of the problem, or None if the change is valid.
+        """
+        staged_topic = self._topic(topic)
+        if staged_topic is None:
+            return f"topic '{topic}' does not exist"
+        if not self._has_card(staged_topic, card_front):
+            return f"'{card_front}' does not exist in '{staged_topic}'"
+        if (new_front is not None and not str(new_front).strip()) or (new_back is not None and not str(new_back).strip()):
+            return "front and back must not be empty"
+        if new_front is not None and new_front != card_front:
+            if self._has_card(staged_topic, new_front):
+                return f"'{new_front}' already exists in '{staged_topic}'"
+            self._cards[(staged_topic, card_front)] = False
+            self._cards[(staged_topic, new_front)] = True
+        return None
+
+    # Private method to check a staged deletion of a flashcard
+    def _check_delete(self, topic, card_front):
+        """
+        Check a staged deletion of a flashcard.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            str or None: A description of the problem, or None if the change is valid.
+        """
+        staged_topic = self._topic(topic)
+        if staged_topic is None:
+            return f"topic '{topic}' does not exist"
+        if not self._has_card(staged_topic, card_front):
+            return f"'{card_front}' does not exist in '{staged_topic}'"
+        self._cards[(staged_topic, card_front)] = False
+        return None
+
+    # Private method to check a staged new topic
+    def _check_create_topic(self, topic):
+        """
+        Check a staged new topic.
+        Args:
+            topic (str): The name of the new topic.
+        Returns:
+            str or None: A description of the problem, or None if the change is valid.
+        """
+        if not str(topic).strip():
+            return "the topic name must not be empty"
+        if self._topic(topic) is not None:
+            return f"topic '{topic}' already exists"
+        self._topics[self._key(topic)] = topic
+        self._origins[topic] = None  # A new topic has no flashcards in the deck
+        return None
+
+    # Private method to check a staged renaming of a topic
+    def _check_rename_topic(self, topic, new_topic):
+        """
+        Check a staged renaming of a topic.
+        Args:
+            topic (str): The current name of the topic.
+            new_topic (str): The new name of the topic.
+        Returns:
+            str or None: A description of the problem, or None if the change is valid.
+        """
+        staged_topic = self._topic(topic)
+        if staged_topic is None:
+            return f"topic '{topic}' does not exist"
+        if not str(new_topic).strip():
+            return "the topic name must not be empty"
+        owner = self._topic(new_topic)
+        if owner is not None and owner != staged_topic:
+            return f"topic '{new_topic}' already exists"
+        self._topics[self._key(staged_topic)] = None  # The old name is free
+        self._topics[self._key(new_topic)] = new_topic
+        self._origins[new_topic] = self._origins.pop(staged_topic, None)  # The flashcards move along
+        for (card_topic, card_front), exists in list(self._cards.items()):
+            if card_topic == staged_topic:
+                self._cards[(new_topic, card_front)] = self._cards.pop((card_topic, card_front))
+        return None
+
+    # Private method to check a staged deletion of a topic
+    def _check_delete_topic(self, topic):
+        """
+        Check a staged deletion of a topic.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            str or None: A description of the problem, or None if the change is valid.
+        """
+        staged_topic = self._topic(topic)
+        if staged_topic is None:
+            return f"topic '{topic}' does not exist"
+        self._topics[self._key(staged_topic)] = None
+        self._origins.pop(staged_topic, None)
+        for card_topic, card_front in list(self._cards):
+            if card_topic == staged_topic:
+                del self._cards[(card_topic, card_front)]
+        return None
+
+    # Private method to get the lookup key of a topic name
+    def _key(self, topic):
+        """
+        Get the case-insensitive lookup key of a topic name.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            str: The key.
+        """
+        return self._deck._topic_key(topic)  # Return the key
+
+
+# Define the BatchHistory class: undo and redo of the last committed batch
+class BatchHistory:
+    def __init__(self, deck, lock=None):
+        """
+        Initialize the history of a deck.
+        Args:
+            deck (Deck or SQLiteDeck): The deck.
+            lock (optional): Lock of the deck (threading.RLock), or the transaction of an SQLiteDeck, held while
+                a batch is applied, undone or redone.
+        """
+        self._deck = deck  # Store the deck
+        self._lock = lock if lock is not None else nullcontext()  # Store the lock
+        self._undo = None  # Changes of the last committed (or redone) batch
+        self._redo = None  # Changes of the last undone batch
+        self._text_version = None  # Text version of the deck right after the last commit, undo or redo
+
+    # Public method to start a batch
+    def begin(self):
+        """
+        Start a new batch of changes.
+        Returns:
+            DeckBatch: The new batch.
+        """
+        return DeckBatch(self._deck, self, self._lock)  # Return the new batch
+
+    # Public method to remember a committed batch
+    def record(self, batch):
+        """
+        Remember a committed batch so that it can be undone.
+        Args:
+            batch (DeckBatch): The committed batch.
+        """
+        if batch.changes:  # Batches without changes do not replace the undo history
+            self._undo, self._redo = batch.changes, None
+            self._text_version = self._deck._text_version
+
+    # Private method to check that the deck was not changed outside of the history
+    def _unchanged(self):
+        """
+        Check that no card text or topic name was changed since the last commit, undo or redo.
+        Returns:
+            bool: True if undo and redo are still safe.
+        """
+        return self._text_version == self._deck._text_version  # Return True if nothing changed
+
+    # Public method to check whether undo is possible
+    def can_undo(self):
+        """
+        Check whether the last batch can be undone.
+        Returns:
+            bool: True if there is a batch to undo and the deck was not changed since.
+        """
+        return self._undo is not None and self._unchanged()  # Return True if undo is possible
+
+    # Public method to check whether redo is possible
+    def can_redo(self):
+        """
+        Check whether the last undone batch can be redone.
+        Returns:
+            bool: True if there is a batch to redo and the deck was not changed since.
+        """
+        return self._redo is not None and self._unchanged()  # Return True if redo is possible
+
+    # Public method to undo the last batch
+    def undo(self):
+        """
+        Undo the last committed batch. Flashcards get back their values from before the batch.
+        Returns:
+            bool: True if the batch was undone, False if there is nothing to undo or the deck was changed since.
+        """
+        with self._lock:
+            if not self.can_undo():
+                return False  # Return False if undo is not possible
+            for change in reversed(self._undo):  # Revert the changes in reverse order
+                if change[0] == "card":
+                    _, topic, card_front, old_card, _ = change
+                    self._deck.set_card(topic, card_front, old_card)
+                else:
+                    _, old_topic, new_topic = change
+                    if old_topic is None:  # Created topic
+                        self._deck.delete_topic(new_topic)
+                    elif new_topic is None:  # Deleted topic; its flashcards are restored by the card changes
+                        self._deck.new_topic_dictionary(old_topic)
+                    else:  # Renamed topic
+                        self._deck.rename_topic(new_topic, old_topic)
+            self._undo, self._redo = None, self._undo
+            self._text_version = self._deck._text_version
+        self._deck.request_save()  # Save the reverted deck
+        return True  # Return True if the batch was undone
+
+    # Public method to redo the last undone batch
+    def redo(self):
+        """
+        Apply the last undone batch again.
+        Returns:
+            bool: True if the batch was redone, False if there is nothing to redo or the deck was changed since.
+        """
+        with self._lock:
+            if not self.can_redo():
+                return False  # Return False if redo is not possible
+            for change in self._redo:  # Apply the changes in their original order
+                if change[0] == "card":
+                    _, topic, card_front, _, new_card = change
+                    self._deck.set_card(topic, card_front, new_card)
+                else:
+                    _, old_topic, new_topic = change
+                    if old_topic is None:  # Created topic
+                        self._deck.new_topic_dictionary(new_topic)
+                    elif new_topic is None:  # Deleted topic; its flashcards were deleted by the card changes
+                        self._deck.delete_topic(old_topic)
+                    else:  # Renamed topic
+                        self._deck.rename_topic(old_topic, new_topic)
+            self._undo, self._redo = self._redo, None
+            self._text_version = self._deck._text_version
+        self._deck.request_save()  # Save the changed deck
+        return True  # Return True if the batch was redone
@@ -0,0 +1,684 @@
+import argparse  # Import the argparse module for the command line check
+import glob  # Import the glob module to discover the deck files
+import json  # Import the JSON module to parse the deck files
+import os  # Import the os module for paths and file identities
+import threading  # Import the threading module to guard the topic map
+import zlib  # Import the zlib module to hand the file content to Deck for merging
+from collections import namedtuple  # Import namedtuple for the loaded files and the topic map
+from concurrent.futures import ProcessPoolExecutor  # Import the process pool for parallel parsing
+from itertools import repeat  # Import repeat to pass the same option to every worker
+
+from deck import Deck  # Import the Deck class that owns each writable file
+from deck_batch import BatchHistory  # Import the undo history of batches
+from deck_snapshot import SUPPORTED, SnapshotTopic, encode_topic  # Import the binary topic blocks
+from deck_validation import DeckProblem, clean_deck, format_problem  # Import the strict validation
+from scheduler import MASTERY_THRESHOLD  # Import the progress at which a flashcard counts as finished
+
+LoadedFile = namedtuple("LoadedFile", "path deck problems base identity")  # Result of parsing one deck file
+TopicSource = namedtuple("TopicSource", "name path deck topic")  # Where a topic of the collection is stored
+PARALLEL_BYTES = 4 << 20  # Below this total file size the files are parsed in this process
+DEFAULT_FILE = "new_topics.json"  # File in the collection directory that receives new topics
+
+
+# Function to parse and validate one deck file; runs in a worker process
+def load_file(path, encode=False):
+    """
+    Parse and validate one deck file.
+    Args:
+        path (str): The file path.
+        encode (bool): Encode every topic as a snapshot block (see deck_snapshot.py). Sending blocks from a
+            worker process is much cheaper than sending the dictionaries, which the parent would have to unpickle
+            object by object; the parent wraps the blocks in SnapshotTopic views.
+    Returns:
+        LoadedFile: The cleaned deck (None if the file cannot be parsed), the problems, the compressed file
+            content and the file identity (both used by Deck to merge concurrent saves).
+    """
+    try:
+        with open(path, 'rb') as fp:
+            data = fp.read()  # Read the deck file
+            status = os.fstat(fp.fileno())  # The file that was actually read
+    except OSError as error:
+        return LoadedFile(path, None, [DeckProblem(path, None, None, f"cannot read file: {error.strerror}",
+                                                   "skipped")], None, None)
+    try:
+        parsed = json.loads(data)
+    except ValueError as error:  # json.JSONDecodeError and invalid UTF-8
+        where = f" at line {error.lineno} column {error.colno}" if isinstance(error, json.JSONDecodeError) else ""
+        message = error.msg if isinstance(error, json.JSONDecodeError) else str(error)
+        return LoadedFile(path, None, [DeckProblem(path, None, None, f"invalid JSON{where}: {message}", "skipped")],
+                          None, None)
+    deck_dict, problems = clean_deck(parsed, path)  # Strict validation
+    if encode:
+        try:
+            deck_dict = {topic: encode_topic(cards) for topic, cards in deck_dict.items()}
+        except OverflowError:  # Over 4 GB of text in a topic; send the dictionary
+            pass
+    return LoadedFile(path, deck_dict, problems, zlib.compress(data, 1),
+                      (status.st_ino, status.st_size, status.st_mtime_ns))
+
+
+# Function to wrap the topic blocks sent by a worker process
+def _topic_views(path, deck_dict):
+    """
+    Turn the topic blocks of an encoded deck into SnapshotTopic views; plain dictionaries are kept.
+    Args:
+        path (str): The file path, read again if a block turns out to be damaged.
+        deck_dict (dict): {topic: cards or (block, text length, card count, hash table size, checksum)}.
+    Returns:
+        dict: {topic: cards}.
+    """
+    return {topic: SnapshotTopic(cards[0], 0, *cards[1:], source=(path, topic)) if isinstance(cards, tuple) else cards
+            for topic, cards in deck_dict.items()}  # Return the topics
+
+
+# Function to parse many deck files
+def load_files(paths, workers=None):
+    """
+    Parse and validate deck files, in parallel across a process pool when there is enough to parse and
+    more than one CPU to parse on.
+    Args:
+        paths (list): The file paths.
+        workers (int, optional): Number of worker processes; the number of CPUs if omitted, 1 parses in this process.
+    Returns:
+        list: LoadedFile tuples in the order of the paths.
+    """
+    total = 0  # Total size of the files
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass  # Reported by load_file
+    workers = min(workers or os.cpu_count() or 1, len(paths))  # Never more processes than files
+    if workers < 2 or total < PARALLEL_BYTES or not SUPPORTED:  # Starting processes would cost more than it saves
+        return [load_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        loaded = executor.map(load_file, paths, repeat(True), chunksize=max(1, len(paths) // (workers * 4)))
+        return [result._replace(deck=_topic_views(result.path, result.deck)) if result.deck is not None else result
+                for result in loaded]
+
+
+# Define the DeckCollection class: many deck files presented as one deck
+class DeckCollection:
+    def __init__(self, directory, pattern="**/*.json", workers=None, default_file=DEFAULT_FILE):
+        """
+        Initialize the DeckCollection: discover the deck files of a directory, parse and validate them in
+        parallel and present their topics as one deck with the same API as Deck. Every change is written
+        back to the file the topic came from, by the Deck of that file.
+        A file that cannot be parsed, or that has entries which could not be loaded, is opened read-only so
+        that saving never drops data; its topics can be reviewed, but changes are not saved. See `problems`.
+        Topics with the same name in several files are shown as "Topic (file.json)".
+        Args:
+            directory (str): The directory of the deck files.
+            pattern (str): Glob pattern of the deck files, relative to the directory.
+            workers (int, optional): Number of worker processes for parsing; 1 parses in this process.
+            default_file (str): File in the directory that receives new topics (created on demand).
+        """
+        self._directory = directory  # Store the directory
+        self._default_path = os.path.join(directory, default_file)  # Store the file for new topics
+        self._lock = threading.RLock()  # Guards the topic map
+        paths = sorted(path for path in glob.glob(os.path.join(directory, pattern), recursive=True)
+                       if os.path.isfile(path))  # The deck files, in a stable order
+        self.problems = []  # Problems found while loading, as DeckProblem tuples
+        self._decks = {}  # Deck of every writable file, by path
+        self._read_only = {}  # Cleaned deck of every read-only file, by path
+        self._topics = {}  # TopicSource of every topic, by the lookup key of its name in the collection
+        self._dirty = set()  # Paths of the decks changed through the collection since the last save
+        self._own_version = 0  # Changes of topic names made by the collection itself
+        for loaded in load_files(paths, workers):
+            self.problems.extend(loaded.problems)
+            skipped = any(problem.action == "skipped" for problem in loaded.problems)
+            if loaded.deck is None or skipped:  # Keep the file as it is
+                self._read_only[loaded.path] = loaded.deck or {}
+                for topic in loaded.deck or {}:
+                    self._add_source(loaded.path, None, topic)
+                continue
+            deck = Deck(loaded.path, snapshot=False, loaded=(loaded.deck, loaded.base, loaded.identity))
+            self.problems.extend(deck.problems)  # E.g. journal records of a crashed session are replayed
+            self._decks[loaded.path] = deck
+            for topic in deck.get_topic_list:
+                self._add_source(loaded.path, deck, topic)
+        self._batch_history = BatchHistory(self, self._lock)  # Undo and redo of the last batch
+
+    # Private method to add a topic to the topic map
+    def _add_source(self, path, deck, topic):
+        """
+        Add a topic of a file to the collection, renaming it if another file has a topic with the same name.
+        Args:
+            path (str): The file path.
+            deck (Deck or None): The deck of the file, or None if the file is read-only.
+            topic (str): The name of the topic in the file.
+        Returns:
+            str: The name of the topic in the collection.
+        """
+        name = topic  # Name in the collection
+        if self._topic_key(name) in self._topics:  # Another file has this topic name
+            name = f"{topic} ({os.path.relpath(path, self._directory)})"
+        self._topics[self._topic_key(name)] = TopicSource(name, path, deck, topic)
+        return name  # Return the name in the collection
+
+    # Private method to build the case-insensitive lookup key of a topic name
+    @staticmethod
+    def _topic_key(topic):
+        """
+        Build the case-insensitive lookup key of a topic name, like Deck.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            str: The normalized, casefolded topic name.
+        """
+        return Deck._topic_key(topic)  # Return the key
+
+    # Private method to find the file and deck of a topic
+    def _source(self, topic):
+        """
+        Find where a topic is stored.
+        Args:
+            topic (str): The name of the topic in the collection (case-insensitive).
+        Returns:
+            TopicSource or None: The source, or None if the topic does not exist.
+        """
+        return self._topics.get(self._topic_key(topic)) if isinstance(topic, str) else None
+
+    # Private method to find the deck of a writable topic
+    def _writable(self, topic):
+        """
+        Find the deck of a topic that can be changed, and mark it for saving.
+        Args:
+            topic (str): The name of the topic in the collection.
+        Returns:
+            TopicSource or None: The source, or None if the topic does not exist or its file is read-only.
+        """
+        source = self._source(topic)
+        if source is None or source.deck is None:
+            return None
+        self._dirty.add(source.path)  # Save the file with the next save
+        return source  # Return the source
+
+    # Private method to get the actual topic name matching the case-insensitive input
+    def _get_actual_topic_name(self, topic):
+        """
+        Get the name of a topic in the collection matching the case-insensitive input.
+        Args:
+            topic (str): The name of the topic to match.
+        Returns:
+            str or None: The topic name in the collection, or None if it does not exist.
+        """
+        source = self._source(topic)
+        return source.name if source is not None else None  # Return the topic name or None
+
+    @property  # Define a property method to get the number of changes of card texts and topic names
+    def _text_version(self):
+        """
+        Get a number that changes whenever card texts or topic names change in any file (used by batches).
+        Returns:
+            int: The text version.
+        """
+        return self._own_version + sum(deck._text_version for deck in self._decks.values())
+
+    @property  # Define a property method to get the deck files
+    def files(self):
+        """
+        Get the paths of all deck files of the collection.
+        Returns:
+            list: The writable and the read-only files.
+        """
+        return sorted(list(self._decks) + list(self._read_only))  # Return the paths
+
+    @property  # Define a property method to get the read-only deck files
+    def read_only_files(self):
+        """
+        Get the paths of the files that are not written because they could not be loaded completely.
+        Returns:
+            list: The read-only files.
+        """
+        return sorted(self._read_only)  # Return the paths
+
+    @property  # Define a property method to get the list of available topics
+    def get_topic_list(self):
+        """
+        Get the list of available topics of all files.
+        Returns:
+            list: A list of topic names.
+        """
+        return [source.name for source in self._topics.values()]  # Return the list of topic names
+
+    # Public method to get the flashcards and progress for a specific topic
+    def get_topic_dictionary(self, topic):
+        """
+        Get the flashcards and progress for a specific topic.
+        Args:
+            topic (str): The name of the topic to retrieve.
+        Returns:
+            dict: The flashcards and progress for the specified topic.
+        """
+        source = self._source(topic)
+        if source is None:  # Check if the topic exists
+            return {}
+        if source.deck is None:  # A read-only file
+            return self._read_only[source.path][source.topic]
+        return source.deck.get_topic_dictionary(source.topic)  # Return the flashcards of the topic
+
+    # Public method to check if a topic exists
+    def topic_exists(self, topic):
+        """
+        Check if a topic exists in any file.
+        Args:
+            topic (str): The name of the topic to check.
+        Returns:
+            bool: True if the topic exists, False otherwise.
+        """
+        return self._source(topic) is not None  # Return True if the topic exists
+
+    # Private method to get the deck that receives new topics
+    def _default_deck(self):
+        """
+        Get the deck of the file that receives new topics, creating it on first use.
+        Returns:
+            Deck or None: The deck, or None if the file is read-only.
+        """
+        if self._default_path in self._read_only:
+            return None
+        deck = self._decks.get(self._default_path)
+        if deck is None:  # The file does not exist yet
+            deck = self._decks[self._default_path] = Deck(self._default_path, snapshot=False)
+        return deck  # Return the deck
+
+    # Public method to create a new topic
+    def new_topic_dictionary(self, topic):
+        """
+        Create a new topic in the file for new topics.
+        Args:
+            topic (str): The name of the new topic.
+        Returns:
+            bool: True if the topic was created, False if it already exists or the file is read-only.
+        """
+        with self._lock:
+            deck = self._default_deck()
+            if self.topic_exists(topic) or deck is None or not deck.new_topic_dictionary(topic):
+                return False  # Return False if the topic exists
+            self._topics[self._topic_key(topic)] = TopicSource(topic, self._default_path, deck, topic)
+            self._dirty.add(self._default_path)
+            return True  # Return True if the topic was created
+
+    # Public method to rename an existing topic
+    def rename_topic(self, topic, new_topic):
+        """
+        Rename a topic in the file it is stored in.
+        Args:
+            topic (str): The current name of the topic.
+            new_topic (str): The new name of the topic.
+        Returns:
+            bool: True if the topic was renamed, False if it does not exist, is read-only or the new name is taken.
+        """
+        with self._lock:
+            source = self._writable(topic)
+            if source is None:
+                return False
+            taken = self._source(new_topic)  # Only the topic itself may have the new name (e.g. another case)
+            if taken is not None and taken != source or not source.deck.rename_topic(source.topic, new_topic):
+                return False
+            del self._topics[self._topic_key(source.name)]
+            self._topics[self._topic_key(new_topic)] = TopicSource(new_topic, source.path, source.deck,
+                                                                   source.deck._get_actual_topic_name(new_topic))
+            self._own_version += 1  # Topic names changed
+            return True  # Return True if the topic was renamed
+
+    # Public method to delete a topic
+    def delete_topic(self, topic):
+        """
+        Delete a topic from the file it is stored in.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            bool: True if the topic was deleted, False if it does not exist or is read-only.
+        """
+        with self._lock:
+            source = self._writable(topic)
+            if source is None or not source.deck.delete_topic(source.topic):
+                return False
+            del self._topics[self._topic_key(source.name)]
+            self._own_version += 1  # Topic names changed
+            return True  # Return True if the topic was deleted
+
+    # Public method to add or replace a flashcard
+    def update_topic_dictionary(self, topic, card_front, card_back):
+        """
+        Add a flashcard to a topic or replace its back text.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str): The back text of the flashcard.
+        Returns:
+            bool: True if the flashcard was stored, False if the topic does not exist or is read-only.
+        """
+        source = self._writable(topic)
+        return source is not None and source.deck.update_topic_dictionary(source.topic, card_front, card_back)
+
+    # Public method to add a new flashcard to a topic
+    def add_new_flashcard(self, topic, card_front, card_back):
+        """
+        Add a new flashcard to a topic.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str): The back text of the flashcard.
+        """
+        self.update_topic_dictionary(topic, card_front, card_back)  # Update the topic with the new flashcard
+
+    # Public method to set or delete a single flashcard exactly
+    def set_card(self, topic, card_front, card):
+        """
+        Set the complete value of a flashcard, or delete it. Used by batches and their undo.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card (list or None): The card value, or None to delete the flashcard.
+        Returns:
+            bool: True if the flashcard was set or deleted, False if the topic does not exist or is read-only.
+        """
+        source = self._writable(topic)
+        return source is not None and source.deck.set_card(source.topic, card_front, card)
+
+    # Public method to record a single card change
+    def record_card(self, topic, card_front):
+        """
+        Record the current state of a flashcard in the review journal of its file.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True if the card was recorded, False if it does not exist or its file is read-only.
+        """
+        source = self._source(topic)
+        return source is not None and source.deck is not None and source.deck.record_card(source.topic, card_front)
+
+    # Public method to start a batch of changes
+    def batch(self):
+        """
+        Start a batch of changes that is validated as a whole, see Deck.batch().
+        Returns:
+            DeckBatch: The batch.
+        """
+        return self._batch_history.begin()  # Return a new batch
+
+    # Public method to undo the last batch
+    def undo_batch(self):
+        """
+        Undo the last committed batch.
+        Returns:
+            bool: True if the batch was undone, False if there is nothing to undo or the collection changed since.
+        """
+        return self._batch_history.undo()  # Undo the batch
+
+    # Public method to redo the last undone batch
+    def redo_batch(self):
+        """
+        Apply the last undone batch again.
+        Returns:
+            bool: True if the batch was redone, False if there is nothing to redo or the collection changed since.
+        """
+        return self._batch_history.redo()  # Redo the batch
+
+    # Public method to add or replace many flashcards at once
+    def import_batch(self, rows):
+        """
+        Add or replace many flashcards at once, creating missing topics in the file for new topics.
+        Args:
+            rows (list): A list of (topic, card_front, card) tuples, where card is [card_back, progress, ...].
+        Returns:
+            int: The number of imported flashcards (rows of read-only topics are not imported).
+        """
+        by_path = {}  # Rows per file, with the topic names of the file
+        with self._lock:
+            for topic, card_front, card in rows:
+                if not self.topic_exists(topic):  # Create missing topics
+                    self.new_topic_dictionary(topic)
+                source = self._writable(topic)
+                if source is not None:
+                    by_path.setdefault(source.path, []).append((source.topic, card_front, card))
+        return sum(self._decks[path].import_batch(file_rows) for path, file_rows in by_path.items())
+
+    # Public method to iterate over all flashcards
+    def iter_cards(self):
+        """
+        Iterate over all flashcards of all files, topic by topic.
+        Yields:
+            tuple: (topic, card_front, card) for every flashcard, with the topic names of the collection.
+        """
+        for topic in self.get_topic_list:  # Iterate through a copy of the topic names
+            for card_front, card in list(self.get_topic_dictionary(topic).items()):
+                yield topic, card_front, card
+
+    # Private method to translate the topic names of a file into the names of the collection
+    def _names(self, path):
+        """
+        Map the topic names of a file to the names in the collection.
+        Args:
+            path (str): The file path.
+        Returns:
+            dict: {topic name in the file: topic name in the collection}.
+        """
+        return {source.topic: source.name for source in self._topics.values() if source.path == path}
+
+    # Public method to search the fronts and backs of all flashcards
+    def search(self, query, limit=10, topic=None):
+        """
+        Find the flashcards containing all words of a query, best match first. Every writable file is
+        searched with its own index; read-only files are not searched.
+        Args:
+            query (str): The words to search for.
+            limit (int): Maximum number of results.
+            topic (str, optional): Only search the flashcards of this topic.
+        Returns:
+            list: (topic, card_front, score) tuples.
+        """
+        if topic is not None:  # Search one file
+            source = self._source(topic)
+            if source is None or source.deck is None:
+                return []
+            return [(source.name, card_front, score) for _, card_front, score
+                    in source.deck.search(query, limit, source.topic)]
+        results = []  # Results of all files
+        for path, deck in self._decks.items():
+            names = self._names(path)
+            results.extend((names.get(found, found), card_front, score) for found, card_front, score
+                           in deck.search(query, limit))
+        results.sort(key=lambda result: result[2], reverse=True)  # Best match first
+        return results[:limit]  # Return the ranked results
+
+    # Public method to load or build the search indexes ahead of the first search
+    def prepare_search(self):
+        """
+        Load or build the search index of every writable file, see Deck.prepare_search.
+        Returns:
+            bool: True once the indexes are ready.
+        """
+        for deck in list(self._decks.values()):  # Read-only files are not searched
+            deck.prepare_search()
+        return True  # Return True once the indexes are ready
+
+    # Public method to find flashcards with the same front
+    def find_duplicates(self, card_front, limit=5):
+        """
+        Find flashcards in any writable file whose front has the same words as the given front.
+        Args:
+            card_front (str): The front text to check.
+            limit (int): Maximum number of results.
+        Returns:
+            list: (topic, card_front) tuples of the flashcards with the same front.
+        """
+        duplicates = []  # Duplicates of all files
+        for path, deck in self._decks.items():
+            names = self._names(path)
+            duplicates.extend((names.get(found, found), front) for found, front in deck.find_duplicates(card_front,
+                                                                                                        limit))
+        return duplicates[:limit]  # Return the duplicates
+
+    # Public method to reset the progress of all flashcards in a topic
+    def reset_progress(self, topic):
+        """
+        Reset the progress of all flashcards in a topic.
+        Args:
+            topic (str): The name of the topic to reset.
+        Returns:
+            bool: True if the progress was reset, False if the topic does not exist or is read-only.
+        """
+        source = self._writable(topic)
+        return source is not None and source.deck.reset_progress(source.topic)
+
+    # Public method to reset the progress of all topics
+    def reset_all_progress(self):
+        """
+        Reset the progress of all flashcards in all writable files.
+        Returns:
+            int: The number of reset topics.
+        """
+        return sum(self.reset_progress(topic) for topic in self.get_topic_list)  # Return the number of reset topics
+
+    # Private method to run a bulk progress operation on one or all topics
+    def _bulk(self, topic, operation):
+        """
+        Run a bulk progress operation of Deck on one topic or on every writable file.
+        Args:
+            topic (str or None): The name of a topic, or None for all topics.
+            operation (callable): Called with a deck and the topic name in its file (or None for all topics).
+        Returns:
+            int: The sum of the results.
+        """
+        if topic is not None:
+            source = self._writable(topic)
+            return operation(source.deck, source.topic) if source is not None else 0
+        self._dirty.update(self._decks)  # Every file changes
+        return sum(operation(deck, None) for deck in self._decks.values())  # Return the sum
+
+    # Public method to set the progress of many flashcards at once
+    def set_progress(self, value, topic=None, predicate=None):
+        """
+        Set the progress of the flashcards whose current progress matches a predicate, see Deck.set_progress.
+        Args:
+            value (int): The new progress.
+            topic (str, optional): The name of a topic; all topics if omitted.
+            predicate (callable, optional): Selects the flashcards by their current progress.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        return self._bulk(topic, lambda deck, name: deck.set_progress(value, name, predicate))
+
+    # Public method to lower the progress of many flashcards at once
+    def decay_progress(self, amount=1, topic=None, predicate=None):
+        """
+        Lower the progress of the flashcards whose current progress matches a predicate, see Deck.decay_progress.
+        Args:
+            amount (int): The number of points to take away.
+            topic (str, optional): The name of a topic; all topics if omitted.
+            predicate (callable, optional): Selects the flashcards by their current progress.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        return self._bulk(topic, lambda deck, name: deck.decay_progress(amount, name, predicate))
+
+    # Public method to count the flashcards per progress level
+    def progress_histogram(self, topic=None):
+        """
+        Count the flashcards per progress level, in all files including the read-only ones.
+        Args:
+            topic (str, optional): The name of a topic; all topics if omitted.
+        Returns:
+            list: The number of flashcards with progress 0, 1, ..., MASTERY_THRESHOLD.
+        """
+        histogram = [0] * (MASTERY_THRESHOLD + 1)  # One bucket per progress level
+        sources = [self._source(topic)] if topic is not None else list(self._topics.values())
+        for source in sources:
+            if source is None:
+                continue
+            if source.deck is not None:  # Let the deck count its columns
+                counts = source.deck.progress_histogram(source.topic)
+            else:
+                counts = [0] * (MASTERY_THRESHOLD + 1)
+                for card in self._read_only[source.path][source.topic].values():
+                    counts[min(max(card[1], 0), MASTERY_THRESHOLD)] += 1
+            histogram = [total + count for total, count in zip(histogram, counts)]
+        return histogram  # Return the counts
+
+    # Public method to summarize the progress of each topic
+    def topic_statistics(self, topic=None):
+        """
+        Summarize the progress of one or all topics.
+        Args:
+            topic (str, optional): The name of a topic; all topics if omitted.
+        Returns:
+            dict: {topic: {"cards", "finished", "completion", "histogram"}}, see Deck.topic_statistics.
+        """
+        names = [self._get_actual_topic_name(topic)] if topic is not None else self.get_topic_list
+        statistics = {}  # Statistics per topic
+        for name in names:
+            if name is None:
+                continue
+            histogram = self.progress_histogram(name)  # Counts per progress level
+            cards = sum(histogram)  # Number of flashcards
+            statistics[name] = {"cards": cards, "finished": histogram[-1],
+                                "completion": 100.0 * histogram[-1] / cards if cards else 0.0,
+                                "histogram": histogram}
+        return statistics  # Return the statistics
+
+    # Public method to save the files
+    def save_deck_json(self):
+        """
+        Save every writable file. Reviews that change cards without record_card (LearnTopic without a topic)
+        are not seen by the collection, so all files are written, each only if its deck changed.
+        Returns:
+            bool: True if all saves were successful, False otherwise.
+        """
+        self._dirty.clear()
+        return all([deck.save_deck_json() for deck in self._decks.values()])  # Save every file
+
+    # Public method to schedule a save on the background writer threads
+    def request_save(self):
+        """
+        Schedule a save of the files changed through the collection. Returns immediately.
+        """
+        dirty, self._dirty = self._dirty, set()  # Files to save
+        for path in dirty:
+            self._decks[path].request_save()
+
+    # Public method to wait for all scheduled saves
+    def flush(self, timeout=None):
+        """
+        Block until all scheduled saves have been written.
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait per file.
+        Returns:
+            bool: True if all saves were successful, False otherwise.
+        """
+        return all([deck.flush(timeout) for deck in self._decks.values()])  # Wait for every file
+
+    # Public method to save and close all files
+    def close(self):
+        """
+        Compact the review journals and save the writable files, e.g. when the application exits.
+        Read-only files are never written.
+        Returns:
+            bool: True if all files were saved, False otherwise.
+        """
+        return all([deck.close() for deck in self._decks.values()])  # Close every file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a directory of deck files and report every problem found.")
+    parser.add_argument("directory", help="The directory of the deck files")
+    parser.add_argument("--pattern", default="**/*.json", help="Glob pattern of the deck files")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (1: no process pool)")
+    args = parser.parse_args()
+
+    import time  # Imported here; only the command line measures the load
+    start = time.perf_counter()
+    collection = DeckCollection(args.directory, args.pattern, args.workers)
+    seconds = time.perf_counter() - start
+    cards = sum(statistics["cards"] for statistics in collection.topic_statistics().values())
+    print(f"{len(collection.files)} files, {len(collection.get_topic_list)} topics, {cards} flashcards "
+          f"loaded in {seconds:.2f} s")
+    for problem in collection.problems:
+        print(format_problem(problem))
+    if collection.read_only_files:
+        print(f"Read-only (not saved): {', '.join(collection.read_only_files)}")
+    raise SystemExit(1 if collection.read_only_files else 0)
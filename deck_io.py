@@ -0,0 +1,374 @@
+import csv  # Import the csv module for CSV/TSV files
+import json  # Import the JSON module for JSON and JSON Lines files
+import os  # Import the os module for file extensions
+import time  # Import the time module to measure throughput
+from deck_validation import DeckProblem, clean_card  # Import the validation of imported flashcards
+from file_lock import keep_file_mode  # Import the permission handling of atomic replacements
+
+CHUNK_SIZE = 1 << 16  # Number of characters read from a nested JSON deck at a time
+BATCH_SIZE = 5000  # Number of flashcards written to the deck at a time
+
+FORMATS = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".tsv": "tsv"}  # By extension
+
+
+# Define the TransferReport class to summarize an import or export
+class TransferReport:
+    def __init__(self, cards, seconds, problems=None):
+        """
+        Initialize the TransferReport.
+        Args:
+            cards (int): The number of transferred flashcards.
+            seconds (float): The time the transfer took.
+            problems (list, optional): DeckProblem entries for the rows that were repaired or skipped.
+        """
+        self.cards = cards  # Store the number of flashcards
+        self.seconds = seconds  # Store the duration
+        self.problems = problems or []  # Store the problems of the imported rows
+        self.cards_per_second = cards / seconds if seconds > 0 else float(cards)  # Throughput
+
+    def __str__(self):
+        """
+        Describe the transfer in one line.
+        Returns:
+            str: The number of flashcards, the duration and the throughput.
+        """
+        summary = f"{self.cards} flashcards in {self.seconds:.2f} s ({self.cards_per_second:,.0f} cards/s)"
+        if self.problems:  # Mention the repaired and skipped rows
+            summary += f", {len(self.problems)} problems"
+        return summary
+
+
+# Define the _JsonStream class: an incremental reader for the nested flash.json layout
+class _JsonStream:
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        """
+        Initialize the stream on an open text file.
+        Args:
+            fp (file): The file to read from.
+            chunk_size (int): Number of characters to read at a time.
+        """
+        self._fp = fp  # Store the file
+        self._chunk_size = chunk_size  # Store the chunk size
+        self._buffer = ""  # Characters read but not consumed yet
+        self._pos = 0  # Position of the next unconsumed character in the buffer
+        self._eof = False  # True once the whole file was read
+        self._decoder = json.JSONDecoder()  # Decoder for single values
+
+    def _fill(self):
+        """
+        Read the next chunk into the buffer, dropping the consumed characters.
+        Returns:
+            bool: True if more characters were read, False at the end of the file.
+        """
+        if self._eof:  # Nothing left to read
+            return False
+        chunk = self._fp.read(self._chunk_size)  # Read the next chunk
+        if not chunk:  # The end of the file was reached
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk  # Keep only the unconsumed characters
+        self._pos = 0  # The buffer now starts at the next unconsumed character
+        return True  # Return True if more characters were read
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character without consuming it.
+        Returns:
+            str: The next character, or '' at the end of the file.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":  # Skip whitespace
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():  # A character is available or the file ended
+                return self._buffer[self._pos:self._pos + 1]
+
+    def expect(self, characters):
+        """
+        Consume the next character, which must be one of the given characters.
+        Args:
+            characters (str): The allowed characters.
+        Returns:
+            str: The consumed character.
+        Raises:
+            ValueError: If the next character is not allowed.
+        """
+        character = self.peek()  # Get the next character
+        if not character or character not in characters:  # Check the character
+            raise ValueError(f"Expected one of {characters!r} but found {character!r}")
+        self._pos += 1  # Consume the character
+        return character  # Return the consumed character
+
+    def value(self):
+        """
+        Decode the next complete JSON value, reading more chunks if the value is split.
+        Returns:
+            object: The decoded value.
+        """
+        self.peek()  # Skip whitespace
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)  # Decode from the buffer
+                if end < len(self._buffer) or self._eof:  # The value cannot continue in the next chunk
+                    self._pos = end  # Consume the value
+                    return value  # Return the decoded value
+            except json.JSONDecodeError:
+                if self._eof:  # The value is damaged, not just split
+                    raise
+            self._fill()  # Read more characters and try again
+
+
+# Function to stream flashcards from a nested flash.json file
+def iter_nested_json(path, chunk_size=CHUNK_SIZE):
+    """
+    Stream the flashcards of a deck in the nested flash.json layout without loading the whole file.
+    Args:
+        path (str): The file path to the JSON deck file.
+        chunk_size (int): Number of characters to read at a time.
+    Yields:
+        tuple: (topic, card_front, card) for every flashcard.
+    """
+    with open(path, 'r', encoding="utf-8") as fp:
+        stream = _JsonStream(fp, chunk_size)  # Incremental reader
+        stream.expect("{")  # The deck is an object of topics
+        if stream.peek() == "}":  # An empty deck
+            return
+        while True:
+            topic = stream.value()  # Name of the topic
+            stream.expect(":")
+            stream.expect("{")  # Each topic is an object of flashcards
+            if stream.peek() != "}":  # The topic has flashcards
+                while True:
+                    card_front = stream.value()  # Front text of the flashcard
+                    stream.expect(":")
+                    card = stream.value()  # [card_back, progress, ...]
+                    yield topic, card_front, card
+                    if stream.expect(",}") == "}":  # End of the topic
+                        break
+            else:
+                stream.expect("}")  # Consume the end of an empty topic
+                yield topic, None, None  # Report the empty topic so it is created
+            if stream.expect(",}") == "}":  # End of the deck
+                return
+
+
+# Function to stream flashcards from a JSON Lines file
+def iter_jsonl(path):
+    """
+    Stream flashcards from a JSON Lines file with one object per line:
+    {"topic": ..., "front": ..., "back": ..., "progress": ...}. "progress" is optional.
+    Args:
+        path (str): The file path to the JSON Lines file.
+    Yields:
+        tuple: (topic, card_front, card) for every flashcard.
+    """
+    with open(path, 'r', encoding="utf-8") as fp:
+        for line in fp:  # Iterate through the lines one at a time
+            if line.strip():  # Skip empty lines
+                record = json.loads(line)  # Decode the flashcard
+                card = [record["back"], record.get("progress", 0)]  # Build the card value
+                if isinstance(record.get("fields"), dict):  # Keep scheduling fields if present
+                    card.append(record["fields"])
+                yield record["topic"], record["front"], card
+
+
+# Function to stream flashcards from a CSV or TSV file
+def iter_csv(path, delimiter=","):
+    """
+    Stream flashcards from a CSV/TSV file with the columns topic, front, back and an optional progress.
+    A header row starting with 'topic' is skipped.
+    Args:
+        path (str): The file path to the CSV/TSV file.
+        delimiter (str): The column separator.
+    Yields:
+        tuple: (topic, card_front, card) for every flashcard.
+    """
+    with open(path, 'r', encoding="utf-8", newline="") as fp:
+        for number, row in enumerate(csv.reader(fp, delimiter=delimiter)):  # Iterate through the rows
+            if len(row) < 3 or (number == 0 and row[0].strip().lower() == "topic"):  # Skip header and short rows
+                continue
+            progress = int(row[3]) if len(row) > 3 and row[3].strip().isdigit() else 0  # Optional progress
+            yield row[0], row[1], [row[2], progress]
+
+
+# Function to stream flashcards from a file in any supported format
+def iter_file(path, file_format=None):
+    """
+    Stream flashcards from a file, choosing the reader by format or file extension.
+    Args:
+        path (str): The file path to read.
+        file_format (str, optional): 'json', 'jsonl', 'csv' or 'tsv'. Guessed from the extension if omitted.
+    Returns:
+        iterator: (topic, card_front, card) tuples.
+    """
+    file_format = file_format or guess_format(path)  # Determine the format
+    if file_format == "json":
+        return iter_nested_json(path)
+    if file_format == "jsonl":
+        return iter_jsonl(path)
+    return iter_csv(path, "\t" if file_format == "tsv" else ",")
+
+
+# Function to guess the format of a file from its extension
+def guess_format(path):
+    """
+    Guess the format of a deck file from its extension.
+    Args:
+        path (str): The file path.
+    Returns:
+        str: 'json', 'jsonl', 'csv' or 'tsv'.
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()  # Get the file extension
+    if extension not in FORMATS:  # Check if the extension is supported
+        raise ValueError(f"Unsupported file type '{extension}'. Supported: {', '.join(FORMATS)}")
+    return FORMATS[extension]  # Return the format
+
+
+# Function to import flashcards into a deck in batches
+def import_cards(deck, path, file_format=None, batch_size=BATCH_SIZE, progress_callback=None):
+    """
+    Stream flashcards from a file into a deck in batches. Only one batch is held in memory at a time.
+    Every row is validated like a loaded deck file (see deck_validation.py): invalid values are repaired or
+    the row is skipped, and both are listed in the report.
+    Args:
+        deck (Deck or SQLiteDeck): The deck to import into.
+        path (str): The file path to read.
+        file_format (str, optional): 'json', 'jsonl', 'csv' or 'tsv'. Guessed from the extension if omitted.
+        batch_size (int): Number of flashcards written to the deck at a time.
+        progress_callback (callable, optional): Called with a TransferReport after every batch.
+    Returns:
+        TransferReport: The number of imported flashcards, the throughput and the problems of the rows.
+    """
+    start = time.perf_counter()  # Start time of the import
+    count = 0  # Number of imported flashcards
+    batch = []  # Flashcards waiting to be written
+    problems = []  # Repaired and skipped rows
+    for topic, card_front, card in iter_file(path, file_format):  # Stream the flashcards
+        if not isinstance(topic, str):  # Topic names are text
+            problems.append(DeckProblem(path, None, card_front, f"topic {topic!r} is not text", "skipped"))
+            continue
+        if card_front is None:  # An empty topic in a nested JSON deck
+            deck.new_topic_dictionary(topic)
+            continue
+        if not isinstance(card_front, str):  # Fronts are text
+            problems.append(DeckProblem(path, topic, None, f"front {card_front!r} is not text", "skipped"))
+            continue
+        if not (type(card) is list and len(card) == 2 and type(card[0]) is str and type(card[1]) is int):
+            card, card_problems, action = clean_card(card)  # Repair the card or skip the row
+            problems.extend(DeckProblem(path, topic, card_front, problem, action) for problem in card_problems)
+            if card is None:
+                continue
+        batch.append((topic, card_front, card))  # Queue the flashcard
+        if len(batch) >= batch_size:  # Write a full batch
+            count += deck.import_batch(batch)
+            batch = []
+            if progress_callback:  # Report the progress
+                progress_callback(TransferReport(count, time.perf_counter() - start, problems))
+    if batch:  # Write the last, partial batch
+        count += deck.import_batch(batch)
+    deck.save_deck_json()  # Persist the imported flashcards once
+    return TransferReport(count, time.perf_counter() - start, problems)  # Return the summary
+
+
+# Function to export all flashcards of a deck to a file
+def export_cards(deck, path, file_format=None):
+    """
+    Stream all flashcards of a deck to a file, writing one flashcard at a time. The export is written to a
+    temporary file that replaces the file only when it is complete, so a failed export leaves no partial file.
+    Args:
+        deck (Deck or SQLiteDeck): The deck to export.
+        path (str): The file path to write.
+        file_format (str, optional): 'json', 'jsonl', 'csv' or 'tsv'. Guessed from the extension if omitted.
+    Returns:
+        TransferReport: The number of exported flashcards and the throughput.
+    """
+    import tempfile  # Imported here; only exports need it
+    file_format = file_format or guess_format(path)  # Determine the format
+    start = time.perf_counter()  # Start time of the export
+    directory = os.path.dirname(os.path.abspath(path))  # Write next to the target, then rename
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8", newline="") as fp:
+            count = _write_cards(deck, fp, file_format)  # Stream the flashcards into the temporary file
+        keep_file_mode(temp_path, path)  # Keep the permissions of the target
+        os.replace(temp_path, path)  # Replace the target only with a complete export
+    except BaseException:
+        try:
+            os.remove(temp_path)  # Remove the partial export
+        except OSError:
+            pass  # A leftover temporary file does not affect the target
+        raise
+    return TransferReport(count, time.perf_counter() - start)  # Return the summary
+
+
+# Function to write all flashcards of a deck to an open file
+def _write_cards(deck, fp, file_format):
+    """
+    Write all flashcards of a deck in one of the export formats.
+    Args:
+        deck (Deck or SQLiteDeck): The deck to export.
+        fp (file): The open text file.
+        file_format (str): 'json', 'jsonl', 'csv' or 'tsv'.
+    Returns:
+        int: The number of written flashcards.
+    """
+    count = 0  # Number of exported flashcards
+    if file_format == "json":  # Nested layout with the same indentation as flash.json
+        written = set()  # Topics that are already in the file
+        fp.write("{")
+        for topic, card_front, card in deck.iter_cards():  # Stream the flashcards
+            if topic not in written:  # Close the previous topic and open the next one
+                fp.write(("\n    }," if written else "") + f"\n    {json.dumps(topic)}: {{")
+                separator = ""  # No comma before the first flashcard of a topic
+                written.add(topic)
+            value = json.dumps(list(card), indent=4).replace("\n", "\n        ")  # Indent the card value
+            fp.write(f"{separator}\n        {json.dumps(card_front)}: {value}")
+            separator = ","  # Separate the following flashcards
+            count += 1
+        for topic in deck.get_topic_list:  # Topics without flashcards are not yielded by iter_cards
+            if topic not in written:
+                fp.write(("\n    }," if written else "") + f"\n    {json.dumps(topic)}: {{")
+                written.add(topic)
+        fp.write("\n    }\n}" if written else "}")
+    elif file_format == "jsonl":  # One flashcard per line
+        for topic, card_front, card in deck.iter_cards():
+            card = list(card)  # Snapshot and compact flashcards as plain lists
+            record = {"topic": topic, "front": card_front, "back": card[0], "progress": card[1]}
+            if len(card) > 2:  # Keep scheduling fields if present
+                record["fields"] = card[2]
+            fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    else:  # CSV or TSV
+        writer = csv.writer(fp, delimiter="\t" if file_format == "tsv" else ",")
+        writer.writerow(["topic", "front", "back", "progress"])  # Header row
+        for topic, card_front, card in deck.iter_cards():
+            writer.writerow([topic, card_front, card[0], card[1]])
+            count += 1
+    return count  # Return the number of exported flashcards
+
+
+if __name__ == "__main__":
+    import argparse  # Imported here; the deck imports this module and should start fast
+    from deck import Deck  # Imported here; the deck imports this module
+    from deck_validation import format_problem  # Imported here; only the command line prints problems
+
+    parser = argparse.ArgumentParser(description="Stream flashcards into or out of a deck.")
+    parser.add_argument("direction", choices=["import", "export"], help="Transfer direction")
+    parser.add_argument("deck", help="Deck file (.json, .db or .sqlite)")
+    parser.add_argument("file", help="File to import from or export to (.json, .jsonl, .csv, .tsv)")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())), help="Override the file format")
+    args = parser.parse_args()
+    if args.deck.endswith((".db", ".sqlite")):  # Use the SQLite backend for database files
+        from sqlite_deck import SQLiteDeck  # Imported lazily; the JSON backend does not need it
+        target_deck = SQLiteDeck(args.deck)
+    else:
+        target_deck = Deck(args.deck)  # Use the JSON backend otherwise
+    if args.direction == "import":
+        report = import_cards(target_deck, args.file, args.format, progress_callback=print)
+        for problem in report.problems:  # List the repaired and skipped rows
+            print(format_problem(problem))
+    else:
+        report = export_cards(target_deck, args.file, args.format)
+    target_deck.close()  # Save and close the deck
+    print(report)
@@ -0,0 +1,104 @@
+from itertools import chain  # Import chain to walk the keys of several dictionaries
+
+from scheduler import MASTERY_THRESHOLD  # Import the progress at which a flashcard counts as finished
+
+
+# Function to read the progress of a card
+def _progress(card):
+    """
+    Get the progress of a card, treating invalid values as 0.
+    Args:
+        card (list): The card value, [card_back, progress, fields (optional)].
+    Returns:
+        int: The progress of the card.
+    """
+    return card[1] if len(card) > 1 and isinstance(card[1], int) else 0  # Return the progress
+
+
+# Function to read the scheduling fields of a card
+def _fields(card):
+    """
+    Get the scheduling fields of a card.
+    Args:
+        card (list or None): The card value.
+    Returns:
+        dict or None: The fields, or None if the card has none.
+    """
+    return card[2] if card is not None and len(card) > 2 and isinstance(card[2], dict) else None
+
+
+# Function to merge two versions of one flashcard
+def merge_card(base, ours, theirs):
+    """
+    Merge the changes two writers made to one flashcard since their common version.
+    If only one side changed the card, its version is taken. If both changed it, the back text is taken
+    from the side that edited it (ours if both did), the progress changes of both sides are added up
+    (two correct answers in two windows count twice), and the scheduling fields are taken from the side
+    that changed them (ours if both did). An edited flashcard wins over its deletion.
+    Args:
+        base (list or None): The card in the common version, or None if it did not exist.
+        ours (list or None): The card as this writer wants to save it, or None if deleted.
+        theirs (list or None): The card as saved by the other writer, or None if deleted.
+    Returns:
+        tuple: (merged card or None, True if both sides changed the card).
+    """
+    if ours == base:  # Only the other writer changed the card (or nobody did)
+        return theirs, False
+    if theirs == base:  # Only this writer changed the card
+        return ours, False
+    if ours is None and theirs is None:  # Deleted on both sides
+        return None, False
+    if ours is None or theirs is None:  # Deleted on one side and edited on the other: keep the edit
+        return (theirs if ours is None else ours), True
+    back = theirs[0] if base is not None and ours[0] == base[0] else ours[0]  # The edited back text
+    if base is None:  # Added on both sides: keep the further progress
+        progress = max(_progress(ours), _progress(theirs))
+    else:  # Add up the progress changes of both sides
+        progress = _progress(ours) + _progress(theirs) - _progress(base)
+        progress = min(max(progress, 0), max(MASTERY_THRESHOLD, _progress(ours), _progress(theirs)))
+    fields = _fields(theirs) if _fields(ours) == _fields(base) else _fields(ours)  # The changed fields
+    return ([back, progress] if fields is None else [back, progress, fields]), True
+
+
+# Function to merge two versions of a deck
+def merge_decks(base, ours, theirs, topic_key=None):
+    """
+    Three-way merge of deck dictionaries in the flash.json layout ({topic: {front: card}}).
+    Topics and flashcards added on either side are kept; changes are merged card by card with merge_card.
+    Args:
+        base (dict): The deck both writers started from.
+        ours (dict): The deck as this writer wants to save it.
+        theirs (dict): The deck as saved by the other writer.
+        topic_key (callable, optional): Builds the lookup key of a topic name, so that topics whose names
+            differ only in case are merged into one topic (named as in `ours`).
+    Returns:
+        tuple: (merged deck, number of flashcards changed on both sides).
+    """
+    if topic_key is not None:  # Use one spelling per topic, preferring this writer's
+        names = {}  # Topic name by key
+        for topic in chain(ours, theirs, base):
+            names.setdefault(topic_key(topic), topic)
+        base, ours, theirs = ({names[topic_key(topic)]: cards for topic, cards in deck.items()}
+                              for deck in (base, ours, theirs))
+    merged = {}  # The merged deck
+    conflicts = 0  # Number of flashcards changed on both sides
+    for topic in chain(ours, (topic for topic in theirs if topic not in ours)):  # Keep the order of the topics
+        base_cards, our_cards, their_cards = base.get(topic), ours.get(topic), theirs.get(topic)
+        if our_cards == base_cards:  # Only the other writer changed the topic
+            cards = their_cards
+        elif their_cards == base_cards:  # Only this writer changed the topic
+            cards = our_cards
+        else:  # Both changed the topic: merge it card by card
+            base_cards, cards = base_cards or {}, {}
+            our_side, their_side = our_cards or {}, their_cards or {}
+            for card_front in chain(our_side, (front for front in their_side if front not in our_side)):
+                card, conflict = merge_card(base_cards.get(card_front), our_side.get(card_front),
+                                            their_side.get(card_front))
+                conflicts += conflict
+                if card is not None:  # Skip deleted flashcards
+                    cards[card_front] = card
+            if not cards and (our_cards is None or their_cards is None):  # Deleted topic with nothing to keep
+                cards = None
+        if cards is not None:  # Skip deleted topics
+            merged[topic] = cards
+    return merged, conflicts  # Return the merged deck
@@ -0,0 +1,763 @@
+import json  # Import the JSON module for the rare cards that do not fit the fixed columns
+import mmap  # Import the mmap module to open snapshots without reading them
+import os  # Import the os module for atomic file replacement
+import struct  # Import the struct module for the header and the topic directory
+import sys  # Import the sys module to check the byte order
+import tempfile  # Import the tempfile module to write snapshots atomically
+import zlib  # Import the zlib module for the checksums and the hash of the fronts
+from array import array  # Import the array type for the offset and hash tables
+from collections.abc import MutableMapping  # Import the mapping base class for the dict-like topics
+from file_lock import keep_file_mode  # Import the permission handling of atomic replacements
+
+# Layout of a snapshot file (little endian):
+#   header | topic directory (entries, then the UTF-8 topic names) | one block per topic
+# A topic block holds, for n cards: the end offsets of front, back and tail of every card (3n uint32, relative
+# to the text), a hash table of the fronts (uint32 card number + 1, 0 = empty), the progress of every card
+# (n bytes) and the UTF-8 text. The tail is empty for [back, progress] cards and holds card[1:] as JSON otherwise.
+MAGIC = b"FGSNAP"  # First bytes of every snapshot
+VERSION = 1  # Format version; snapshots of other versions are ignored and rewritten
+# magic, version, inode, size and modification time of the JSON deck, topic count, directory length and checksum
+HEADER = struct.Struct("<6sHQQqIQI")
+HEADER_CHECKSUM = struct.Struct("<I")  # Checksum of the header, stored right after it
+TOPIC = struct.Struct("<QQIIII")  # Block offset, text length, card count, hash table size, name length, block checksum
+ALIGNMENT = 8  # Blocks start at multiples of 8 bytes so that their tables can be cast to uint32
+TEXT_ERRORS = "surrogatepass"  # JSON allows lone surrogates in strings; keep them instead of failing
+SUPPORTED = sys.byteorder == "little"  # The tables are read in the native byte order
+
+
+# Function to round a length up to the alignment
+def _aligned(length):
+    """
+    Round a length up to a multiple of ALIGNMENT.
+    Args:
+        length (int): The length in bytes.
+    Returns:
+        int: The aligned length.
+    """
+    return (length + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT  # Return the aligned length
+
+
+# Function to compute the size of the hash table of a topic
+def _table_size(count):
+    """
+    Compute the size of the hash table for a number of cards: a power of two, at most half full.
+    Args:
+        count (int): The number of cards.
+    Returns:
+        int: The number of slots.
+    """
+    size = 1  # Smallest table
+    while size < count * 2:
+        size *= 2
+    return size  # Return the number of slots
+
+
+# Function to encode the flashcards of one topic as a block
+def encode_topic(cards):
+    """
+    Encode the flashcards of one topic as a snapshot block.
+    Args:
+        cards (Mapping): {card_front: [card_back, progress, ...]}; dictionaries, CompactTopic and SnapshotTopic.
+    Returns:
+        tuple: (block bytes, text length, card count, hash table size, block checksum).
+    """
+    text = bytearray()  # UTF-8 text of all fronts, backs and tails
+    ends = array('I')  # End offsets of front, back and tail of every card
+    progress = bytearray()  # Progress of every card
+    hashes = []  # Hash of every front
+    for card_front, card in cards.items():
+        card = list(card)  # Plain list, also for compact and snapshot cards
+        encoded = card_front.encode("utf-8", TEXT_ERRORS)
+        hashes.append(zlib.crc32(encoded))  # Stable across processes, unlike hash()
+        text += encoded
+        ends.append(len(text))
+        text += card[0].encode("utf-8", TEXT_ERRORS)
+        ends.append(len(text))
+        value = card[1] if len(card) > 1 else 0  # The progress
+        fits = isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 255
+        if len(card) != 2 or not fits:  # Keep fields and unusual progress values exactly
+            text += json.dumps(card[1:]).encode("utf-8")
+        ends.append(len(text))
+        progress.append(min(max(value, 0), 255) if fits or isinstance(value, int) else 0)
+    slots = array('I', bytes(4 * _table_size(len(hashes))))  # Empty hash table
+    mask = len(slots) - 1  # Table sizes are powers of two
+    for number, front_hash in enumerate(hashes):  # Insert every card with linear probing
+        slot = front_hash & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = number + 1
+    block = bytearray(ends.tobytes())  # Assemble the block
+    block += slots.tobytes()
+    block += progress
+    block += text
+    block += bytes(_aligned(len(block)) - len(block))  # Pad the block to the alignment
+    return bytes(block), len(text), len(hashes), len(slots), zlib.crc32(block)  # Return the block and its entry
+
+
+# Function to encode a whole deck for a snapshot
+def build_snapshot(deck_dict):
+    """
+    Encode all topics of a deck. Snapshot topics that were not changed since they were opened are copied
+    as they are, so saving a deck that was opened from a snapshot only encodes the topics that changed.
+    Args:
+        deck_dict (dict): {topic: cards} as stored by Deck.
+    Returns:
+        list or None: (topic, block, text length, card count, hash table size, checksum) per topic, or None if
+            snapshots are not supported here or a topic is too large for the format.
+    """
+    if not SUPPORTED:  # Big endian machines keep using the JSON file only
+        return None
+    topics = []  # Encoded topics
+    try:
+        for topic, cards in deck_dict.items():
+            block = cards.raw_block() if isinstance(cards, SnapshotTopic) else None  # Unchanged snapshot topic
+            topics.append((topic,) + (block if block is not None else encode_topic(cards)))
+    except (OverflowError, TypeError, AttributeError):  # Over 4 GB of text in a topic, or a damaged card
+        return None
+    return topics  # Return the encoded topics
+
+
+# Function to write a snapshot file
+def write_snapshot(path, topics, identity):
+    """
+    Write a snapshot atomically. The file is not flushed to disk: it is a cache of the JSON deck, and a
+    snapshot damaged by a crash fails its checksums and is rebuilt from the JSON deck.
+    Args:
+        path (str): The file path of the snapshot.
+        topics (list): The encoded topics returned by build_snapshot.
+        identity (tuple): Inode, size and modification time of the JSON deck the snapshot belongs to.
+    Returns:
+        bool: True if the snapshot was written, False otherwise.
+    """
+    names = [topic[0].encode("utf-8", TEXT_ERRORS) for topic in topics]  # UTF-8 topic names
+    directory_length = _aligned(TOPIC.size * len(topics) + sum(len(name) for name in names))
+    offset = _aligned(HEADER.size + HEADER_CHECKSUM.size) + directory_length  # Offset of the first block
+    directory = bytearray()  # Entries of the topic directory
+    for name, (_, block, text_length, count, table_size, checksum) in zip(names, topics):
+        directory += TOPIC.pack(offset, text_length, count, table_size, len(name), checksum)
+        offset += len(block)
+    directory += b"".join(names)
+    directory += bytes(directory_length - len(directory))  # Pad the directory to the alignment
+    header = HEADER.pack(MAGIC, VERSION, identity[0], identity[1], identity[2], len(topics), directory_length,
+                         zlib.crc32(directory))
+    header += HEADER_CHECKSUM.pack(zlib.crc32(header))
+    header += bytes(_aligned(len(header)) - len(header))
+    temp_path = None  # Path of the temporary file
+    try:
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                         dir=os.path.dirname(os.path.abspath(path)))
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(header)  # Write the header, the directory and the blocks
+            fp.write(directory)
+            for topic in topics:
+                fp.write(topic[1])
+        keep_file_mode(temp_path, path)  # Keep the permissions of the snapshot
+        os.replace(temp_path, path)  # Atomically replace the snapshot
+        return True  # Return True if the snapshot was written
+    except (IOError, OSError, PermissionError):  # E.g. the old snapshot is still mapped on Windows
+        if temp_path is not None and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass  # A leftover temporary file does not affect the snapshot
+        return False  # Return False on error
+
+
+# Function to open a snapshot file
+def open_snapshot(path, identity, source_path=None):
+    """
+    Open a snapshot by mapping it into memory. Only the header and the topic directory are read and
+    checked; the block of a topic is checked on its first use, and its card texts are decoded only when
+    they are accessed.
+    Args:
+        path (str): The file path of the snapshot.
+        identity (tuple): Inode, size and modification time of the current JSON deck.
+        source_path (str, optional): The JSON deck; a topic whose block is damaged is read from it.
+    Returns:
+        tuple or None: ({topic: SnapshotTopic}, mapping), or None if the snapshot is missing, damaged, of another
+            version or older than the JSON deck. Release the mapping with close_snapshot.
+    """
+    if not SUPPORTED or identity is None:
+        return None
+    try:
+        with open(path, 'rb') as fp:
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)  # The mapping outlives the file object
+    except (OSError, ValueError):  # Missing or empty file
+        return None
+    if len(data) < HEADER.size + HEADER_CHECKSUM.size:
+        data.close()  # Release the mapping
+        return None
+    header = HEADER.unpack_from(data)
+    magic, version, inode, size, mtime_ns, topic_count, directory_length, directory_checksum = header
+    if (magic != MAGIC or version != VERSION or (inode, size, mtime_ns) != tuple(identity)
+            or HEADER_CHECKSUM.unpack_from(data, HEADER.size)[0] != zlib.crc32(data[:HEADER.size])):
+        data.close()  # Release the mapping
+        return None  # Another format, a JSON deck saved since, or a damaged header
+    start = _aligned(HEADER.size + HEADER_CHECKSUM.size)  # Start of the directory
+    directory = data[start:start + directory_length]
+    if len(directory) != directory_length or zlib.crc32(directory) != directory_checksum:
+        data.close()  # Release the mapping
+        return None  # Damaged directory
+    topics = {}  # Topics by name
+    name_offset = TOPIC.size * topic_count  # The names follow the entries
+    try:
+        for number in range(topic_count):
+            offset, text_length, count, table_size, name_length, checksum = TOPIC.unpack_from(directory,
+                                                                                            TOPIC.size * number)
+            name = directory[name_offset:name_offset + name_length].decode("utf-8", TEXT_ERRORS)
+            name_offset += name_length
+            topic = SnapshotTopic(data, offset, text_length, count, table_size, checksum, (source_path, name))
+            if offset + topic.block_length > len(data):  # The file was cut off
+                topics = None
+                break
+            topics[name] = topic
+    except (struct.error, UnicodeDecodeError):
+        topics = None
+    if topics is None:  # Damaged directory entries
+        data.close()  # Release the mapping
+        return None
+    return topics, data  # Return the topics and their mapping
+
+
+# Function to release the mapping of a snapshot
+def close_snapshot(data, topics, keep=False):
+    """
+    Close the mapping returned by open_snapshot. A mapped file cannot be replaced on Windows, so the mapping
+    is closed before the snapshot is rewritten there, and when the deck is closed.
+    Args:
+        data (mmap.mmap): The mapping.
+        topics (iterable): The SnapshotTopic objects of the mapping.
+        keep (bool): Copy the mapped file into memory first so that the topics keep working; otherwise the
+            topics must not be used any more.
+    Returns:
+        bool: True if the mapping was closed, False if views of it are still in use elsewhere.
+    """
+    copy = bytes(data) if keep else None  # The file contents for the topics
+    for topic in topics:  # Drop the views of the mapping held by the topics
+        topic._remap(copy)
+    try:
+        data.close()  # Release the mapping and the file
+        return True  # Return True if the mapping was closed
+    except BufferError:  # A view is still in use; the mapping is closed when it is released
+        return False
+
+
+# Function to list the fronts whose saved progress is hidden by the overlay
+def _hidden_fronts(deleted, overlay, added):
+    """
+    List the fronts of saved cards that were deleted or changed.
+    Args:
+        deleted (set): Fronts of the deleted cards.
+        overlay (dict): Changed and added cards by front.
+        added (dict): Fronts of the added cards.
+    Yields:
+        str: The front of each hidden saved card.
+    """
+    yield from deleted
+    for card_front in overlay:
+        if card_front not in added:
+            yield card_front
+
+
+# Define the SnapshotTopic class: the flashcards of one topic in a mapped snapshot, with a writable overlay
+class SnapshotTopic(MutableMapping):
+    def __init__(self, data, offset, text_length, count, table_size, checksum, source=None):
+        """
+        Initialize the SnapshotTopic. Created by open_snapshot. Behaves like the {front: [back, progress]}
+        dictionary that LearnTopic and FlashcardApp use: reading a card returns a SnapshotCard view that
+        decodes its texts on access, and changed, added and deleted cards are kept in a small overlay in
+        memory. The snapshot file itself is never written.
+        Args:
+            data (mmap.mmap): The mapped snapshot file.
+            offset (int): The offset of the topic block.
+            text_length (int): The length of the text in bytes.
+            count (int): The number of cards in the block.
+            table_size (int): The number of hash table slots.
+            checksum (int): The checksum of the block.
+            source (tuple, optional): (JSON deck path, topic name), read if the block is damaged.
+        """
+        self._data = data  # Store the mapped file
+        self._offset = offset  # Store the block offset
+        self._text_length = text_length  # Store the text length
+        self._count = count  # Store the number of cards in the block
+        self._table_size = table_size  # Store the hash table size
+        self._checksum = checksum  # Store the block checksum
+        self._source = source  # Store where to recover the topic from
+        self._checked = False  # Whether the block was checked and its tables mapped
+        self._ends = self._slots = self._progress = None  # Tables of the block
+        self._text = 0  # Offset of the text in the file
+        self._recovered = None  # The cards read from the JSON deck if the block is damaged
+        self._overlay = {}  # Changed and added cards by front
+        self._added = {}  # Fronts of the added cards, in insertion order
+        self._deleted = set()  # Fronts of the deleted cards of the block
+        self._zeroed = False  # Whether the progress of the cards of the block was reset
+
+    @property  # Define a property method to get the length of the block
+    def block_length(self):
+        """
+        Get the length of the topic block in the file.
+        Returns:
+            int: The length in bytes.
+        """
+        return _aligned(13 * self._count + 4 * self._table_size + self._text_length)  # Return the length
+
+    # Private method to check the block and map its tables
+    def _load(self):
+        """
+        Check the block against its checksum and map its tables on first use. A damaged block is replaced
+        by the topic read from the JSON deck.
+        """
+        if self._checked:  # Already checked
+            return
+        self._checked = True
+        block = memoryview(self._data)[self._offset:self._offset + self.block_length]
+        if zlib.crc32(block) != self._checksum:  # Damaged block
+            self._recover()
+            return
+        self._map_tables(block)  # Map the tables
+
+    # Private method to map the tables of the block
+    def _map_tables(self, block):
+        """
+        Map the offset table, the hash table and the progress column of the block.
+        Args:
+            block (memoryview): The checked block.
+        """
+        progress = 12 * self._count + 4 * self._table_size  # Offset of the progress column in the block
+        self._ends = block[:12 * self._count].cast('I')  # Map the tables
+        self._slots = block[12 * self._count:progress].cast('I')
+        self._progress = block[progress:progress + self._count]
+        self._text = self._offset + progress + self._count
+
+    # Private method to read the block from another copy of the file
+    def _remap(self, data):
+        """
+        Read the block from another copy of the snapshot file, dropping the views of the current one.
+        Args:
+            data (bytes or None): The new copy, or None if the topic is not used any more.
+        """
+        if data is None:  # Release the views of the old copy
+            self._ends = self._slots = self._progress = None
+        elif self._checked and self._recovered is None:  # Map the tables of the copy before it is used
+            self._map_tables(memoryview(data)[self._offset:self._offset + self.block_length])
+        self._data = data  # Store the new copy; both copies hold the same bytes for readers in between
+
+    # Private method to read a damaged topic from the JSON deck
+    def _recover(self):
+        """
+        Read the topic from the JSON deck instead of the damaged block. All cards are kept in the overlay.
+        """
+        cards = {}  # The cards of the topic in the JSON deck
+        if self._source is not None and self._source[0] is not None:
+            try:
+                with open(self._source[0], 'rb') as fp:
+                    cards = json.load(fp).get(self._source[1], {})
+            except (OSError, ValueError, AttributeError):
+                cards = {}  # The topic is lost in both files; start empty
+        if not isinstance(cards, dict):
+            cards = {}
+        self._recovered = {front: card for front, card in cards.items() if isinstance(card, list) and len(card) > 1}
+        self._count = 0  # The block is not used
+        self._overlay = {front: list(card) for front, card in self._recovered.items()}
+        self._added = dict.fromkeys(self._overlay)
+
+    # Private method to find the number of a card in the block
+    def _find(self, card_front):
+        """
+        Find a front in the hash table of the block.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Returns:
+            int or None: The card number, or None if the front is not in the block.
+        """
+        self._load()
+        if not self._count or not isinstance(card_front, str):
+            return None
+        encoded = card_front.encode("utf-8", TEXT_ERRORS)
+        mask = self._table_size - 1  # Table sizes are powers of two
+        slot = zlib.crc32(encoded) & mask  # First slot to probe
+        while True:
+            number = self._slots[slot]  # Card number + 1, or 0 for an empty slot
+            if not number:
+                return None
+            number -= 1
+            start = self._ends[3 * number - 1] if number else 0  # The front starts after the previous card
+            if self._data[self._text + start:self._text + self._ends[3 * number]] == encoded:
+                return number  # Return the card number
+            slot = (slot + 1) & mask  # Probe the next slot
+
+    # Private method to decode a text of a card in the block
+    def _field_text(self, number, field):
+        """
+        Decode the front (0), back (1) or tail (2) of a card in the block.
+        Args:
+            number (int): The card number.
+            field (int): The text to decode.
+        Returns:
+            str: The decoded text.
+        """
+        index = 3 * number + field  # Position of the end offset
+        start = self._ends[index - 1] if index else 0
+        return self._data[self._text + start:self._text + self._ends[index]].decode("utf-8", TEXT_ERRORS)
+
+    # Private method to read a card of the block as a list
+    def _base_card(self, number):
+        """
+        Read a card of the block as it was saved, ignoring the overlay.
+        Args:
+            number (int): The card number.
+        Returns:
+            list: [card_back, progress] or [card_back, progress, fields].
+        """
+        if self._zeroed:  # Reset since the snapshot was opened
+            return [self._field_text(number, 1), 0]
+        tail = self._field_text(number, 2)  # Progress and fields that do not fit the columns
+        if tail:
+            return [self._field_text(number, 1)] + json.loads(tail)
+        return [self._field_text(number, 1), self._progress[number]]  # Return the card
+
+    # Private method to read all cards of the block
+    def _base_items(self, saved=False):
+        """
+        Read all cards of the block, ignoring the overlay. Faster than reading the cards one by one: the
+        text of the topic is copied once and split along the offset table.
+        Args:
+            saved (bool): Read the progress as it was saved, also after reset_progress.
+        Yields:
+            tuple: (card_front, card) for every card of the block, in saved order.
+        """
+        self._load()
+        if not self._count:
+            return
+        text = self._data[self._text:self._text + self._text_length]  # Text of the topic
+        progress = self._progress.tolist()  # Progress column
+        zeroed = self._zeroed and not saved  # Whether every card reads as [back, 0]
+        ends = iter(self._ends.tolist())  # End offsets of front, back and tail of every card
+        start = 0  # Start of the next card
+        for level, front_end, back_end, tail_end in zip(progress, ends, ends, ends):
+            card_back = text[front_end:back_end].decode("utf-8", TEXT_ERRORS)
+            if zeroed:  # Reset since the snapshot was opened
+                card = [card_back, 0]
+            elif tail_end == back_end:  # [back, progress]
+                card = [card_back, level]
+            else:  # Progress and fields from the tail
+                card = [card_back] + json.loads(text[back_end:tail_end])
+            yield text[start:front_end].decode("utf-8", TEXT_ERRORS), card
+            start = tail_end
+
+    # Private method to get the progress of a card of the block
+    def _base_progress(self, number):
+        """
+        Get the progress of a card of the block as it was saved.
+        Args:
+            number (int): The card number.
+        Returns:
+            int: The progress.
+        """
+        if self._zeroed:  # Reset since the snapshot was opened
+            return 0
+        if self._ends[3 * number + 2] != self._ends[3 * number + 1]:  # The card has a tail
+            return self._base_card(number)[1]
+        return self._progress[number]  # Return the progress
+
+    def __getitem__(self, card_front):
+        """
+        Get a card by its front text.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Returns:
+            SnapshotCard or list: A view of a saved card, or the list of a changed or added card.
+        Raises:
+            KeyError: If the flashcard does not exist.
+        """
+        card = self._overlay.get(card_front)  # Changed and added cards
+        if card is not None:
+            return card
+        number = self._find(card_front) if card_front not in self._deleted else None
+        if number is None:  # Check if the flashcard exists
+            raise KeyError(card_front)
+        return SnapshotCard(self, card_front, number)  # Return a view of the card
+
+    def __setitem__(self, card_front, card):
+        """
+        Add or replace a card; the card is kept in the overlay.
+        Args:
+            card_front (str): The front text of the flashcard.
+            card (list): The card value, [card_back, progress] or [card_back, progress, fields].
+        """
+        card = list(card)  # Accept lists and views alike
+        if card_front in self._deleted:  # A deleted card of the block comes back
+            self._deleted.discard(card_front)
+        elif card_front not in self._overlay and self._find(card_front) is None:  # A new card
+            self._added[card_front] = None
+        self._overlay[card_front] = card  # Store the card
+
+    def __delitem__(self, card_front):
+        """
+        Delete a card.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Raises:
+            KeyError: If the flashcard does not exist.
+        """
+        if card_front in self._added:  # An added card
+            del self._added[card_front]
+            del self._overlay[card_front]
+            return
+        if card_front in self._deleted or self._find(card_front) is None:  # Check if the flashcard exists
+            raise KeyError(card_front)
+        self._overlay.pop(card_front, None)  # Forget the changed card
+        self._deleted.add(card_front)  # Hide the card of the block
+
+    def __contains__(self, card_front):
+        """
+        Check if a card exists.
+        Args:
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True if the flashcard exists.
+        """
+        if card_front in self._overlay:
+            return True
+        return card_front not in self._deleted and self._find(card_front) is not None
+
+    def __iter__(self):
+        """
+        Iterate over the fronts: the cards of the block in saved order, then the added cards.
+        Yields:
+            str: The front text of each flashcard.
+        """
+        for card_front, _ in self._base_items():  # Cards of the block
+            if card_front not in self._deleted:
+                yield card_front
+        yield from list(self._added)  # Added cards
+
+    def __len__(self):
+        """
+        Get the number of existing cards.
+        Returns:
+            int: The number of flashcards.
+        """
+        self._load()
+        return self._count - len(self._deleted) + len(self._added)  # Return the number of flashcards
+
+    def __repr__(self):
+        """
+        Describe the topic.
+        Returns:
+            str: The number of cards and of changed cards.
+        """
+        return f"SnapshotTopic({len(self)} cards, {len(self._overlay) + len(self._deleted)} changed)"
+
+    # Public method to count the cards per progress level
+    def progress_counts(self):
+        """
+        Count the existing cards per progress level, from the progress column of the block and the overlay,
+        without decoding any card texts.
+        Returns:
+            list: The number of cards for each progress level (clamped to 0-255), starting at 0.
+        """
+        self._load()
+        data = bytes(self._progress) if self._count and not self._zeroed else b""  # Progress column of the block
+        counts = [data.count(level) for level in range(max(data, default=0) + 1)]  # One pass per used level
+        if self._zeroed:  # Every card of the block is at 0
+            counts[0] = self._count
+        for card_front in _hidden_fronts(self._deleted, self._overlay, self._added):  # Saved values that are hidden
+            counts[0 if self._zeroed else self._progress[self._find(card_front)]] -= 1
+        for card in self._overlay.values():  # Changed and added cards
+            level = min(max(card[1], 0), 255) if isinstance(card[1], int) else 0
+            counts.extend([0] * (level + 1 - len(counts)))
+            counts[level] += 1
+        return counts  # Return the counts
+
+    # Public method to reset the progress of all cards
+    def reset_progress(self):
+        """
+        Reset the progress of all cards to 0 and drop their scheduling fields, without copying the cards of
+        the block into the overlay.
+        """
+        self._load()
+        self._zeroed = True  # The cards of the block read as [back, 0]
+        for card in self._overlay.values():  # Changed and added cards
+            card[1] = 0
+            del card[2:]
+
+    # Public method to get the block of an unchanged topic
+    def raw_block(self):
+        """
+        Get the block of the topic if nothing was changed since the snapshot was opened, for copying it
+        into the next snapshot.
+        Returns:
+            tuple or None: (block, text length, card count, hash table size, checksum), or None if the topic
+                was changed or its block is damaged.
+        """
+        self._load()
+        if self._overlay or self._deleted or self._zeroed or self._recovered is not None:
+            return None
+        block = memoryview(self._data)[self._offset:self._offset + self.block_length]
+        return block, self._text_length, self._count, self._table_size, self._checksum  # Return the block
+
+    # Public method to get the topic as it was saved
+    def base_json(self):
+        """
+        Get the topic as it was saved in the snapshot, ignoring the overlay; used as the common version when
+        the deck is merged with the saves of another process.
+        Returns:
+            dict: {card_front: [card_back, progress, ...]}.
+        """
+        self._load()
+        if self._recovered is not None:  # The topic was read from the JSON deck
+            return {front: list(card) for front, card in self._recovered.items()}
+        return dict(self._base_items(saved=True))  # Return the saved cards
+
+    # Public method to convert the topic into a plain dictionary
+    def to_json(self):
+        """
+        Convert the topic into a plain dictionary, e.g. for json.dump.
+        Returns:
+            dict: {card_front: [card_back, progress, ...]} for all existing cards.
+        """
+        if not self._overlay and not self._deleted:  # Unchanged topic
+            return dict(self._base_items())
+        cards = {}  # The converted cards
+        for card_front, card in self._base_items():  # Cards of the block, without looking them up again
+            if card_front in self._deleted:
+                continue
+            changed = self._overlay.get(card_front)
+            cards[card_front] = list(changed) if changed is not None else card
+        for card_front in self._added:  # Added cards
+            cards[card_front] = list(self._overlay[card_front])
+        return cards  # Return the cards
+
+
+# Define the SnapshotCard class: a list-like view of one saved card in a SnapshotTopic
+class SnapshotCard:
+    __slots__ = ("_topic", "_front", "_number")  # Views are created per access; keep them small
+
+    def __init__(self, topic, card_front, number):
+        """
+        Initialize the view. Reading decodes only the requested element; the first change copies the card
+        into the overlay of the topic, and the view then reads and writes that copy.
+        Args:
+            topic (SnapshotTopic): The topic storing the card.
+            card_front (str): The front text of the flashcard.
+            number (int): The card number in the block.
+        """
+        self._topic = topic  # Store the topic
+        self._front = card_front  # Store the front text
+        self._number = number  # Store the card number
+
+    # Private method to get the changed card, if any
+    def _changed(self):
+        """
+        Get the card from the overlay of the topic.
+        Returns:
+            list or None: The changed card, or None if the card is unchanged.
+        """
+        return self._topic._overlay.get(self._front)  # Return the changed card
+
+    # Private method to get a card that can be changed
+    def _writable(self):
+        """
+        Copy the card into the overlay of the topic on its first change.
+        Returns:
+            list: The card in the overlay.
+        """
+        card = self._topic._overlay.get(self._front)
+        if card is None:  # First change of the card
+            card = self._topic._overlay[self._front] = self._topic._base_card(self._number)
+        return card  # Return the card
+
+    def __len__(self):
+        """
+        Get the number of card elements.
+        Returns:
+            int: 3 if the card has fields, otherwise 2.
+        """
+        card = self._changed()
+        if card is not None:
+            return len(card)
+        topic, number = self._topic, self._number
+        if topic._zeroed or topic._ends[3 * number + 2] == topic._ends[3 * number + 1]:  # [back, progress]
+            return 2
+        return len(topic._base_card(number))  # Return the number of elements
+
+    def __getitem__(self, index):
+        """
+        Get a card element: 0 is the back text, 1 the progress, 2 the fields (a copy).
+        Args:
+            index (int or slice): The element index.
+        Returns:
+            object: The card element.
+        """
+        card = self._changed()  # The changed card, if any
+        if card is not None:
+            return card[index]
+        if index == 0:  # Decode only the back text
+            return self._topic._field_text(self._number, 1)
+        if index == 1:  # Read only the progress
+            return self._topic._base_progress(self._number)
+        return self._topic._base_card(self._number)[index]  # Return the card element
+
+    def __setitem__(self, index, value):
+        """
+        Set a card element: 0 is the back text, 1 the progress, 2 the fields.
+        Args:
+            index (int): The element index.
+            value (object): The new value.
+        """
+        self._writable()[index] = value  # Change the copy in the overlay
+
+    def __delitem__(self, index):
+        """
+        Delete card elements, e.g. del card[2:] to drop the fields.
+        Args:
+            index (int or slice): The element index.
+        """
+        if self._changed() is None and index == slice(2, None) and len(self) == 2:  # Nothing to delete
+            return  # Keep the card out of the overlay
+        del self._writable()[index]  # Change the copy in the overlay
+
+    def append(self, fields):
+        """
+        Add fields to a card in the [back, progress] format.
+        Args:
+            fields (dict): The fields to add.
+        """
+        self._writable().append(fields)  # Change the copy in the overlay
+
+    def __iter__(self):
+        """
+        Iterate over the card elements.
+        Returns:
+            iterator: The card elements.
+        """
+        return iter(self.to_json())
+
+    def __eq__(self, other):
+        """
+        Compare the card with a list or another view.
+        Args:
+            other (object): The other card.
+        Returns:
+            bool: True if both cards have the same elements.
+        """
+        return self.to_json() == list(other) if isinstance(other, (list, SnapshotCard)) else NotImplemented
+
+    def __repr__(self):
+        """
+        Describe the card like a list.
+        Returns:
+            str: The card elements.
+        """
+        return repr(self.to_json())
+
+    # Public method to convert the card into a plain list
+    def to_json(self):
+        """
+        Convert the card into a plain list, e.g. for json.dump.
+        Returns:
+            list: [card_back, progress] or [card_back, progress, fields].
+        """
+        card = self._changed()
+        return list(card) if card is not None else self._topic._base_card(self._number)  # Return the card
@@ -0,0 +1,103 @@
+import argparse  # Import the argparse module for the command line interface
+import multiprocessing  # Import the multiprocessing module for the concurrent writers
+import os  # Import the os module for paths
+import random  # Import the random module for the simulated answers
+import shutil  # Import the shutil module to copy the deck
+import tempfile  # Import the tempfile module for a throwaway copy of the deck
+import time  # Import the time module for the elapsed time
+
+from deck import Deck  # Import the Deck class
+from scheduler import MASTERY_THRESHOLD  # Import the progress at which a flashcard counts as finished
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))  # Directory with flash.json
+SHARED_TOPIC = "Stress Shared"  # Topic every writer adds flashcards to
+
+
+# Function run by each writer process
+def writer(path, number, operations, seed):
+    """
+    Open the deck and hammer it with additions, answers and saves, like a second application window.
+    Every writer only answers its own flashcards, so the final progress of each one is known exactly.
+    Args:
+        path (str): The file path of the shared deck.
+        number (int): The number of the writer.
+        operations (int): Number of changes, each followed by a save.
+        seed (int): Seed of the random answers.
+    Returns:
+        dict: The expected flashcards {(topic, front): progress} and the merge counters of the writer.
+    """
+    rng = random.Random(seed * 1000 + number)  # Reproducible answers per writer
+    deck = Deck(path)
+    own_topic = f"Stress Writer {number}"  # Topic only this writer adds to
+    deck.new_topic_dictionary(own_topic)
+    expected = {}  # Progress of every flashcard this writer added
+    for operation in range(operations):
+        if not expected or rng.random() < 0.4:  # Add a flashcard, alternating between the two topics
+            topic = own_topic if operation % 2 else SHARED_TOPIC
+            card_front = f"writer {number} card {operation}"
+            deck.update_topic_dictionary(topic, card_front, f"answer {operation}")
+            expected[(topic, card_front)] = 0
+        else:  # Answer one of the own flashcards
+            topic, card_front = rng.choice(list(expected))
+            card = deck.get_topic_dictionary(topic)[card_front]
+            if rng.random() < 0.7:  # Knew the answer
+                card[1] = min(card[1] + 1, MASTERY_THRESHOLD)
+            else:
+                card[1] = max(card[1] - 1, 0)
+            expected[(topic, card_front)] = card[1]
+        deck.save_deck_json()  # Save after every change, the worst case for lost updates
+    deck.close()
+    return {"expected": expected, "merges": deck.merges, "conflicts": deck.merge_conflicts}
+
+
+# Function to run the stress test
+def run_stress_test(path, writers, operations, seed=0):
+    """
+    Run several writer processes against one deck file and check that no change was lost.
+    Args:
+        path (str): The file path of the deck.
+        writers (int): Number of concurrent processes.
+        operations (int): Number of changes per process.
+        seed (int): Seed of the random answers.
+    Returns:
+        dict: Elapsed time, merge counters, and the number of lost flashcards and wrong progress values.
+    """
+    deck = Deck(path)
+    deck.new_topic_dictionary(SHARED_TOPIC)  # The topic all writers add to
+    deck.close()
+    started = time.perf_counter()
+    with multiprocessing.Pool(writers) as pool:
+        results = pool.starmap(writer, [(path, number, operations, seed) for number in range(writers)])
+    elapsed = time.perf_counter() - started
+    final = Deck(path)  # The deck after all writers finished
+    lost, wrong = 0, 0
+    for result in results:
+        for (topic, card_front), progress in result["expected"].items():
+            card = final.get_topic_dictionary(topic).get(card_front)
+            if card is None:
+                lost += 1  # A flashcard that another writer's save discarded
+            elif card[1] != progress:
+                wrong += 1  # An answer that another writer's save discarded
+    final.close()
+    return {"writers": writers, "saves": writers * operations, "seconds": elapsed,
+            "merges": sum(result["merges"] for result in results),
+            "conflicts": sum(result["conflicts"] for result in results),
+            "cards": sum(len(result["expected"]) for result in results), "lost": lost, "wrong_progress": wrong}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Let several processes save the same deck file at once.")
+    parser.add_argument("--writers", type=int, default=8, help="Number of concurrent processes")
+    parser.add_argument("--operations", type=int, default=200, help="Changes (and saves) per process")
+    parser.add_argument("--deck", default=os.path.join(PROJECT_DIRECTORY, "flash.json"),
+                        help="Deck to start from; a copy is used")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random answers")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "flash.json")
+        shutil.copyfile(args.deck, path)  # Never touch the original deck
+        results = run_stress_test(path, args.writers, args.operations, args.seed)
+    print(f"{results['writers']} writers, {results['saves']} saves in {results['seconds']:.2f} s; "
+          f"{results['merges']} merges, {results['conflicts']} flashcards changed on both sides")
+    print(f"{results['cards']} flashcards added: {results['lost']} lost, {results['wrong_progress']} with wrong progress")
+    raise SystemExit(1 if results["lost"] or results["wrong_progress"] else 0)
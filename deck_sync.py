@@ -0,0 +1,876 @@
+import argparse  # Import the argparse module for the hub command line
+import hashlib  # Import the hashlib module for stable card ids
+import json  # Import the JSON module for the changes and the hub files
+import os  # Import the os module for the hub directory
+import re  # Import the re module to check entry ids received by the hub server
+import sqlite3  # Import the sqlite3 module for the sync state of a deck
+import tempfile  # Import the tempfile module to write hub files atomically
+import uuid  # Import the uuid module to name replicas
+import zlib  # Import the zlib module for the topic digests
+from collections import namedtuple  # Import namedtuple for the sync report
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Import the HTTP server of the hub
+from urllib.parse import parse_qsl, urlsplit  # Import URL helpers for the hub requests
+from urllib.request import Request, urlopen  # Import the HTTP client of the hub transport
+
+from deck import Deck  # Import the Deck class for its topic key
+from deck_snapshot import SnapshotTopic, encode_topic  # Import the snapshot blocks, whose checksums are digests
+from file_lock import FileLock, keep_file_mode  # Import the advisory lock that serializes pushes to a hub directory
+from scheduler import MASTERY_THRESHOLD  # Import the highest progress a flashcard can have
+
+NO_VERSION = [0, ""]  # Version of a field that was never set
+PULL_LIMIT = 1000  # Largest number of hub entries returned by one pull request
+ENTRY_ID = re.compile(r"[0-9a-z]{1,32}-[0-9]{1,12}")  # Replica name and sequence number; also a file name of the hub
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS topics (key TEXT PRIMARY KEY, digest TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    topic_key TEXT,
+    topic TEXT,
+    front TEXT,
+    back TEXT,
+    fields TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    raw INTEGER NOT NULL DEFAULT 0,
+    versions TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS cards_topic ON cards (topic_key);
+CREATE TABLE IF NOT EXISTS pending (id TEXT PRIMARY KEY, entry TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS unwritten (id TEXT PRIMARY KEY, topic TEXT, front TEXT);
+"""  # Sync state of one deck
+
+SyncReport = namedtuple("SyncReport", "sent received written")  # Changes sent, changes received, cards written
+
+
+# Function to compute the stable id of a new card
+def card_id(topic, card_front):
+    """
+    Compute the id of a card from its topic and front, so that the same card created on two machines (e.g.
+    in copies of the same deck file) gets the same id. Moved and renamed cards keep their id.
+    Args:
+        topic (str): The name of the topic.
+        card_front (str): The front text of the flashcard.
+    Returns:
+        str: The card id (20 hex digits).
+    """
+    key = f"{Deck._topic_key(topic)}\0{card_front}".encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(key, digest_size=10).hexdigest()  # Return the id
+
+
+# Function to compute the digest of a topic
+def topic_digest(cards, blocks=False):
+    """
+    Compute a digest of the flashcards of a topic, to skip the topics that did not change since the last sync.
+    Decks with binary snapshots use the checksum of the snapshot block: unchanged snapshot topics have it for
+    free, and other topics get the checksum of the block that the next save writes, so they are not compared
+    again after the deck is reopened from the snapshot.
+    Args:
+        cards (Mapping): The flashcards of the topic.
+        blocks (bool): The deck keeps binary snapshots.
+    Returns:
+        str: The digest.
+    """
+    if blocks or isinstance(cards, SnapshotTopic):
+        block = cards.raw_block() if isinstance(cards, SnapshotTopic) else None  # Unchanged snapshot topic
+        block = block or encode_topic(cards)  # The block of the next save
+        return f"b{block[4]:08x}{block[2]:x}"  # Checksum and card count of the block
+    text = json.dumps(cards, default=lambda value: value.to_json())  # Same serialization as Deck
+    return f"j{zlib.crc32(text.encode('utf-8', 'surrogatepass')):08x}{len(cards):x}"  # Return the digest
+
+
+# Function to encode the scheduling fields of a card
+def _fields_text(card):
+    """
+    Encode the optional scheduling fields of a card in a canonical form.
+    Args:
+        card (list): The card value.
+    Returns:
+        str or None: The fields as JSON with sorted keys, or None if the card has none.
+    """
+    return json.dumps(card[2], sort_keys=True) if len(card) > 2 else None  # Return the fields
+
+
+# Function to bring a progress value into the range shown to the user
+def _clamp(raw):
+    """
+    Bring the merged progress of a card into the range 0 to MASTERY_THRESHOLD.
+    Args:
+        raw (int): The sum of all progress changes.
+    Returns:
+        int: The progress.
+    """
+    return min(max(raw, 0), MASTERY_THRESHOLD)  # Return the progress
+
+
+# Define the SyncState class: what a deck looked like at its last sync, with ids and versions
+class SyncState:
+    def __init__(self, path):
+        """
+        Open the sync state of a deck ('flash.json.sync'), a SQLite database next to the deck. For every card
+        it holds the id, the values and versions of the card fields as of the last sync and the merged
+        progress; for every topic a digest, so that topics without changes are not compared card by card.
+        Args:
+            path (str): The file path of the database.
+        """
+        self._connection = sqlite3.connect(path)  # Open the database
+        self._connection.executescript(SCHEMA)
+        meta = dict(self._connection.execute("SELECT key, value FROM meta"))  # Stored counters
+        self.replica = meta.get("replica") or uuid.uuid4().hex[:12]  # Name of this machine in the versions
+        self.clock = int(meta.get("clock", 0))  # Lamport clock: above every version seen so far
+        self.pulled = int(meta.get("pulled", 0))  # Hub position of the last pulled entry
+        self.sequence = int(meta.get("sequence", 0))  # Number of entries created by this replica
+
+    # Public method to get a new version
+    def tick(self):
+        """
+        Get a version that is newer than every version seen so far.
+        Returns:
+            list: [counter, replica]; versions compare by counter, then by replica, so every machine orders
+                them the same way.
+        """
+        self.clock += 1
+        return [self.clock, self.replica]  # Return the version
+
+    # Public method to remember a version of another replica
+    def observe(self, counter):
+        """
+        Move the clock past a version received from another replica.
+        Args:
+            counter (int): The counter of the version.
+        """
+        self.clock = max(self.clock, counter)
+
+    # Public method to check whether the deck ever synced
+    def is_new(self):
+        """
+        Check whether this deck has never synced.
+        Returns:
+            bool: True if the state holds no cards and nothing was pulled.
+        """
+        return not self.pulled and self._connection.execute("SELECT 1 FROM cards LIMIT 1").fetchone() is None
+
+    # Public method to get the digests of the topics
+    def digests(self):
+        """
+        Get the digests of all topics as of the last sync.
+        Returns:
+            dict: {topic key: digest}.
+        """
+        return dict(self._connection.execute("SELECT key, digest FROM topics"))  # Return the digests
+
+    # Public method to store the digest of a topic
+    def set_digest(self, key, digest):
+        """
+        Store or remove the digest of a topic.
+        Args:
+            key (str): The topic key.
+            digest (str or None): The digest, or None to remove the topic.
+        """
+        if digest is None:
+            self._connection.execute("DELETE FROM topics WHERE key = ?", (key,))
+        else:
+            self._connection.execute("INSERT OR REPLACE INTO topics (key, digest) VALUES (?, ?)", (key, digest))
+
+    # Private method to convert a database row into a card state
+    @staticmethod
+    def _row(values):
+        """
+        Convert a row of the cards table into a dictionary.
+        Args:
+            values (tuple): The column values.
+        Returns:
+            dict: The card state.
+        """
+        row = dict(zip(("id", "topic_key", "topic", "front", "back", "fields", "deleted", "raw", "versions"), values))
+        row["versions"] = json.loads(row["versions"])
+        return row  # Return the card state
+
+    # Public method to get the state of a card
+    def card(self, card_id):
+        """
+        Get the state of a card.
+        Args:
+            card_id (str): The card id.
+        Returns:
+            dict or None: The card state, or None if the card is unknown.
+        """
+        values = self._connection.execute("SELECT * FROM cards WHERE id = ?", (card_id,)).fetchone()
+        return self._row(values) if values is not None else None  # Return the card state
+
+    # Public method to get the cards of a topic
+    def topic_cards(self, key):
+        """
+        Get the existing cards of a topic as of the last sync.
+        Args:
+            key (str): The topic key.
+        Returns:
+            dict: {card_front: card state}.
+        """
+        return {row["front"]: row for row in map(self._row, self._connection.execute(
+            "SELECT * FROM cards WHERE topic_key = ? AND deleted = 0", (key,)))}  # Return the cards
+
+    # Public method to iterate over the existing cards
+    def existing_cards(self):
+        """
+        Iterate over all cards that were not deleted.
+        Yields:
+            dict: The card state.
+        """
+        yield from map(self._row, self._connection.execute("SELECT * FROM cards WHERE deleted = 0"))
+
+    # Public method to store the state of a card
+    def save_card(self, row):
+        """
+        Store the state of a card.
+        Args:
+            row (dict): The card state.
+        """
+        row["topic_key"] = Deck._topic_key(row["topic"]) if row["topic"] is not None else None
+        self._connection.execute("INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (row["id"], row["topic_key"], row["topic"], row["front"], row["back"], row["fields"],
+                                  row["deleted"], row["raw"], json.dumps(row["versions"])))
+
+    # Public method to queue an entry for the hub
+    def add_pending(self, changes):
+        """
+        Queue local changes as one hub entry. The entry is stored with the state, so it is sent again if
+        the push fails, and the hub ignores it if it arrives twice.
+        Args:
+            changes (list): The changes.
+        """
+        self.sequence += 1
+        entry = {"id": f"{self.replica}-{self.sequence}", "replica": self.replica, "changes": changes}
+        self._connection.execute("INSERT INTO pending (id, entry) VALUES (?, ?)", (entry["id"], json.dumps(entry)))
+
+    # Public method to get the queued entries
+    def pending(self):
+        """
+        Get the entries that were not yet accepted by the hub.
+        Returns:
+            list: The entries, oldest first.
+        """
+        return [json.loads(entry) for _, entry in self._connection.execute("SELECT id, entry FROM pending ORDER BY rowid")]
+
+    # Public method to drop an entry accepted by the hub
+    def remove_pending(self, entry_id):
+        """
+        Drop an entry that the hub accepted.
+        Args:
+            entry_id (str): The entry id.
+        """
+        self._connection.execute("DELETE FROM pending WHERE id = ?", (entry_id,))
+        self.commit()
+
+    # Public method to remember the cards that must be written to the deck
+    def set_unwritten(self, locations):
+        """
+        Remember the merged cards that still have to be written to the deck, with the place they had in the
+        deck before, so that a sync interrupted before the deck was saved is finished by the next one.
+        Args:
+            locations (dict): {card id: (topic, card_front) before the merge, or None}.
+        """
+        self._connection.execute("DELETE FROM unwritten")
+        self._connection.executemany("INSERT INTO unwritten (id, topic, front) VALUES (?, ?, ?)",
+                                     ((card_id,) + (location or (None, None)) for card_id, location in locations.items()))
+
+    # Public method to get the cards that must be written to the deck
+    def unwritten(self):
+        """
+        Get the merged cards that were not yet written to the deck.
+        Returns:
+            dict: {card id: (topic, card_front) before the merge, or None}.
+        """
+        return {card_id: (topic, front) if topic is not None else None
+                for card_id, topic, front in self._connection.execute("SELECT id, topic, front FROM unwritten")}
+
+    # Public method to store the state
+    def commit(self):
+        """
+        Store the counters and all changes of the state in one transaction.
+        """
+        self._connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                     (("replica", self.replica), ("clock", str(self.clock)),
+                                      ("pulled", str(self.pulled)), ("sequence", str(self.sequence))))
+        self._connection.commit()
+
+    # Public method to drop the changes since the last commit
+    def rollback(self):
+        """
+        Drop all changes since the last commit, e.g. when the hub cannot be reached.
+        """
+        self._connection.rollback()
+        meta = dict(self._connection.execute("SELECT key, value FROM meta"))  # Counters as committed
+        self.clock = int(meta.get("clock", 0))
+        self.pulled = int(meta.get("pulled", 0))
+        self.sequence = int(meta.get("sequence", 0))
+
+    # Public method to close the database
+    def close(self):
+        """
+        Close the database.
+        """
+        self._connection.close()
+
+
+# Define the DirectoryTransport class: a hub that is a directory, e.g. on a shared drive
+class DirectoryTransport:
+    def __init__(self, directory):
+        """
+        Initialize the DirectoryTransport. The hub is an append-only log of entries, one file per entry
+        ('00000001.json', ...), with the number of the last entry in 'head'. Pulling reads only the entries
+        after the last pulled one.
+        Args:
+            directory (str): The hub directory; created if it does not exist.
+        """
+        self._directory = directory  # Store the directory
+        os.makedirs(os.path.join(directory, "ids"), exist_ok=True)  # Markers of the accepted entry ids
+        self._lock = FileLock(os.path.join(directory, "hub.lock"))  # Serializes pushes of several machines
+
+    # Private method to write a hub file atomically
+    def _write(self, name, text):
+        """
+        Write a file of the hub atomically.
+        Args:
+            name (str): The file name relative to the hub directory.
+            text (str): The content.
+        """
+        path = os.path.join(self._directory, name)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(handle, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        keep_file_mode(temporary, path)  # Keep the permissions of the hub file
+        os.replace(temporary, path)
+
+    # Public method to get the position of the last entry
+    def head(self):
+        """
+        Get the number of the last entry of the hub.
+        Returns:
+            int: The position; 0 if the hub is empty.
+        """
+        try:
+            with open(os.path.join(self._directory, "head"), encoding='utf-8') as fp:
+                return int(fp.read() or 0)  # Return the position
+        except FileNotFoundError:
+            return 0
+
+    # Public method to read the entries after a position
+    def pull(self, since):
+        """
+        Read the entries added after a position.
+        Args:
+            since (int): The position of the last entry that was already read.
+        Returns:
+            tuple: (list of entries, position of the last returned entry).
+        """
+        head = min(self.head(), since + PULL_LIMIT)  # Read at most PULL_LIMIT entries per call
+        entries = []  # The new entries
+        for position in range(since + 1, head + 1):
+            with open(os.path.join(self._directory, f"{position:08d}.json"), encoding='utf-8') as fp:
+                entries.append(json.load(fp))
+        return entries, head  # Return the entries and the new position
+
+    # Public method to add an entry
+    def push(self, entry):
+        """
+        Append an entry to the hub, unless an entry with the same id was accepted before.
+        Args:
+            entry (dict): The entry.
+        Returns:
+            int: The position of the entry.
+        """
+        with self._lock:
+            marker = os.path.join("ids", entry["id"])  # Accepted entries are never appended twice
+            try:
+                with open(os.path.join(self._directory, marker), encoding='utf-8') as fp:
+                    return int(fp.read())  # Return the position of the earlier copy
+            except FileNotFoundError:
+                pass
+            position = self.head() + 1  # Next position
+            self._write(f"{position:08d}.json", json.dumps(entry))
+            self._write(marker, str(position))
+            self._write("head", str(position))  # Readers see the entry once head moves
+            return position  # Return the position of the entry
+
+
+# Define the HTTPTransport class: a hub that is reached over HTTP, see serve_hub
+class HTTPTransport:
+    def __init__(self, url, timeout=30):
+        """
+        Initialize the HTTPTransport.
+        Args:
+            url (str): The address of the hub, e.g. 'http://127.0.0.1:8766'.
+            timeout (float): Seconds to wait for a response.
+        """
+        self._url = url.rstrip("/")  # Store the address
+        self._timeout = timeout  # Store the timeout
+
+    # Private method to send a request to the hub
+    def _request(self, path, entry=None):
+        """
+        Send a request to the hub.
+        Args:
+            path (str): The path and query.
+            entry (dict, optional): The entry to push; None for a GET request.
+        Returns:
+            dict: The JSON response.
+        Raises:
+            OSError: If the hub cannot be reached or answers with an error.
+        """
+        data = json.dumps(entry).encode("utf-8") if entry is not None else None
+        request = Request(self._url + path, data=data, headers={"Content-Type": "application/json"})
+        with urlopen(request, timeout=self._timeout) as response:
+            return json.load(response)  # Return the response
+
+    # Public method to read the entries after a position
+    def pull(self, since):
+        """
+        Read the entries added after a position.
+        Args:
+            since (int): The position of the last entry that was already read.
+        Returns:
+            tuple: (list of entries, position of the last returned entry).
+        """
+        response = self._request(f"/entries?since={since}")
+        return response["entries"], response["position"]  # Return the entries and the new position
+
+    # Public method to add an entry
+    def push(self, entry):
+        """
+        Append an entry to the hub.
+        Args:
+            entry (dict): The entry.
+        Returns:
+            int: The position of the entry.
+        """
+        return self._request("/entries", entry)["position"]  # Return the position of the entry
+
+
+# Function to open the transport for a hub location
+def open_transport(location):
+    """
+    Open the transport for a hub location.
+    Args:
+        location (str): A directory, or the 'http://' address of a hub started with 'python deck_sync.py serve'.
+    Returns:
+        DirectoryTransport or HTTPTransport: The transport.
+    """
+    if location.startswith(("http://", "https://")):
+        return HTTPTransport(location)
+    return DirectoryTransport(location)  # Return the transport
+
+
+# Define the DeckSync class: merges the changes of a deck with the changes of other machines
+class DeckSync:
+    def __init__(self, deck, state, transport):
+        """
+        Initialize the DeckSync.
+        Every card has a stable id (see card_id). Topic, front, back, scheduling fields and deletion of a card
+        are merged field by field: the value with the newer version wins, and versions are ordered the same
+        way on every machine. Progress is not overwritten but merged by answers: each machine sends the net
+        change of progress its answers made since the last sync, and the merged progress is the sum of all
+        changes, limited to 0 to MASTERY_THRESHOLD. A sync sends and applies only the changed cards.
+        Args:
+            deck (Deck, SQLiteDeck or DeckCollection): The deck.
+            state (SyncState): The sync state of the deck.
+            transport (DirectoryTransport or HTTPTransport): The hub.
+        """
+        self.deck = deck  # Store the deck
+        self.state = state  # Store the sync state
+        self.transport = transport  # Store the hub
+        self._blocks = getattr(deck, "_snapshot_path", None) is not None  # Digests are snapshot block checksums
+
+    # Private method to record the local changes of one card
+    def _card_changes(self, row, topic, card_front, card):
+        """
+        Compare a card of the deck with its state at the last sync, give the changed fields new versions and
+        update the state.
+        Args:
+            row (dict): The card state.
+            topic (str): The name of the topic in the deck.
+            card_front (str): The front text of the flashcard.
+            card (list or None): The card value, or None if the card was deleted.
+        Returns:
+            dict or None: The change for the hub, or None if nothing changed.
+        """
+        if card is None:
+            values = {"deleted": 1}
+        else:
+            values = {"topic": topic, "front": card_front, "back": card[0], "fields": _fields_text(card), "deleted": 0}
+        changed = {}  # New values with their versions
+        for field, value in values.items():
+            if row[field] != value:
+                version = self.state.tick()
+                row[field], row["versions"][field] = value, version
+                changed[field] = [value] + version
+        change = {"id": row["id"], "set": changed} if changed else {"id": row["id"]}
+        if card is not None and card[1] != _clamp(row["raw"]):  # The answers of this machine changed progress
+            change["progress"] = card[1] - row["raw"]  # The sum of all changes becomes the shown progress here
+            row["raw"] = card[1]
+        if len(change) == 1:  # Nothing changed
+            return None
+        self.state.save_card(row)
+        return change  # Return the change
+
+    # Private method to create the state of a card that appeared in the deck
+    def _new_row(self, topic, card_front):
+        """
+        Create the state of a card that is new in the deck.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            dict: The card state.
+        """
+        new_id = card_id(topic, card_front)
+        row = self.state.card(new_id)
+        if row is not None and not row["deleted"]:  # The id belongs to a card that moved elsewhere
+            new_id, row = f"{new_id}-{uuid.uuid4().hex[:8]}", None
+        if row is None:
+            row = {"id": new_id, "topic_key": None, "topic": None, "front": None, "back": None, "fields": None,
+                   "deleted": 0, "raw": 0, "versions": {}}
+        return row  # Return the card state
+
+    # Private method to find the cards that changed in the deck since the last sync
+    def _local_changes(self, deletions=True):
+        """
+        Compare the topics whose digest changed with their state at the last sync.
+        Args:
+            deletions (bool): Record cards missing from the deck as deleted; False when a deck joins a hub.
+        Returns:
+            tuple: (list of changes, {topic key: digest} of the compared topics, or None for deleted topics).
+        """
+        digests = self.state.digests()  # Digests as of the last sync
+        changes, compared, existing = [], {}, set()  # Changes, digests of the compared topics, topics of the deck
+        vanished, appeared = [], []  # Cards missing from their place, cards without a state
+        for topic in self.deck.get_topic_list:
+            key = Deck._topic_key(topic)
+            existing.add(key)
+            cards = self.deck.get_topic_dictionary(topic)
+            digest = topic_digest(cards, self._blocks)
+            if digests.get(key) == digest:  # Unchanged since the last sync
+                continue
+            compared[key] = digest
+            rows = self.state.topic_cards(key)  # Cards of the topic at the last sync
+            for card_front, card in cards.items():
+                row = rows.pop(card_front, None)
+                if row is None:
+                    appeared.append((topic, card_front, list(card)))
+                else:
+                    changes.append(self._card_changes(row, topic, card_front, list(card)))
+            vanished.extend(rows.values())
+        for key in set(digests) - existing:  # Deleted topics
+            compared[key] = None
+            vanished.extend(self.state.topic_cards(key).values())
+        for row, topic, card_front, card in self._match_moves(vanished, appeared):
+            changes.append(self._card_changes(row or self._new_row(topic, card_front), topic, card_front, card))
+        if deletions:  # The cards that were not matched were deleted
+            changes.extend(self._card_changes(row, None, None, None) for row in vanished)
+        return [change for change in changes if change is not None], compared  # Return the changes
+
+    # Private method to recognize moved cards
+    @staticmethod
+    def _match_moves(vanished, appeared):
+        """
+        Match the cards that left their place with the cards that appeared, so that moved and renamed cards keep
+        their id, history and progress. A card matches by front and back (moved to another topic), otherwise
+        by front alone (moved and edited) or by topic and back (front edited) if exactly one card fits.
+        Args:
+            vanished (list): The states of the cards missing from their place; matched ones are removed.
+            appeared (list): (topic, card_front, card) of the cards without a state.
+        Returns:
+            list: (card state or None, topic, card_front, card) per appeared card.
+        """
+        matches = [[None, topic, card_front, card] for topic, card_front, card in appeared]  # Unmatched so far
+        keys = (lambda row: (row["front"], row["back"]), lambda row: row["front"],
+                lambda row: (row["topic_key"], row["back"]))  # Ways a vanished card is recognized, safest first
+        wanted = (lambda match: (match[2], match[3][0]), lambda match: match[2],
+                  lambda match: (Deck._topic_key(match[1]), match[3][0]))  # The same key of an appeared card
+        for index, (row_key, match_key) in enumerate(zip(keys, wanted)):
+            candidates = {}  # Vanished cards by key
+            for row in vanished:
+                candidates.setdefault(row_key(row), []).append(row)
+            for match in matches:
+                found = candidates.get(match_key(match)) if match[0] is None else None
+                if found and (index == 0 or len(found) == 1):  # Loose keys only count when unambiguous
+                    match[0] = found.pop()
+                    vanished.remove(match[0])
+        return matches  # Return the matches
+
+    # Private method to apply the changes of other machines to the state
+    def _apply_remote(self, entries, moved):
+        """
+        Merge the changes received from the hub into the sync state.
+        Args:
+            entries (list): The hub entries.
+            moved (dict): Collects {card id: (topic, card_front) in the deck before the merge, or None}.
+        Returns:
+            int: The number of received changes.
+        """
+        received = 0  # Number of changes of other machines
+        for entry in entries:
+            if entry["replica"] == self.state.replica:  # Sent by this machine, already applied
+                continue
+            for change in entry["changes"]:
+                received += 1
+                row = self.state.card(change["id"]) or {"id": change["id"], "topic_key": None, "topic": None,
+                                                        "front": None, "back": None, "fields": None, "deleted": 0,
+                                                        "raw": 0, "versions": {}}
+                moved.setdefault(row["id"], (row["topic"], row["front"]) if self._alive(row) else None)
+                for field, (value, counter, replica) in change.get("set", {}).items():
+                    self.state.observe(counter)
+                    if [counter, replica] > row["versions"].get(field, NO_VERSION):  # The newer version wins
+                        row[field], row["versions"][field] = value, [counter, replica]
+                row["raw"] += change.get("progress", 0)  # Progress changes add up
+                self.state.save_card(row)
+        return received  # Return the number of changes
+
+    # Private method to check whether a card exists
+    @staticmethod
+    def _alive(row):
+        """
+        Check whether a card state describes an existing card.
+        Args:
+            row (dict): The card state.
+        Returns:
+            bool: True if the card has a topic, front and back and was not deleted.
+        """
+        return not row["deleted"] and None not in (row["topic"], row["front"], row["back"])
+
+    # Private method to write merged cards into the deck
+    def _write_cards(self, moved):
+        """
+        Write the merged cards into the deck: remove them from their old place, store them at the new one
+        and delete topics that only the merge emptied.
+        Args:
+            moved (dict): {card id: (topic, card_front) in the deck before the merge, or None}.
+        Returns:
+            tuple: (keys of the changed topics, number of written cards).
+        """
+        changed, emptied = set(), set()  # Keys of the changed topics, topics that lost cards
+        written = 0  # Number of written cards
+        for card_id_, before in moved.items():
+            row = self.state.card(card_id_)
+            after = (row["topic"], row["front"]) if row is not None and self._alive(row) else None
+            if before is not None and (after is None or Deck._topic_key(before[0]) != row["topic_key"]
+                                       or before[1] != after[1]):  # Remove the card from its old place
+                if self.deck.topic_exists(before[0]):
+                    self.deck.set_card(before[0], before[1], None)
+                    changed.add(Deck._topic_key(before[0]))
+                    emptied.add(before[0])
+                    written += 1
+            if after is not None:
+                if not self.deck.topic_exists(row["topic"]):
+                    self.deck.new_topic_dictionary(row["topic"])
+                card = [row["back"], _clamp(row["raw"])] + ([json.loads(row["fields"])] if row["fields"] else [])
+                current = self.deck.get_topic_dictionary(row["topic"]).get(row["front"])  # Card in the deck now
+                if current is None or list(current) != card:  # Write only cards that differ
+                    self.deck.set_card(row["topic"], row["front"], card)
+                    changed.add(row["topic_key"])
+                    written += 1
+        for topic in emptied:
+            if self.deck.topic_exists(topic) and not self.deck.get_topic_dictionary(topic):
+                self.deck.delete_topic(topic)
+        return changed, written  # Return the changed topics and the number of written cards
+
+    # Private method to store the digests of the topics after the sync
+    def _store_digests(self, keys):
+        """
+        Store the digests of topics as they are in the deck now.
+        Args:
+            keys (set): The keys of the topics.
+        """
+        names = {Deck._topic_key(topic): topic for topic in self.deck.get_topic_list}  # Topics of the deck
+        for key in keys:
+            topic = names.get(key)
+            cards = self.deck.get_topic_dictionary(topic) if topic is not None else None
+            self.state.set_digest(key, topic_digest(cards, self._blocks) if cards is not None else None)
+
+    # Private method to finish a sync that stopped before the deck was saved
+    def _finish_interrupted(self):
+        """
+        Write the merged cards of an interrupted sync into the deck.
+        Returns:
+            int: The number of written cards.
+        """
+        moved = self.state.unwritten()
+        if not moved:
+            return 0
+        changed, written = self._write_cards(moved)
+        self._store_digests(changed)
+        self.deck.save_deck_json()
+        self.state.set_unwritten({})
+        self.state.commit()
+        return written  # Return the number of written cards
+
+    # Private method to send the queued entries
+    def _push_pending(self):
+        """
+        Send the entries that the hub has not accepted yet.
+        Returns:
+            int: The number of sent changes.
+        """
+        sent = 0  # Number of sent changes
+        for entry in self.state.pending():
+            self.transport.push(entry)
+            self.state.remove_pending(entry["id"])
+            sent += len(entry["changes"])
+        return sent  # Return the number of sent changes
+
+    # Private method to pull all new entries
+    def _pull(self):
+        """
+        Read all entries that were added to the hub since the last sync.
+        Returns:
+            tuple: (list of entries, new position).
+        """
+        entries, position = [], self.state.pulled  # Entries read so far
+        while True:
+            batch, new_position = self.transport.pull(position)
+            entries.extend(batch)
+            if new_position == position or not batch:
+                return entries, new_position  # Return the entries and the new position
+            position = new_position
+
+    # Public method to sync the deck
+    def sync(self):
+        """
+        Send the changes of this deck to the hub and merge the changes of other machines into the deck.
+        The first sync of a deck joins the hub: cards of the hub are added, cards that differ take the
+        values of this deck, and nothing is deleted. The deck is saved afterwards.
+        Returns:
+            SyncReport: The numbers of sent changes, received changes and written cards.
+        Raises:
+            OSError: If the hub cannot be reached; the deck and the sync state are not changed.
+        """
+        written = self._finish_interrupted()  # A sync that stopped before the deck was saved
+        joining = self.state.is_new()  # The first sync adds the cards of the hub
+        moved = {}  # {card id: (topic, card_front) before the merge, or None}
+        try:
+            if joining:  # Take the state of the hub first, then record how this deck differs from it
+                entries, position = self._pull()
+                received = self._apply_remote(entries, moved)
+                changes, compared = self._local_changes(deletions=False)
+                for row in self.state.existing_cards():  # Cards of the hub that are missing from this deck
+                    moved.setdefault(row["id"], None)
+            else:  # Record the changes of this deck first, then merge the changes of the others
+                changes, compared = self._local_changes()
+                entries, position = self._pull()
+                received = self._apply_remote(entries, moved)
+        except (OSError, ValueError, KeyError):
+            self.state.rollback()
+            raise
+        if changes:
+            self.state.add_pending(changes)  # Sent below, or by the next sync if the hub fails
+        self.state.pulled = position
+        self.state.set_unwritten(moved)
+        self.state.commit()
+        changed, count = self._write_cards(moved)  # Write the merged cards into the deck
+        self._store_digests(set(compared) | changed)
+        if count or changes:  # The state now assumes that the deck file holds these cards
+            self.deck.save_deck_json()
+        self.state.set_unwritten({})
+        self.state.commit()
+        sent = self._push_pending()
+        return SyncReport(sent, received, written + count)  # Return the report
+
+
+# Function to sync a deck with a hub
+def sync_deck(deck, state_path, location):
+    """
+    Sync a deck with a hub.
+    Args:
+        deck (Deck, SQLiteDeck or DeckCollection): The deck.
+        state_path (str): The file path of the sync state, e.g. 'flash.json.sync'.
+        location (str): The hub: a directory or an 'http://' address.
+    Returns:
+        SyncReport: The numbers of sent changes, received changes and written cards.
+    """
+    state = SyncState(state_path)
+    try:
+        return DeckSync(deck, state, open_transport(location)).sync()  # Return the report
+    finally:
+        state.close()
+
+
+# Define the HubHandler class: HTTP access to a hub directory
+class HubHandler(BaseHTTPRequestHandler):
+    hub = None  # The DirectoryTransport of the server, set by serve_hub
+
+    # Private method to send a JSON response
+    def _reply(self, status, body):
+        """
+        Send a JSON response.
+        Args:
+            status (int): The HTTP status.
+            body (dict): The response body.
+        """
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        """
+        Return the entries after a position: GET /entries?since=N.
+        """
+        url = urlsplit(self.path)
+        if url.path != "/entries":
+            return self._reply(404, {"error": "not found"})
+        try:
+            since = int(dict(parse_qsl(url.query)).get("since", 0))
+        except ValueError:
+            return self._reply(400, {"error": "since must be a number"})
+        entries, position = self.hub.pull(max(since, 0))
+        return self._reply(200, {"entries": entries, "position": position})
+
+    def do_POST(self):
+        """
+        Append an entry: POST /entries with the entry as JSON.
+        """
+        if urlsplit(self.path).path != "/entries":
+            return self._reply(404, {"error": "not found"})
+        try:
+            entry = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if not isinstance(entry, dict) or not isinstance(entry.get("id"), str) or not ENTRY_ID.fullmatch(entry["id"]) \
+                    or not isinstance(entry.get("replica"), str) or not isinstance(entry.get("changes"), list):
+                raise ValueError("invalid entry")
+        except ValueError as error:
+            return self._reply(400, {"error": str(error)})
+        return self._reply(200, {"position": self.hub.push(entry)})
+
+    def log_message(self, format, *args):
+        """
+        Keep the terminal quiet; the hub logs nothing per request.
+        """
+
+
+# Function to serve a hub directory over HTTP
+def serve_hub(directory, host="127.0.0.1", port=8766):
+    """
+    Serve a hub directory over HTTP until interrupted, as a stand-in for a sync server.
+    Args:
+        directory (str): The hub directory.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+    """
+    HubHandler.hub = DirectoryTransport(directory)
+    server = ThreadingHTTPServer((host, port), HubHandler)
+    print(f"Serving the hub {directory} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a sync hub over HTTP.")
+    parser.add_argument("directory", help="The hub directory")
+    parser.add_argument("--host", default="127.0.0.1", help="The address to listen on")
+    parser.add_argument("--port", type=int, default=8766, help="The port to listen on")
+    args = parser.parse_args()
+    serve_hub(args.directory, args.host, args.port)
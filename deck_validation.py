@@ -0,0 +1,115 @@
+from collections import namedtuple  # Import namedtuple for the problem reports
+
+# One problem found while loading a deck file. topic and card are None for problems of the whole file or topic;
+# action is 'repaired' (the value was changed into a valid one) or 'skipped' (the entry could not be loaded).
+DeckProblem = namedtuple("DeckProblem", "path topic card problem action")
+
+
+# Function to format a problem for the user
+def format_problem(problem):
+    """
+    Format a problem as one line, e.g. "decks/bio.json: topic 'Cells', card 'Nucleus': progress 'x' is not a
+    number (repaired)".
+    Args:
+        problem (DeckProblem): The problem.
+    Returns:
+        str: The formatted problem.
+    """
+    where = [problem.path or "deck"]  # File, topic and card the problem belongs to
+    if problem.topic is not None:
+        where.append(f"topic {problem.topic!r}")
+    if problem.card is not None:
+        where.append(f"card {problem.card!r}")
+    return f"{where[0]}: {', '.join(where[1:])}{': ' if len(where) > 1 else ''}{problem.problem} ({problem.action})"
+
+
+# Function to clean the progress value of a card
+def _clean_progress(value):
+    """
+    Turn a progress value into an integer.
+    Args:
+        value (object): The stored progress.
+    Returns:
+        tuple: (progress, None) if the value is valid, otherwise (repaired progress, description of the problem).
+    """
+    if isinstance(value, int) and not isinstance(value, bool):  # The expected case
+        return value, None
+    if isinstance(value, float) and value.is_integer():  # E.g. 2.0 written by another tool
+        return int(value), f"progress {value!r} is not an integer"
+    if isinstance(value, str):  # E.g. "2"
+        try:
+            return int(value.strip()), f"progress {value!r} is text"
+        except ValueError:  # E.g. "--2" or "²"; repaired below
+            pass
+    return 0, f"progress {value!r} is not a number; set to 0"  # Return the repaired progress
+
+
+# Function to clean one card
+def clean_card(card):
+    """
+    Bring a card into the [back, progress] or [back, progress, fields] format.
+    Args:
+        card (object): The stored card value.
+    Returns:
+        tuple: (card or None, list of problem descriptions, action of the problems: 'repaired' or 'skipped').
+    """
+    if isinstance(card, str):  # An answer without progress: "front": "back"
+        return [card, 0], ["answer without progress; progress set to 0"], "repaired"
+    if not isinstance(card, list):
+        return None, [f"card is not [answer, progress] ({type(card).__name__})"], "skipped"
+    if not card:
+        return None, ["card is an empty list"], "skipped"
+    problems = []  # Problems of this card
+    card_back = card[0]
+    if isinstance(card_back, (int, float)) and not isinstance(card_back, bool):  # E.g. "2 + 2": 4
+        card_back = str(card_back)
+        problems.append(f"answer {card[0]!r} is a number")
+    elif not isinstance(card_back, str):
+        return None, [f"answer is not text ({type(card_back).__name__})"], "skipped"
+    if len(card) < 2:
+        progress = 0
+        problems.append("missing progress; set to 0")
+    else:
+        progress, problem = _clean_progress(card[1])
+        if problem is not None:
+            problems.append(problem)
+    cleaned = [card_back, progress]  # The cleaned card
+    if len(card) > 2:  # Optional scheduling fields
+        if isinstance(card[2], dict):
+            cleaned.extend(card[2:])
+        else:
+            problems.append(f"fields are not an object ({type(card[2]).__name__}); removed")
+    return cleaned, problems, "repaired"  # Return the cleaned card
+
+
+# Function to clean a whole deck
+def clean_deck(data, path=None):
+    """
+    Validate a parsed deck file and clean it into the {topic: {front: [back, progress, ...]}} format.
+    Every change and every entry that cannot be loaded is reported instead of failing or dropping it silently.
+    Args:
+        data (object): The parsed JSON file.
+        path (str, optional): The file path, used in the problem reports.
+    Returns:
+        tuple: (cleaned deck dictionary, list of DeckProblem).
+    """
+    if not isinstance(data, dict):  # The file is not a deck
+        return {}, [DeckProblem(path, None, None, f"file is not an object of topics ({type(data).__name__})",
+                                "skipped")]
+    problems = []  # Problems found in the file
+    deck_dict = {}  # The cleaned deck
+    for topic, cards in data.items():
+        if not isinstance(cards, dict):  # A topic must map fronts to cards
+            problems.append(DeckProblem(path, topic, None, f"topic is not an object of flashcards "
+                                                           f"({type(cards).__name__})", "skipped"))
+            continue
+        cleaned_cards = deck_dict[topic] = {}  # The cleaned topic
+        for card_front, card in cards.items():
+            if type(card) is list and len(card) == 2 and type(card[0]) is str and type(card[1]) is int:  # Valid
+                cleaned_cards[card_front] = card  # The common case, kept without a copy
+                continue
+            cleaned, card_problems, action = clean_card(card)
+            problems.extend(DeckProblem(path, topic, card_front, problem, action) for problem in card_problems)
+            if cleaned is not None:
+                cleaned_cards[card_front] = cleaned
+    return deck_dict, problems  # Return the cleaned deck and the problems
@@ -0,0 +1,72 @@
+import threading  # Import the threading module for the background writer thread
+
+
+# Define the DeckWriter class to run deck saves on a dedicated background thread
+class DeckWriter:
+    def __init__(self, write_function, coalesce_delay=0.25):
+        """
+        Initialize the DeckWriter with the function that performs the actual save.
+        Args:
+            write_function (callable): Function without arguments that saves the deck and returns True on success.
+            coalesce_delay (float): Seconds to wait after the first dirty notification so that bursts
+                of changes are written only once.
+        """
+        self._write_function = write_function  # Store the save function
+        self._coalesce_delay = coalesce_delay  # Store the coalescing delay
+        self._condition = threading.Condition()  # Condition guarding the writer state
+        self._dirty = False  # True if there are changes that have not been written yet
+        self._writing = False  # True while the writer thread is saving
+        self._flush_requested = False  # True if a caller is waiting in flush()
+        self._thread = None  # The writer thread is started lazily on the first notification
+        self.last_result = True  # Result of the most recent save
+
+    # Public method to notify the writer that the deck has changed
+    def mark_dirty(self):
+        """
+        Notify the writer that the deck has changed. Returns immediately.
+        """
+        with self._condition:
+            self._dirty = True  # Remember that a save is needed
+            if self._thread is None:  # Start the writer thread on first use
+                self._thread = threading.Thread(target=self._run, name="DeckWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()  # Wake up the writer thread
+
+    # Public method to wait until all pending changes are written
+    def flush(self, timeout=None):
+        """
+        Block until all pending changes have been written.
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+        Returns:
+            bool: True if everything was written successfully, False otherwise.
+        """
+        with self._condition:
+            if self._thread is None:  # Nothing was ever scheduled
+                return self.last_result
+            self._flush_requested = True  # Ask the writer thread to skip the coalescing delay
+            self._condition.notify_all()  # Wake up the writer thread
+            finished = self._condition.wait_for(lambda: not self._dirty and not self._writing, timeout)
+            self._flush_requested = False  # The flush is over
+            return finished and self.last_result  # Return whether all changes were written
+
+    # Private method containing the loop of the writer thread
+    def _run(self):
+        """
+        Wait for dirty notifications and write the deck once per burst of changes.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._dirty)  # Sleep until something changed
+                if not self._flush_requested:  # Give further changes a moment to arrive
+                    self._condition.wait_for(lambda: self._flush_requested, self._coalesce_delay)
+                self._dirty = False  # Changes arriving from now on need another save
+                self._writing = True  # Mark the save as running
+            try:
+                result = self._write_function()  # Save the deck outside of the lock
+            except Exception:
+                result = False  # Never let the writer thread die on an unexpected error
+            with self._condition:
+                self.last_result = result  # Store the result of the save
+                self._writing = False  # Mark the save as finished
+                self._condition.notify_all()  # Wake up callers waiting in flush()
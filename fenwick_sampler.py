@@ -0,0 +1,191 @@
+import math  # Import the math module for the critical value of the self-check
+import random  # Import the random module for the draws
+import sys  # Import the sys module for the command line self-check
+
+
+# Define the FenwickSampler class: weighted random choice with O(log n) draws and weight updates
+class FenwickSampler:
+    def __init__(self, weights=()):
+        """
+        Initialize the FenwickSampler with one non-negative integer weight per item. The weights are kept in
+        a Fenwick tree (binary indexed tree) of prefix sums, so drawing an item and changing a weight both
+        take O(log n) and no weight list is rebuilt per draw. Integer weights keep the sums exact.
+        Args:
+            weights (iterable): The initial weight of every item; items are numbered from 0.
+        """
+        self._weights = [int(weight) for weight in weights]  # Weight of every item
+        if any(weight < 0 for weight in self._weights):
+            raise ValueError("weights must not be negative")
+        self._tree = [0] + self._weights  # Build the tree in O(n): push every node into its parent
+        for node in range(1, len(self._tree)):
+            parent = node + (node & -node)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[node]
+        self._total = sum(self._weights)  # Sum of all weights
+
+    def __len__(self):
+        """
+        Get the number of items.
+        Returns:
+            int: The number of items.
+        """
+        return len(self._weights)  # Return the number of items
+
+    @property  # Define a property method to get the sum of all weights
+    def total(self):
+        """
+        Get the sum of all weights.
+        Returns:
+            int: The total weight; 0 if no item can be drawn.
+        """
+        return self._total  # Return the total weight
+
+    # Public method to get the weight of an item
+    def weight(self, index):
+        """
+        Get the weight of an item.
+        Args:
+            index (int): The item number.
+        Returns:
+            int: The weight.
+        """
+        return self._weights[index]  # Return the weight
+
+    # Public method to change the weight of an item
+    def update(self, index, weight):
+        """
+        Change the weight of an item in O(log n).
+        Args:
+            index (int): The item number.
+            weight (int): The new non-negative weight; 0 means the item is never drawn.
+        """
+        weight = int(weight)
+        if weight < 0:
+            raise ValueError("weights must not be negative")
+        delta = weight - self._weights[index]  # Change of the weight
+        if not delta:
+            return
+        self._weights[index] = weight
+        self._total += delta
+        node = index + 1  # Tree nodes are numbered from 1
+        while node < len(self._tree):  # Update every node covering the item
+            self._tree[node] += delta
+            node += node & -node
+
+    # Public method to add an item
+    def append(self, weight):
+        """
+        Add an item at the end in O(log n).
+        Args:
+            weight (int): The weight of the new item.
+        Returns:
+            int: The number of the new item.
+        """
+        index = len(self._weights)  # Number of the new item
+        node = index + 1  # The new node covers the items (node - lowbit, node]
+        covered = sum(self._weights[node - (node & -node):index])  # Weights of the other covered items
+        self._weights.append(0)
+        self._tree.append(covered)
+        self.update(index, weight)  # Add the weight to the new node and its parents
+        return index  # Return the number of the new item
+
+    # Public method to sum the weights before an item
+    def prefix_sum(self, index):
+        """
+        Sum the weights of the items before an item in O(log n).
+        Args:
+            index (int): The item number.
+        Returns:
+            int: The sum of the weights of items 0 to index - 1.
+        """
+        total = 0  # Sum so far
+        node = index  # Node covering the items before the item
+        while node > 0:
+            total += self._tree[node]
+            node -= node & -node
+        return total  # Return the sum
+
+    # Public method to find the item at a position of the cumulative weights
+    def find(self, value):
+        """
+        Find the item whose range of the cumulative weights contains a value, by descending the tree in
+        O(log n).
+        Args:
+            value (int): A value in the range 0 to total - 1.
+        Returns:
+            int: The first item whose prefix sum including its own weight exceeds the value.
+        """
+        node = 0  # The items before node have a prefix sum of at most value
+        step = 1 << (len(self._tree) - 1).bit_length()  # Largest power of two within the tree
+        while step:
+            child = node + step
+            if child < len(self._tree) and self._tree[child] <= value:  # The item lies beyond this node
+                node = child
+                value -= self._tree[child]
+            step >>= 1
+        return node  # Return the item number (node is 1-based, the item 0-based)
+
+    # Public method to draw an item
+    def sample(self, rng=random, exclude=None):
+        """
+        Draw an item with probability proportional to its weight in O(log n).
+        Args:
+            rng (random.Random): The random number generator, e.g. seeded for reproducible draws.
+            exclude (int, optional): An item that is not drawn if any other item has a weight, e.g. the
+                item drawn last.
+        Returns:
+            int or None: The drawn item, or None if all weights are 0.
+        """
+        if not self._total:  # Nothing can be drawn
+            return None
+        skipped = self._weights[exclude] if exclude is not None else 0  # Weight left out of the draw
+        if skipped == self._total:  # The excluded item is the only one left
+            return exclude
+        value = rng.randrange(self._total - skipped)  # Position among the weights of the other items
+        if skipped and value >= self.prefix_sum(exclude):  # Jump over the excluded item
+            value += skipped
+        return self.find(value)  # Return the drawn item
+
+
+# Function to check the sampled distribution against the weights
+def chi_square_check(weights, draws=200000, seed=0, exclude=None):
+    """
+    Draw many times and compare the counts with the weights by Pearson's chi-square test.
+    Args:
+        weights (list): Integer weights; at least two must be positive.
+        draws (int): Number of draws.
+        seed (int): Seed of the draws.
+        exclude (int, optional): Item excluded from every draw.
+    Returns:
+        tuple: (chi-square statistic, critical value at the 0.1% level, True if the counts fit the weights).
+    """
+    sampler = FenwickSampler(weights)
+    rng = random.Random(seed)
+    counts = [0] * len(weights)  # Draws per item
+    for _ in range(draws):
+        counts[sampler.sample(rng, exclude)] += 1
+    expected = [weight if index != exclude else 0 for index, weight in enumerate(weights)]
+    total = sum(expected)
+    statistic = 0.0  # Sum of (observed - expected)^2 / expected over the items that can be drawn
+    for count, weight in zip(counts, expected):
+        if weight:
+            statistic += (count - draws * weight / total) ** 2 / (draws * weight / total)
+        elif count:  # An item without weight was drawn
+            return math.inf, 0.0, False
+    freedom = sum(1 for weight in expected if weight) - 1  # Degrees of freedom
+    # Wilson-Hilferty approximation of the chi-square quantile; 3.0902 is the 99.9% normal quantile
+    critical = freedom * (1 - 2 / (9 * freedom) + 3.0902 * math.sqrt(2 / (9 * freedom))) ** 3
+    return statistic, critical, statistic <= critical  # Return the result
+
+
+if __name__ == "__main__":
+    draws = int(sys.argv[1]) if len(sys.argv) > 1 else 200000  # Number of draws per check
+    checks = {"skewed weights": ([1, 2, 3, 4, 10, 0, 50, 7], None),
+              "many items": ([number % 7 + 1 for number in range(1000)], None),
+              "excluded item": ([5, 1, 3, 8, 2], 3)}
+    failed = 0  # Number of failed checks
+    for name, (weights, exclude) in checks.items():
+        statistic, critical, passed = chi_square_check(weights, draws, exclude=exclude)
+        failed += not passed
+        print(f"{name:>15}: chi-square {statistic:8.1f} (critical {critical:7.1f}) {'ok' if passed else 'FAILED'}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,117 @@
+import os  # Import the os module for the lock file
+import time  # Import the time module to wait for the lock
+
+try:
+    import fcntl  # Import the fcntl module for advisory locks (Unix)
+except ImportError:
+    fcntl = None
+    import msvcrt  # Import the msvcrt module for byte-range locks (Windows)
+
+_UMASK = os.umask(0o022)  # Read the umask once at import, while no other thread creates files
+os.umask(_UMASK)  # Restore it
+
+
+# Function to give a temporary file the permissions of the file it replaces
+def keep_file_mode(temp_path, path):
+    """
+    Set the permissions of a temporary file (created with mode 0600 by tempfile.mkstemp) to those of the file it
+    is about to replace, or to the default permissions of a new file, so that the rename keeps a shared deck
+    readable by everyone who could read it before.
+    Args:
+        temp_path (str): The file path of the temporary file.
+        path (str): The file path that the temporary file replaces.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777  # Permissions of the existing file
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK  # Permissions open() would give a new file
+    os.chmod(temp_path, mode)
+
+
+# Define the FileLock class: an advisory lock shared by all processes that write the same deck
+class FileLock:
+    def __init__(self, path, timeout=10.0, poll_interval=0.01):
+        """
+        Initialize the FileLock with the path of its lock file. The lock file is created on first use
+        and never removed, because removing it while another process waits would let two writers in.
+        Args:
+            path (str): The file path of the lock file, e.g. 'flash.json.lock'.
+            timeout (float): Maximum number of seconds to wait for the lock.
+            poll_interval (float): Seconds between two attempts to take the lock.
+        """
+        self._path = path  # Store the lock file path
+        self._timeout = timeout  # Store the timeout
+        self._poll_interval = poll_interval  # Store the polling interval
+        self._fd = None  # File descriptor of the lock file while the lock is held
+
+    # Private method to try to take the lock once
+    def _try_lock(self, fd):
+        """
+        Try to take the lock without waiting.
+        Args:
+            fd (int): The file descriptor of the lock file.
+        Returns:
+            bool: True if the lock was taken, False if another process holds it.
+        """
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)  # Exclusive lock on the whole file
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)  # Windows locks byte ranges; lock the first byte
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True  # Return True if the lock was taken
+        except OSError:
+            return False  # Return False if the lock is held by another process
+
+    # Public method to take the lock
+    def acquire(self):
+        """
+        Take the lock, waiting up to the timeout while another process holds it.
+        Returns:
+            bool: True if the lock was taken, False on timeout or if the lock file cannot be opened.
+        """
+        try:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)  # Open or create the lock file
+        except OSError:
+            return False  # Return False if the lock file cannot be opened
+        deadline = time.monotonic() + self._timeout  # Give up after the timeout
+        while not self._try_lock(fd):
+            if time.monotonic() >= deadline:  # Another process held the lock too long
+                os.close(fd)
+                return False
+            time.sleep(self._poll_interval)  # Wait for the other process
+        self._fd = fd  # Remember the descriptor until the lock is released
+        return True  # Return True if the lock was taken
+
+    # Public method to release the lock
+    def release(self):
+        """
+        Release the lock if it is held.
+        """
+        if self._fd is None:  # The lock is not held
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)  # Unlock the file
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass  # Closing the descriptor releases the lock as well
+        finally:
+            os.close(self._fd)  # Close the lock file
+            self._fd = None
+
+    def __enter__(self):
+        """
+        Take the lock at the start of a with block.
+        Returns:
+            bool: True if the lock was taken, False on timeout.
+        """
+        return self.acquire()  # Return whether the lock was taken
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Release the lock at the end of a with block.
+        """
+        self.release()  # Release the lock
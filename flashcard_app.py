@@ -1,7 +1,19 @@
+import os  # Import the os module to read the frame time setting
+import statistics  # Import the statistics module to summarize frame times
+import threading  # Import the threading module to load the deck in the background
+import time  # Import the time module to measure frame times
 import tkinter as tk  # Import the tkinter library for GUI
-from tkinter import messagebox  # Import messagebox for displaying messages
-from initialize import mydeck  # Import the 'mydeck' object from initialize module
+from collections import deque  # Import deque to keep the most recent frame times
+from tkinter import filedialog, messagebox  # Import dialogs for choosing media files and displaying messages
+from assets import get_image  # Import the image cache
+from deck_validation import format_problem  # Import the formatting of deck file problems
+from initialize import DECK_PATH, open_deck  # Import the deck path and loader from initialize module
 from learn_topic import LearnTopic  # Import the LearnTopic class from learn_topic module
+from media_cache import MediaPrefetcher, play_sound  # Import the image prefetcher and the sound player
+from media_store import IMAGE_EXTENSIONS, SOUND_EXTENSIONS, MediaStore, media_tag, parse_media  # Import card media
+from review_timings import ReviewTimings  # Import the step timings of the review loop
+from session_recorder import SessionRecorder  # Import the session log
+from topic_picker import TopicIndex, TopicPicker  # Import the searchable topic list
 
 
 class FlashcardApp:
@@ -10,46 +22,188 @@ class FlashcardApp:
         self.root.title("Flash Genius")  # Set the title of the window
         self.root.configure(bg='white')  # Set the background color of the window to white
 
-        self.deck = mydeck  # Assign the 'mydeck' object to self.deck
+        self.deck = None  # The deck is loaded in the background while the main menu is shown
+        self.loaded_deck = None  # Deck handed over by the loader thread
+        self.load_error = None  # Exception raised by the loader thread, if the deck could not be loaded
+        self.deck_loaded = threading.Event()  # Set by the loader thread once the deck (or load_error) is ready
+        self.topic_index = None  # Searchable topic names, built together with the deck
         self.current_topic = None  # Initialize current_topic to None
         self.learn_topic = None  # Initialize learn_topic to None
         self.current_question = None  # Initialize current_question to None
         self.current_answer = None  # Initialize current_answer to None
-
+        self.current_sounds = []  # Sounds of the side of the flashcard that is shown
+        self.topic_action = None  # Action of the topic selection ('learn' or 'add')
+
+        self.screens = {}  # Screens built so far, by name; each screen is built once and reused
+        self.current_screen = None  # Name of the screen that is currently shown
+        self.frame_times = deque(maxlen=1000)  # Durations of the most recent screen changes in the review loop (ms)
+        self.review_timings = ReviewTimings()  # Durations of choosing, updating and writing cards
+        self.recorder = SessionRecorder(DECK_PATH + ".sessions")  # Log of every answer for the session analysis
+        self.media_store = MediaStore(DECK_PATH + ".media")  # Images and sounds of the flashcards
+        self.media = MediaPrefetcher(self.root, self.media_store)  # Decodes the images of the next flashcards early
+
+        self.root.protocol("WM_DELETE_WINDOW", self.quit_app)  # Save the deck when the window is closed
         self.create_main_menu()  # Call the create_main_menu method to initialize the main menu
 
-    def clear_window(self):
+        self.deck_loader = threading.Thread(target=self.load_deck, daemon=True)  # Load the deck in the background
+        self.deck_loader.start()
+        self.root.after(20, self.wait_for_deck)  # Check regularly whether the deck is ready
+
+    def load_deck(self):
         """
-        Clears all widgets from the root window.
+        Loads the deck, then the search index. Runs on the loader thread and must not touch any widget; an
+        error is handed over to wait_for_deck. The deck is handed over before the search index is ready, so
+        the main menu is usable early and the first search does not build the index on the main thread.
         """
-        for widget in self.root.winfo_children():
-            widget.destroy()  # Destroy each widget within the root window
+        try:
+            self.loaded_deck = open_deck(DECK_PATH)  # Parse and validate the deck file
+            self.topic_index = TopicIndex(self.loaded_deck.get_topic_list)  # Sort the topics for the topic picker
+        except Exception as error:  # Any failure leaves the application without a deck
+            self.load_error = error
+        finally:
+            self.deck_loaded.set()  # Hand the deck or the error over to wait_for_deck
+        if self.load_error is None:
+            self.loaded_deck.prepare_search()  # Load or build the search index before the first search
 
-    def create_main_menu(self):
+    def wait_for_deck(self):
+        """
+        Hands the loaded deck over to the application and enables the main menu once loading has finished.
+        """
+        if not self.deck_loaded.is_set():  # Still loading
+            self.root.after(20, self.wait_for_deck)  # Check again shortly
+            return
+        menu = self.screens["main_menu"]  # The main menu is always built first
+        if self.load_error is not None:  # Keep the deck buttons disabled
+            menu.loading_label.configure(text="The flashcards could not be loaded.")
+            messagebox.showerror("Error", f"The deck {DECK_PATH} could not be loaded:\n{self.load_error}")
+            return
+        self.deck = self.loaded_deck  # The deck is ready
+        for button in menu.deck_buttons:  # Enable the buttons that need the deck
+            button.configure(state=tk.NORMAL)
+        menu.loading_label.pack_forget()  # Remove the loading indicator
+        self.report_deck_problems()  # Tell the user about entries of the deck file that were repaired or skipped
+
+    def report_deck_problems(self):
+        """
+        Shows the problems found while loading the deck file, and whether the deck was opened read-only.
+        """
+        problems = getattr(self.deck, "problems", [])  # The SQLite backend does not validate a file
+        if not problems:
+            return
+        lines = [format_problem(problem) for problem in problems[:10]]  # The first problems
+        if len(problems) > 10:
+            lines.append(f"... and {len(problems) - 10} more")
+        read_only = getattr(self.deck, "read_only_files", None)  # Files of a deck directory that are not saved
+        if read_only is None:
+            read_only = [DECK_PATH] if getattr(self.deck, "read_only", False) else []
+        if read_only:  # Saving would drop the skipped entries
+            lines.append(f"\nChanges to {', '.join(read_only)} are not saved until the file is repaired.")
+        messagebox.showwarning("Deck problems", "\n".join(lines))  # Display the problems
+
+    def quit_app(self):
+        """
+        Saves the journaled answers into the deck file and closes the application.
+        """
+        if self.deck is not None:  # The deck may still be loading
+            self.deck.close()  # Compact the review journal into the deck file
+        self.recorder.close()  # Write the last answers to the session log
+        if os.environ.get("FLASH_GENIUS_FRAME_TIMES") and self.frame_times:  # Report frame times on request
+            print("Review frame times:", self.frame_time_summary())
+            print("Review step times:", self.review_timings.summary())
+        self.root.quit()  # Stop the main loop
+
+    def screen(self, name):
+        """
+        Returns the frame of a screen, building it on first use.
+        Args:
+            name (str): The name of the screen; it is built by the method 'build_<name>'.
+        Returns:
+            tk.Frame: The frame of the screen.
+        """
+        if name not in self.screens:  # Build each screen only once
+            frame = tk.Frame(self.root, bg='white')  # Frame holding all widgets of the screen
+            getattr(self, f"build_{name}")(frame)  # Create the widgets of the screen
+            self.screens[name] = frame
+        return self.screens[name]  # Return the frame of the screen
+
+    def show_screen(self, name):
+        """
+        Hides the current screen and shows another one without destroying any widgets.
+        Args:
+            name (str): The name of the screen to show.
+        Returns:
+            tk.Frame: The frame of the shown screen.
+        """
+        frame = self.screen(name)  # Get (or build) the screen
+        if self.current_screen != name:  # Swap the screens
+            if self.current_screen is not None:
+                self.screens[self.current_screen].pack_forget()  # Hide the current screen
+            frame.pack(fill=tk.BOTH, expand=True)  # Show the new screen
+            self.current_screen = name
+        return frame  # Return the frame of the shown screen
+
+    def timed(self, action, *args):
+        """
+        Runs a screen change of the review loop, waits until it is laid out and records how long it took.
+        Args:
+            action (callable): The method changing the screen.
+            *args: Arguments for the method.
         """
-        Creates the main menu GUI with logo, options, and buttons.
+        start = time.perf_counter()  # Start of the screen change
+        action(*args)  # Change the screen
+        self.root.update_idletasks()  # Lay out the changed widgets
+        self.frame_times.append((time.perf_counter() - start) * 1000)  # Record the duration in ms
+
+    def frame_time_summary(self):
+        """
+        Summarizes the recorded frame times of the review loop.
+        Returns:
+            dict: Number of frames and the median, 95th percentile and maximum frame time in ms.
         """
-        self.clear_window()  # Clear the window before creating the main menu
+        times = sorted(self.frame_times)  # Recorded frame times in ascending order
+        if not times:
+            return {"frames": 0}
+        return {"frames": len(times), "median_ms": round(statistics.median(times), 2),
+                "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 2), "max_ms": round(times[-1], 2)}
 
-        logo_image = tk.PhotoImage(file="image.png")  # Load logo image from file
-        tk.Label(self.root, image=logo_image, bg='white').pack(pady=10)  # Display logo image on the window
-        self.root.logo_image = logo_image  # Store the logo image reference in the root
+    def build_main_menu(self, frame):
+        """
+        Builds the main menu with logo, options, and buttons.
+        Args:
+            frame (tk.Frame): The frame of the screen.
+        """
+        logo_image = get_image("image.png")  # Logo image, decoded once per process
+        tk.Label(frame, image=logo_image, bg='white').pack(pady=10)  # Display logo image on the window
 
-        tk.Label(self.root, text="What would you like to do?", font=("Helvetica", 24, "bold"), fg='pink',
+        tk.Label(frame, text="What would you like to do?", font=("Helvetica", 24, "bold"), fg='pink',
                  bg='white').pack(pady=20)  # Main menu label
-        tk.Button(self.root, text="learn", command=self.start_learning, bg='#ff66b2', fg='black',
-                  font=("Helvetica", 20), height=2, width=15).pack(pady=10)  # Learn button
-        tk.Button(self.root, text="add", command=self.add_flashcards, bg='#ffb380', fg='black', font=("Helvetica", 20),
-                  height=2, width=15).pack(pady=10)  # Add flashcards button
-        tk.Button(self.root, text="quit", command=self.root.quit, bg='#666666', fg='white', font=("Helvetica", 20),
+        frame.deck_buttons = [
+            tk.Button(frame, text="learn", command=self.start_learning, bg='#ff66b2', fg='black',
+                      font=("Helvetica", 20), height=2, width=15, state=tk.DISABLED),  # Learn button
+            tk.Button(frame, text="add", command=self.add_flashcards, bg='#ffb380', fg='black',
+                      font=("Helvetica", 20), height=2, width=15, state=tk.DISABLED),  # Add flashcards button
+            tk.Button(frame, text="search", command=self.search_flashcards, bg='#ffd9b3', fg='black',
+                      font=("Helvetica", 20), height=2, width=15, state=tk.DISABLED),  # Search flashcards button
+        ]  # Learning, adding and searching are enabled once the deck is loaded
+        for button in frame.deck_buttons:
+            button.pack(pady=10)  # Pack the buttons
+        tk.Button(frame, text="quit", command=self.quit_app, bg='#666666', fg='white', font=("Helvetica", 20),
                   height=2, width=15).pack(pady=10)  # Quit button
+        frame.loading_label = tk.Label(frame, text="Loading flashcards...", font=("Helvetica", 14), fg='#666666',
+                                       bg='white')  # Loading indicator, removed once the deck is loaded
+        frame.loading_label.pack(pady=5)
+
+    def create_main_menu(self):
+        """
+        Shows the main menu.
+        """
+        self.show_screen("main_menu")  # Show the main menu
 
     def start_learning(self):
         """
         Initiates the learning process by choosing a topic.
         """
-        self.topics = self.deck.get_topic_list  # Get the list of topics from the deck
-        if not self.topics:  # If no topics are available
+        if not len(self.topic_index):  # If no topics are available
             messagebox.showinfo("Info", "No topics available to learn.")  # Display info message
             return
         self.choose_topic("learn")  # Proceed to choose a topic for learning
@@ -58,61 +212,154 @@ class FlashcardApp:
         """
         Allows user to add flashcards to a chosen topic.
         """
-        self.topics = self.deck.get_topic_list  # Get the list of topics from the deck
         self.choose_topic("add")  # Proceed to choose a topic for adding flashcards
 
-    def choose_topic(self, action):
+    def build_search(self, frame):
         """
-        Allows user to choose a topic from the dropdown menu.
+        Builds the screen for searching the fronts and backs of all flashcards.
         Args:
-            action (str): Specifies the action to be performed ('learn' or 'add').
+            frame (tk.Frame): The frame of the screen.
+        """
+        tk.Label(frame, text="Search flashcards", font=("Helvetica", 20), bg='white').pack(pady=20)  # Search label
+        frame.query = tk.StringVar(frame)  # Search words
+        frame.query.trace_add("write", lambda *_: self.show_search_results())  # Search while typing
+        frame.query_entry = tk.Entry(frame, textvariable=frame.query, width=50, font=("Helvetica", 14))  # Search entry
+        frame.query_entry.pack(pady=10)
+        frame.result_labels = [tk.Label(frame, font=("Helvetica", 12), bg='white', anchor='w', width=70)
+                               for _ in range(10)]  # One label per result
+        for label in frame.result_labels:
+            label.pack()
+        tk.Button(frame, text="Back to Main Menu", command=self.create_main_menu, bg='#ff66b2', fg='black',
+                  font=("Helvetica", 18)).pack(pady=20)  # Back to main menu button
+
+    def search_flashcards(self):
+        """
+        Shows the search screen with an empty search.
+        """
+        frame = self.show_screen("search")  # Show the search screen
+        frame.query.set("")  # Start with an empty search
+        frame.query_entry.focus_set()  # Type the search words right away
+
+    def show_search_results(self):
+        """
+        Searches the flashcards for the typed words and shows the best matches.
+        """
+        frame = self.screens["search"]  # The search screen
+        query = frame.query.get()  # Search words
+        if query.strip() and self.deck_loader.is_alive():  # The loader thread is still preparing the search index
+            frame.result_labels[0].configure(text="Preparing the search...")
+            if not getattr(frame, "search_pending", False):  # Search once the index is ready
+                frame.search_pending = True
+                self.root.after(100, self.retry_search)
+            return
+        results = self.deck.search(query, limit=len(frame.result_labels)) if query.strip() else []  # Best matches
+        for row, label in enumerate(frame.result_labels):
+            if row < len(results):
+                topic, card_front, _ = results[row]
+                card_back = self.deck.get_topic_dictionary(topic)[card_front][0]  # Answer of the flashcard
+                label.configure(text=f"{topic}: {card_front} \u2192 {card_back}")
+            else:
+                label.configure(text="No flashcards found." if row == 0 and query.strip() else "")
+
+    def retry_search(self):
+        """
+        Shows the results of the typed words once the loader thread has prepared the search index.
         """
-        self.clear_window()  # Clear the window before displaying topic selection
+        frame = self.screens["search"]  # The search screen
+        if self.deck_loader.is_alive():  # Check again shortly
+            self.root.after(100, self.retry_search)
+            return
+        frame.search_pending = False
+        self.show_search_results()  # Search the words typed meanwhile
 
-        tk.Label(self.root, text="Choose a topic", font=("Helvetica", 20), bg='white').pack(
+    def build_choose_topic(self, frame):
+        """
+        Builds the topic selection screen.
+        Args:
+            frame (tk.Frame): The frame of the screen.
+        """
+        tk.Label(frame, text="Choose a topic", font=("Helvetica", 20), bg='white').pack(
             pady=20)  # Topic selection label
-        tk.Label(self.root, text="Click on the dropdown menu to see the list of topics.", font=("Helvetica", 14),
+        tk.Label(frame, text="Type to filter the list of topics, then click on a topic.", font=("Helvetica", 14),
                  bg='white').pack(pady=5)  # Instruction label
 
-        topic_var = tk.StringVar(self.root)  # Variable to hold the selected topic
-        topic_var.set("Dropdown Menu")  # Default text for the dropdown menu
+        frame.topic_picker = TopicPicker(frame, describe=self.describe_topic,
+                                         on_activate=self.proceed_with_topic)  # Filterable list of topics
+        frame.topic_picker.pack(pady=10)
+
+        frame.new_topic_button = tk.Button(frame, text="Create new topic", command=lambda: self.create_new_topic("add"),
+                                           bg='#ffb380', fg='black', font=("Helvetica", 18))  # Shown when adding
+        frame.proceed_button = tk.Button(frame, text="Proceed", command=self.proceed_with_topic, bg='#ff66b2',
+                                         fg='black', font=("Helvetica", 18))  # Proceed button
+        frame.proceed_button.pack(pady=10)
+        tk.Button(frame, text="Back", command=self.create_main_menu, bg='#ff66b2', fg='black',
+                  font=("Helvetica", 18)).pack(pady=5)  # Back button
+
+    def choose_topic(self, action):
+        """
+        Allows user to choose a topic from the dropdown menu.
+        Args:
+            action (str): Specifies the action to be performed ('learn' or 'add').
+        """
+        self.topic_action = action  # Remember what to do with the chosen topic
+        frame = self.show_screen("choose_topic")  # Show the topic selection
+        if frame.topic_picker.index is not self.topic_index:  # Show the topics of the loaded deck
+            frame.topic_picker.set_index(self.topic_index)
+        else:
+            frame.topic_picker.reset()  # Clear the filter and recompute the progress of the visible topics
 
         if action == "add":
-            topic_options = self.topics + ["Create new topic"] if self.topics else [
-                "Create new topic"]  # Add 'Create new topic' option if adding flashcards
+            frame.new_topic_button.pack(pady=5, before=frame.proceed_button)  # Offer to create a new topic
         else:
-            topic_options = self.topics  # Use existing topics for learning
-
-        tk.OptionMenu(self.root, topic_var, *topic_options).pack(pady=10)  # Dropdown menu for selecting topics
-
-        def proceed():
-            """
-            Function called when the 'Proceed' button is clicked.
-            Retrieves the selected topic and takes appropriate action based on the chosen action.
-            """
-            chosen_topic = topic_var.get()  # Get the selected topic from the dropdown menu
-            if action == "add" and chosen_topic == "Create new topic":  # If 'Create new topic' is selected when adding flashcards
-                self.create_new_topic(action)  # Proceed to create a new topic
-            elif chosen_topic == "Dropdown Menu":  # If no topic is selected
-                if action == "learn":
-                    self.choose_topic("learn")  # Stay at the choosing topic menu
-                    messagebox.showinfo("Info",
-                                        "You need to choose one of the topics in the Dropdown Menu!")  # Show prompt to choose valid topic
-                elif action == "add":
-                    self.choose_topic("add")  # Stay at the choosing topic menu
-                    messagebox.showinfo("Info",
-                                        "You need to choose one of the topics in the Dropdown Menu!")  # Show prompt to choose valid topic
-            else:
-                self.current_topic = chosen_topic  # Set the current topic to the chosen topic
-                if action == "learn":
-                    self.confirm_reset_or_start()  # Proceed to confirm reset or start learning
-                elif action == "add":
-                    self.add_flashcard_to_topic()  # Proceed to add flashcards to the chosen topic
+            frame.new_topic_button.pack_forget()  # Only existing topics can be learned
+        frame.topic_picker.entry.focus_set()  # Type to filter right away
 
-        tk.Button(self.root, text="Proceed", command=proceed, bg='#ff66b2', fg='black', font=("Helvetica", 18)).pack(
-            pady=10)  # Proceed button
-        tk.Button(self.root, text="Back", command=self.create_main_menu, bg='#ff66b2', fg='black',
-                  font=("Helvetica", 18)).pack(pady=5)  # Back button
+    def describe_topic(self, topic):
+        """
+        Describes the progress of a topic for the topic list. Only called for visible topics.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            str: The number of flashcards left to learn and the completion of the topic.
+        """
+        topic_statistics = next(iter(self.deck.topic_statistics(topic).values()), None)  # Statistics of the topic
+        if not topic_statistics:
+            return "empty"
+        return (f"{topic_statistics['cards'] - topic_statistics['finished']} to learn, "
+                f"{topic_statistics['completion']:.0f}% complete")
+
+    def proceed_with_topic(self):
+        """
+        Function called when the 'Proceed' button is clicked.
+        Retrieves the selected topic and takes appropriate action based on the chosen action.
+        """
+        action = self.topic_action  # Action of the topic selection
+        chosen_topic = self.screens["choose_topic"].topic_picker.get()  # Get the selected topic from the list
+        if chosen_topic is None:  # If no topic is selected
+            messagebox.showinfo("Info",
+                                "You need to choose one of the topics in the list!")  # Show prompt to choose valid topic
+        else:
+            self.current_topic = chosen_topic  # Set the current topic to the chosen topic
+            if action == "learn":
+                self.confirm_reset_or_start()  # Proceed to confirm reset or start learning
+            elif action == "add":
+                self.add_flashcard_to_topic()  # Proceed to add flashcards to the chosen topic
+
+    def build_create_new_topic(self, frame):
+        """
+        Builds the screen for creating a new topic.
+        Args:
+            frame (tk.Frame): The frame of the screen.
+        """
+        tk.Label(frame, text="Enter the name of the new topic", font=("Helvetica", 20), bg='white').pack(
+            pady=20)  # New topic label
+        frame.topic_entry = tk.Entry(frame, width=50, font=("Helvetica", 14))  # Entry widget for the new topic name
+        frame.topic_entry.pack(pady=10)  # Pack the entry widget
+
+        tk.Button(frame, text="Save Topic", command=self.save_new_topic, bg='#ff66b2', fg='black',
+                  font=("Helvetica", 18)).pack(pady=10)  # Save topic button
+        tk.Button(frame, text="Back", command=lambda: self.choose_topic(self.topic_action), bg='#ff66b2',
+                  fg='black', font=("Helvetica", 18)).pack(pady=5)  # Back button
 
     def create_new_topic(self, action):
         """
@@ -120,58 +367,58 @@ class FlashcardApp:
         Args:
             action (str): Specifies the action to be performed ('learn' or 'add').
         """
-        self.clear_window()  # Clear the window before displaying new topic creation
+        self.topic_action = action  # Remember what to do with the new topic
+        frame = self.show_screen("create_new_topic")  # Show the new topic screen
+        frame.topic_entry.delete(0, tk.END)  # Start with an empty entry
 
-        tk.Label(self.root, text="Enter the name of the new topic", font=("Helvetica", 20), bg='white').pack(
-            pady=20)  # New topic label
-        new_topic_entry = tk.Entry(self.root, width=50,
-                                   font=("Helvetica", 14))  # Entry widget for entering new topic name
-        new_topic_entry.pack(pady=10)  # Pack the entry widget
-
-        def save_new_topic():
-            """
-            Function called when 'Save Topic' button is clicked.
-            Saves the newly created topic and proceeds accordingly.
-            """
-            new_topic = new_topic_entry.get().strip()  # Get the entered topic name
-            if new_topic:
-                if not self.deck.new_topic_dictionary(new_topic):  # Check if the topic already exists
-                    messagebox.showinfo("Info", "Topic already exists.")  # Display info message if topic already exists
-                else:
-                    self.deck.save_deck_json()  # Save the updated deck to JSON file
-                    messagebox.showinfo("Info",
-                                        f"Topic '{new_topic}' created successfully!")  # Display info message for successful creation
-                    self.current_topic = new_topic  # Set the current topic to the newly created topic
-                    if action == "add":
-                        self.add_flashcard_to_topic()  # Proceed to add flashcards to the new topic
-                    elif action == "learn":
-                        self.confirm_reset_or_start()  # Proceed to confirm reset or start learning
-
-        tk.Button(self.root, text="Save Topic", command=save_new_topic, bg='#ff66b2', fg='black',
-                  font=("Helvetica", 18)).pack(pady=10)  # Save topic button
-        tk.Button(self.root, text="Back", command=lambda: self.choose_topic(action), bg='#ff66b2', fg='black',
-                  font=("Helvetica", 18)).pack(pady=5)  # Back button
-
-    def confirm_reset_or_start(self):
+    def save_new_topic(self):
         """
-        Allows user to confirm resetting progress or starting learning.
+        Function called when 'Save Topic' button is clicked.
+        Saves the newly created topic and proceeds accordingly.
         """
-        self.clear_window()  # Clear the window before displaying confirmation
+        new_topic = self.screens["create_new_topic"].topic_entry.get().strip()  # Get the entered topic name
+        if new_topic:
+            if not self.deck.new_topic_dictionary(new_topic):  # Check if the topic already exists
+                messagebox.showinfo("Info", "Topic already exists.")  # Display info message if topic already exists
+            else:
+                self.deck.request_save()  # Save the updated deck to JSON file in the background
+                self.topic_index.add(new_topic)  # Show the new topic in the topic list
+                messagebox.showinfo("Info",
+                                    f"Topic '{new_topic}' created successfully!")  # Display info message for successful creation
+                self.current_topic = new_topic  # Set the current topic to the newly created topic
+                if self.topic_action == "add":
+                    self.add_flashcard_to_topic()  # Proceed to add flashcards to the new topic
+                elif self.topic_action == "learn":
+                    self.confirm_reset_or_start()  # Proceed to confirm reset or start learning
 
-        tk.Label(self.root, text=f"Topic: {self.current_topic}", font=("Helvetica", 20), bg='white').pack(
-            pady=20)  # Display current topic
-        tk.Button(self.root, text="Start Learning", command=self.check_topic_completion, bg='#ff66b2', fg='black',
+    def build_confirm_reset_or_start(self, frame):
+        """
+        Builds the screen for resetting progress or starting learning.
+        Args:
+            frame (tk.Frame): The frame of the screen.
+        """
+        frame.topic_label = tk.Label(frame, font=("Helvetica", 20), bg='white')  # Display current topic
+        frame.topic_label.pack(pady=20)
+        tk.Button(frame, text="Start Learning", command=self.check_topic_completion, bg='#ff66b2', fg='black',
                   font=("Helvetica", 18)).pack(pady=5)  # Start learning button
-        tk.Button(self.root, text="Reset Progress", command=self.reset_progress, bg='#ff66b2', fg='black',
+        tk.Button(frame, text="Reset Progress", command=self.reset_progress, bg='#ff66b2', fg='black',
                   font=("Helvetica", 18)).pack(pady=5)  # Reset progress button
-        tk.Button(self.root, text="Back", command=self.create_main_menu, bg='#ff66b2', fg='black',
+        tk.Button(frame, text="Back", command=self.create_main_menu, bg='#ff66b2', fg='black',
                   font=("Helvetica", 18)).pack(pady=5)  # Back button
 
+    def confirm_reset_or_start(self):
+        """
+        Allows user to confirm resetting progress or starting learning.
+        """
+        frame = self.show_screen("confirm_reset_or_start")  # Show the confirmation screen
+        frame.topic_label.configure(text=f"Topic: {self.current_topic}")  # Display current topic
+
     def reset_progress(self):
         """
         Resets the progress of the current topic.
         """
         self.deck.reset_progress(self.current_topic)  # Reset progress for the current topic
+        self.deck.request_save()  # Save the reset progress in the background
         messagebox.showinfo("Info",
                             f"Progress for topic '{self.current_topic}' has been reset.")  # Display info message
         self.confirm_reset_or_start()  # Proceed to confirm reset or start learning
@@ -180,8 +427,8 @@ class FlashcardApp:
         """
         Checks if the topic has any flashcards left to learn.
         """
-        self.learn_topic = LearnTopic(self.deck.get_topic_dictionary(self.current_topic),
-                                      self.deck)  # Create LearnTopic instance for the current topic
+        self.learn_topic = LearnTopic(self.deck.get_topic_dictionary(self.current_topic), self.deck,
+                                      self.current_topic)  # Create LearnTopic instance for the current topic
         if not self.learn_topic.still_has_flashcards():  # If no flashcards left to learn
             messagebox.showinfo("Info",
                                 f"You have completed the topic '{self.current_topic}'. Please reset the progress to start learning again.")  # Display info message
@@ -189,30 +436,65 @@ class FlashcardApp:
         else:
             self.show_learning_instructions()  # Proceed to show learning instructions
 
-    def show_learning_instructions(self):
+    def build_learning_instructions(self, frame):
         """
-        Displays learning instructions before starting learning session.
+        Builds the screen with the learning instructions.
+        Args:
+            frame (tk.Frame): The frame of the screen.
         """
-        self.clear_window()  # Clear the window before displaying instructions
-
         instructions = (
             "Your learning session is about to begin. For each flashcard, you'll earn a point if you know the answer. "
             "If you don't, one point will be deducted. Once you've earned three points for a card, it will be marked as complete."
         )
-        tk.Label(self.root, text=instructions, font=("Helvetica", 16), bg='white', wraplength=400).pack(
+        tk.Label(frame, text=instructions, font=("Helvetica", 16), bg='white', wraplength=400).pack(
             pady=20)  # Display learning instructions
-        tk.Button(self.root, text="Start Learning", command=self.start_learning_topic, bg='#ff66b2', fg='black',
+        tk.Button(frame, text="Start Learning", command=self.start_learning_topic, bg='#ff66b2', fg='black',
                   font=("Helvetica", 18)).pack(pady=10)  # Start learning button
-        tk.Button(self.root, text="Back", command=self.confirm_reset_or_start, bg='#ff66b2', fg='black',
+        tk.Button(frame, text="Back", command=self.confirm_reset_or_start, bg='#ff66b2', fg='black',
                   font=("Helvetica", 18)).pack(pady=5)  # Back button
 
+    def show_learning_instructions(self):
+        """
+        Displays learning instructions before starting learning session.
+        """
+        self.show_screen("learning_instructions")  # Show the instructions
+
     def start_learning_topic(self):
         """
         Initiates the learning session by starting to show flashcards.
         """
-        self.learn_topic = LearnTopic(self.deck.get_topic_dictionary(self.current_topic),
-                                      self.deck)  # Create LearnTopic instance for the current topic
-        self.show_flashcard()  # Proceed to show the first flashcard
+        self.learn_topic = LearnTopic(self.deck.get_topic_dictionary(self.current_topic), self.deck,
+                                      self.current_topic, recorder=self.recorder,
+                                      timings=self.review_timings)  # Create LearnTopic instance for the current topic
+        self.timed(self.show_flashcard)  # Proceed to show the first flashcard
+
+    def build_flashcard(self, frame):
+        """
+        Builds the flashcard screen with the question, the answer and the answer buttons.
+        Args:
+            frame (tk.Frame): The frame of the screen.
+        """
+        frame.question_label = tk.Label(frame, font=("Helvetica", 20), bg='white', compound=tk.TOP,
+                                        wraplength=700)  # Display the flashcard question and its image
+        frame.question_label.pack(pady=20)
+        frame.answer_label = tk.Label(frame, font=("Helvetica", 20), bg='white', compound=tk.TOP,
+                                      wraplength=700)  # Answer and its image, shown on request
+        frame.sound_button = tk.Button(frame, text="Play Sound", command=self.play_current_sounds, bg='#ffb380',
+                                       fg='black', font=("Helvetica", 14))  # Shown for flashcards with sounds
+
+        frame.show_answer_button = tk.Button(frame, text="Show Answer", command=self.show_answer, bg='#ff66b2',
+                                             fg='black', font=("Helvetica", 18))  # Show answer button
+        frame.show_answer_button.pack(pady=10)
+
+        frame.answer_buttons = tk.Frame(frame, bg='white')  # Frame to hold the answer buttons, shown with the answer
+        tk.Button(frame.answer_buttons, text="I knew this", command=lambda: self.timed(self.update_and_show_result, True),
+                  bg='#ff66b2', fg='black', font=("Helvetica", 18)).pack(side=tk.LEFT, padx=20)  # Button for 'I knew this'
+        tk.Button(frame.answer_buttons, text="I did not know this",
+                  command=lambda: self.timed(self.update_and_show_result, False),
+                  bg='#ff66b2', fg='black', font=("Helvetica", 18)).pack(side=tk.LEFT,
+                                                                         padx=20)  # Button for 'I did not know this'
+        tk.Button(frame.answer_buttons, text="Exit", command=lambda: self.show_progress(topic_completed=False),
+                  bg='#ff66b2', fg='black', font=("Helvetica", 18)).pack(side=tk.LEFT, padx=20)  # Exit button
 
     def show_flashcard(self):
         """
@@ -222,38 +504,67 @@ class FlashcardApp:
             self.show_progress(topic_completed=True)  # Show progress (topic completed)
             return
 
-        self.clear_window()  # Clear the window before showing the flashcard
-
         self.current_question, self.current_answer = self.learn_topic.choose_card()  # Choose a flashcard from the topic
         if self.current_question is None:  # If no flashcards left to show
             self.show_progress(topic_completed=True)  # Show progress (topic completed)
             return
 
-        tk.Label(self.root, text=f"Your flashcard is: {self.current_question}", font=("Helvetica", 20),
-                 bg='white').pack(pady=20)  # Display the flashcard question
+        frame = self.show_screen("flashcard")  # Show the flashcard screen
+        self.show_card_side(frame.question_label, "Your flashcard is: ", self.current_question)  # Display the question
+        frame.answer_label.pack_forget()  # Hide the answer of the previous flashcard
+        frame.answer_buttons.pack_forget()  # Hide the answer buttons
+        frame.show_answer_button.pack(pady=10)  # Show the show answer button
+        self.prefetch_media(self.current_answer)  # Load the media of the answer while the question is read
 
-        answer_frame = tk.Frame(self.root, bg='white')  # Frame to hold answer and buttons
-        answer_frame.pack(pady=10)  # Pack the answer frame
+    def show_card_side(self, label, prefix, text):
+        """
+        Displays the front or back of a flashcard with its first image and offers its sounds.
+        Args:
+            label (tk.Label): The label showing the side.
+            prefix (str): The text shown before the card text.
+            text (str): The card text, possibly with media references (see media_store.py).
+        """
+        plain_text, images, sounds = parse_media(text)  # Split the text from the media references
+        image = self.media.image(images[0]) if images else None  # Prefetched in the common case
+        label.configure(text=f"{prefix}{plain_text}", image=image if image is not None else "")
+        label.image = image  # Keep a reference; tkinter drops images that are only used by widgets
+        self.current_sounds = sounds  # Sounds of the side that is shown
+        frame = self.screens["flashcard"]  # The flashcard screen
+        if sounds:  # Offer the sounds below the side
+            frame.sound_button.pack(pady=5, after=label)
+        else:
+            frame.sound_button.pack_forget()
 
-        def show_answer():
-            """
-            Displays the answer to the flashcard and provides options to indicate whether the user knew the answer or not.
-            """
-            for widget in answer_frame.winfo_children():
-                widget.destroy()  # Destroy existing widgets in the answer frame
+    def prefetch_media(self, *texts):
+        """
+        Reads and decodes the media of flashcard texts in the background.
+        Args:
+            *texts (str): The card texts.
+        """
+        names = []  # Media referenced by the texts
+        for text in texts:
+            _, images, sounds = parse_media(text)
+            names += images + sounds
+        if names:
+            self.media.prefetch(names)
 
-            tk.Label(self.root, text=f"The answer is: {self.current_answer}", font=("Helvetica", 20), bg='white').pack(
-                pady=10)  # Display the answer
-            tk.Button(answer_frame, text="I knew this", command=lambda: self.update_and_show_result(True), bg='#ff66b2',
-                      fg='black', font=("Helvetica", 18)).pack(side=tk.LEFT, padx=20)  # Button for 'I knew this'
-            tk.Button(answer_frame, text="I did not know this", command=lambda: self.update_and_show_result(False),
-                      bg='#ff66b2', fg='black', font=("Helvetica", 18)).pack(side=tk.LEFT,
-                                                                             padx=20)  # Button for 'I did not know this'
-            tk.Button(answer_frame, text="Exit", command=lambda: self.show_progress(topic_completed=False),
-                      bg='#ff66b2', fg='black', font=("Helvetica", 18)).pack(side=tk.LEFT, padx=20)  # Exit button
+    def play_current_sounds(self):
+        """
+        Plays the sounds of the side of the flashcard that is shown.
+        """
+        for name in self.current_sounds[:1]:  # Play the first sound; players do not queue
+            if not play_sound(self.media_store.path(name)):
+                messagebox.showinfo("Sound", "The sound could not be played: no sound player was found.")
 
-        tk.Button(answer_frame, text="Show Answer", command=show_answer, bg='#ff66b2', fg='black',
-                  font=("Helvetica", 18)).pack(pady=10)  # Show answer button
+    def show_answer(self):
+        """
+        Displays the answer to the flashcard and provides options to indicate whether the user knew the answer or not.
+        """
+        frame = self.screens["flashcard"]  # The flashcard screen
+        frame.show_answer_button.pack_forget()  # Hide the show answer button
+        frame.answer_label.pack(pady=10, after=frame.question_label)
+        self.show_card_side(frame.answer_label, "The answer is: ", self.current_answer)  # Display the answer
+        frame.answer_buttons.pack(pady=10)  # Show the answer buttons
 
     def update_and_show_result(self, knew_answer):
         """
@@ -264,6 +575,22 @@ class FlashcardApp:
         self.learn_topic.update_card_progress(self.current_question,
                                               knew_answer)  # Update progress based on user response
         self.show_result(knew_answer)  # Proceed to show result
+        next_question = self.learn_topic.peek_card()  # The next flashcard, drawn now that the answer is recorded
+        if next_question is not None:  # Load its media while the result is read
+            self.prefetch_media(next_question, self.learn_topic.dict[next_question][0])
+
+    def build_result(self, frame):
+        """
+        Builds the screen showing the result of an answer.
+        Args:
+            frame (tk.Frame): The frame of the screen.
+        """
+        frame.message_label = tk.Label(frame, font=("Helvetica", 20), bg='white')  # Display the message
+        frame.message_label.pack(pady=20)
+        tk.Button(frame, text="Next Flashcard", command=lambda: self.timed(self.show_flashcard), bg='#ff66b2',
+                  fg='black', font=("Helvetica", 18)).pack(pady=10)  # Next flashcard button
+        tk.Button(frame, text="Exit", command=lambda: self.show_progress(topic_completed=False), bg='#ff66b2',
+                  fg='black', font=("Helvetica", 18)).pack(pady=5)  # Exit button
 
     def show_result(self, knew_answer):
         """
@@ -271,8 +598,6 @@ class FlashcardApp:
         Args:
             knew_answer (bool): Indicates whether the user knew the answer to the flashcard.
         """
-        self.clear_window()  # Clear the window before displaying result
-
         achieved_message = ""
         if self.learn_topic.dict[self.current_question][1] == 3:
             achieved_message = "\nThis card is now achieved and will not be shown again until progress is reset."
@@ -288,11 +613,31 @@ class FlashcardApp:
             else:
                 message = f"Try to go on! You have {self.learn_topic.dict[self.current_question][1]} points for this card."  # Negative message
 
-        tk.Label(self.root, text=message, font=("Helvetica", 20), bg='white').pack(pady=20)  # Display the message
-        tk.Button(self.root, text="Next Flashcard", command=self.show_flashcard, bg='#ff66b2', fg='black',
-                  font=("Helvetica", 18)).pack(pady=10)  # Next flashcard button
-        tk.Button(self.root, text="Exit", command=lambda: self.show_progress(topic_completed=False), bg='#ff66b2',
-                  fg='black', font=("Helvetica", 18)).pack(pady=5)  # Exit button
+        frame = self.show_screen("result")  # Show the result screen
+        frame.message_label.configure(text=message)  # Display the message
+
+    def build_progress(self, frame):
+        """
+        Builds the screen showing the progress of the learning session.
+        Args:
+            frame (tk.Frame): The frame of the screen.
+        """
+        frame.completed_label = tk.Label(frame, text="Congratulations! You have completed the topic.",
+                                         font=("Helvetica", 20), bg='white')  # Topic completed message
+        frame.session_label = tk.Label(frame, text="Learning Session Complete", font=("Helvetica", 20),
+                                       bg='white')  # Session complete message
+        frame.session_label.pack(pady=20)
+        frame.counters_label = tk.Label(frame, font=("Helvetica", 16), bg='white')  # Display the session counters
+        frame.counters_label.pack(pady=5)
+        frame.topic_label = tk.Label(frame, font=("Helvetica", 16), bg='white')  # Display the topic completion
+        frame.topic_label.pack(pady=5)
+        frame.histogram = tk.Canvas(frame, width=400, height=120, bg='white',
+                                    highlightthickness=0)  # Display the cards per progress level
+        frame.histogram.pack(pady=10)
+        frame.overall_label = tk.Label(frame, font=("Helvetica", 14), bg='white')  # Display the overall completion
+        frame.overall_label.pack(pady=5)
+        tk.Button(frame, text="Back to Main Menu", command=self.create_main_menu, bg='#ff66b2', fg='black',
+                  font=("Helvetica", 18)).pack(pady=20)  # Back to main menu button
 
     def show_progress(self, topic_completed=False):
         """
@@ -300,66 +645,211 @@ class FlashcardApp:
         Args:
             topic_completed (bool): Indicates whether the entire topic has been completed.
         """
-        self.clear_window()  # Clear the window before displaying progress
+        frame = self.show_screen("progress")  # Show the progress screen
+        self.recorder.flush()  # The session has ended; write its answers to the session log
 
         if topic_completed:
-            tk.Label(self.root, text="Congratulations! You have completed the topic.", font=("Helvetica", 20),
-                     bg='white').pack(pady=20)  # Topic completed message
-
-        tk.Label(self.root, text="Learning Session Complete", font=("Helvetica", 20), bg='white').pack(
-            pady=20)  # Session complete message
-        tk.Label(self.root, text=f"Correct answers: {self.learn_topic.correct_answers}", font=("Helvetica", 18),
-                 bg='white').pack(pady=5)  # Display correct answers
-        tk.Label(self.root, text=f"Wrong answers: {self.learn_topic.wrong_answers}", font=("Helvetica", 18),
-                 bg='white').pack(pady=5)  # Display wrong answers
-        tk.Label(self.root, text=f"Finished flashcards: {self.learn_topic.finished_cards}", font=("Helvetica", 18),
-                 bg='white').pack(pady=5)  # Display finished flashcards
-
-        tk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu, bg='#ff66b2', fg='black',
-                  font=("Helvetica", 18)).pack(pady=20)  # Back to main menu button
+            frame.completed_label.pack(pady=20, before=frame.session_label)  # Topic completed message
+        else:
+            frame.completed_label.pack_forget()
+
+        frame.counters_label.configure(text=f"This session: {self.learn_topic.correct_answers} correct, "
+                                            f"{self.learn_topic.wrong_answers} wrong, "
+                                            f"{self.learn_topic.finished_cards} finished")  # Session counters
+
+        # Statistics of the current topic (a dictionary with at most one entry)
+        topic_statistics = next(iter(self.deck.topic_statistics(self.current_topic).values()), None)
+        if topic_statistics:
+            frame.topic_label.configure(text=f"Topic '{self.current_topic}': "
+                                             f"{topic_statistics['completion']:.0f}% complete "
+                                             f"({topic_statistics['finished']} of {topic_statistics['cards']} flashcards)")
+            self.draw_histogram(frame.histogram, topic_statistics['histogram'])  # Display the cards per progress level
+        else:
+            frame.topic_label.configure(text="")
+            frame.histogram.delete("all")
+        overall = self.deck.progress_histogram()  # Cards per progress level over all topics
+        frame.overall_label.configure(
+            text=f"All topics: {100.0 * overall[-1] / sum(overall):.0f}% complete" if sum(overall) else "")
 
-    def add_flashcard_to_topic(self):
+    def draw_histogram(self, canvas, histogram):
         """
-        Allows user to add flashcards to the selected topic.
+        Draws a bar chart of the number of flashcards per progress level.
+        Args:
+            canvas (tk.Canvas): The canvas to draw on; its previous chart is removed.
+            histogram (list): The number of flashcards with progress 0, 1, 2 and 3.
+        """
+        width, height, bar_height = 400, 30 * len(histogram), 20  # Size of the chart
+        canvas.delete("all")  # Remove the previous chart
+        canvas.configure(height=height)
+        largest = max(histogram) or 1  # Longest bar
+        for level, count in enumerate(histogram):  # One bar per progress level
+            top = level * 30 + 5
+            label = "finished" if level == len(histogram) - 1 else f"{level} points"
+            canvas.create_text(70, top + bar_height / 2, text=label, anchor='e', font=("Helvetica", 12))
+            canvas.create_rectangle(80, top, 80 + (width - 140) * count / largest, top + bar_height,
+                                    fill='#ff66b2', outline='')
+            canvas.create_text(width - 50, top + bar_height / 2, text=str(count), anchor='w',
+                               font=("Helvetica", 12))
+
+    def build_add_flashcard(self, frame):
+        """
+        Builds the screen for adding flashcards.
+        Args:
+            frame (tk.Frame): The frame of the screen.
         """
-        self.clear_window()  # Clear the window before displaying add flashcard interface
-
-        tk.Label(self.root, text=f"Adding flashcards to {self.current_topic}", font=("Helvetica", 20), bg='white').pack(
-            pady=20)  # Label indicating topic for adding flashcards
+        frame.title_label = tk.Label(frame, font=("Helvetica", 20), bg='white')  # Label indicating topic for adding flashcards
+        frame.title_label.pack(pady=20)
 
-        tk.Label(self.root, text="Enter the front of the flashcard:", font=("Helvetica", 10), bg='white').pack(
+        tk.Label(frame, text="Enter the front of the flashcard:", font=("Helvetica", 10), bg='white').pack(
             pady=20)  # Label indicating to add front
-        card_front = tk.Entry(self.root, width=50, font=("Helvetica", 14))  # Entry widget for flashcard front
-        card_front.pack(pady=10)  # Pack the entry widget
-        card_front.insert(0, "")  # Default text for flashcard front
+        frame.card_front = tk.Entry(frame, width=50, font=("Helvetica", 14))  # Entry widget for flashcard front
+        frame.card_front.pack(pady=10)  # Pack the entry widget
 
-        tk.Label(self.root, text="Enter the back of the flashcard:", font=("Helvetica", 10), bg='white').pack(
+        tk.Label(frame, text="Enter the back of the flashcard:", font=("Helvetica", 10), bg='white').pack(
             pady=20)  # Label indicating to add back
-        card_back = tk.Entry(self.root, width=50, font=("Helvetica", 14))  # Entry widget for flashcard back
-        card_back.pack(pady=10)  # Pack the entry widget
-        card_back.insert(0, "")  # Default text for flashcard back
-
-        def add_card():
-            """
-            Function called when 'Add Flashcard' button is clicked.
-            Adds a new flashcard to the selected topic.
-            """
-            front = card_front.get()  # Get the text from flashcard front entry
-            back = card_back.get()  # Get the text from flashcard back entry
-            if front and back:  # If both front and back are non-empty
-                self.deck.add_new_flashcard(self.current_topic, front,
-                                            back)  # Add the new flashcard to the selected topic
-                self.deck.save_deck_json()  # Save the updated deck to JSON file
-                messagebox.showinfo("Info", "Flashcard added successfully!")  # Show success message
-
-            card_front.delete(0, tk.END)  # Clear the flashcard front entry widget
-            card_back.delete(0, tk.END)  # Clear the flashcard back entry widget
-            card_front.insert(0, "Enter the front of the flashcard")  # Reset default text for flashcard front
-            card_back.insert(0, "Enter the back of the flashcard")  # Reset default text for flashcard back
-
-        tk.Button(self.root, text="Add Flashcard", command=add_card, bg='#ff66b2', fg='black',
+        frame.card_back = tk.Entry(frame, width=50, font=("Helvetica", 14))  # Entry widget for flashcard back
+        frame.card_back.pack(pady=10)  # Pack the entry widget
+
+        media_buttons = tk.Frame(frame, bg='white')  # Frame to hold the media buttons
+        media_buttons.pack(pady=5)
+        tk.Button(media_buttons, text="Image/Sound for Front", command=lambda: self.attach_media(frame.card_front),
+                  bg='#ffb380', fg='black', font=("Helvetica", 12)).pack(side=tk.LEFT, padx=10)  # Media of the front
+        tk.Button(media_buttons, text="Image/Sound for Back", command=lambda: self.attach_media(frame.card_back),
+                  bg='#ffb380', fg='black', font=("Helvetica", 12)).pack(side=tk.LEFT, padx=10)  # Media of the back
+
+        tk.Button(frame, text="Add Flashcard", command=self.add_card, bg='#ff66b2', fg='black',
                   font=("Helvetica", 18)).pack(pady=10)  # Add flashcard button
-        tk.Button(self.root, text="Back to Main Menu", command=self.create_main_menu, bg='#ff66b2', fg='black',
+
+        tk.Label(frame, text="Or paste many flashcards, one per line as 'front<Tab>back' or 'front;back':",
+                 font=("Helvetica", 10), bg='white').pack(pady=5)  # Label explaining the paste area
+        frame.paste_area = tk.Text(frame, width=60, height=8, font=("Helvetica", 12))  # Multi-line paste area
+        frame.paste_area.pack(pady=5)
+        batch_buttons = tk.Frame(frame, bg='white')  # Frame to hold the batch buttons
+        batch_buttons.pack(pady=5)
+        tk.Button(batch_buttons, text="Add All", command=self.add_pasted_cards, bg='#ff66b2', fg='black',
+                  font=("Helvetica", 14)).pack(side=tk.LEFT, padx=10)  # Add all pasted flashcards
+        tk.Button(batch_buttons, text="Undo", command=self.undo_batch, bg='#ffb380', fg='black',
+                  font=("Helvetica", 14)).pack(side=tk.LEFT, padx=10)  # Undo the last batch
+        tk.Button(batch_buttons, text="Redo", command=self.redo_batch, bg='#ffb380', fg='black',
+                  font=("Helvetica", 14)).pack(side=tk.LEFT, padx=10)  # Redo the last undone batch
+        frame.status_label = tk.Label(frame, font=("Helvetica", 12), fg='#666666', bg='white')  # Result of the last action
+        frame.status_label.pack(pady=5)
+
+        tk.Button(frame, text="Back to Main Menu", command=self.create_main_menu, bg='#ff66b2', fg='black',
                   font=("Helvetica", 18)).pack(pady=5)  # Back to main menu button
 
+    def add_flashcard_to_topic(self):
+        """
+        Allows user to add flashcards to the selected topic.
+        """
+        frame = self.show_screen("add_flashcard")  # Show the add flashcard screen
+        frame.title_label.configure(text=f"Adding flashcards to {self.current_topic}")  # Display the topic
+        frame.card_front.delete(0, tk.END)  # Start with empty entries
+        frame.card_back.delete(0, tk.END)
+        frame.paste_area.delete("1.0", tk.END)
+        frame.status_label.configure(text="")
+
+    def add_card(self):
+        """
+        Function called when 'Add Flashcard' button is clicked.
+        Adds a new flashcard to the selected topic.
+        """
+        frame = self.screens["add_flashcard"]  # The add flashcard screen
+        front = frame.card_front.get()  # Get the text from flashcard front entry
+        back = frame.card_back.get()  # Get the text from flashcard back entry
+        if front and back:  # If both front and back are non-empty
+            duplicates = self.deck.find_duplicates(front)  # Flashcards with the same front in any topic
+            if duplicates and not messagebox.askyesno(
+                    "Duplicate flashcard", "A flashcard with this front already exists in: "
+                    + ", ".join(f"{topic} ('{card_front}')" for topic, card_front in duplicates)
+                    + "\n\nAdd it anyway?"):  # Let the user edit the flashcard instead
+                return
+            self.deck.add_new_flashcard(self.current_topic, front,
+                                        back)  # Add the new flashcard to the selected topic
+            self.deck.request_save()  # Save the updated deck to JSON file in the background
+            frame.status_label.configure(text=f"Flashcard '{front}' added.")  # Confirm without a dialog
+
+        frame.card_front.delete(0, tk.END)  # Clear the flashcard front entry widget
+        frame.card_back.delete(0, tk.END)  # Clear the flashcard back entry widget
+        frame.card_front.insert(0, "Enter the front of the flashcard")  # Reset default text for flashcard front
+        frame.card_back.insert(0, "Enter the back of the flashcard")  # Reset default text for flashcard back
+
+    def attach_media(self, entry):
+        """
+        Copies an image or sound file into the media store and adds its reference to a side of the new flashcard.
+        Args:
+            entry (tk.Entry): The entry of the front or back.
+        """
+        path = filedialog.askopenfilename(title="Choose an image or sound", filetypes=[
+            ("Images and sounds", " ".join("*" + extension for extension in IMAGE_EXTENSIONS + SOUND_EXTENSIONS)),
+            ("All files", "*")])  # Let the user choose the file
+        if not path:  # The dialog was cancelled
+            return
+        name = self.media_store.add_file(path)  # Store the file under the hash of its content
+        status_label = self.screens["add_flashcard"].status_label
+        if name is None:
+            status_label.configure(text=f"'{os.path.basename(path)}' could not be stored.")
+            return
+        entry.insert(0, media_tag(name) + " ")  # The reference goes before the text
+        status_label.configure(text=f"'{os.path.basename(path)}' attached.")
+
+    @staticmethod
+    def parse_pasted_cards(text):
+        """
+        Splits pasted text into flashcards, one per line as 'front<Tab>back' or 'front;back'.
+        Args:
+            text (str): The pasted text.
+        Returns:
+            tuple: The list of (front, back) pairs and a list of problems with line numbers.
+        """
+        cards, problems = [], []
+        for number, line in enumerate(text.splitlines(), start=1):  # Iterate through the lines
+            if not line.strip():  # Skip empty lines
+                continue
+            separator = "\t" if "\t" in line else ";"  # Tabs come from spreadsheets, semicolons from typing
+            front, found, back = line.partition(separator)
+            if not found or not front.strip() or not back.strip():
+                problems.append(f"Line {number}: expected 'front<Tab>back' or 'front;back'")
+            else:
+                cards.append((front.strip(), back.strip()))
+        return cards, problems  # Return the flashcards and the problems
 
+    def add_pasted_cards(self):
+        """
+        Function called when 'Add All' button is clicked.
+        Adds all pasted flashcards to the selected topic as one batch with a single save.
+        """
+        frame = self.screens["add_flashcard"]  # The add flashcard screen
+        cards, problems = self.parse_pasted_cards(frame.paste_area.get("1.0", tk.END))  # Pasted flashcards
+        if problems:  # Let the user fix the lines first
+            messagebox.showinfo("Info", "Nothing was added:\n" + "\n".join(problems[:10])
+                                + (f"\n... and {len(problems) - 10} more" if len(problems) > 10 else ""))
+            return
+        if not cards:
+            return
+        with self.deck.batch() as batch:  # Validate all flashcards together and save once
+            for front, back in cards:
+                batch.add(self.current_topic, front, back)
+        if batch.errors:  # Nothing was applied
+            messagebox.showinfo("Info", "Nothing was added (flashcards are numbered by non-empty line):\n"
+                                + "\n".join(batch.errors[:10])
+                                + (f"\n... and {len(batch.errors) - 10} more" if len(batch.errors) > 10 else ""))
+            return
+        frame.paste_area.delete("1.0", tk.END)  # Clear the paste area
+        frame.status_label.configure(text=f"Added {len(cards)} flashcards. Use Undo to remove them again.")
+
+    def undo_batch(self):
+        """
+        Function called when 'Undo' button is clicked. Undoes the last batch of added flashcards.
+        """
+        undone = self.deck.undo_batch()  # Undo the last batch
+        self.screens["add_flashcard"].status_label.configure(
+            text="The last batch was undone." if undone else "Nothing to undo.")
+
+    def redo_batch(self):
+        """
+        Function called when 'Redo' button is clicked. Adds the last undone batch again.
+        """
+        redone = self.deck.redo_batch()  # Redo the last undone batch
+        self.screens["add_flashcard"].status_label.configure(
+            text="The last batch was added again." if redone else "Nothing to redo.")
@@ -1,4 +1,44 @@
 # Initialize deck
+import os  # Import the os module to recognize deck directories
+
 from deck import Deck
 
-mydeck = Deck('flash.json')
+DECK_PATH = 'flash.json'  # Deck file used by the application
+
+
+def open_deck(path):
+    """
+    Open a deck with the backend matching its path.
+    Args:
+        path (str): The file path to the deck ('.db' or '.sqlite' for SQLite, a directory for a collection of
+            JSON files, otherwise JSON).
+    Returns:
+        Deck, SQLiteDeck or DeckCollection: The opened deck.
+    """
+    if os.path.isdir(path):  # Load every deck file of the directory in parallel
+        from deck_collection import DeckCollection  # Imported lazily; single files do not need it
+        return DeckCollection(path)
+    if path.endswith((".db", ".sqlite")):  # Use the SQLite backend for database files
+        from sqlite_deck import SQLiteDeck  # Imported lazily; the JSON backend does not need it
+        return SQLiteDeck(path)
+    return Deck(path)  # Use the JSON backend otherwise
+
+
+_deck = None  # The deck opened on the first access to 'mydeck'
+
+
+def __getattr__(name):
+    """
+    Open the deck on the first access to 'mydeck' instead of at import time,
+    so that importing this module does not parse flash.json.
+    Args:
+        name (str): The name of the requested module attribute.
+    Returns:
+        Deck or SQLiteDeck: The application deck for 'mydeck'.
+    """
+    global _deck
+    if name == "mydeck":
+        if _deck is None:  # Open the deck once
+            _deck = open_deck(DECK_PATH)
+        return _deck
+    raise AttributeError(f"module 'initialize' has no attribute '{name}'")
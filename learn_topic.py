@@ -1,21 +1,47 @@
-import random  # Import the random module for random selection
 import os  # Import the os module for operating system dependent functionality
+import time  # Import the time module to measure how long an answer took
+from contextlib import nullcontext  # Import nullcontext for steps that are not measured
+from scheduler import CounterScheduler, MASTERY_THRESHOLD  # Import the default learning model
 
 class LearnTopic:
-    def __init__(self, flashcard_dict, deck):
+    def __init__(self, flashcard_dict, deck, topic=None, scheduler=None, recorder=None, timings=None):
         """
         Initialize the LearnTopic with the flashcard dictionary and deck instance.
         Args:
             flashcard_dict (dict): Dictionary of flashcards for the topic.
             deck (Deck): Instance of the Deck class.
+            topic (str, optional): Name of the topic, used to journal answers instead of saving the whole deck.
+            scheduler (optional): Learning model deciding which card comes next, e.g. SM2Scheduler.
+                Defaults to the CounterScheduler ("three correct answers = done").
+            recorder (SessionRecorder, optional): Records every answer with its latency for later analysis;
+                the session is started with the first answer.
+            timings (ReviewTimings, optional): Measures choose_card, update_card_progress and the deck write
+                (record_card or save_deck_json).
         """
         self.dict = flashcard_dict  # Store the flashcard dictionary
         self.deck = deck  # Store the deck instance
+        self.topic = topic  # Store the topic name
         self.numberofcards = len(flashcard_dict)  # Get the number of flashcards in the topic
         self.correct_answers = 0  # Initialize correct answers counter
         self.wrong_answers = 0  # Initialize wrong answers counter
         self.finished_cards = 0  # Initialize finished cards counter
-        self.previous_result = ""  # Initialize storage for previous result (currently unused)
+        self.previous_result = ""  # Result of the last answer ('correct' or 'wrong')
+        self.scheduler = scheduler if scheduler is not None else CounterScheduler(flashcard_dict)  # Learning model
+        self.recorder = recorder  # Store the session recorder
+        self.timings = timings  # Store the step timings
+        self._session = None  # Recorded session, started with the first answer
+        self._shown = None  # Key of the last chosen flashcard and when it was chosen
+        self._next = None  # Key of the flashcard drawn ahead of time by peek_card
+
+    def _measure(self, name):
+        """
+        Measure a step if timings are enabled.
+        Args:
+            name (str): The name of the step.
+        Returns:
+            context manager: Records the duration of the with block, or does nothing without timings.
+        """
+        return self.timings.measure(name) if self.timings is not None else nullcontext()
 
     def still_has_flashcards(self):
         """
@@ -23,24 +49,35 @@ class LearnTopic:
         Returns:
             bool: True if there are flashcards left to learn, False otherwise.
         """
-        # Return True if any flashcard's progress is less than 3, meaning it still needs to be reviewed
-        return any(card[1] < 3 for card in self.dict.values())
+        # Return True if the learning model still has a flashcard to review
+        return self.scheduler.has_cards()
 
     def choose_card(self):
         """
-        Select a flashcard at random for the user to learn.
+        Select the next flashcard for the user to learn.
         Returns:
             tuple: The key and front text of the chosen flashcard.
         """
-        # Get a list of flashcards with progress less than 3
-        available_flashcards = [key for key, value in self.dict.items() if value[1] < 3]
-        if not available_flashcards:  # If no flashcards are available
+        with self._measure("choose_card"):
+            mykey, self._next = self._next, None  # The flashcard drawn ahead of time, if any
+            if mykey is None or mykey not in self.dict:
+                mykey = self.scheduler.next_card()  # Let the learning model choose the flashcard
+        if mykey is None:  # If no flashcards are available
             return None, None  # Return None, None
-
-        # Select a random flashcard key from the available flashcards
-        mykey = random.choice(available_flashcards)
+        self._shown = (mykey, time.perf_counter())  # The answer latency starts when the card is shown
         return mykey, self.dict[mykey][0]  # Return the key (question) and the answer of the chosen flashcard
 
+    def peek_card(self):
+        """
+        Draw the next flashcard ahead of time, e.g. to load its images while the result of the current one is
+        shown. The next choose_card returns this flashcard. Call it only after the current answer is recorded.
+        Returns:
+            str or None: The key of the next flashcard, or None if no flashcard is left.
+        """
+        if self._next is None and self.scheduler.has_cards():  # Draw once per flashcard
+            self._next = self.scheduler.next_card()
+        return self._next  # Return the key of the next flashcard
+
     def update_card_progress(self, key, knew_answer):
         """
         Update the progress of the selected flashcard based on the user's answer.
@@ -48,14 +85,50 @@ class LearnTopic:
             key (str): The key of the flashcard.
             knew_answer (bool): Whether the user knew the answer or not.
         """
+        with self._measure("update_card_progress"):
+            self._update_card_progress(key, knew_answer)
+
+    def _update_card_progress(self, key, knew_answer):
+        """
+        Update the progress of a flashcard, record the answer and write the card.
+        Args:
+            key (str): The key of the flashcard.
+            knew_answer (bool): Whether the user knew the answer or not.
+        """
+        progress_before = self.dict[key][1]  # Progress before the answer, for the session log
         if knew_answer:  # If the user knew the answer
-            self.dict[key][1] += 1  # Increment the progress of the flashcard
             self.correct_answers += 1  # Increment the correct answers counter
-            if self.dict[key][1] == 3:  # If the progress reaches 3
-                self.finished_cards += 1  # Increment the finished cards counter
+            if self.dict[key][1] < MASTERY_THRESHOLD:  # Spaced repetition may show finished flashcards again
+                self.dict[key][1] += 1  # Increment the progress of the flashcard
+                if self.dict[key][1] == MASTERY_THRESHOLD:  # If the progress reaches 3
+                    self.finished_cards += 1  # Increment the finished cards counter
         else:  # If the user didn't know the answer
             if self.dict[key][1] > 0:  # If the progress is greater than 0
                 self.dict[key][1] -= 1  # Decrement the progress of the flashcard
             self.wrong_answers += 1  # Increment the wrong answers counter
-        self.deck.save_deck_json()  # Save the updated progress to the JSON file
+        self.scheduler.answer(key, knew_answer)  # Update the learning model
+        self.previous_result = "correct" if knew_answer else "wrong"  # Remember the result
+        if self.recorder is not None:  # Record the answer for the session analysis
+            self._record(key, knew_answer, progress_before)
+        if self.topic is not None:  # If the topic is known, only the changed card has to be written
+            with self._measure("record_card"):
+                self.deck.record_card(self.topic, key)  # Append the updated card to the review journal
+        else:
+            with self._measure("save_deck_json"):
+                self.deck.save_deck_json()  # Save the updated progress to the JSON file
+
+    def _record(self, key, knew_answer, progress_before):
+        """
+        Record an answer in the session log.
+        Args:
+            key (str): The key of the flashcard.
+            knew_answer (bool): Whether the user knew the answer or not.
+            progress_before (int): The progress before the answer.
+        """
+        if self._session is None:  # Start the session with its first answer
+            self._session = self.recorder.start_session(self.topic if self.topic is not None else "")
+        shown = self._shown  # The last chosen flashcard
+        latency = time.perf_counter() - shown[1] if shown is not None and shown[0] == key else float("nan")
+        self._shown = None  # Each showing is answered once
+        self._session.record(key, knew_answer, latency, progress_before, self.dict[key][1])
 
@@ -0,0 +1,267 @@
+import argparse  # Import the argparse module for the command line interface
+import asyncio  # Import the asyncio module for the simulated learners
+import json  # Import the JSON module for requests and responses
+import os  # Import the os module for paths
+import random  # Import the random module for the simulated answers
+import subprocess  # Import the subprocess module to start a local server
+import sys  # Import the sys module for the interpreter path
+import tempfile  # Import the tempfile module for a throwaway progress database
+import time  # Import the time module for latency measurements
+
+try:
+    import resource  # Import the resource module to raise the open file limit (Unix only)
+except ImportError:
+    resource = None
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))  # Directory with review_server.py and flash.json
+
+
+# Define the Client class: one keep-alive HTTP connection of a simulated learner
+class Client:
+    def __init__(self, host, port):
+        """
+        Initialize the Client for a server address.
+        Args:
+            host (str): The server address.
+            port (int): The server port.
+        """
+        self.host = host  # Store the address
+        self.port = port  # Store the port
+        self.reader = None  # Incoming stream, opened on the first request
+        self.writer = None  # Outgoing stream
+
+    # Public method to send a request and read the JSON response
+    async def request(self, method, path, payload=None):
+        """
+        Send a request over the keep-alive connection.
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path including the query string.
+            payload (dict, optional): The JSON body.
+        Returns:
+            tuple: (status, response payload).
+        """
+        if self.writer is None:  # Connect on the first request
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        head = await self.reader.readuntil(b"\r\n\r\n")  # Read the status line and headers
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ")[1])  # Status code
+        length = 0
+        for line in lines[1:]:  # Find the size of the body
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))  # Return the status and payload
+
+    # Public method to close the connection
+    async def close(self):
+        """
+        Close the connection.
+        """
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+# Function to simulate one learner
+async def learner(number, host, port, topics, answers, knew_rate, think_time, latencies, errors, arrive):
+    """
+    Review flashcards like a learner: ask for the next card, answer it, repeat.
+    Args:
+        number (int): The number of the learner, used as user name.
+        host (str): The server address.
+        port (int): The server port.
+        topics (list): The topics to choose from.
+        answers (int): Number of answers to give.
+        knew_rate (float): Probability of knowing an answer.
+        think_time (float): Mean pause in seconds between the requests.
+        latencies (list): Collects the request latencies in seconds.
+        errors (list): Collects error descriptions.
+        arrive (callable): Called once connected; returns an event that is set when all learners are ready.
+    """
+    rng = random.Random(number)  # Reproducible answers per learner
+    client = Client(host, port)
+    user, topic = f"learner-{number}", rng.choice(topics)
+    arrived = False
+    try:
+        await client.request("GET", "/health")  # Open the connection before the measurement starts
+        arrived = True
+        await arrive().wait()  # Start together with the other learners
+        for _ in range(answers):
+            started = time.perf_counter()
+            status, card = await client.request("POST", "/next", {"user": user, "topic": topic})
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(f"next: {status} {card.get('error')}")
+                break
+            if card["done"]:  # The learner finished the topic
+                break
+            if think_time:  # Pause like a learner reading the card
+                await asyncio.sleep(rng.expovariate(1 / think_time))
+            started = time.perf_counter()
+            status, result = await client.request("POST", "/answer", {"user": user, "topic": topic,
+                                                                      "front": card["front"],
+                                                                      "knew": rng.random() < knew_rate})
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(f"answer: {status} {result.get('error')}")
+                break
+    except (OSError, asyncio.IncompleteReadError, ValueError) as error:
+        errors.append(f"{type(error).__name__}: {error}")
+    finally:
+        if not arrived:  # Do not keep the others waiting
+            arrive()
+        await client.close()
+
+
+# Function to compute a percentile of sorted values
+def percentile(sorted_values, share):
+    """
+    Get a percentile of sorted values.
+    Args:
+        sorted_values (list): The values in ascending order.
+        share (float): The percentile as a share, e.g. 0.95.
+    Returns:
+        float: The value below which the given share of the values lies, or 0.0 without values.
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(share * len(sorted_values)))]
+
+
+# Function to run the load test
+async def run_load_test(host, port, learners, answers, knew_rate=0.7, think_time=0.0):
+    """
+    Simulate concurrent learners against a running server.
+    Args:
+        host (str): The server address.
+        port (int): The server port.
+        learners (int): Number of concurrent learners, each with its own connection.
+        answers (int): Number of answers per learner.
+        knew_rate (float): Probability of knowing an answer.
+        think_time (float): Mean pause in seconds between the requests.
+    Returns:
+        dict: Request count, throughput, latency percentiles in milliseconds and errors.
+    """
+    client = Client(host, port)
+    _, payload = await client.request("GET", "/topics")  # The topics to review
+    await client.close()
+    latencies, errors = [], []
+    start_gate = asyncio.Event()  # Set when every learner is connected or failed to connect
+    arrivals = [0]
+
+    def arrive():
+        arrivals[0] += 1
+        if arrivals[0] == learners:
+            start_gate.set()
+        return start_gate
+
+    tasks = [asyncio.create_task(learner(number, host, port, payload["topics"], answers, knew_rate, think_time,
+                                         latencies, errors, arrive)) for number in range(learners)]
+    await start_gate.wait()  # The measurement starts with all connections open
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {"learners": learners, "requests": len(latencies), "seconds": elapsed,
+            "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000, "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000, "errors": len(errors),
+            "first_errors": errors[:5]}
+
+
+# Function to wait until a server answers
+async def wait_for_server(host, port, timeout=30.0):
+    """
+    Wait until the server answers a health request.
+    Args:
+        host (str): The server address.
+        port (int): The server port.
+        timeout (float): Seconds to wait.
+    Returns:
+        bool: True if the server answered, False otherwise.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        client = Client(host, port)
+        try:
+            status, _ = await client.request("GET", "/health")
+            return status == 200
+        except OSError:
+            await asyncio.sleep(0.1)  # Not listening yet
+        finally:
+            await client.close()
+    return False
+
+
+# Function to allow one connection per learner
+def raise_file_limit(needed):
+    """
+    Raise the soft limit of open files towards the hard limit, as every learner keeps a connection open.
+    Args:
+        needed (int): Number of file descriptors needed.
+    Returns:
+        int or None: The new soft limit, or None where it cannot be changed.
+    """
+    if resource is None:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    if wanted > soft:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+            soft = wanted
+        except (ValueError, OSError):
+            pass
+    return soft
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate many concurrent learners against the review server.")
+    parser.add_argument("--learners", type=int, default=2000, help="Number of concurrent learners")
+    parser.add_argument("--answers", type=int, default=20, help="Answers per learner")
+    parser.add_argument("--knew-rate", type=float, default=0.7, help="Probability of knowing an answer")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between requests in seconds")
+    parser.add_argument("--host", default="127.0.0.1", help="The server address")
+    parser.add_argument("--port", type=int, help="Port of a running server; a local server is started if omitted")
+    parser.add_argument("--deck", default=os.path.join(PROJECT_DIRECTORY, "flash.json"),
+                        help="The deck of the started server")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    raise_file_limit(args.learners + 256)  # One connection per learner, plus some for the rest
+    server = None
+    port = args.port
+    with tempfile.TemporaryDirectory() as directory:
+        if port is None:  # Start a local server with a throwaway progress database
+            port = 18765 + os.getpid() % 1000
+            server = subprocess.Popen([sys.executable, os.path.join(PROJECT_DIRECTORY, "review_server.py"),
+                                       "--deck", args.deck, "--progress", os.path.join(directory, "progress.db"),
+                                       "--host", args.host, "--port", str(port)], stdout=subprocess.PIPE, text=True)
+        try:
+            if not asyncio.run(wait_for_server(args.host, port)):
+                raise SystemExit(f"No server answered on {args.host}:{port}")
+            results = asyncio.run(run_load_test(args.host, port, args.learners, args.answers, args.knew_rate,
+                                                args.think_time))
+        finally:
+            if server is not None:  # Stop the server; it writes the last answers first
+                server.terminate()
+                output, _ = server.communicate(timeout=60)
+                print(output.strip())
+    print(f"{results['learners']} learners, {results['requests']} requests in {results['seconds']:.2f} s "
+          f"({results['requests_per_second']:.0f} requests/s)")
+    print(f"Latency: p50 {results['p50_ms']:.1f} ms, p95 {results['p95_ms']:.1f} ms, "
+          f"p99 {results['p99_ms']:.1f} ms, max {results['max_ms']:.1f} ms")
+    print(f"Errors: {results['errors']}")
+    for error in results["first_errors"]:
+        print(f"    {error}")
+    if args.json:  # Write the machine-readable results
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
@@ -0,0 +1,220 @@
+import base64  # Import the base64 module; tkinter reads image data as base64 text
+import os  # Import the os module to recognize the platform for sound playback
+import queue  # Import the queue module to hand work between the threads
+import shutil  # Import the shutil module to find a sound player
+import subprocess  # Import the subprocess module to start the sound player
+import threading  # Import the threading module for the prefetch thread
+import tkinter as tk  # Import the tkinter library to decode images
+from collections import OrderedDict  # Import OrderedDict for the least recently used order
+
+from media_store import SOUND_EXTENSIONS  # Import the sound formats of the media store
+
+CACHE_BYTES = 64 << 20  # Default size of the decoded image cache: 64 MB of pixels
+POLL_MS = 15  # Interval at which the main thread decodes prefetched images
+SOUND_PLAYERS = (("afplay",), ("paplay",), ("aplay", "-q"), ("ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"))
+
+
+# Define the ImageCache class: decoded images, least recently used first out
+class ImageCache:
+    def __init__(self, max_bytes=CACHE_BYTES):
+        """
+        Initialize the ImageCache. Decoded images take width * height * 4 bytes no matter how small their
+        file is, so the cache is bounded by that size; the least recently used images are dropped first.
+        Args:
+            max_bytes (int): Maximum size of the decoded images.
+        """
+        self.max_bytes = max_bytes  # Store the size limit
+        self.size = 0  # Current size of the decoded images
+        self.hits = 0  # Number of requests answered from the cache
+        self.misses = 0  # Number of requests that had to decode
+        self._images = OrderedDict()  # Decoded images by name, least recently used first
+
+    def __len__(self):
+        """
+        Get the number of decoded images.
+        Returns:
+            int: The number of images in the cache.
+        """
+        return len(self._images)  # Return the number of images
+
+    def __contains__(self, name):
+        """
+        Check whether an image is decoded, without changing the order.
+        Args:
+            name (str): The name of the image.
+        Returns:
+            bool: True if the image is in the cache.
+        """
+        return name in self._images  # Return True if the image is cached
+
+    # Private method to compute the memory used by an image
+    @staticmethod
+    def _cost(image):
+        """
+        Compute the memory used by a decoded image.
+        Args:
+            image (tk.PhotoImage): The image.
+        Returns:
+            int: The size in bytes.
+        """
+        return image.width() * image.height() * 4  # Return the size of the pixels
+
+    # Public method to get a decoded image
+    def get(self, name):
+        """
+        Get a decoded image and mark it as recently used.
+        Args:
+            name (str): The name of the image.
+        Returns:
+            tk.PhotoImage or None: The image, or None if it is not in the cache.
+        """
+        image = self._images.get(name)
+        if image is None:
+            self.misses += 1
+            return None
+        self._images.move_to_end(name)  # Most recently used
+        self.hits += 1
+        return image  # Return the image
+
+    # Public method to add a decoded image
+    def put(self, name, image):
+        """
+        Add a decoded image and drop the least recently used ones beyond the size limit. The newest image
+        is always kept, even if it alone is larger than the limit.
+        Args:
+            name (str): The name of the image.
+            image (tk.PhotoImage): The image.
+        """
+        old = self._images.pop(name, None)
+        if old is not None:
+            self.size -= self._cost(old)
+        self._images[name] = image
+        self.size += self._cost(image)
+        while self.size > self.max_bytes and len(self._images) > 1:  # Drop the least recently used images
+            _, dropped = self._images.popitem(last=False)
+            self.size -= self._cost(dropped)
+
+
+# Define the MediaPrefetcher class: reads and decodes the media of the next cards ahead of time
+class MediaPrefetcher:
+    def __init__(self, root, store, cache=None):
+        """
+        Initialize the MediaPrefetcher. A background thread reads the files of the requested media from the
+        store; tkinter may only be used from the main thread, so the images are decoded there, in short
+        steps while the application is idle (e.g. while the user reads the current card). image() then
+        finds them decoded.
+        Args:
+            root (tk.Tk): The root window, used to schedule the decoding on the main thread.
+            store (MediaStore): The media store.
+            cache (ImageCache, optional): The cache of decoded images; a new one if omitted.
+        """
+        self._root = root  # Store the root window
+        self._store = store  # Store the media store
+        self.cache = cache if cache is not None else ImageCache()  # Store the image cache
+        self._requests = queue.Queue()  # Names to read, for the background thread
+        self._ready = queue.Queue()  # (name, base64 data) read by the background thread
+        self._pending = set()  # Names requested but not yet decoded
+        self._polling = False  # Whether a decoding step is scheduled
+        self._thread = threading.Thread(target=self._read_files, daemon=True)  # Reads the files
+        self._thread.start()
+
+    # Private method to read requested files; runs on the background thread
+    def _read_files(self):
+        """
+        Read the requested files and hand them to the main thread. Must not touch tkinter.
+        """
+        while True:
+            name = self._requests.get()
+            data = self._store.read(name)  # Read from disk off the main thread
+            if name.endswith(SOUND_EXTENSIONS):  # Sounds are played from the file; reading warms the disk cache
+                data = None
+            self._ready.put((name, base64.b64encode(data) if data is not None else None))
+
+    # Public method to request media ahead of time
+    def prefetch(self, names):
+        """
+        Read and decode images (and read sounds) in the background. Returns immediately.
+        Args:
+            names (list): Names of media files in the store.
+        """
+        for name in names:
+            if name in self.cache or name in self._pending:  # Decoded or on the way
+                continue
+            self._pending.add(name)
+            self._requests.put(name)
+        if self._pending and not self._polling:  # Decode on the main thread as the files arrive
+            self._polling = True
+            self._root.after(POLL_MS, self._decode_ready)
+
+    # Private method to decode the images read by the background thread; runs on the main thread
+    def _decode_ready(self):
+        """
+        Decode the images that the background thread has read, one at a time so the window stays responsive.
+        """
+        try:
+            name, data = self._ready.get_nowait()
+        except queue.Empty:
+            name = data = None
+        if name is not None:
+            self._pending.discard(name)
+            if data is not None:
+                self._decode(name, data)
+        if self._pending or not self._ready.empty():  # More to come
+            self._root.after(POLL_MS if name is None else 1, self._decode_ready)
+        else:
+            self._polling = False
+
+    # Private method to decode one image into the cache
+    def _decode(self, name, data):
+        """
+        Decode one image into the cache.
+        Args:
+            name (str): The name of the image.
+            data (bytes): The base64 encoded file content.
+        Returns:
+            tk.PhotoImage or None: The image, or None if it could not be decoded.
+        """
+        try:
+            image = tk.PhotoImage(data=data)
+        except tk.TclError:  # Not an image format tkinter can read
+            return None
+        self.cache.put(name, image)
+        return image  # Return the decoded image
+
+    # Public method to get a decoded image
+    def image(self, name):
+        """
+        Get a decoded image, decoding it now if it was not prefetched.
+        Args:
+            name (str): The name of the image in the store.
+        Returns:
+            tk.PhotoImage or None: The image, or None if it does not exist or cannot be decoded.
+        """
+        image = self.cache.get(name)
+        if image is not None:  # Prefetched
+            return image
+        data = self._store.read(name)  # Not prefetched (e.g. the first card); read and decode now
+        return self._decode(name, base64.b64encode(data)) if data is not None else None
+
+
+# Function to play a sound file
+def play_sound(path):
+    """
+    Play a sound file in the background with the player of the system.
+    Args:
+        path (str): The path of the sound file.
+    Returns:
+        bool: True if playback was started, False if no player was found or the file does not exist.
+    """
+    if path is None or not os.path.isfile(path):
+        return False
+    if os.name == "nt":  # Windows plays WAV files itself
+        import winsound  # Imported here; only exists on Windows
+        winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        return True
+    for player in SOUND_PLAYERS:  # The first player that is installed
+        if shutil.which(player[0]):
+            subprocess.Popen(player + (path,), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL)
+            return True
+    return False  # Return False if no player is installed
@@ -0,0 +1,170 @@
+import hashlib  # Import the hashlib module to name media files by their content
+import os  # Import the os module for paths and atomic renames
+import re  # Import the re module to find media references in card texts
+import tempfile  # Import the tempfile module to copy media files atomically
+
+from file_lock import keep_file_mode  # Import the permission handling of atomic replacements
+
+IMAGE_EXTENSIONS = (".png", ".gif", ".ppm", ".pgm")  # Image formats that tkinter decodes without extra packages
+SOUND_EXTENSIONS = (".wav", ".mp3", ".ogg", ".m4a")  # Sound formats played by the system player
+MEDIA_NAME = re.compile(r"[0-9a-f]{64}\.[0-9a-z]{1,8}")  # SHA-256 of the content and the file extension
+# Media reference in the front or back text of a card, e.g. "[image:3a7b...e1.png] Which bone is this?"
+MEDIA_TAG = re.compile(r"\[(image|sound):([0-9a-f]{64}\.[0-9a-z]{1,8})\]")
+
+
+# Function to build the media reference for a card text
+def media_tag(name):
+    """
+    Build the reference to a stored media file that is written into the front or back text of a card.
+    Args:
+        name (str): The name of the file in the media store.
+    Returns:
+        str: The reference, e.g. "[image:<sha256>.png]" or "[sound:<sha256>.wav]".
+    """
+    kind = "sound" if name.endswith(SOUND_EXTENSIONS) else "image"  # Everything else is shown as an image
+    return f"[{kind}:{name}]"  # Return the reference
+
+
+# Function to split a card text into its text and its media references
+def parse_media(text):
+    """
+    Split the front or back text of a card into the text to display and the media it references.
+    Args:
+        text (str): The card text.
+    Returns:
+        tuple: (text without the references, list of image names, list of sound names).
+    """
+    if "[" not in text:  # Plain text cards, the common case
+        return text, [], []
+    images, sounds = [], []  # Referenced media files in the order of the text
+    for kind, name in MEDIA_TAG.findall(text):
+        (images if kind == "image" else sounds).append(name)
+    return " ".join(MEDIA_TAG.sub(" ", text).split()), images, sounds  # Return the parts
+
+
+# Define the MediaStore class: content-addressed storage for the images and sounds of cards
+class MediaStore:
+    def __init__(self, directory):
+        """
+        Initialize the MediaStore. Every file is stored once under the SHA-256 of its content (e.g.
+        'flash.json.media/3a/3a7b...e1.png'), so adding the same picture to many cards stores it once and
+        a reference can never point at changed content. Cards reference files with media_tag().
+        Args:
+            directory (str): The directory of the media files; created when the first file is added.
+        """
+        self.directory = directory  # Store the directory
+
+    # Public method to get the path of a stored file
+    def path(self, name):
+        """
+        Get the path of a stored media file.
+        Args:
+            name (str): The name of the file in the store.
+        Returns:
+            str or None: The file path, or None if the name is not a valid media name.
+        """
+        if not MEDIA_NAME.fullmatch(name):  # Names come from card texts; never follow other paths
+            return None
+        return os.path.join(self.directory, name[:2], name)  # Return the path
+
+    # Public method to check whether a file is stored
+    def exists(self, name):
+        """
+        Check whether a media file is stored.
+        Args:
+            name (str): The name of the file in the store.
+        Returns:
+            bool: True if the file exists, False otherwise.
+        """
+        path = self.path(name)
+        return path is not None and os.path.isfile(path)  # Return True if the file exists
+
+    # Public method to read a stored file
+    def read(self, name):
+        """
+        Read a stored media file.
+        Args:
+            name (str): The name of the file in the store.
+        Returns:
+            bytes or None: The content, or None if the file does not exist.
+        """
+        path = self.path(name)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as fp:
+                return fp.read()  # Return the content
+        except OSError:
+            return None
+
+    # Public method to add the content of a file
+    def add_bytes(self, data, extension):
+        """
+        Store media content under the hash of the content.
+        Args:
+            data (bytes): The content.
+            extension (str): The file extension, e.g. '.png'.
+        Returns:
+            str or None: The name of the stored file, or None if it could not be written.
+        """
+        name = hashlib.sha256(data).hexdigest() + extension.lower()  # Same content, same name
+        path = self.path(name)
+        if path is None:  # The extension is not a valid one
+            return None
+        if os.path.isfile(path):  # Stored already
+            return name
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(handle, 'wb') as fp:  # Write next to the target, then rename atomically
+                    fp.write(data)
+                keep_file_mode(temporary, path)  # Readable like any other media file
+                os.replace(temporary, path)
+            except OSError:
+                os.unlink(temporary)
+                raise
+        except OSError:
+            return None  # Return None if the file could not be written
+        return name  # Return the name of the stored file
+
+    # Public method to add a file
+    def add_file(self, source):
+        """
+        Store a copy of a media file.
+        Args:
+            source (str): The path of the image or sound file.
+        Returns:
+            str or None: The name of the stored file, or None if it could not be read or written.
+        """
+        try:
+            with open(source, 'rb') as fp:
+                data = fp.read()  # Media files of cards are small enough to hash in memory
+        except OSError:
+            return None
+        return self.add_bytes(data, os.path.splitext(source)[1])  # Return the name of the stored file
+
+    # Public method to delete the files that no card references
+    def remove_unused(self, deck):
+        """
+        Delete the stored files that no card of a deck references any more.
+        Args:
+            deck (Deck): The deck; every card text is checked.
+        Returns:
+            int: The number of deleted files.
+        """
+        used = set()  # Names referenced by any card
+        for _, card_front, card in deck.iter_cards():
+            used.update(MEDIA_TAG.findall(card_front))
+            used.update(MEDIA_TAG.findall(card[0]))
+        used = {name for _, name in used}
+        removed = 0  # Number of deleted files
+        for folder, _, names in os.walk(self.directory):
+            for name in names:
+                if MEDIA_NAME.fullmatch(name) and name not in used:
+                    try:
+                        os.unlink(os.path.join(folder, name))
+                        removed += 1
+                    except OSError:
+                        pass  # Deleted by another process, or not ours to delete
+        return removed  # Return the number of deleted files
@@ -0,0 +1,164 @@
+import asyncio  # Import the asyncio module for the background flush task
+import json  # Import the JSON module for the optional scheduling fields
+import sqlite3  # Import the sqlite3 module for the progress database
+import threading  # Import the threading module to serialize the writes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    user TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    front TEXT NOT NULL,
+    progress INTEGER NOT NULL,
+    fields TEXT,
+    PRIMARY KEY (user, topic, front)
+) WITHOUT ROWID;
+"""  # One row per user and flashcard the user has answered
+
+
+# Define the ProgressStore class: per-user progress with batched writes
+class ProgressStore:
+    def __init__(self, path, batch_size=1000, flush_interval=0.5):
+        """
+        Initialize the ProgressStore with the given database file path.
+        Answers are collected in memory and written in one transaction per batch, either every
+        `flush_interval` seconds or as soon as `batch_size` answers are waiting.
+        Args:
+            path (str): The file path of the SQLite progress database.
+            batch_size (int): Number of waiting answers that triggers an early write.
+            flush_interval (float): Seconds between regular writes.
+        """
+        self._path = path  # Store the file path
+        self._batch_size = batch_size  # Store the batch size
+        self._flush_interval = flush_interval  # Store the flush interval
+        self._reader = sqlite3.connect(path)  # Connection for reads on the event loop thread
+        self._reader.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+        self._reader.executescript(SCHEMA)  # Create the table if the database is new
+        # Connection for the writes, which run on a worker thread
+        self._writer = sqlite3.connect(path, check_same_thread=False)
+        self._writer.execute("PRAGMA synchronous=NORMAL")  # Durable at every checkpoint, fast commits
+        self._write_lock = threading.Lock()  # Only one batch is written at a time
+        self._pending = {}  # Answers not written yet: (user, topic, front) -> (progress, fields)
+        self._writing = {}  # Batch currently being written on the worker thread
+        self._wakeup = None  # Event set when a batch is full, created on the event loop
+        self._task = None  # Background flush task
+        self.batches_written = 0  # Number of written batches
+        self.records_written = 0  # Number of written progress rows
+
+    # Public method to read the progress of a user in a topic
+    def load(self, user, topic):
+        """
+        Read the progress of a user in a topic, including answers that are not written yet.
+        Args:
+            user (str): The name of the user.
+            topic (str): The name of the topic.
+        Returns:
+            dict: {card_front: (progress, fields)} where fields is a dictionary or None.
+        """
+        progress = {}  # Progress by front
+        for front, value, fields in self._reader.execute(
+                "SELECT front, progress, fields FROM progress WHERE user = ? AND topic = ?", (user, topic)):
+            progress[front] = (value, json.loads(fields) if fields else None)
+        for batch in (self._writing, self._pending):  # Newer answers that the database may not show yet
+            for (pending_user, pending_topic, front), (value, fields) in batch.items():
+                if pending_user == user and pending_topic == topic:
+                    progress[front] = (value, json.loads(fields) if fields else None)
+        return progress  # Return the progress
+
+    @property  # Define a property method to get the number of waiting answers
+    def pending(self):
+        """
+        Get the number of answers that are not written yet.
+        Returns:
+            int: The number of waiting progress rows.
+        """
+        return len(self._pending) + len(self._writing)  # Return the number of waiting rows
+
+    # Public method to record the new state of a flashcard for a user
+    def record(self, user, topic, card_front, card):
+        """
+        Record the progress of a flashcard for a user. Only the latest value per flashcard is written.
+        Args:
+            user (str): The name of the user.
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card (list): The user's card value, [card_back, progress, fields (optional)].
+        """
+        fields = json.dumps(card[2]) if len(card) > 2 and isinstance(card[2], dict) else None  # Optional fields
+        self._pending[(user, topic, card_front)] = (card[1], fields)  # Replace an older waiting value
+        if len(self._pending) >= self._batch_size and self._wakeup is not None:  # Write a full batch early
+            self._wakeup.set()
+
+    # Private method to write a batch
+    def _write(self, batch):
+        """
+        Write a batch of progress rows in one transaction. Runs on a worker thread.
+        Args:
+            batch (dict): (user, topic, front) -> (progress, fields).
+        """
+        with self._write_lock:
+            with self._writer:  # Commit the whole batch at once
+                self._writer.executemany(
+                    "INSERT INTO progress (user, topic, front, progress, fields) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (user, topic, front) DO UPDATE SET progress = excluded.progress, "
+                    "fields = excluded.fields",
+                    ((user, topic, front, value, fields) for (user, topic, front), (value, fields) in batch.items()))
+            self.batches_written += 1
+            self.records_written += len(batch)
+
+    # Public method to write the waiting answers
+    async def flush(self):
+        """
+        Write all waiting answers on a worker thread without blocking the event loop.
+        """
+        if not self._pending:  # Nothing to write
+            return
+        if self._writing:  # Another flush is still writing; its successor picks up these answers
+            return
+        self._writing, self._pending = self._pending, {}  # New answers go to a fresh batch
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, self._writing)
+        except sqlite3.Error:
+            for key, value in self._writing.items():  # Keep the answers for the next attempt
+                self._pending.setdefault(key, value)
+        finally:
+            self._writing = {}
+
+    # Private method containing the loop of the flush task
+    async def _run(self):
+        """
+        Write the waiting answers regularly, or early when a batch is full.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)  # Wait for a full batch
+            except asyncio.TimeoutError:
+                pass  # Regular write
+            self._wakeup.clear()
+            await self.flush()
+
+    # Public method to start the flush task
+    def start(self):
+        """
+        Start writing answers in the background. Must be called on the event loop.
+        """
+        self._wakeup = asyncio.Event()  # Created on the running event loop
+        self._task = asyncio.get_running_loop().create_task(self._run())  # Start the flush task
+
+    # Public method to stop the flush task and write everything
+    async def close(self):
+        """
+        Stop the flush task, write all waiting answers and close the database.
+        """
+        if self._task is not None:  # Stop the regular writes
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        with self._write_lock:  # Wait for a batch that a cancelled flush left running on the worker thread
+            pass
+        if self._pending:  # Write the last answers
+            self._write(self._pending)
+            self._pending = {}
+        self._reader.close()
+        self._writer.close()
@@ -0,0 +1,207 @@
+import json  # Import the JSON module for encoding and decoding journal records
+import os  # Import the os module for file system operations
+
+
+# Define the ReviewJournal class to append card changes to a small log next to the deck file
+class ReviewJournal:
+    def __init__(self, path, journal_only=False):
+        """
+        Initialize the ReviewJournal with the given journal file path.
+        Args:
+            path (str): The file path of the append-only journal.
+            journal_only (bool): True for writers that never save the deck file themselves (cli.JournalTopic).
+                Their records are marked, so that a Deck open in another process folds them into the deck
+                file before it discards the journal (see read_journal_only).
+        """
+        self._path = path  # Store the journal file path
+        self._rotated_path = path + ".old"  # Records handed over to a save that has not finished yet
+        self._journal_only = journal_only  # Store whether the records are marked
+        self._fp = None  # The journal file is opened lazily on the first append
+        self._read = {}  # (inode, bytes) of each journal file that replay() and read_journal_only() have read
+        self.record_count = 0  # Number of records appended since the last rotation
+
+    @property  # Define a property method to get the journal file path
+    def path(self):
+        """
+        Get the journal file path.
+        Returns:
+            str: The file path of the journal.
+        """
+        return self._path  # Return the journal file path
+
+    # Public method to append one card record to the journal
+    def append(self, topic, card_front, card):
+        """
+        Append the current state of a single card to the journal.
+        Args:
+            topic (str): The name of the topic the card belongs to.
+            card_front (str): The front text of the flashcard.
+            card (list): The card value, e.g. [card_back, progress].
+        Returns:
+            bool: True if the record was written, False otherwise.
+        """
+        return self._write({"topic": topic, "front": card_front, "card": card})  # Return whether it was written
+
+    # Public method to append the renaming or deletion of a topic to the journal
+    def append_topic_change(self, topic, new_topic):
+        """
+        Append the renaming or deletion of a topic, so that replaying the journal follows it.
+        Args:
+            topic (str): The name of the topic.
+            new_topic (str or None): The new name of the topic, or None if the topic was deleted.
+        Returns:
+            bool: True if the record was written, False otherwise.
+        """
+        return self._write({"topic": topic, "rename": new_topic})  # Return whether it was written
+
+    # Private method to append one record to the journal
+    def _write(self, record):
+        """
+        Append one record to the journal as a single line.
+        Args:
+            record (dict): The record.
+        Returns:
+            bool: True if the record was written, False otherwise.
+        """
+        if self._journal_only:  # Mark the records that only the journal holds
+            record["journal_only"] = True
+        line = json.dumps(record, ensure_ascii=False)  # One line per record
+        try:
+            if self._fp is None:  # Open the journal in append mode on first use
+                self._fp = open(self._path, 'a', encoding="utf-8")
+            self._fp.write(line + "\n")  # Write the record as a single line
+            self._fp.flush()  # Hand the record to the operating system so it survives an application crash
+            if self._moved():  # A Deck in another process rotated the journal; the record may be discarded with it
+                self.close()
+                self._fp = open(self._path, 'a', encoding="utf-8")  # Write it again to the current journal
+                self._fp.write(line + "\n")
+                self._fp.flush()
+            self.record_count += 1  # Count the record for periodic compaction
+            return True  # Return True if the record was written
+        except (IOError, OSError, PermissionError):
+            return False  # Return False on error
+
+    # Private method to check whether the open journal file is still the journal
+    def _moved(self):
+        """
+        Check whether the journal file this object appends to was moved aside or removed.
+        Returns:
+            bool: True if the path no longer refers to the open file.
+        """
+        try:
+            return os.fstat(self._fp.fileno()).st_ino != os.stat(self._path).st_ino  # Compare the inodes
+        except OSError:  # The journal was moved and no new one exists yet
+            return True
+
+    # Public method to read back all complete records from the journal
+    def replay(self):
+        """
+        Read back all complete records stored in the journal.
+        A partially written last line (e.g. after a crash) is ignored.
+        Returns:
+            list: A list of (topic, card_front, card) tuples in the order they were written. The renaming or
+                deletion of a topic is returned as (topic, None, new topic name or None).
+        """
+        self._read = {}  # Read both files from the start
+        records = self._read_new(False)  # Read all records
+        self.record_count = len(records)  # Records still pending compaction
+        return records  # Return the decoded records
+
+    # Public method to read the records of journal-only writers appended since the last read
+    def read_journal_only(self):
+        """
+        Read the complete records that journal-only writers (see __init__) appended since the last call or
+        replay(). The records of other Decks are skipped: those Decks save them into the deck file themselves.
+        Returns:
+            list: A list of (topic, card_front, card) tuples in the order they were written.
+        """
+        return self._read_new(True)  # Return the new records of journal-only writers
+
+    # Private method to read the records appended since the last read
+    def _read_new(self, journal_only):
+        """
+        Read the complete records that were appended to the rotated and the current journal since the last read.
+        Args:
+            journal_only (bool): Only return the records marked by journal-only writers.
+        Returns:
+            list: A list of (topic, card_front, card) tuples in the order they were written.
+        """
+        records = []  # List of records read from the journal
+        for path in (self._rotated_path, self._path):  # Older records first, then the current journal
+            try:
+                with open(path, 'rb') as fp:
+                    inode = os.fstat(fp.fileno()).st_ino
+                    read_inode, offset = self._read.get(path, (None, 0))
+                    if read_inode != inode:  # A file this object has not read yet, e.g. rotated by another Deck
+                        offset = 0
+                    fp.seek(offset)
+                    for line in fp:  # Iterate through each line of the journal
+                        if not line.endswith(b"\n"):  # Still being written; read it next time
+                            break
+                        offset += len(line)
+                        try:
+                            record = json.loads(line)  # Decode the record
+                            if journal_only and not record.get("journal_only"):  # Saved by the Deck that wrote it
+                                continue
+                            if "rename" in record:  # A renamed or deleted topic
+                                records.append((record["topic"], None, record["rename"]))
+                            else:
+                                records.append((record["topic"], record["front"], record["card"]))  # Store the record
+                        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, AttributeError):
+                            continue  # Skip incomplete or damaged records
+                    self._read[path] = (inode, offset)  # Continue after the last complete record
+            except (IOError, OSError, FileNotFoundError, PermissionError):
+                continue  # Skip journal files that do not exist
+        return records  # Return the decoded records
+
+    # Public method to hand the current records over to a save in progress
+    def rotate(self):
+        """
+        Move the current records aside so that new records can be appended while the deck is being saved.
+        Records that are still waiting from an earlier, failed save are kept.
+        Returns:
+            bool: True if the journal was rotated, False otherwise.
+        """
+        self.close()  # Close the current file handle before moving the file
+        try:
+            if os.path.exists(self._path):  # Only rotate if there are records
+                if os.path.exists(self._rotated_path):  # Keep records of an earlier save that did not finish
+                    with open(self._path, 'r', encoding="utf-8") as src, \
+                            open(self._rotated_path, 'a', encoding="utf-8") as dst:
+                        dst.write(src.read())  # Append the current records to the rotated ones
+                    os.remove(self._path)  # Remove the current journal
+                    # Already read records of the current journal are read again; replaying a card state twice
+                    # gives the same card
+                else:
+                    os.replace(self._path, self._rotated_path)  # Move the current journal aside
+                    if self._path in self._read:  # The rotated file was read as far as the current journal
+                        self._read[self._rotated_path] = self._read[self._path]
+                self._read.pop(self._path, None)  # The next journal is a new file
+            self.record_count = 0  # New records start a fresh count
+            return True  # Return True if the journal was rotated
+        except (IOError, OSError, PermissionError):
+            return False  # Return False on error
+
+    # Public method to drop the rotated records once the deck has been saved
+    def discard_rotated(self):
+        """
+        Remove the records that were moved aside by rotate().
+        Returns:
+            bool: True if the rotated records were removed, False otherwise.
+        """
+        try:
+            if os.path.exists(self._rotated_path):  # Remove the rotated journal if it exists
+                os.remove(self._rotated_path)
+            self._read.pop(self._rotated_path, None)  # Forget how far it was read
+            return True  # Return True if the rotated records were removed
+        except (IOError, OSError, PermissionError):
+            return False  # Return False on error
+
+    # Public method to close the journal file handle
+    def close(self):
+        """
+        Close the journal file handle if it is open.
+        """
+        if self._fp is not None:  # Check if the journal is open
+            self._fp.close()  # Close the file handle
+            self._fp = None  # Forget the closed file handle
@@ -0,0 +1,348 @@
+import argparse  # Import the argparse module for the command line interface
+import asyncio  # Import the asyncio module for the connection handling
+import json  # Import the JSON module for requests and responses
+import signal  # Import the signal module to stop the server cleanly
+from collections import OrderedDict  # Import OrderedDict for the least recently used sessions
+from urllib.parse import parse_qsl, urlsplit  # Import URL helpers for paths and query strings
+
+from deck import Deck  # Import the Deck class for its topic key
+from initialize import DECK_PATH, open_deck  # Import the deck location and opener
+from learn_topic import LearnTopic  # Import the LearnTopic class for the review logic
+from progress_store import ProgressStore  # Import the per-user progress database
+from scheduler import MASTERY_THRESHOLD, SCHEDULERS, create_scheduler  # Import the learning models
+
+MAX_BODY = 64 * 1024  # Largest accepted request body in bytes
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 431: "Request Header Fields Too Large"}  # Status lines
+
+
+# Define the SessionDeck class: the deck seen by the LearnTopic of one user
+class SessionDeck:
+    def __init__(self, store, user, cards):
+        """
+        Initialize the SessionDeck, which sends answered cards to the progress store instead of the shared deck.
+        Args:
+            store (ProgressStore): The per-user progress database.
+            user (str): The name of the user.
+            cards (dict): The user's copy of the topic, {front: [back, progress, fields (optional)]}.
+        """
+        self._store = store  # Store the progress database
+        self._user = user  # Store the user name
+        self._cards = cards  # Store the user's cards
+
+    # Public method to record an answered card
+    def record_card(self, topic, card_front):
+        """
+        Record the progress of an answered card for the user.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True, the answer is written with the next batch.
+        """
+        self._store.record(self._user, topic, card_front, self._cards[card_front])  # Queue the answer
+        return True  # Return True
+
+    # Public method called by LearnTopic when no topic is known
+    def save_deck_json(self):
+        """
+        Do nothing; the shared deck is read-only for the server.
+        Returns:
+            bool: True.
+        """
+        return True  # Return True
+
+
+# Define the ReviewServer class: a local HTTP/JSON review service for many users
+class ReviewServer:
+    def __init__(self, deck, store, scheduler="counter", max_sessions=10000):
+        """
+        Initialize the ReviewServer with a shared deck and a per-user progress store.
+        The flashcard texts are shared by all users and never written; each user reviews a copy of the topic
+        that holds only the user's progress.
+        Args:
+            deck (Deck or SQLiteDeck): The shared deck.
+            store (ProgressStore): The per-user progress database.
+            scheduler (str): The learning model of the sessions ('counter', 'sm2' or 'weighted').
+            max_sessions (int): Number of sessions kept in memory; the least recently used ones are dropped.
+        """
+        self.deck = deck  # Store the deck
+        self.store = store  # Store the progress database
+        self.scheduler = scheduler  # Store the name of the learning model
+        self.max_sessions = max_sessions  # Store the session limit
+        # The deck does not change while the server runs, so the topics are looked up once
+        self._topics = {Deck._topic_key(topic): topic for topic in deck.get_topic_list}
+        self._sessions = OrderedDict()  # LearnTopic per (user, topic), least recently used first
+        self._routes = {("GET", "/health"): self.health, ("GET", "/topics"): self.topics,
+                        ("GET", "/progress"): self.progress, ("POST", "/next"): self.next_card,
+                        ("POST", "/answer"): self.answer}  # Handlers by method and path
+        self.connections = 0  # Number of open connections
+        self.requests = 0  # Number of handled requests
+
+    # Private method to get or create the session of a user in a topic
+    def _session(self, user, topic):
+        """
+        Get the review session of a user in a topic, creating it from the shared deck and the stored progress.
+        Args:
+            user (str): The name of the user.
+            topic (str): The name of the topic.
+        Returns:
+            tuple: (status, LearnTopic or error payload).
+        """
+        if not isinstance(user, str) or not user or len(user) > 100:  # Check the user name
+            return 400, {"error": "A user name of 1 to 100 characters is required"}
+        actual_topic = self._topics.get(Deck._topic_key(topic)) if isinstance(topic, str) else None
+        if actual_topic is None:  # Check if the topic exists
+            return 404, {"error": f"Unknown topic '{topic}'"}
+        key = (user, actual_topic)  # Session key
+        session = self._sessions.get(key)  # Look up an existing session
+        if session is not None:
+            self._sessions.move_to_end(key)  # Mark the session as recently used
+            return 200, session
+        progress = self.store.load(user, actual_topic)  # The user's progress in the topic
+        cards = {}  # The user's copy of the topic; the texts are shared with the deck
+        for front, card in self.deck.get_topic_dictionary(actual_topic).items():
+            value, fields = progress.get(front, (0, None))  # New cards start at zero
+            cards[front] = [card[0], value] if fields is None else [card[0], value, fields]
+        session = LearnTopic(cards, SessionDeck(self.store, user, cards), actual_topic,
+                             create_scheduler(self.scheduler, cards))  # Review the user's copy
+        self._sessions[key] = session  # Keep the session for the next requests
+        if len(self._sessions) > self.max_sessions:  # Drop the least recently used session
+            self._sessions.popitem(last=False)
+        return 200, session
+
+    # Public method to report the state of the server
+    def health(self, params):
+        """
+        Report the state of the server.
+        Args:
+            params (dict): The request parameters (unused).
+        Returns:
+            tuple: (status, payload).
+        """
+        return 200, {"status": "ok", "connections": self.connections, "sessions": len(self._sessions),
+                     "requests": self.requests, "pending_writes": self.store.pending,
+                     "batches_written": self.store.batches_written}
+
+    # Public method to list the topics
+    def topics(self, params):
+        """
+        List the topics of the shared deck.
+        Args:
+            params (dict): The request parameters (unused).
+        Returns:
+            tuple: (status, payload).
+        """
+        return 200, {"topics": sorted(self._topics.values())}
+
+    # Public method to summarize the progress of a user in a topic
+    def progress(self, params):
+        """
+        Count the user's flashcards per progress level in a topic.
+        Args:
+            params (dict): 'user' and 'topic'.
+        Returns:
+            tuple: (status, payload).
+        """
+        status, session = self._session(params.get("user"), params.get("topic"))  # Get the session
+        if status != 200:
+            return status, session
+        histogram = [0] * (MASTERY_THRESHOLD + 1)  # One bucket per progress level
+        for card in session.dict.values():
+            histogram[min(max(card[1], 0), MASTERY_THRESHOLD)] += 1
+        return 200, {"topic": session.topic, "cards": session.numberofcards, "finished": histogram[-1],
+                     "histogram": histogram}
+
+    # Public method to choose the next flashcard of a user
+    def next_card(self, params):
+        """
+        Choose the next flashcard for a user.
+        Args:
+            params (dict): 'user' and 'topic'.
+        Returns:
+            tuple: (status, payload) with 'front', 'back' and 'progress', or 'done' if nothing is left to review.
+        """
+        status, session = self._session(params.get("user"), params.get("topic"))  # Get the session
+        if status != 200:
+            return status, session
+        if not session.still_has_flashcards():  # Nothing left to review
+            return 200, {"done": True}
+        front, back = session.choose_card()  # Let the learning model choose
+        return 200, {"done": False, "front": front, "back": back, "progress": session.dict[front][1]}
+
+    # Public method to record an answer of a user
+    def answer(self, params):
+        """
+        Record whether a user knew the answer to a flashcard.
+        Args:
+            params (dict): 'user', 'topic', 'front' and 'knew' (bool).
+        Returns:
+            tuple: (status, payload) with the new progress of the flashcard.
+        """
+        status, session = self._session(params.get("user"), params.get("topic"))  # Get the session
+        if status != 200:
+            return status, session
+        front, knew = params.get("front"), params.get("knew")
+        if not isinstance(knew, bool):  # Check the answer
+            return 400, {"error": "'knew' must be true or false"}
+        if not isinstance(front, str) or front not in session.dict:  # Check the flashcard
+            return 404, {"error": f"Unknown flashcard '{front}'"}
+        session.update_card_progress(front, knew)  # Update the progress and queue the write
+        progress = session.dict[front][1]
+        return 200, {"progress": progress, "finished": progress >= MASTERY_THRESHOLD,
+                     "correct": session.correct_answers, "wrong": session.wrong_answers}
+
+    # Private method to run a request
+    def _dispatch(self, method, target, body):
+        """
+        Parse the parameters of a request and call its handler.
+        Args:
+            method (str): The HTTP method.
+            target (str): The request target, e.g. '/progress?user=ann&topic=Python'.
+            body (bytes): The request body; a JSON object for POST requests.
+        Returns:
+            tuple: (status, payload).
+        """
+        url = urlsplit(target)  # Split the path from the query string
+        handler = self._routes.get((method, url.path))  # Find the handler
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):  # The path exists for another method
+                return 405, {"error": f"{method} is not allowed for {url.path}"}
+            return 404, {"error": f"Unknown path '{url.path}'"}
+        if method == "GET":  # Parameters of GET requests are in the query string
+            params = dict(parse_qsl(url.query))
+        else:
+            try:
+                params = json.loads(body) if body else {}
+            except (UnicodeDecodeError, ValueError):
+                return 400, {"error": "The body is not valid JSON"}
+            if not isinstance(params, dict):
+                return 400, {"error": "The body must be a JSON object"}
+        return handler(params)  # Run the handler
+
+    # Private method to build a response
+    @staticmethod
+    def _response(status, payload, keep_alive):
+        """
+        Build an HTTP response with a JSON body.
+        Args:
+            status (int): The HTTP status code.
+            payload (dict): The JSON body.
+            keep_alive (bool): Whether the connection stays open.
+        Returns:
+            bytes: The response.
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")  # Encode the body
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode("latin-1") + body  # Return the response
+
+    # Public method to serve one connection
+    async def handle_connection(self, reader, writer):
+        """
+        Serve the requests of one connection until the client closes it. Connections are served concurrently;
+        the requests of one connection are answered in order (HTTP/1.1 keep-alive and pipelining).
+        Args:
+            reader (asyncio.StreamReader): The incoming stream.
+            writer (asyncio.StreamWriter): The outgoing stream.
+        """
+        self.connections += 1  # Count the connection
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")  # Read the request line and headers
+                except asyncio.LimitOverrunError:  # Headers larger than the stream buffer
+                    writer.write(self._response(431, {"error": "The headers are too large"}, False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):  # The client closed the connection
+                    break
+                lines = head.decode("latin-1").split("\r\n")  # Split the head into lines
+                parts = lines[0].split(" ")
+                headers = {}  # Header values by lower-case name
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", "0"))  # Size of the body
+                except ValueError:
+                    length = -1
+                if len(parts) != 3 or length < 0:  # Malformed request
+                    writer.write(self._response(400, {"error": "Malformed request"}, False))
+                    break
+                if length > MAX_BODY:  # Refuse large bodies without reading them
+                    writer.write(self._response(413, {"error": "The body is too large"}, False))
+                    break
+                method, target, version = parts
+                try:
+                    body = await reader.readexactly(length) if length else b""  # Read the body
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                connection = headers.get("connection", "").lower()  # HTTP/1.1 keeps connections open by default
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                status, payload = self._dispatch(method, target, body)  # Run the request
+                self.requests += 1  # Count the request
+                writer.write(self._response(status, payload, keep_alive))  # Send the response
+                await writer.drain()  # Wait while the client reads slowly
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass  # The client went away while the response was sent
+        finally:
+            self.connections -= 1  # The connection is closed
+            writer.close()
+
+
+# Function to run the server until it is stopped
+async def serve(deck_path, progress_path, host="127.0.0.1", port=8765, scheduler="counter",
+                batch_size=1000, flush_interval=0.5, max_sessions=10000):
+    """
+    Serve the deck until SIGINT or SIGTERM and write all waiting answers before returning.
+    Args:
+        deck_path (str): The file path of the shared deck.
+        progress_path (str): The file path of the per-user progress database.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        scheduler (str): The learning model of the sessions.
+        batch_size (int): Number of waiting answers that triggers an early write.
+        flush_interval (float): Seconds between regular writes.
+        max_sessions (int): Number of sessions kept in memory.
+    """
+    deck = open_deck(deck_path)  # Open the shared deck
+    store = ProgressStore(progress_path, batch_size, flush_interval)  # Open the progress database
+    review_server = ReviewServer(deck, store, scheduler, max_sessions)
+    store.start()  # Write answers in the background
+    stop = asyncio.Event()  # Set by the signal handlers
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except (NotImplementedError, AttributeError):  # Not supported on Windows; Ctrl+C still cancels the loop
+            pass
+    server = await asyncio.start_server(review_server.handle_connection, host, port, backlog=4096)
+    print(f"Serving {len(review_server._topics)} topics on http://{host}:{port}", flush=True)
+    try:
+        await stop.wait()  # Serve until stopped
+    finally:
+        server.close()  # Stop accepting connections
+        await store.close()  # Write the last answers
+        print(f"Stopped after {review_server.requests} requests; "
+              f"{store.records_written} progress rows written in {store.batches_written} batches", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a Flash Genius deck to many learners over HTTP/JSON.")
+    parser.add_argument("--deck", default=DECK_PATH, help="The shared deck (read-only)")
+    parser.add_argument("--progress", help="The per-user progress database (default: <deck>.progress.db)")
+    parser.add_argument("--host", default="127.0.0.1", help="The address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="The port to listen on")
+    parser.add_argument("--scheduler", default="counter", choices=tuple(SCHEDULERS), help="The learning model")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Answers per early progress write")
+    parser.add_argument("--flush-interval", type=float, default=0.5, help="Seconds between progress writes")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="Sessions kept in memory")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.deck, args.progress or args.deck + ".progress.db", args.host, args.port,
+                          args.scheduler, args.batch_size, args.flush_interval, args.max_sessions))
+    except KeyboardInterrupt:
+        pass  # Stopped with Ctrl+C where signal handlers are not available
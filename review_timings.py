@@ -0,0 +1,98 @@
+import statistics  # Import the statistics module for the medians
+import time  # Import the time module for the measurements
+from collections import deque  # Import deque to keep the most recent durations
+
+
+# Define the ReviewTimings class: durations of the steps of the review loop
+class ReviewTimings:
+    def __init__(self, maxlen=1000):
+        """
+        Initialize the ReviewTimings, which keep the most recent durations of each measured step.
+        Args:
+            maxlen (int): Number of durations kept per step.
+        """
+        self._maxlen = maxlen  # Store the number of kept durations
+        self._durations = {}  # Durations in seconds by step name
+        self._hooks = []  # Functions called with (name, seconds) after every measurement
+
+    # Public method to register a function that sees every measurement
+    def add_hook(self, hook):
+        """
+        Register a function that is called after every measurement, e.g. to log slow steps.
+        Args:
+            hook (callable): Called with the step name and the duration in seconds.
+        """
+        self._hooks.append(hook)  # Store the hook
+
+    # Public method to record the duration of a step
+    def record(self, name, seconds):
+        """
+        Record the duration of a step.
+        Args:
+            name (str): The name of the step, e.g. 'choose_card'.
+            seconds (float): The duration in seconds.
+        """
+        durations = self._durations.get(name)  # Durations of the step
+        if durations is None:  # First measurement of the step
+            durations = self._durations[name] = deque(maxlen=self._maxlen)
+        durations.append(seconds)  # Keep the duration
+        for hook in self._hooks:  # Report the measurement
+            hook(name, seconds)
+
+    # Public method to measure a step
+    def measure(self, name):
+        """
+        Measure the code of a with block:
+
+            with timings.measure("choose_card"):
+                key = scheduler.next_card()
+
+        Args:
+            name (str): The name of the step.
+        Returns:
+            _Measurement: The context manager recording the duration.
+        """
+        return _Measurement(self, name)  # Return the context manager
+
+    # Public method to summarize the durations
+    def summary(self):
+        """
+        Summarize the recorded durations of every step.
+        Returns:
+            dict: {name: {"count", "median_ms", "p95_ms", "max_ms", "total_ms"}} for the kept durations.
+        """
+        summary = {}  # Summary per step
+        for name, durations in self._durations.items():
+            times = sorted(durations)  # Durations in ascending order
+            summary[name] = {"count": len(times), "median_ms": round(statistics.median(times) * 1000, 3),
+                             "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 3),
+                             "max_ms": round(times[-1] * 1000, 3), "total_ms": round(sum(times) * 1000, 3)}
+        return summary  # Return the summary
+
+
+# Define the _Measurement class: the context manager returned by ReviewTimings.measure
+class _Measurement:
+    __slots__ = ("_timings", "_name", "_start")  # Created for every measured call; keep it small
+
+    def __init__(self, timings, name):
+        """
+        Initialize the measurement of one step.
+        Args:
+            timings (ReviewTimings): The timings receiving the duration.
+            name (str): The name of the step.
+        """
+        self._timings = timings  # Store the timings
+        self._name = name  # Store the step name
+        self._start = 0.0  # Start of the step
+
+    def __enter__(self):
+        """
+        Start the measurement.
+        """
+        self._start = time.perf_counter()  # Remember the start
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Record the duration of the step, also if it raised an exception.
+        """
+        self._timings.record(self._name, time.perf_counter() - self._start)  # Record the duration
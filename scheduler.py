@@ -0,0 +1,286 @@
+import heapq  # Import the heapq module for the due-date priority queue
+import random  # Import the random module for random selection
+import time  # Import the time module for due timestamps
+from fenwick_sampler import FenwickSampler  # Import the weighted sampler of the WeightedScheduler
+
+MASTERY_THRESHOLD = 3  # Number of points after which a flashcard counts as finished
+SECONDS_PER_DAY = 24 * 60 * 60  # Length of one scheduling interval unit
+
+
+# Define the CounterScheduler class: the classic "three correct answers = done" learning model
+class CounterScheduler:
+    def __init__(self, flashcard_dict):
+        """
+        Initialize the CounterScheduler with the flashcards of a topic.
+        Args:
+            flashcard_dict (dict): Dictionary of flashcards for the topic.
+        """
+        self.dict = flashcard_dict  # Store the flashcard dictionary
+        self._unfinished = []  # Keys of all flashcards with progress below the mastery threshold
+        self._unfinished_position = {}  # Maps each unfinished key to its position in self._unfinished
+        for key, value in flashcard_dict.items():  # Collect the unfinished flashcards once
+            if value[1] < MASTERY_THRESHOLD:
+                self._add_unfinished(key)
+
+    def _add_unfinished(self, key):
+        """
+        Add a flashcard to the pool of unfinished flashcards in constant time.
+        Args:
+            key (str): The key of the flashcard.
+        """
+        if key not in self._unfinished_position:  # Only add flashcards that are not in the pool yet
+            self._unfinished_position[key] = len(self._unfinished)  # Remember the position of the key
+            self._unfinished.append(key)  # Append the key to the pool
+
+    def _remove_unfinished(self, key):
+        """
+        Remove a flashcard from the pool of unfinished flashcards in constant time.
+        Args:
+            key (str): The key of the flashcard.
+        """
+        position = self._unfinished_position.pop(key, None)  # Get and forget the position of the key
+        if position is None:  # The flashcard is not in the pool
+            return
+        last_key = self._unfinished.pop()  # Take the last key out of the pool
+        if last_key != key:  # Move the last key into the gap left by the removed key
+            self._unfinished[position] = last_key
+            self._unfinished_position[last_key] = position
+
+    def has_cards(self):
+        """
+        Check if there are flashcards left to learn.
+        Returns:
+            bool: True if any flashcard has progress below the mastery threshold.
+        """
+        return bool(self._unfinished)  # Return True if the pool is not empty
+
+    def next_card(self):
+        """
+        Select an unfinished flashcard uniformly at random.
+        Returns:
+            str or None: The key of the chosen flashcard, or None if all flashcards are finished.
+        """
+        if not self._unfinished:  # If no flashcards are available
+            return None  # Return None
+        return random.choice(self._unfinished)  # Select a random key from the pool
+
+    def answer(self, key, knew_answer):
+        """
+        Update the scheduling state after the progress of a flashcard has changed.
+        Args:
+            key (str): The key of the flashcard.
+            knew_answer (bool): Whether the user knew the answer or not.
+        """
+        if self.dict[key][1] < MASTERY_THRESHOLD:  # Keep the pool of unfinished flashcards up to date
+            self._add_unfinished(key)
+        else:
+            self._remove_unfinished(key)
+
+
+# Define the SM2Scheduler class: SM-2 spaced repetition with a due-date priority queue
+class SM2Scheduler:
+    def __init__(self, flashcard_dict, now=time.time, initial_ease=2.5, minimum_ease=1.3):
+        """
+        Initialize the SM2Scheduler with the flashcards of a topic.
+        Cards stored in the old [answer, progress] format are treated as new cards that are due now;
+        their scheduling fields are added the first time they are answered.
+        Args:
+            flashcard_dict (dict): Dictionary of flashcards for the topic.
+            now (callable): Function returning the current time in seconds.
+            initial_ease (float): Ease factor of new cards.
+            minimum_ease (float): Lowest ease factor a card can reach.
+        """
+        self.dict = flashcard_dict  # Store the flashcard dictionary
+        self._now = now  # Store the clock
+        self._initial_ease = initial_ease  # Store the ease factor of new cards
+        self._minimum_ease = minimum_ease  # Store the lowest ease factor
+        self._counter = 0  # Tie breaker keeping the heap order stable for equal due times
+        self._due = {}  # Maps each key to the due time of its valid heap entry
+        self._heap = []  # Heap of (due, counter, key) entries; outdated entries are skipped lazily
+        for key, value in flashcard_dict.items():  # Queue every flashcard by its due time
+            due = self.schedule(value)["due"]
+            self._due[key] = due
+            self._heap.append((due, self._next_counter(), key))
+        heapq.heapify(self._heap)  # Build the heap in linear time
+
+    def _next_counter(self):
+        """
+        Get the next tie breaker value.
+        Returns:
+            int: A number that increases with every call.
+        """
+        self._counter += 1  # Increment the counter
+        return self._counter  # Return the new value
+
+    def schedule(self, card):
+        """
+        Get the scheduling fields of a card without changing the card.
+        Args:
+            card (list): The card value, e.g. [answer, progress] or [answer, progress, {...}].
+        Returns:
+            dict: The ease, interval (in days), repetition count and due timestamp of the card.
+        """
+        fields = {"ease": self._initial_ease, "interval": 0, "reps": 0, "due": 0.0}  # Defaults for new cards
+        if len(card) > 2 and isinstance(card[2], dict):  # Use stored fields where present
+            fields.update((name, card[2][name]) for name in fields if name in card[2])
+        return fields  # Return the scheduling fields
+
+    def _top(self):
+        """
+        Drop outdated heap entries and return the earliest valid one.
+        Returns:
+            tuple or None: The (due, counter, key) entry with the earliest due time, or None if the heap is empty.
+        """
+        while self._heap:  # Skip entries that were replaced by a later answer
+            due, _, key = self._heap[0]
+            if self._due.get(key) == due and key in self.dict:
+                return self._heap[0]  # Return the valid entry
+            heapq.heappop(self._heap)  # Remove the outdated entry
+        return None  # Return None if the heap is empty
+
+    def has_cards(self):
+        """
+        Check if any flashcard is due.
+        Returns:
+            bool: True if the earliest flashcard is due now.
+        """
+        top = self._top()  # Get the earliest flashcard
+        return top is not None and top[0] <= self._now()  # Return True if it is due
+
+    def next_card(self):
+        """
+        Select the flashcard with the earliest due time.
+        Returns:
+            str or None: The key of the most overdue flashcard, or None if no flashcard is due.
+        """
+        top = self._top()  # Get the earliest flashcard
+        if top is None or top[0] > self._now():  # If no flashcard is due
+            return None  # Return None
+        return top[2]  # Return the key of the earliest flashcard
+
+    def answer(self, key, knew_answer):
+        """
+        Update ease, interval and due time of a flashcard and requeue it.
+        Args:
+            key (str): The key of the flashcard.
+            knew_answer (bool): Whether the user knew the answer or not.
+        """
+        card = self.dict[key]  # Get the card
+        fields = self.schedule(card)  # Current scheduling fields
+        now = self._now()  # Current time
+        if knew_answer:  # A correct answer extends the interval
+            fields["reps"] += 1
+            if fields["reps"] == 1:
+                fields["interval"] = 1  # First success: see the card again tomorrow
+            elif fields["reps"] == 2:
+                fields["interval"] = 6  # Second success: see the card again in six days
+            else:
+                fields["interval"] = round(fields["interval"] * fields["ease"])  # Grow by the ease factor
+            fields["due"] = now + fields["interval"] * SECONDS_PER_DAY
+        else:  # A wrong answer restarts the card and makes it harder
+            fields["reps"] = 0
+            fields["interval"] = 0
+            fields["ease"] = round(max(self._minimum_ease, fields["ease"] - 0.2), 2)
+            fields["due"] = now  # Show the card again in this session, after the cards that are already due
+        if len(card) > 2 and isinstance(card[2], dict):  # Keep other fields stored in the card
+            fields = dict(card[2], **fields)
+        del card[2:]  # Replace the fields as a whole; compact cards hand out copies of their fields
+        card.append(fields)  # Store the fields in the [answer, progress, fields] format
+        self._due[key] = fields["due"]  # Invalidate the previous heap entry
+        heapq.heappush(self._heap, (fields["due"], self._next_counter(), key))  # Requeue the card
+
+
+# Define the WeightedScheduler class: weak cards first, drawn in proportion to a difficulty weight
+class WeightedScheduler:
+    def __init__(self, flashcard_dict, seed=None, avoid_repeat=True):
+        """
+        Initialize the WeightedScheduler with the flashcards of a topic. Every unfinished flashcard is
+        drawn with probability proportional to its weight: (MASTERY_THRESHOLD - progress) * (1 + misses),
+        where misses counts the recent wrong answers in this session (each wrong answer adds one, each
+        correct answer halves it). Finished flashcards have weight 0. Draws and weight updates take
+        O(log n) (see fenwick_sampler.py).
+        Args:
+            flashcard_dict (dict): Dictionary of flashcards for the topic.
+            seed (int, optional): Seed of the random draws, for reproducible sessions.
+            avoid_repeat (bool): Never draw the same flashcard twice in a row while another one is left.
+        """
+        self.dict = flashcard_dict  # Store the flashcard dictionary
+        self._rng = random.Random(seed)  # Random number generator of this session
+        self._avoid_repeat = avoid_repeat  # Store the repeat option
+        self._keys = list(flashcard_dict)  # Key of every item of the sampler
+        self._index = {key: index for index, key in enumerate(self._keys)}  # Item number of every key
+        self._misses = {}  # Recent wrong answers by key
+        self._last = None  # Item number of the flashcard drawn last
+        self._sampler = FenwickSampler(self.weight(key) for key in self._keys)  # Weights of all flashcards
+
+    # Public method to compute the weight of a flashcard
+    def weight(self, key):
+        """
+        Compute the weight of a flashcard from its progress and recent wrong answers.
+        Args:
+            key (str): The key of the flashcard.
+        Returns:
+            int: The weight; 0 for finished flashcards.
+        """
+        progress = self.dict[key][1]  # Progress of the flashcard
+        if progress >= MASTERY_THRESHOLD:  # Finished flashcards are not drawn
+            return 0
+        return (MASTERY_THRESHOLD - max(progress, 0)) * (1 + self._misses.get(key, 0))  # Return the weight
+
+    def has_cards(self):
+        """
+        Check if there are flashcards left to learn.
+        Returns:
+            bool: True if any flashcard has progress below the mastery threshold.
+        """
+        return self._sampler.total > 0  # Return True if any weight is left
+
+    def next_card(self):
+        """
+        Draw an unfinished flashcard in proportion to its weight.
+        Returns:
+            str or None: The key of the chosen flashcard, or None if all flashcards are finished.
+        """
+        index = self._sampler.sample(self._rng, self._last if self._avoid_repeat else None)  # Draw a flashcard
+        if index is None:  # If no flashcards are available
+            return None  # Return None
+        self._last = index  # Remember the flashcard for the next draw
+        return self._keys[index]  # Return the key of the chosen flashcard
+
+    def answer(self, key, knew_answer):
+        """
+        Update the recent wrong answers and the weight of a flashcard after its progress has changed.
+        Args:
+            key (str): The key of the flashcard.
+            knew_answer (bool): Whether the user knew the answer or not.
+        """
+        misses = self._misses.get(key, 0) // 2 if knew_answer else self._misses.get(key, 0) + 1
+        if misses:  # Keep only flashcards with recent wrong answers
+            self._misses[key] = misses
+        else:
+            self._misses.pop(key, None)
+        index = self._index.get(key)  # Item number of the flashcard
+        if index is None:  # A flashcard added during the session
+            index = self._index[key] = self._sampler.append(0)
+            self._keys.append(key)
+        self._sampler.update(index, self.weight(key))  # Update the weight in O(log n)
+
+
+SCHEDULERS = {"counter": CounterScheduler, "sm2": SM2Scheduler, "weighted": WeightedScheduler}  # Models by name
+
+
+def create_scheduler(name, flashcard_dict, **options):
+    """
+    Create a scheduler by name.
+    Args:
+        name (str): The name of the learning model ('counter', 'sm2' or 'weighted').
+        flashcard_dict (dict): Dictionary of flashcards for the topic.
+        **options: Options of the learning model, e.g. seed=1 for the weighted model.
+    Returns:
+        CounterScheduler, SM2Scheduler or WeightedScheduler: The new scheduler.
+    Raises:
+        ValueError: If no scheduler with this name exists.
+    """
+    if name not in SCHEDULERS:  # Check if the learning model exists
+        raise ValueError(f"Unknown scheduler '{name}'. Available: {', '.join(SCHEDULERS)}")
+    return SCHEDULERS[name](flashcard_dict, **options)  # Create the scheduler
@@ -0,0 +1,428 @@
+import heapq  # Import the heapq module to pick the best ranked results
+import json  # Import the JSON module for the header of the index file
+import math  # Import the math module for the ranking formula
+import os  # Import the os module for atomic file replacement
+import re  # Import the re module for tokenization
+import sys  # Import the sys module for the byte order and the command line measurement
+import unicodedata  # Import the unicodedata module for Unicode normalization of the texts
+from array import array  # Import the array type for compact posting lists
+from bisect import bisect_left, bisect_right  # Import binary search for the sorted posting lists
+
+INDEX_VERSION = 1  # Version of the index file layout
+TOKEN_PATTERN = re.compile(r"\w+")  # Words made of letters, digits and underscores
+FRONT_WEIGHT = 2  # Words on the front count twice as much as words on the back
+BM25_K1 = 1.2  # Term frequency saturation of the BM25 ranking
+BM25_B = 0.75  # Document length normalization of the BM25 ranking
+MAX_CANDIDATES = 10000  # Number of matching flashcards ranked for very common words
+SIGNATURE_SIZE = 64  # Size of the first line of the index file, which can be rewritten in place
+
+
+# Function to split a text into normalized words
+def tokenize(text):
+    """
+    Split a text into lowercase words; composed and decomposed Unicode forms give the same words.
+    Args:
+        text (str): The text to split.
+    Returns:
+        list: The words in the order they appear.
+    """
+    return TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text).casefold())  # Return the words
+
+
+# Define the SearchIndex class: an inverted index over the fronts and backs of all flashcards
+class SearchIndex:
+    def __init__(self):
+        """
+        Initialize an empty SearchIndex.
+        Every flashcard is a document with an id. For every word, the index keeps the sorted ids of the
+        documents containing it (once per occurrence), so a word lookup is a dictionary access and the
+        term frequency of a document is a binary search. Removed documents are skipped until the
+        posting lists are compacted.
+        """
+        self._topics = []  # Topic names by topic id
+        self._topic_ids = {}  # Maps the topic name to its topic id
+        self._documents = []  # Maps the front of each flashcard to its document id, one dictionary per topic id
+        self._document_topics = array('I')  # Topic id of each document
+        self._document_fronts = []  # Front of each document, None for removed documents
+        self._document_lengths = array('I')  # Number of weighted words of each document, 0 for removed documents
+        self._postings = {}  # Maps each word to the sorted array of ids of the documents containing it
+        self._document_frequency = {}  # Number of live documents containing each word
+        self._total_length = 0  # Sum of the lengths of all live documents
+        self._live_documents = 0  # Number of live documents
+
+    def __len__(self):
+        """
+        Get the number of indexed flashcards.
+        Returns:
+            int: The number of flashcards.
+        """
+        return self._live_documents  # Return the number of flashcards
+
+    # Class method to build an index from flashcards
+    @classmethod
+    def from_cards(cls, cards):
+        """
+        Build an index over flashcards.
+        Args:
+            cards (iterable): (topic, card_front, card) tuples, e.g. from Deck.iter_cards().
+        Returns:
+            SearchIndex: The new index.
+        """
+        index = cls()  # Create an empty index
+        for topic, card_front, card in cards:  # Add every flashcard
+            if card_front is not None:  # Skip the markers of empty topics
+                index.add(topic, card_front, card[0])
+        return index  # Return the new index
+
+    # Private method to get the id of a topic
+    def _topic_id(self, topic):
+        """
+        Get the id of a topic, assigning a new one for a new topic.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            int: The topic id.
+        """
+        topic_id = self._topic_ids.get(topic)  # Look up the topic
+        if topic_id is None:  # Assign a new id
+            topic_id = self._topic_ids[topic] = len(self._topics)
+            self._topics.append(topic)
+            self._documents.append({})
+        return topic_id  # Return the topic id
+
+    # Public method to add or replace a flashcard
+    def add(self, topic, card_front, card_back, old_back=None):
+        """
+        Add a flashcard to the index, replacing an earlier version of it.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str): The back text of the flashcard.
+            old_back (str, optional): The back text of the earlier version, if known.
+        """
+        self.remove(topic, card_front, old_back)  # Replace an earlier version
+        topic_id = self._topic_id(topic)  # Id of the topic
+        document = len(self._document_fronts)  # New documents get the highest id, so posting lists stay sorted
+        words = sorted(tokenize(card_front) * FRONT_WEIGHT + tokenize(str(card_back)))  # Weighted words
+        self._documents[topic_id][card_front] = document
+        self._document_topics.append(topic_id)
+        self._document_fronts.append(card_front)
+        self._document_lengths.append(len(words))
+        for word in words:  # Add the document to the posting list of each occurrence
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = array('I')
+            postings.append(document)
+        for word in set(words):  # Count each word once per document
+            self._document_frequency[word] = self._document_frequency.get(word, 0) + 1
+        self._total_length += len(words)
+        self._live_documents += 1
+
+    # Public method to remove a flashcard
+    def remove(self, topic, card_front, card_back=None):
+        """
+        Remove a flashcard from the index.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str, optional): The back text of the flashcard. Without it, the word counts of the
+                back stay too high until the index is compacted.
+        Returns:
+            bool: True if the flashcard was removed, False if it was not indexed.
+        """
+        topic_id = self._topic_ids.get(topic)  # Id of the topic
+        if topic_id is None or card_front not in self._documents[topic_id]:  # Check if the flashcard is indexed
+            return False  # Return False if the flashcard is not indexed
+        document = self._documents[topic_id].pop(card_front)  # Id of the document
+        words = tokenize(card_front) + (tokenize(str(card_back)) if card_back is not None else [])
+        for word in set(words):  # Lower the document frequency of the words of the flashcard
+            count = self._document_frequency.get(word, 0) - 1
+            if count > 0:
+                self._document_frequency[word] = count
+            else:
+                self._document_frequency.pop(word, None)
+        self._document_fronts[document] = None  # Mark the document as removed
+        self._total_length -= self._document_lengths[document]
+        self._document_lengths[document] = 0
+        self._live_documents -= 1
+        return True  # Return True if the flashcard was removed
+
+    # Public method to remove all flashcards of a topic
+    def remove_topic(self, topic, cards=None):
+        """
+        Remove all flashcards of a topic from the index.
+        Args:
+            topic (str): The name of the topic.
+            cards (dict, optional): The flashcards of the topic, {card_front: [card_back, progress]},
+                used to keep the word counts exact.
+        """
+        topic_id = self._topic_ids.get(topic)  # Id of the topic
+        if topic_id is None:  # Nothing to remove
+            return
+        for card_front in list(self._documents[topic_id]):  # Remove every flashcard of the topic
+            card = cards.get(card_front) if cards is not None else None
+            self.remove(topic, card_front, card[0] if card is not None else None)
+
+    # Public method to rename a topic
+    def rename_topic(self, topic, new_topic):
+        """
+        Rename a topic in the index. The flashcards keep their documents.
+        Args:
+            topic (str): The current name of the topic.
+            new_topic (str): The new name of the topic.
+        """
+        topic_id = self._topic_ids.pop(topic, None)  # Id of the topic
+        if topic_id is None:  # Nothing to rename
+            return
+        self._topic_ids[new_topic] = topic_id  # The documents refer to the topic id
+        self._topics[topic_id] = new_topic
+
+    # Public method to drop removed documents from the posting lists
+    def compact(self):
+        """
+        Drop removed documents from the posting lists and recount the word frequencies.
+        """
+        frequency = {}  # Exact document frequency of each word
+        for word, postings in list(self._postings.items()):  # Filter each posting list
+            live = array('I', (document for document in postings if self._document_lengths[document]))
+            if live:
+                self._postings[word] = live
+                frequency[word] = len(set(live))
+            else:
+                del self._postings[word]  # No live document contains the word
+        self._document_frequency = frequency
+
+    # Private method to compute the inverse document frequency of a word
+    def _idf(self, word):
+        """
+        Compute the BM25 inverse document frequency of a word: rare words weigh more.
+        Args:
+            word (str): The word.
+        Returns:
+            float: The inverse document frequency.
+        """
+        frequency = self._document_frequency.get(word, 1)  # Number of documents containing the word
+        return math.log(1 + (self._live_documents - frequency + 0.5) / (frequency + 0.5))
+
+    # Public method to search flashcards
+    def search(self, query, limit=10, topic=None):
+        """
+        Find the flashcards containing all words of a query, ranked by BM25.
+        For very common words only the first MAX_CANDIDATES matching flashcards are ranked.
+        Args:
+            query (str): The words to search for.
+            limit (int): Maximum number of results.
+            topic (str, optional): Only search the flashcards of this topic.
+        Returns:
+            list: (topic, card_front, score) tuples, best match first.
+        """
+        words = list(dict.fromkeys(tokenize(query)))  # Distinct words of the query
+        if not words or not self._live_documents:
+            return []
+        topic_id = None
+        if topic is not None:  # Restrict the search to one topic
+            topic_id = self._topic_ids.get(topic)
+            if topic_id is None:
+                return []
+        posting_lists = []  # Posting list of each word, rarest word first
+        for word in words:
+            postings = self._postings.get(word)
+            if not postings:  # A word that no flashcard contains: no flashcard contains all words
+                return []
+            posting_lists.append((len(postings), word, postings))
+        posting_lists.sort()
+        first_postings = posting_lists[0][2]  # Posting list of the rarest word
+
+        candidates = {}  # Occurrences of the rarest word in each candidate document
+        for document in first_postings:  # Documents containing the rarest word, in sorted order
+            if document in candidates:  # Another occurrence in the same document
+                candidates[document] += 1
+            elif len(candidates) >= MAX_CANDIDATES:  # Enough candidates for very common words
+                break
+            elif self._document_lengths[document] and (topic_id is None or self._document_topics[document] == topic_id):
+                candidates[document] = 1
+
+        average_length = self._total_length / self._live_documents  # Average document length
+        weights = [self._idf(word) * (BM25_K1 + 1) for _, word, _ in posting_lists]  # Weight of each word
+        other_lists = [postings for _, _, postings in posting_lists[1:]]  # The other words, rarest first
+        results = []  # (score, document) of the documents containing all words
+        for document, frequency in candidates.items():
+            frequencies = [frequency]  # Occurrences of each word in the document
+            for postings in other_lists:
+                position = bisect_left(postings, document)
+                if position == len(postings) or postings[position] != document:  # The word is missing
+                    break
+                frequencies.append(bisect_right(postings, document, position) - position)
+            else:
+                # BM25: saturate the term frequencies and normalize by the document length
+                saturation = BM25_K1 * (1 - BM25_B + BM25_B * self._document_lengths[document] / average_length)
+                results.append((sum(weight * frequency / (frequency + saturation)
+                                    for weight, frequency in zip(weights, frequencies)), document))
+        return [(self._topics[self._document_topics[document]], self._document_fronts[document], score)
+                for score, document in heapq.nlargest(limit, results)]  # Return the best results
+
+    # Public method to find flashcards with the same front
+    def duplicates(self, card_front, limit=5):
+        """
+        Find flashcards whose front has the same words as the given front, ignoring case and punctuation.
+        Args:
+            card_front (str): The front text to check.
+            limit (int): Maximum number of results.
+        Returns:
+            list: (topic, card_front) tuples of the flashcards with the same front.
+        """
+        words = tokenize(card_front)  # Words of the front
+        if not words:
+            return []
+        matches = []  # Flashcards with the same words
+        for topic, front, _ in self.search(card_front, limit=MAX_CANDIDATES):  # Flashcards containing all words
+            if tokenize(front) == words:
+                matches.append((topic, front))
+                if len(matches) == limit:
+                    break
+        return matches  # Return the duplicates
+
+    # Public method to write the index to a file
+    def save(self, path, signature):
+        """
+        Write the index to a file. The file is replaced atomically.
+        Args:
+            path (str): The file path of the index.
+            signature (str): Identifies the version of the deck file the index belongs to.
+        Returns:
+            bool: True if the index was written, False otherwise.
+        """
+        if self._live_documents < len(self._document_fronts) // 2:  # Mostly removed documents
+            self.compact()
+        words = list(self._postings)  # Order of the posting lists in the file
+        header = {"byteorder": sys.byteorder, "itemsize": array('I').itemsize, "topics": self._topics,
+                  "fronts": self._document_fronts,
+                  "words": [[word, len(self._postings[word]), self._document_frequency.get(word, 0)] for word in words],
+                  "total_length": self._total_length, "live_documents": self._live_documents}
+        temp_path = path + ".tmp"  # Temporary file next to the index
+        try:
+            with open(temp_path, 'wb') as fp:
+                fp.write(_signature_line(signature))  # Fixed-size first line
+                fp.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")  # Header line
+                self._document_topics.tofile(fp)  # Topic id of each document
+                self._document_lengths.tofile(fp)  # Length of each document
+                for word in words:  # Posting lists in the order of the header
+                    self._postings[word].tofile(fp)
+                fp.flush()
+                os.fsync(fp.fileno())  # Make sure the data is on disk before the rename
+            os.replace(temp_path, path)  # Atomically replace the index file
+            return True  # Return True if the index was written
+        except (IOError, OSError, PermissionError):
+            return False  # Return False on error
+
+    # Class method to read an index from a file
+    @classmethod
+    def load(cls, path, signature):
+        """
+        Read an index written by save().
+        Args:
+            path (str): The file path of the index.
+            signature (str): The expected signature; an index of another deck file version is ignored.
+        Returns:
+            SearchIndex or None: The index, or None if the file is missing, damaged or out of date.
+        """
+        try:
+            with open(path, 'rb') as fp:
+                if fp.read(SIGNATURE_SIZE) != _signature_line(signature):  # Index of another deck file version
+                    return None
+                header = json.loads(fp.readline().decode("utf-8"))  # Header line
+                if header.get("byteorder") != sys.byteorder or header.get("itemsize") != array('I').itemsize:
+                    return None  # The index was written on another kind of machine
+                index = cls()  # Create an empty index
+                documents = len(header["fronts"])  # Number of documents including removed ones
+                index._document_topics.fromfile(fp, documents)
+                index._document_lengths.fromfile(fp, documents)
+                for word, length, frequency in header["words"]:  # Posting lists in the order of the header
+                    postings = index._postings[word] = array('I')
+                    postings.fromfile(fp, length)
+                    if frequency:
+                        index._document_frequency[word] = frequency
+        except (IOError, OSError, EOFError, ValueError, KeyError, TypeError):
+            return None  # Return None if the file is missing or damaged
+        index._topics = header["topics"]
+        index._topic_ids = {topic: topic_id for topic_id, topic in enumerate(index._topics)}
+        index._documents = [{} for _ in index._topics]
+        index._document_fronts = header["fronts"]
+        for document, card_front in enumerate(index._document_fronts):  # Map the fronts to their documents
+            if card_front is not None:
+                index._documents[index._document_topics[document]][card_front] = document
+        index._total_length = header["total_length"]
+        index._live_documents = header["live_documents"]
+        return index  # Return the index
+
+
+# Function to build the first line of an index file
+def _signature_line(signature):
+    """
+    Build the fixed-size first line of an index file.
+    Args:
+        signature (str): Identifies the version of the deck file the index belongs to.
+    Returns:
+        bytes: SIGNATURE_SIZE bytes ending with a newline.
+    """
+    return f"FGSEARCH {INDEX_VERSION} {signature}".ljust(SIGNATURE_SIZE - 1)[:SIGNATURE_SIZE - 1].encode("ascii") + b"\n"
+
+
+# Function to read the signature of an index file
+def read_signature(path):
+    """
+    Read the signature of an index file without loading the index.
+    Args:
+        path (str): The file path of the index.
+    Returns:
+        str or None: The signature, or None if the file is missing or has another layout version.
+    """
+    try:
+        with open(path, 'rb') as fp:
+            parts = fp.read(SIGNATURE_SIZE).decode("ascii").split()  # 'FGSEARCH <version> <signature>'
+    except (IOError, OSError, UnicodeDecodeError):
+        return None  # Return None if the file is missing or damaged
+    if len(parts) != 3 or parts[0] != "FGSEARCH" or parts[1] != str(INDEX_VERSION):
+        return None  # Return None for another layout version
+    return parts[2]  # Return the signature
+
+
+# Function to move an index file to a new deck file version
+def write_signature(path, signature):
+    """
+    Rewrite the signature of an index file in place, e.g. after a save that only changed progress values.
+    Args:
+        path (str): The file path of the index.
+        signature (str): The new signature.
+    Returns:
+        bool: True if the signature was written, False otherwise.
+    """
+    try:
+        with open(path, 'r+b') as fp:
+            fp.write(_signature_line(signature))  # Overwrite the first line
+            fp.flush()
+            os.fsync(fp.fileno())  # Make sure the signature is on disk
+        return True  # Return True if the signature was written
+    except (IOError, OSError, PermissionError):
+        return False  # Return False on error
+
+
+if __name__ == "__main__":
+    import itertools  # Import the itertools module for the cumulative word weights
+    import random  # Import the random module for the synthetic flashcards
+    import time  # Import the time module for the measurement
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000  # Number of synthetic flashcards
+    vocabulary = [f"word{number}" for number in range(50000)]  # Words with a skewed frequency
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    rng = random.Random(1)
+    start = time.perf_counter()
+    index = SearchIndex()
+    for number in range(count):  # Add the flashcards
+        front, back = rng.choices(vocabulary, cum_weights=weights, k=4), rng.choices(vocabulary, cum_weights=weights, k=8)
+        index.add(f"Topic {number % 1000}", f"{number} " + " ".join(front), " ".join(back))
+    print(f"Indexed {count} flashcards in {time.perf_counter() - start:.1f} s")
+    for query in ("word0", "word5 word17", "word12345", "word3 word40 word700"):  # Common and rare words
+        start = time.perf_counter()
+        results = index.search(query)
+        print(f"search({query!r}): {len(results)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
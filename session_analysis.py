@@ -0,0 +1,164 @@
+import argparse  # Import the argparse module for the command line interface
+import json  # Import the JSON module for the machine-readable report
+import math  # Import the math module to skip unknown latencies
+import statistics  # Import the statistics module for medians
+
+from session_recorder import read_events  # Import the reader of the session log
+
+RETENTION_BUCKETS = ((3600, "< 1 hour"), (86400, "1 hour - 1 day"), (3 * 86400, "1 - 3 days"),
+                     (7 * 86400, "3 - 7 days"), (30 * 86400, "1 - 4 weeks"), (math.inf, "> 4 weeks"))  # Intervals
+
+
+# Function to compute the retention curve
+def retention_curve(events):
+    """
+    Share of correct answers depending on the time since the previous review of the same flashcard,
+    over all sessions. First reviews of a flashcard have no interval and are not counted.
+    Args:
+        events (list): ReviewEvent tuples in the order they were recorded.
+    Returns:
+        list: One dictionary per interval: {"interval", "reviews", "retention"} (retention in percent or None).
+    """
+    counts = [[0, 0] for _ in RETENTION_BUCKETS]  # [reviews, correct] per interval
+    last_review = {}  # Time of the previous review by (topic, front)
+    for event in events:
+        card = (event.topic, event.front)
+        previous = last_review.get(card)  # Time of the previous review of the flashcard
+        last_review[card] = event.timestamp
+        if previous is None:  # First review of the flashcard
+            continue
+        interval = event.timestamp - previous
+        bucket = next(number for number, (limit, _) in enumerate(RETENTION_BUCKETS) if interval < limit)
+        counts[bucket][0] += 1
+        counts[bucket][1] += event.knew
+    return [{"interval": label, "reviews": reviews, "retention": 100.0 * correct / reviews if reviews else None}
+            for (_, label), (reviews, correct) in zip(RETENTION_BUCKETS, counts)]
+
+
+# Function to summarize answer latencies
+def _latency_summary(latencies):
+    """
+    Summarize answer latencies.
+    Args:
+        latencies (list): Latencies in seconds.
+    Returns:
+        dict: Number of reviews, median, mean and 95th percentile in seconds.
+    """
+    if not latencies:
+        return {"reviews": 0}
+    latencies = sorted(latencies)
+    return {"reviews": len(latencies), "median_s": round(statistics.median(latencies), 3),
+            "mean_s": round(statistics.fmean(latencies), 3),
+            "p95_s": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3)}
+
+
+# Function to compute the time spent per flashcard
+def time_per_card(events):
+    """
+    Time from showing a flashcard to the answer, overall and per topic.
+    Args:
+        events (list): ReviewEvent tuples.
+    Returns:
+        dict: {"all": summary, "topics": {topic: summary}} with the summaries of _latency_summary.
+    """
+    overall, by_topic = [], {}  # Latencies overall and per topic
+    for event in events:
+        if math.isnan(event.latency):  # The answer was not preceded by showing the card
+            continue
+        overall.append(event.latency)
+        by_topic.setdefault(event.topic, []).append(event.latency)
+    return {"all": _latency_summary(overall),
+            "topics": {topic: _latency_summary(latencies) for topic, latencies in sorted(by_topic.items())}}
+
+
+# Function to find the hardest flashcards
+def hardest_cards(events, limit=10, min_reviews=3):
+    """
+    Find the flashcards answered wrongly most often, across all sessions. Ties are broken by the
+    median answer time.
+    Args:
+        events (list): ReviewEvent tuples.
+        limit (int): Maximum number of flashcards.
+        min_reviews (int): Flashcards reviewed less often are skipped.
+    Returns:
+        list: Dictionaries {"topic", "front", "reviews", "error_rate", "median_s"}, hardest first.
+    """
+    cards = {}  # [reviews, wrong, latencies] by (topic, front)
+    for event in events:
+        card = cards.setdefault((event.topic, event.front), [0, 0, []])
+        card[0] += 1
+        card[1] += not event.knew
+        if not math.isnan(event.latency):
+            card[2].append(event.latency)
+    ranked = [{"topic": topic, "front": front, "reviews": reviews, "error_rate": 100.0 * wrong / reviews,
+               "median_s": round(statistics.median(latencies), 3) if latencies else None}
+              for (topic, front), (reviews, wrong, latencies) in cards.items() if reviews >= min_reviews]
+    ranked.sort(key=lambda card: (card["error_rate"], card["median_s"] or 0.0), reverse=True)
+    return ranked[:limit]  # Return the hardest flashcards
+
+
+# Function to summarize each session
+def session_summaries(events):
+    """
+    Summarize each session.
+    Args:
+        events (list): ReviewEvent tuples.
+    Returns:
+        list: Dictionaries {"session", "topic", "start", "reviews", "correct", "progress", "minutes",
+            "cards_per_minute"} in the order of the sessions.
+    """
+    sessions = {}  # Summary by session number
+    for event in events:
+        summary = sessions.get(event.session)
+        if summary is None:  # First review of the session
+            summary = sessions[event.session] = {"session": event.session, "topic": event.topic,
+                                                 "start": event.timestamp, "end": event.timestamp,
+                                                 "reviews": 0, "correct": 0, "progress": 0}
+        summary["end"] = event.timestamp
+        summary["reviews"] += 1
+        summary["correct"] += event.knew
+        summary["progress"] += event.progress_after - event.progress_before  # Points gained in the session
+    for summary in sessions.values():
+        minutes = (summary.pop("end") - summary["start"]) / 60
+        summary["minutes"] = round(minutes, 2)
+        summary["cards_per_minute"] = round(summary["reviews"] / minutes, 2) if minutes > 0 else None
+    return list(sessions.values())  # Return the summaries
+
+
+# Function to analyze a session log
+def analyze(path, limit=10):
+    """
+    Analyze a session log.
+    Args:
+        path (str): The file path of the log.
+        limit (int): Number of hardest flashcards.
+    Returns:
+        dict: The retention curve, time per card, hardest flashcards and session summaries.
+    """
+    events = read_events(path)  # Read the reviews
+    return {"reviews": len(events), "retention": retention_curve(events), "time_per_card": time_per_card(events),
+            "hardest_cards": hardest_cards(events, limit), "sessions": session_summaries(events)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze the recorded learning sessions.")
+    parser.add_argument("log", nargs="?", default="flash.json.sessions", help="The session log")
+    parser.add_argument("--limit", type=int, default=10, help="Number of hardest flashcards")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    report = analyze(args.log, args.limit)
+    print(f"{report['reviews']} reviews in {len(report['sessions'])} sessions")
+    print("Retention by time since the previous review:")
+    for bucket in report["retention"]:
+        if bucket["reviews"]:
+            print(f"    {bucket['interval']:>15}: {bucket['retention']:5.1f}% of {bucket['reviews']} reviews")
+    overall = report["time_per_card"]["all"]
+    if overall["reviews"]:
+        print(f"Time per card: median {overall['median_s']:.1f} s, 95th percentile {overall['p95_s']:.1f} s")
+    print("Hardest flashcards:")
+    for card in report["hardest_cards"]:
+        print(f"    {card['error_rate']:5.1f}% wrong of {card['reviews']:3d}  {card['topic']}: {card['front']}")
+    if args.json:  # Write the machine-readable results
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(report, json_file, indent=2)
@@ -0,0 +1,196 @@
+import os  # Import the os module to check the log file
+import struct  # Import the struct module for the binary records
+import time  # Import the time module for the timestamps
+from collections import namedtuple  # Import namedtuple for the decoded reviews
+
+# Binary records of the session log; every record starts with its type byte. Every flush of a recorder is a
+# segment starting with b"G" and its recorder id, so the logs of several processes can be appended to one file.
+SEGMENT = struct.Struct("<BQ")  # b"G", random id of the recorder that wrote the records up to the next b"G"
+OPEN = struct.Struct("<Bd")  # b"O", time the recorder was opened (older logs); session numbers restart after it
+SESSION = struct.Struct("<BIdH")  # b"S", session number, start time, length of the topic name (UTF-8 follows)
+CARD = struct.Struct("<BIII")  # b"C", session number, card number, length of the front text (UTF-8 follows)
+REVIEW = struct.Struct("<BIIdfbb?")  # b"R", session, card, time, latency in seconds, progress before/after, knew
+
+ReviewEvent = namedtuple("ReviewEvent", "session topic front timestamp latency progress_before progress_after knew")
+
+
+# Function to clamp a progress value to the range stored in the log
+def _clamp(progress):
+    """
+    Clamp a progress value to a signed byte.
+    Args:
+        progress (int): The progress value.
+    Returns:
+        int: The value in the range -128..127.
+    """
+    return max(-128, min(127, progress))  # Return the clamped value
+
+
+# Define the RecordedSession class: one learning session in the log
+class RecordedSession:
+    def __init__(self, recorder, number, topic):
+        """
+        Initialize the RecordedSession. Created by SessionRecorder.start_session.
+        Args:
+            recorder (SessionRecorder): The recorder writing the log.
+            number (int): The number of the session in the log.
+            topic (str): The name of the topic.
+        """
+        self._recorder = recorder  # Store the recorder
+        self.number = number  # Store the session number
+        self.topic = topic  # Store the topic name
+        self._cards = {}  # Card number by front text; each front is written once per session
+
+    # Public method to record one review
+    def record(self, card_front, knew_answer, latency, progress_before, progress_after, timestamp=None):
+        """
+        Record one review of a flashcard.
+        Args:
+            card_front (str): The front text of the flashcard.
+            knew_answer (bool): Whether the user knew the answer.
+            latency (float): Seconds from showing the card to the answer; NaN if unknown.
+            progress_before (int): The progress before the answer.
+            progress_after (int): The progress after the answer.
+            timestamp (float, optional): The time of the answer; now if omitted.
+        """
+        card = self._cards.get(card_front)  # Number of the card in this session
+        if card is None:  # Define the card on its first review in the session
+            card = self._cards[card_front] = len(self._cards)
+            encoded = card_front.encode("utf-8")
+            self._recorder._write(CARD.pack(ord("C"), self.number, card, len(encoded)) + encoded)
+        self._recorder._write(REVIEW.pack(ord("R"), self.number, card, time.time() if timestamp is None else timestamp,
+                                          latency, _clamp(progress_before), _clamp(progress_after), knew_answer))
+
+
+# Define the SessionRecorder class: an append-only binary log of reviews
+class SessionRecorder:
+    def __init__(self, path, buffer_size=64 * 1024):
+        """
+        Initialize the SessionRecorder with the given log file path. Records are collected in memory and
+        appended to the file when the buffer is full, on flush() and on close(), so recording a review costs
+        two struct.pack calls and no system call. Each flush is written as one segment tagged with a random
+        recorder id, so several application instances can record into the same log.
+        Args:
+            path (str): The file path of the log, e.g. 'flash.json.sessions'.
+            buffer_size (int): Number of bytes collected before they are written.
+        """
+        self._path = path  # Store the file path
+        self._buffer_size = buffer_size  # Store the buffer size
+        self._id = int.from_bytes(os.urandom(8), "little")  # Tells the sessions of this recorder from others
+        self._buffer = bytearray()  # Records not yet written
+        self._sessions = 0  # Number of sessions started
+
+    @property  # Define a property method to get the log file path
+    def path(self):
+        """
+        Get the log file path.
+        Returns:
+            str: The file path of the log.
+        """
+        return self._path  # Return the file path
+
+    # Public method to start a learning session
+    def start_session(self, topic):
+        """
+        Start a learning session in a topic.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            RecordedSession: The session that records the reviews.
+        """
+        self._sessions += 1  # Number the session
+        encoded = topic.encode("utf-8")
+        self._write(SESSION.pack(ord("S"), self._sessions, time.time(), len(encoded)) + encoded)
+        return RecordedSession(self, self._sessions, topic)  # Return the session
+
+    # Private method to buffer a record
+    def _write(self, record):
+        """
+        Add a record to the buffer and write the buffer once it is full.
+        Args:
+            record (bytes): The packed record.
+        """
+        self._buffer += record  # Collect the record
+        if len(self._buffer) >= self._buffer_size:  # Write a full buffer
+            self.flush()
+
+    # Public method to write the buffered records
+    def flush(self):
+        """
+        Append the buffered records to the log file.
+        Returns:
+            bool: True if the records were written, False otherwise (they are kept for the next attempt).
+        """
+        if not self._buffer or not self._sessions:  # Nothing to write; an unused recorder leaves no trace
+            return True
+        try:
+            with open(self._path, 'ab') as fp:  # Append the segment to the log with a single write
+                fp.write(SEGMENT.pack(ord("G"), self._id) + self._buffer)
+            self._buffer = bytearray()  # Start a fresh buffer
+            return True  # Return True if the records were written
+        except (IOError, OSError, PermissionError):
+            return False  # Return False on error
+
+    # Public method to write the last records
+    def close(self):
+        """
+        Write the buffered records, e.g. when the application exits.
+        Returns:
+            bool: True if the records were written, False otherwise.
+        """
+        return self.flush()  # Write the buffer
+
+
+# Function to read the reviews stored in a log
+def read_events(path):
+    """
+    Read all reviews stored in a session log. A record cut off at the end of the file (e.g. after a crash)
+    ends the log.
+    Args:
+        path (str): The file path of the log.
+    Returns:
+        list: ReviewEvent tuples in the order they were recorded; sessions are numbered across the whole log.
+    """
+    if not os.path.exists(path):  # No sessions were recorded yet
+        return []
+    with open(path, 'rb') as fp:
+        data = fp.read()  # Logs are small: about 25 bytes per review
+    events = []  # Decoded reviews
+    sessions = {}  # (global session number, topic) by (recorder, session number)
+    cards = {}  # Front text by (recorder, session number, card number)
+    recorder = None  # Recorder of the current segment
+    session_count = 0  # Number of sessions read so far
+    offset = 0  # Position in the log
+    try:
+        while offset < len(data):
+            kind = data[offset]  # Type of the record
+            if kind == ord("R"):  # A review
+                _, session, card, timestamp, latency, before, after, knew = REVIEW.unpack_from(data, offset)
+                offset += REVIEW.size
+                number, topic = sessions[(recorder, session)]
+                events.append(ReviewEvent(number, topic, cards[(recorder, session, card)], timestamp, latency, before,
+                                          after, knew))
+            elif kind == ord("C"):  # A flashcard reviewed for the first time in a session
+                _, session, card, length = CARD.unpack_from(data, offset)
+                offset += CARD.size + length
+                if offset > len(data):
+                    break  # Cut off
+                cards[(recorder, session, card)] = data[offset - length:offset].decode("utf-8")
+            elif kind == ord("S"):  # A new session
+                _, session, _, length = SESSION.unpack_from(data, offset)
+                offset += SESSION.size + length
+                if offset > len(data):
+                    break  # Cut off
+                session_count += 1
+                sessions[(recorder, session)] = (session_count, data[offset - length:offset].decode("utf-8"))
+            elif kind == ord("G"):  # A segment written by one recorder
+                _, recorder = SEGMENT.unpack_from(data, offset)
+                offset += SEGMENT.size
+            elif kind == ord("O"):  # A new recorder of an older log; its session numbers start again
+                offset += OPEN.size
+                recorder = ("O", offset)
+            else:
+                break  # Damaged log
+    except (struct.error, KeyError, UnicodeDecodeError):
+        pass  # The rest of the log is cut off or damaged
+    return events  # Return the reviews
@@ -0,0 +1,741 @@
+import json  # Import the JSON module for the optional scheduling fields
+import sqlite3  # Import the sqlite3 module for the database backend
+import sys  # Import the sys module for the command line migrator
+from contextlib import nullcontext  # Import nullcontext for changes inside an open transaction
+from card_store import progress_table  # Import the progress mapping helper for the bulk operations
+from deck_batch import BatchHistory  # Import the undo history of batches
+from deck import Deck  # Import the Deck class for topic name normalization and JSON loading
+from scheduler import MASTERY_THRESHOLD  # Import the progress at which a flashcard counts as finished
+from search_index import tokenize  # Import the tokenizer shared with the JSON deck's search index
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    topic_key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY,
+    topic_id INTEGER NOT NULL REFERENCES topics(id) ON DELETE CASCADE,
+    front TEXT NOT NULL,
+    back TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    fields TEXT,
+    UNIQUE (topic_id, front)
+);
+"""  # Database layout: one row per topic and one row per flashcard
+
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS cards_search USING fts5(front, back, content='cards', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS cards_search_insert AFTER INSERT ON cards BEGIN
+    INSERT INTO cards_search (rowid, front, back) VALUES (new.id, new.front, new.back);
+END;
+CREATE TRIGGER IF NOT EXISTS cards_search_delete AFTER DELETE ON cards BEGIN
+    INSERT INTO cards_search (cards_search, rowid, front, back) VALUES ('delete', old.id, old.front, old.back);
+END;
+CREATE TRIGGER IF NOT EXISTS cards_search_update AFTER UPDATE OF front, back ON cards
+WHEN old.front IS NOT new.front OR old.back IS NOT new.back BEGIN
+    INSERT INTO cards_search (cards_search, rowid, front, back) VALUES ('delete', old.id, old.front, old.back);
+    INSERT INTO cards_search (rowid, front, back) VALUES (new.id, new.front, new.back);
+END;
+"""  # Full-text index over fronts and backs, kept up to date by triggers
+
+
+# Define the SQLiteDeck class: a Deck with the same public API, stored in an SQLite database
+class SQLiteDeck:
+    _topic_key = staticmethod(Deck._topic_key)  # Case-insensitive lookup key of a topic name, as in Deck
+
+    def __init__(self, path):
+        """
+        Initialize the SQLiteDeck with the given database file path.
+        Only the list of topics is read; the flashcards of a topic are loaded when the topic is opened.
+        Args:
+            path (str): The file path to the SQLite database.
+        """
+        self._path = path  # Store the file path
+        # Open (or create) the database; it may be opened on a loader thread and used on the main thread
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the single writer
+        self._connection.execute("PRAGMA synchronous=NORMAL")  # Durable at every checkpoint, fast commits
+        self._connection.execute("PRAGMA foreign_keys=ON")  # Delete the cards of a deleted topic
+        self._connection.executescript(SCHEMA)  # Create the tables if the database is new
+        self._search_available = self._create_search_index()  # Full-text search needs SQLite's FTS5 extension
+        self._topic_ids = {}  # Maps the actual topic name to its row id
+        self._topic_index = {}  # Maps the casefolded topic name to the actual topic name
+        self._loaded_topics = {}  # Flashcards of the topics that were opened, by actual topic name
+        self._load_topics()  # Read the topic names
+        self._text_version = 0  # Number of changes to card texts and topic names, used by the batch history
+        self._transaction = _Transaction(self)  # Groups the changes of a batch into one transaction
+        self._batch_history = BatchHistory(self, self._transaction)  # Undo and redo of the last batch
+
+    # Private method to read the topic names from the database
+    def _load_topics(self):
+        """
+        Read the topic names and row ids from the database and forget the loaded flashcards.
+        """
+        self._topic_ids.clear()
+        self._topic_index.clear()
+        self._loaded_topics.clear()
+        for topic_id, name, topic_key in self._connection.execute("SELECT id, name, topic_key FROM topics ORDER BY id"):
+            self._topic_ids[name] = topic_id  # Remember the row id of the topic
+            self._topic_index[topic_key] = name  # Index the topic name
+
+    # Private method to get the transaction of a change
+    def _write(self):
+        """
+        Get the context of a change: its own committed transaction, or nothing inside a batch, whose
+        transaction commits all changes at once.
+        Returns:
+            context manager: The connection, or a context that does nothing inside a batch.
+        """
+        return nullcontext() if self._transaction.depth else self._connection  # Return the context
+
+    # Private method to create the full-text search index
+    def _create_search_index(self):
+        """
+        Create the full-text search index, filling it from the existing flashcards if the database had none.
+        Returns:
+            bool: True if full-text search is available, False if SQLite was built without FTS5.
+        """
+        exists = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'cards_search'").fetchone() is not None  # Older databases
+        try:
+            with self._connection:  # Create the index and its triggers in one transaction
+                self._connection.executescript(SEARCH_SCHEMA)
+                if not exists:  # Index the flashcards that were added before the index existed
+                    self._connection.execute("INSERT INTO cards_search (cards_search) VALUES ('rebuild')")
+            return True  # Return True if full-text search is available
+        except sqlite3.OperationalError:
+            return False  # Return False if FTS5 is not available
+
+    # Private method to get the actual topic name matching the case-insensitive input
+    def _get_actual_topic_name(self, topic):
+        """
+        Get the actual topic name matching the case-insensitive input.
+        Args:
+            topic (str): The name of the topic to match.
+        Returns:
+            str or None: The actual topic name if found, otherwise None.
+        """
+        return self._topic_index.get(Deck._topic_key(topic))  # Return the actual topic name or None
+
+    # Private method to convert a card into its column values
+    @staticmethod
+    def _card_columns(card):
+        """
+        Convert a card value into the back, progress and fields column values.
+        Args:
+            card (list): The card value, e.g. [card_back, progress].
+        Returns:
+            tuple: The back text, the progress and the JSON encoded scheduling fields (or None).
+        """
+        fields = json.dumps(card[2]) if len(card) > 2 and isinstance(card[2], dict) else None  # Optional fields
+        return card[0], card[1] if isinstance(card[1], int) else 0, fields  # Return the column values
+
+    # Public method to write all opened topics to the database
+    def save_deck_json(self):
+        """
+        Write the flashcards of all opened topics to the database.
+        Named like Deck.save_deck_json so both backends can be used interchangeably.
+        Returns:
+            bool: True if the save was successful, False otherwise.
+        """
+        try:
+            with self._write():  # Commit all rows in one transaction
+                for topic, cards in self._loaded_topics.items():  # Iterate through the opened topics
+                    self._connection.executemany(
+                        "UPDATE cards SET back = ?, progress = ?, fields = ? WHERE topic_id = ? AND front = ?",
+                        ((*self._card_columns(card), self._topic_ids[topic], front) for front, card in cards.items()))
+            return True  # Return True if the save was successful
+        except sqlite3.Error:
+            return False  # Return False on error
+
+    # Public method to write a single card change
+    def record_card(self, topic, card_front):
+        """
+        Write the current state of a single flashcard as a single-row UPDATE.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+        Returns:
+            bool: True if the card was written, False if the card does not exist or could not be written.
+        """
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        cards = self._loaded_topics.get(actual_topic)  # Flashcards of the topic, if it was opened
+        if cards is None or card_front not in cards:  # Check if the card exists
+            return False  # Return False if the card does not exist
+        try:
+            with self._write():  # Commit the update
+                self._connection.execute(
+                    "UPDATE cards SET back = ?, progress = ?, fields = ? WHERE topic_id = ? AND front = ?",
+                    (*self._card_columns(cards[card_front]), self._topic_ids[actual_topic], card_front))
+            return True  # Return True if the card was written
+        except sqlite3.Error:
+            return False  # Return False on error
+
+    # Public method kept for compatibility with Deck; every change is already committed
+    def compact(self):
+        """
+        Checkpoint the write-ahead log into the database file.
+        Returns:
+            bool: True if the checkpoint was successful, False otherwise.
+        """
+        try:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # Fold the WAL into the database
+            return True  # Return True if the checkpoint was successful
+        except sqlite3.Error:
+            return False  # Return False on error
+
+    # Public method kept for compatibility with Deck; changes are committed immediately
+    def request_save(self):
+        """
+        Write the opened topics. Card additions and answers are already committed when they happen.
+        """
+        self.save_deck_json()  # Write the opened topics
+
+    # Public method kept for compatibility with Deck; there is no background writer
+    def flush(self, timeout=None):
+        """
+        Wait for pending saves. Nothing is pending for the SQLite backend.
+        Args:
+            timeout (float, optional): Ignored.
+        Returns:
+            bool: Always True.
+        """
+        return True  # Nothing to wait for
+
+    # Public method to save and close the database
+    def close(self):
+        """
+        Save the opened topics and close the database.
+        Returns:
+            bool: True if the deck was saved, False otherwise.
+        """
+        saved = self.save_deck_json() and self.compact()  # Write and checkpoint everything
+        self._connection.close()  # Close the database
+        return saved  # Return whether the deck was saved
+
+    @property  # Define a property method to get the list of available topics
+    def get_topic_list(self):
+        """
+        Get the list of available topics.
+        Returns:
+            list: A list of topic names.
+        """
+        return list(self._topic_ids.keys())  # Return the list of topic names
+
+    # Public method to get the flashcards and progress for a specific topic
+    def get_topic_dictionary(self, topic):
+        """
+        Get the flashcards and progress for a specific topic, loading them from the database on first use.
+        Args:
+            topic (str): The name of the topic to retrieve.
+        Returns:
+            dict: The flashcards and progress for the specified topic.
+        """
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        if actual_topic is None:  # Check if the topic exists
+            return {}  # Return an empty dictionary if the topic does not exist
+        if actual_topic not in self._loaded_topics:  # Load the flashcards of the topic on first use
+            cards = {}  # Flashcards of the topic
+            for front, back, progress, fields in self._connection.execute(
+                    "SELECT front, back, progress, fields FROM cards WHERE topic_id = ? ORDER BY id",
+                    (self._topic_ids[actual_topic],)):
+                cards[front] = [back, progress] if fields is None else [back, progress, json.loads(fields)]
+            self._loaded_topics[actual_topic] = cards  # Keep the loaded flashcards
+        return self._loaded_topics[actual_topic]  # Return the flashcards and progress for the topic
+
+    # Public method to check if a topic exists
+    def topic_exists(self, topic):
+        """
+        Check if a topic exists.
+        Args:
+            topic (str): The name of the topic to check.
+        Returns:
+            bool: True if the topic exists, False otherwise.
+        """
+        return self._get_actual_topic_name(topic) is not None  # Return True if the topic exists
+
+    # Public method to create a new topic in the database
+    def new_topic_dictionary(self, topic):
+        """
+        Create a new topic in the database.
+        Args:
+            topic (str): The name of the new topic.
+        Returns:
+            bool: True if the topic was created, False if it already exists.
+        """
+        if self.topic_exists(topic):  # Check if the topic already exists
+            return False  # Return False if the topic exists
+        with self._write():  # Commit the new topic
+            cursor = self._connection.execute("INSERT INTO topics (name, topic_key) VALUES (?, ?)",
+                                              (topic, Deck._topic_key(topic)))
+        self._topic_ids[topic] = cursor.lastrowid  # Remember the row id of the topic
+        self._topic_index[Deck._topic_key(topic)] = topic  # Index the new topic
+        self._loaded_topics[topic] = {}  # A new topic has no flashcards to load
+        return True  # Return True if the topic was created
+
+    # Public method to rename an existing topic
+    def rename_topic(self, topic, new_topic):
+        """
+        Rename an existing topic.
+        Args:
+            topic (str): The current name of the topic.
+            new_topic (str): The new name of the topic.
+        Returns:
+            bool: True if the topic was renamed, False if it does not exist or the new name is taken.
+        """
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        if actual_topic is None:  # Check if the topic exists
+            return False  # Return False if the topic does not exist
+        owner = self._get_actual_topic_name(new_topic)  # Topic that already uses the new name
+        if owner is not None and owner != actual_topic:  # A different topic already has this name
+            return False  # Return False if the new name is taken
+        topic_id = self._topic_ids.pop(actual_topic)  # Row id of the topic
+        with self._write():  # Commit the new name
+            self._connection.execute("UPDATE topics SET name = ?, topic_key = ? WHERE id = ?",
+                                     (new_topic, Deck._topic_key(new_topic), topic_id))
+        del self._topic_index[Deck._topic_key(actual_topic)]  # Remove the old name from the index
+        self._topic_ids[new_topic] = topic_id  # Remember the row id under the new name
+        self._topic_index[Deck._topic_key(new_topic)] = new_topic  # Index the new name
+        self._text_version += 1  # Topic names changed
+        if actual_topic in self._loaded_topics:  # Keep the loaded flashcards under the new name
+            self._loaded_topics[new_topic] = self._loaded_topics.pop(actual_topic)
+        return True  # Return True if the topic was renamed
+
+    # Public method to delete a topic and all of its flashcards
+    def delete_topic(self, topic):
+        """
+        Delete a topic and all of its flashcards.
+        Args:
+            topic (str): The name of the topic to delete.
+        Returns:
+            bool: True if the topic was deleted, False if it does not exist.
+        """
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        if actual_topic is None:  # Check if the topic exists
+            return False  # Return False if the topic does not exist
+        with self._write():  # Commit the deletion; the cards are removed by the foreign key
+            self._connection.execute("DELETE FROM topics WHERE id = ?", (self._topic_ids.pop(actual_topic),))
+        del self._topic_index[Deck._topic_key(actual_topic)]  # Remove the topic from the index
+        self._loaded_topics.pop(actual_topic, None)  # Forget the loaded flashcards
+        self._text_version += 1  # Flashcards were deleted
+        return True  # Return True if the topic was deleted
+
+    # Public method to update the flashcards and progress for an existing topic
+    def update_topic_dictionary(self, topic, card_front, card_back):
+        """
+        Update the flashcards and progress for an existing topic.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str): The back text of the flashcard.
+        Returns:
+            bool: True if the topic was updated, False if the topic does not exist.
+        """
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        if actual_topic is None:  # Check if the topic exists
+            return False  # Return False if the topic does not exist
+        with self._write():  # Add or update the flashcard with progress 0
+            self._connection.execute(
+                "INSERT INTO cards (topic_id, front, back, progress, fields) VALUES (?, ?, ?, 0, NULL) "
+                "ON CONFLICT (topic_id, front) DO UPDATE SET back = excluded.back, progress = 0, fields = NULL",
+                (self._topic_ids[actual_topic], card_front, card_back))
+        if actual_topic in self._loaded_topics:  # Keep an opened topic in sync
+            self._loaded_topics[actual_topic][card_front] = [card_back, 0]
+        self._text_version += 1  # Card texts changed
+        return True  # Return True if the topic was updated
+
+    # Public method to add a new flashcard to a topic
+    def add_new_flashcard(self, topic, card_front, card_back):
+        """
+        Add a new flashcard to a topic.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card_back (str): The back text of the flashcard.
+        """
+        self.update_topic_dictionary(topic, card_front, card_back)  # Update the topic with the new flashcard
+
+    # Public method to set or delete a single flashcard exactly
+    def set_card(self, topic, card_front, card):
+        """
+        Set the complete value of a flashcard (including progress and scheduling fields), or delete it.
+        Used by batches and their undo.
+        Args:
+            topic (str): The name of the topic.
+            card_front (str): The front text of the flashcard.
+            card (list or None): The card value, e.g. [card_back, progress], or None to delete the flashcard.
+        Returns:
+            bool: True if the flashcard was set or deleted, False if the topic does not exist.
+        """
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        if actual_topic is None:  # Check if the topic exists
+            return False  # Return False if the topic does not exist
+        topic_id = self._topic_ids[actual_topic]  # Row id of the topic
+        with self._write():  # Commit the change
+            if card is None:  # Delete the flashcard
+                self._connection.execute("DELETE FROM cards WHERE topic_id = ? AND front = ?", (topic_id, card_front))
+            else:
+                self._connection.execute(
+                    "INSERT INTO cards (topic_id, front, back, progress, fields) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (topic_id, front) DO UPDATE SET back = excluded.back, "
+                    "progress = excluded.progress, fields = excluded.fields",
+                    (topic_id, card_front, *self._card_columns(card)))
+        if actual_topic in self._loaded_topics:  # Keep an opened topic in sync
+            if card is None:
+                self._loaded_topics[actual_topic].pop(card_front, None)
+            else:
+                self._loaded_topics[actual_topic][card_front] = list(card)
+        self._text_version += 1  # Card texts changed
+        return True  # Return True if the flashcard was set or deleted
+
+    # Public method to start a batch of changes
+    def batch(self):
+        """
+        Start a batch of changes that is validated as a whole, see Deck.batch().
+        Returns:
+            DeckBatch: The batch.
+        """
+        return self._batch_history.begin()  # Return a new batch
+
+    # Public method to undo the last batch
+    def undo_batch(self):
+        """
+        Undo the last committed batch.
+        Returns:
+            bool: True if the batch was undone, False if there is nothing to undo or the deck changed since.
+        """
+        return self._batch_history.undo()  # Undo the batch
+
+    # Public method to redo the last undone batch
+    def redo_batch(self):
+        """
+        Apply the last undone batch again.
+        Returns:
+            bool: True if the batch was redone, False if there is nothing to redo or the deck changed since.
+        """
+        return self._batch_history.redo()  # Redo the batch
+
+    # Public method to add or replace many flashcards at once
+    def import_batch(self, rows):
+        """
+        Add or replace many flashcards at once in a single transaction, creating missing topics.
+        Args:
+            rows (list): A list of (topic, card_front, card) tuples, where card is [card_back, progress, ...].
+        Returns:
+            int: The number of imported flashcards.
+        """
+        values = []  # Column values of the flashcards
+        for topic, card_front, card in rows:  # Iterate through the flashcards of the batch
+            if not self.topic_exists(topic):  # Create missing topics
+                self.new_topic_dictionary(topic)
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            values.append((self._topic_ids[actual_topic], card_front, *self._card_columns(card)))
+            if actual_topic in self._loaded_topics:  # Keep an opened topic in sync
+                self._loaded_topics[actual_topic][card_front] = card
+        with self._write():  # Write the whole batch in one transaction
+            self._connection.executemany(
+                "INSERT INTO cards (topic_id, front, back, progress, fields) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (topic_id, front) DO UPDATE SET back = excluded.back, "
+                "progress = excluded.progress, fields = excluded.fields", values)
+        self._text_version += 1  # Card texts changed
+        return len(values)  # Return the number of imported flashcards
+
+    # Public method to iterate over all flashcards of the deck
+    def iter_cards(self):
+        """
+        Iterate over all flashcards of the deck, topic by topic, without loading them all into memory.
+        Every change is written to its row when it happens (record_card, set_card, ...), so the rows are current.
+        Yields:
+            tuple: (topic, card_front, card) for every flashcard.
+        """
+        cursor = self._connection.execute(
+            "SELECT topics.name, cards.front, cards.back, cards.progress, cards.fields "
+            "FROM cards JOIN topics ON topics.id = cards.topic_id ORDER BY topics.id, cards.id")
+        for topic, front, back, progress, fields in cursor:  # Stream the rows from the database
+            yield topic, front, [back, progress] if fields is None else [back, progress, json.loads(fields)]
+
+    # Public method to search the fronts and backs of all flashcards
+    def search(self, query, limit=10, topic=None):
+        """
+        Find the flashcards containing all words of a query in their front or back, best match first.
+        Uses SQLite's FTS5 index with BM25 ranking; front matches count twice as much as back matches.
+        Args:
+            query (str): The words to search for.
+            limit (int): Maximum number of results.
+            topic (str, optional): Only search the flashcards of this topic.
+        Returns:
+            list: (topic, card_front, score) tuples. Empty if SQLite was built without FTS5.
+        """
+        words = tokenize(query)  # Words of the query
+        if not words or not self._search_available:
+            return []
+        match = " ".join('"' + word.replace('"', '""') + '"' for word in words)  # All words, quoted
+        sql = ("SELECT topics.name, cards.front, -bm25(cards_search, 2.0, 1.0) FROM cards_search "
+               "JOIN cards ON cards.id = cards_search.rowid JOIN topics ON topics.id = cards.topic_id "
+               "WHERE cards_search MATCH ?")
+        parameters = [match]
+        if topic is not None:  # Restrict the search to one topic
+            actual_topic = self._get_actual_topic_name(topic)
+            if actual_topic is None:
+                return []  # Return no results if the topic does not exist
+            sql += " AND cards.topic_id = ?"
+            parameters.append(self._topic_ids[actual_topic])
+        try:
+            return self._connection.execute(sql + " ORDER BY bm25(cards_search, 2.0, 1.0) LIMIT ?",
+                                            (*parameters, limit)).fetchall()  # Return the ranked results
+        except sqlite3.Error:
+            return []  # Return no results on error
+
+    # Public method kept for compatibility with Deck; the full-text index is kept up to date by triggers
+    def prepare_search(self):
+        """
+        Prepare the first search. The FTS5 index lives in the database, so there is nothing to load.
+        Returns:
+            bool: True if full-text search is available, False if SQLite was built without FTS5.
+        """
+        return self._search_available  # Return whether searching is possible
+
+    # Public method to find flashcards with the same front
+    def find_duplicates(self, card_front, limit=5):
+        """
+        Find flashcards in any topic whose front has the same words as the given front,
+        ignoring case and punctuation.
+        Args:
+            card_front (str): The front text to check, e.g. of a flashcard that is about to be added.
+            limit (int): Maximum number of results.
+        Returns:
+            list: (topic, card_front) tuples of the flashcards with the same front.
+        """
+        words = tokenize(card_front)  # Words of the front
+        matches = []  # Flashcards with the same words
+        for topic, front, _ in self.search(card_front, limit=1000):  # Flashcards containing all words
+            if tokenize(front) == words:
+                matches.append((topic, front))
+                if len(matches) == limit:
+                    break
+        return matches  # Return the duplicates
+
+    # Public method to reset the progress of all flashcards in a topic
+    def reset_progress(self, topic):
+        """
+        Reset the progress of all flashcards in a topic.
+        Args:
+            topic (str): The name of the topic to reset.
+        Returns:
+            bool: True if the progress was reset, False if the topic does not exist.
+        """
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        if actual_topic is None:  # Check if the topic exists
+            return False  # Return False if the topic does not exist
+        with self._write():  # Reset all flashcards of the topic in one statement
+            self._connection.execute("UPDATE cards SET progress = 0, fields = NULL WHERE topic_id = ?",
+                                     (self._topic_ids[actual_topic],))
+        for card in self._loaded_topics.get(actual_topic, {}).values():  # Keep an opened topic in sync
+            card[1] = 0  # Reset progress to 0
+            del card[2:]  # Forget the spaced-repetition schedule
+        return True  # Return True if the progress was reset
+
+    # Private method to resolve the topic argument of the bulk operations
+    def _bulk_topics(self, topic):
+        """
+        Get the actual topic names a bulk operation applies to.
+        Args:
+            topic (str or None): The name of a topic, or None for all topics.
+        Returns:
+            list: The actual topic names.
+        """
+        if topic is None:  # All topics
+            return list(self._topic_ids)
+        actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+        return [actual_topic] if actual_topic else []  # Return the topic if it exists
+
+    # Private method to map the progress of all flashcards of the given topics
+    def _map_progress(self, topic, function):
+        """
+        Replace the progress p of every flashcard by function(p) with one UPDATE per topic.
+        Args:
+            topic (str or None): The name of a topic, or None for all topics.
+            function (callable): Maps an old progress value to the new one.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        table = progress_table(function)  # Evaluate the function once per progress level
+        changed_levels = [level for level in range(256) if table[level] != level]  # Levels that change
+        if not changed_levels:  # Nothing to do
+            return 0
+        case = "CASE progress " + " ".join(f"WHEN {level} THEN {table[level]}" for level in changed_levels) + " END"
+        levels = ", ".join(str(level) for level in changed_levels)  # Only touch rows that change
+        changed = 0  # Number of changed flashcards
+        with self._write():  # Commit all topics in one transaction
+            for actual_topic in self._bulk_topics(topic):  # Iterate through the topics
+                changed += self._connection.execute(
+                    f"UPDATE cards SET progress = {case} WHERE topic_id = ? AND progress IN ({levels})",
+                    (self._topic_ids[actual_topic],)).rowcount
+                for card in self._loaded_topics.get(actual_topic, {}).values():  # Keep an opened topic in sync
+                    if 0 <= card[1] <= 255:  # Rows outside the table are not updated either
+                        card[1] = table[card[1]]
+        return changed  # Return the number of changed flashcards
+
+    # Public method to reset the progress of all topics
+    def reset_all_progress(self):
+        """
+        Reset the progress of all flashcards in all topics.
+        Returns:
+            int: The number of reset topics.
+        """
+        topics = self._bulk_topics(None)  # All topics
+        for topic in topics:  # Reset each topic
+            self.reset_progress(topic)
+        return len(topics)  # Return the number of reset topics
+
+    # Public method to set the progress of many flashcards at once
+    def set_progress(self, value, topic=None, predicate=None):
+        """
+        Set the progress of the flashcards whose current progress matches a predicate.
+        Args:
+            value (int): The new progress.
+            topic (str, optional): The name of a topic; all topics if omitted.
+            predicate (callable, optional): Receives the current progress and returns True for the
+                flashcards to change. All flashcards if omitted.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        return self._map_progress(topic, lambda level: value if predicate is None or predicate(level) else level)
+
+    # Public method to lower the progress of many flashcards at once
+    def decay_progress(self, amount=1, topic=None, predicate=None):
+        """
+        Lower the progress of the flashcards whose current progress matches a predicate, never below 0.
+        Args:
+            amount (int): The number of points to take away.
+            topic (str, optional): The name of a topic; all topics if omitted.
+            predicate (callable, optional): Receives the current progress and returns True for the
+                flashcards to change. All flashcards if omitted.
+        Returns:
+            int: The number of flashcards whose progress changed.
+        """
+        return self._map_progress(topic, lambda level: max(level - amount, 0)
+                                  if predicate is None or predicate(level) else level)
+
+    # Public method to count the flashcards per progress level
+    def progress_histogram(self, topic=None):
+        """
+        Count the flashcards per progress level with one GROUP BY query.
+        Args:
+            topic (str, optional): The name of a topic; all topics if omitted.
+        Returns:
+            list: The number of flashcards with progress 0, 1, ..., MASTERY_THRESHOLD
+                (higher progress values are counted as finished).
+        """
+        histogram = [0] * (MASTERY_THRESHOLD + 1)  # One bucket per progress level
+        if topic is None:  # Count all flashcards
+            rows = self._connection.execute("SELECT progress, COUNT(*) FROM cards GROUP BY progress")
+        else:
+            actual_topic = self._get_actual_topic_name(topic)  # Get the actual topic name
+            if actual_topic is None:  # Check if the topic exists
+                return histogram  # Return empty counts if the topic does not exist
+            rows = self._connection.execute("SELECT progress, COUNT(*) FROM cards WHERE topic_id = ? "
+                                            "GROUP BY progress", (self._topic_ids[actual_topic],))
+        for level, count in rows:  # Add the counts to the buckets
+            histogram[min(max(level, 0), MASTERY_THRESHOLD)] += count
+        return histogram  # Return the counts
+
+    # Public method to summarize the progress of each topic
+    def topic_statistics(self, topic=None):
+        """
+        Summarize the progress of one or all topics.
+        Args:
+            topic (str, optional): The name of a topic; all topics if omitted.
+        Returns:
+            dict: {topic: {"cards": int, "finished": int, "completion": float, "histogram": list}}
+                where completion is the finished share in percent.
+        """
+        statistics = {}  # Statistics per topic
+        for actual_topic in self._bulk_topics(topic):  # Iterate through the topics
+            histogram = self.progress_histogram(actual_topic)  # Counts per progress level
+            cards = sum(histogram)  # Number of flashcards
+            statistics[actual_topic] = {"cards": cards, "finished": histogram[-1],
+                                        "completion": 100.0 * histogram[-1] / cards if cards else 0.0,
+                                        "histogram": histogram}
+        return statistics  # Return the statistics
+
+
+# Define the _Transaction class: the changes of a batch, committed together or not at all
+class _Transaction:
+    def __init__(self, deck):
+        """
+        Initialize the transaction of a deck. Used as the lock of the batch history, so a batch, its undo and
+        its redo each commit once; a crash in between leaves none of their changes in the database.
+        Args:
+            deck (SQLiteDeck): The deck.
+        """
+        self._deck = deck  # Store the deck
+        self.depth = 0  # Number of open with blocks; changes are only committed by the outermost one
+
+    def __enter__(self):
+        """
+        Start the transaction; the first change opens it in SQLite.
+        Returns:
+            _Transaction: The transaction.
+        """
+        self.depth += 1
+        return self  # Return the transaction
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Commit the changes at the end of the outermost with block, or roll them back if it raised.
+        """
+        self.depth -= 1
+        if self.depth:  # An inner block
+            return False
+        if exc_type is None:
+            self._deck._connection.commit()  # Commit all changes at once
+        else:
+            self._deck._connection.rollback()  # Apply none of the changes
+            self._deck._load_topics()  # The loaded topics may hold rolled back changes
+            self._deck._text_version += 1
+        return False  # Do not suppress the exception
+
+
+# Function to copy a JSON deck into an SQLite database
+def migrate_json_to_sqlite(json_path, db_path):
+    """
+    Copy all topics and flashcards of a JSON deck (including journaled answers) into an SQLite database.
+    Topics and flashcards that already exist in the database are overwritten.
+    Args:
+        json_path (str): The file path to the JSON deck file.
+        db_path (str): The file path to the SQLite database.
+    Returns:
+        int: The number of migrated flashcards.
+    """
+    json_deck = Deck(json_path, snapshot=False)  # Load the JSON deck and replay its journal; no snapshot file
+    try:
+        sqlite_deck = SQLiteDeck(db_path)  # Open (or create) the database
+        count = 0  # Number of migrated flashcards
+        connection = sqlite_deck._connection  # Write directly for speed, in one transaction
+        try:
+            with sqlite_deck._transaction:
+                for topic in json_deck.get_topic_list:  # Iterate through the topics of the JSON deck
+                    sqlite_deck.new_topic_dictionary(topic)  # Create the topic if it does not exist
+                    topic_id = sqlite_deck._topic_ids[sqlite_deck._get_actual_topic_name(topic)]  # Row id of the topic
+                    cards = json_deck.get_topic_dictionary(topic)  # Flashcards of the topic
+                    connection.executemany(
+                        "INSERT INTO cards (topic_id, front, back, progress, fields) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (topic_id, front) DO UPDATE SET back = excluded.back, "
+                        "progress = excluded.progress, fields = excluded.fields",
+                        ((topic_id, front, *SQLiteDeck._card_columns(card)) for front, card in cards.items()))
+                    count += len(cards)  # Count the migrated flashcards
+        finally:
+            sqlite_deck.close()  # Checkpoint and close the database
+    finally:
+        json_deck.close()  # Stop the writer thread and release the journal
+    return count  # Return the number of migrated flashcards
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:  # Expect the JSON deck and the database path
+        print("Usage: python sqlite_deck.py flash.json flash.db")
+        sys.exit(1)
+    print(f"Migrated {migrate_json_to_sqlite(sys.argv[1], sys.argv[2])} flashcards.")
@@ -0,0 +1,121 @@
+import argparse  # Import the argparse module for the command line interface
+import json  # Import the JSON module for the machine-readable results
+import os  # Import the os module for paths
+import subprocess  # Import the subprocess module to measure fresh interpreters
+import sys  # Import the sys module for the interpreter path
+import time  # Import the time module for wall-clock measurements
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))  # Directory with main.py, flash.json and image.png
+
+# Script run in a fresh interpreter to measure the time until the main menu is drawn and the deck is loaded
+FIRST_FRAME_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import tkinter as tk
+from flashcard_app import FlashcardApp
+imported = time.perf_counter()
+try:
+    root = tk.Tk()
+except tk.TclError as error:
+    print(json.dumps({"error": str(error)}))
+    raise SystemExit
+app = FlashcardApp(root)
+root.update()
+first_frame = time.perf_counter()
+while app.deck is None:
+    root.update()
+    time.sleep(0.001)
+deck_ready = time.perf_counter()
+app.quit_app()
+root.destroy()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_frame_ms": (first_frame - start) * 1000,
+                  "deck_ready_ms": (deck_ready - start) * 1000}))
+"""
+
+
+# Function to measure the import time of the application modules
+def measure_import_time(module="flashcard_app", top=10):
+    """
+    Import a module in a fresh interpreter with 'python -X importtime' and collect the results.
+    Args:
+        module (str): The module to import.
+        top (int): Number of slowest modules to report.
+    Returns:
+        dict: The cumulative import time of the module and the slowest modules by own import time (in ms).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=PROJECT_DIRECTORY,
+                            capture_output=True, text=True)  # Run the import in a fresh interpreter
+    total_ms = None  # Cumulative import time of the module
+    own_times = []  # (own time, module name) of every imported module
+    for line in result.stderr.splitlines():  # Lines look like 'import time:  self [us] | cumulative | name'
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        own_times.append((int(own) / 1000, name.strip()))
+        if name.strip() == module:  # The top-level module is listed last with its cumulative time
+            total_ms = int(cumulative) / 1000
+    own_times.sort(reverse=True)  # Slowest modules first
+    return {"module": module, "total_ms": total_ms,
+            "slowest": [{"module": name, "self_ms": own} for own, name in own_times[:top]]}
+
+
+# Function to measure the time until the first frame and until the deck is ready
+def measure_first_frame():
+    """
+    Start the application in a fresh interpreter and measure the time to the first drawn frame
+    and the time until the deck has been loaded in the background.
+    Returns:
+        dict: The measured times in ms, or an 'error' entry if no display is available.
+    """
+    start = time.perf_counter()  # Include the interpreter start-up
+    result = subprocess.run([sys.executable, "-c", FIRST_FRAME_SCRIPT], cwd=PROJECT_DIRECTORY,
+                            capture_output=True, text=True)  # Run the application in a fresh interpreter
+    process_ms = (time.perf_counter() - start) * 1000  # Total time of the process
+    try:
+        measurement = json.loads(result.stdout.strip().splitlines()[-1])  # Result printed by the script
+    except (IndexError, json.JSONDecodeError):
+        return {"error": result.stderr.strip() or "no output"}  # The script failed
+    if "error" not in measurement:
+        measurement["process_ms"] = process_ms  # Add the total time of the process
+    return measurement  # Return the measured times
+
+
+# Function to measure how long loading the deck takes by itself
+def measure_deck_load(path="flash.json", repeat=5):
+    """
+    Measure how long it takes to open the deck, without the user interface.
+    Args:
+        path (str): The file path of the deck, relative to the project directory.
+        repeat (int): Number of measurements; the fastest one is reported.
+    Returns:
+        dict: The fastest load time in ms.
+    """
+    script = ("import time; start = time.perf_counter(); from initialize import open_deck; "
+              f"open_deck({path!r}); print((time.perf_counter() - start) * 1000)")  # Import and open the deck
+    times = []  # Load time of each run
+    for _ in range(repeat):  # Use a fresh interpreter for every run
+        result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_DIRECTORY, capture_output=True,
+                                text=True)
+        times.append(float(result.stdout.strip()))
+    return {"path": path, "load_ms": min(times)}  # Return the fastest run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the start-up time of Flash Genius.")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {"imports": measure_import_time(), "deck": measure_deck_load(), "first_frame": measure_first_frame()}
+    print(f"Import of flashcard_app: {results['imports']['total_ms']:.1f} ms")
+    for entry in results["imports"]["slowest"]:  # Slowest modules
+        print(f"    {entry['self_ms']:7.1f} ms  {entry['module']}")
+    print(f"Deck load ({results['deck']['path']}): {results['deck']['load_ms']:.1f} ms")
+    frame = results["first_frame"]
+    if "error" in frame:  # No display available, e.g. on a build server
+        print(f"Time to first frame: skipped ({frame['error']})")
+    else:
+        print(f"Time to first frame: {frame['first_frame_ms']:.1f} ms (process {frame['process_ms']:.1f} ms), "
+              f"deck ready after {frame['deck_ready_ms']:.1f} ms")
+    if args.json:  # Store the results for comparisons between commits
+        with open(args.json, 'w', encoding="utf-8") as fp:
+            json.dump(results, fp, indent=4)
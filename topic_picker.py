@@ -0,0 +1,385 @@
+import sys  # Import the sys module for the command line measurement
+import tkinter as tk  # Import the tkinter library for the topic list widget
+from bisect import bisect_left, bisect_right  # Import binary search for the sorted topic keys
+from deck import Deck  # Import the Deck class for topic name normalization
+
+RECORD_SEPARATOR = "\x00"  # Separates the topic keys in the substring search text
+
+
+# Define the TopicIndex class: sorted topic names with prefix and substring search
+class TopicIndex:
+    def __init__(self, topics=()):
+        """
+        Initialize the TopicIndex with a list of topic names.
+        Topics are kept sorted by their case-insensitive key, so prefix matches are a binary search.
+        Substring matches are found by scanning one joined text of all keys.
+        Args:
+            topics (iterable, optional): The topic names to index.
+        """
+        pairs = sorted((Deck._topic_key(topic), topic) for topic in topics)  # Sort the topics by key
+        self._keys = [key for key, _ in pairs]  # Sorted topic keys
+        self._names = [topic for _, topic in pairs]  # Topic names in the order of their keys
+        self._text = None  # Joined keys for the substring search, built on the first search
+        self._starts = None  # Offset of each key in the joined text
+        self._last_query = None  # Key of the previous search
+        self._last_matches = None  # Positions found by the previous search
+
+    def __len__(self):
+        """
+        Get the number of indexed topics.
+        Returns:
+            int: The number of topics.
+        """
+        return len(self._names)  # Return the number of topics
+
+    @property  # Define a property method to get the sorted topic names
+    def names(self):
+        """
+        Get all topic names, sorted case-insensitively. The list must not be modified.
+        Returns:
+            list: The topic names.
+        """
+        return self._names  # Return the sorted topic names
+
+    # Private method to forget the search tables after a change
+    def _changed(self):
+        """
+        Forget the substring search text and the previous search after the topics changed.
+        """
+        self._text = self._starts = None  # Rebuilt on the next substring search
+        self._last_query = self._last_matches = None  # Positions of the previous search are no longer valid
+
+    # Public method to add a topic
+    def add(self, topic):
+        """
+        Add a topic to the index.
+        Args:
+            topic (str): The name of the topic.
+        """
+        key = Deck._topic_key(topic)  # Key of the topic
+        position = bisect_right(self._keys, key)  # Keep the keys sorted
+        self._keys.insert(position, key)
+        self._names.insert(position, topic)
+        self._changed()  # Positions after the new topic have moved
+
+    # Public method to remove a topic
+    def remove(self, topic):
+        """
+        Remove a topic from the index.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            bool: True if the topic was removed, False if it was not indexed.
+        """
+        key = Deck._topic_key(topic)  # Key of the topic
+        for position in range(bisect_left(self._keys, key), bisect_right(self._keys, key)):
+            if self._names[position] == topic:  # Remove the topic with exactly this name
+                del self._keys[position]
+                del self._names[position]
+                self._changed()  # Positions after the removed topic have moved
+                return True
+        return False  # Return False if the topic was not indexed
+
+    # Public method to rename a topic
+    def rename(self, topic, new_topic):
+        """
+        Rename a topic in the index.
+        Args:
+            topic (str): The current name of the topic.
+            new_topic (str): The new name of the topic.
+        """
+        if self.remove(topic):  # Only rename indexed topics
+            self.add(new_topic)
+
+    # Private method to build the substring search text
+    def _search_text(self):
+        """
+        Get the joined text of all keys and the offset of each key in it, building them if necessary.
+        Returns:
+            tuple: The joined text and the list of key offsets.
+        """
+        if self._text is None:  # Build the text once after each change
+            starts = []  # Offset of each key
+            offset = 0
+            for key in self._keys:
+                starts.append(offset)
+                offset += len(key) + 1  # The key and its separator
+            self._text = RECORD_SEPARATOR.join(self._keys)
+            self._starts = starts
+        return self._text, self._starts  # Return the text and the offsets
+
+    # Private method to find the positions of all keys containing a query
+    def _find(self, query):
+        """
+        Find all topics whose key starts with or contains the query.
+        Args:
+            query (str): The normalized query.
+        Returns:
+            list: Positions of the matching topics; prefix matches first, then the other matches,
+                both in sorted order.
+        """
+        low = bisect_left(self._keys, query)  # First key starting with the query
+        high = bisect_left(self._keys, query + "\U0010ffff", low)  # First key after the prefix range
+        matches = list(range(low, high))  # Prefix matches
+        text, starts = self._search_text()  # Search the other keys in one pass over the joined text
+        found = text.find(query)
+        while found != -1:
+            position = bisect_right(starts, found) - 1  # Key containing the match
+            if low <= position < high:  # Prefix matches are already listed; skip the whole prefix range
+                position = high - 1
+            else:
+                matches.append(position)
+            if position + 1 == len(starts):  # Last key
+                break
+            found = text.find(query, starts[position + 1])  # Continue with the next key
+        return matches  # Return the positions
+
+    # Public method to search topics
+    def search(self, query):
+        """
+        Search the topics whose name starts with or contains the query (case-insensitive).
+        Typing one more letter only filters the previous result instead of searching all topics again.
+        Args:
+            query (str): The text typed by the user.
+        Returns:
+            list: The matching topic names; names starting with the query come first.
+        """
+        query = Deck._topic_key(query.strip())  # Normalize the query like the topic names
+        if not query:  # An empty query matches every topic
+            return self._names
+        if self._last_query is not None and query.startswith(self._last_query):  # Refine the previous result
+            prefix, other = [], []
+            for position in self._last_matches:
+                key = self._keys[position]
+                if key.startswith(query):
+                    prefix.append(position)
+                elif query in key:
+                    other.append(position)
+            matches = sorted(prefix) + sorted(other)  # Matches may move between the two groups
+        else:
+            matches = self._find(query)  # Search all topics
+        self._last_query, self._last_matches = query, matches  # Remember the result for the next letter
+        return [self._names[position] for position in matches]  # Return the matching names
+
+
+# Define the TopicPicker class: a filterable topic list that only renders its visible rows
+class TopicPicker(tk.Frame):
+    def __init__(self, master, describe=None, on_activate=None, rows=8):
+        """
+        Initialize the TopicPicker with a filter entry, a fixed number of row labels and a scrollbar.
+        However many topics there are, only the visible rows are drawn.
+        Args:
+            master (tk.Widget): The parent widget.
+            describe (callable, optional): Returns a short status text for a topic (e.g. its progress).
+                It is only called for visible rows, and the texts are cached until refresh() is called.
+            on_activate (callable, optional): Called without arguments when a topic is double-clicked
+                or Return is pressed.
+            rows (int): Number of visible rows.
+        """
+        super().__init__(master, bg='white')
+        self.describe = describe  # Status text of a topic
+        self.on_activate = on_activate  # Called when a topic is activated
+        self.index = TopicIndex()  # Searchable topics
+        self.matches = self.index.names  # Topics matching the current filter
+        self.top = 0  # Position of the first visible row in the matches
+        self.selected = None  # Position of the selected topic in the matches
+        self._descriptions = {}  # Cached status texts by topic name
+
+        self.query = tk.StringVar(self)  # Filter text
+        self.entry = tk.Entry(self, textvariable=self.query, width=40, font=("Helvetica", 14))  # Filter entry
+        self.entry.pack(pady=5)
+        self.query.trace_add("write", lambda *_: self._filter())  # Filter while typing
+        self.entry.bind("<Down>", lambda event: self._move_selection(1))  # Keyboard navigation
+        self.entry.bind("<Up>", lambda event: self._move_selection(-1))
+        self.entry.bind("<Return>", lambda event: self._activate())
+
+        list_frame = tk.Frame(self, bg='white')  # Frame holding the rows and the scrollbar
+        list_frame.pack()
+        self.scrollbar = tk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._scroll)  # Scrollbar
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.row_labels = []  # Fixed pool of row labels, re-populated when scrolling
+        for row in range(rows):
+            label = tk.Label(list_frame, width=50, anchor='w', font=("Helvetica", 14), bg='white')
+            label.pack()
+            label.bind("<Button-1>", lambda event, row=row: self._select_row(row))  # Select a topic
+            label.bind("<Double-Button-1>", lambda event, row=row: self._activate(row))  # Activate a topic
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):  # Scroll with the mouse wheel
+                label.bind(sequence, self._wheel)
+            self.row_labels.append(label)
+        self.empty_label = tk.Label(self, text="", font=("Helvetica", 12), fg='#666666', bg='white')  # No matches
+        self.empty_label.pack()
+
+    # Public method to show a set of topics
+    def set_index(self, index):
+        """
+        Show the topics of an index and clear the filter.
+        Args:
+            index (TopicIndex): The topics to show.
+        """
+        self.index = index  # Searchable topics
+        self.reset()
+
+    # Public method to clear the filter, the selection and the cached status texts
+    def reset(self):
+        """
+        Clear the filter, the selection and the cached status texts, e.g. when the picker is shown again.
+        """
+        self._descriptions.clear()  # Progress may have changed since the texts were computed
+        self.selected = None
+        if self.query.get():
+            self.query.set("")  # Triggers the filter, which shows all topics
+        else:
+            self._filter()
+
+    # Public method to forget the cached status texts
+    def refresh(self):
+        """
+        Forget the cached status texts and redraw the visible rows.
+        """
+        self._descriptions.clear()
+        self._render()
+
+    # Public method to get the selected topic
+    def get(self):
+        """
+        Get the selected topic. If exactly one topic matches the filter, it counts as selected.
+        Returns:
+            str or None: The selected topic name, or None if no topic is selected.
+        """
+        if self.selected is None:
+            return self.matches[0] if len(self.matches) == 1 else None  # The filter leaves a single topic
+        return self.matches[self.selected]  # Return the selected topic
+
+    # Private method to apply the filter text
+    def _filter(self):
+        """
+        Apply the filter text and show the first matching topics.
+        """
+        self.matches = self.index.search(self.query.get())  # Matching topics
+        self.selected = None  # Positions change with the filter
+        self.top = 0  # Scroll to the first match
+        self.empty_label.configure(text="" if self.matches or not len(self.index) else "No matching topics")
+        self._render()
+
+    # Private method to draw the visible rows
+    def _render(self):
+        """
+        Fill the row labels with the visible topics and update the scrollbar.
+        """
+        for row, label in enumerate(self.row_labels):
+            position = self.top + row  # Position of the topic shown in this row
+            if position < len(self.matches):
+                topic = self.matches[position]
+                label.configure(text=f"{topic}  {self._description(topic)}",
+                                bg='#ffb3d9' if position == self.selected else 'white')
+            else:
+                label.configure(text="", bg='white')  # Empty row below the last match
+        total = max(len(self.matches), 1)
+        self.scrollbar.set(self.top / total, min(self.top + len(self.row_labels), total) / total)
+
+    # Private method to get the status text of a topic
+    def _description(self, topic):
+        """
+        Get the status text of a topic, computing it only when the topic is shown for the first time.
+        Args:
+            topic (str): The name of the topic.
+        Returns:
+            str: The status text in parentheses, or an empty string.
+        """
+        if self.describe is None:
+            return ""
+        if topic not in self._descriptions:  # Computed lazily for visible rows only
+            self._descriptions[topic] = f"({self.describe(topic)})"
+        return self._descriptions[topic]  # Return the status text
+
+    # Private method to scroll to a position
+    def _scroll_to(self, top):
+        """
+        Scroll so that a given match is in the first row.
+        Args:
+            top (int): Position of the match to show in the first row.
+        """
+        self.top = max(0, min(top, len(self.matches) - len(self.row_labels)))  # Stay within the matches
+        self._render()
+
+    # Private method handling the scrollbar
+    def _scroll(self, action, amount, unit=None):
+        """
+        Scroll in response to the scrollbar.
+        Args:
+            action (str): 'moveto' or 'scroll'.
+            amount (str): The fraction to move to, or the number of units or pages to scroll.
+            unit (str, optional): 'units' or 'pages' when scrolling.
+        """
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.matches)))
+        else:
+            step = len(self.row_labels) if unit == "pages" else 1  # Rows per step
+            self._scroll_to(self.top + int(amount) * step)
+
+    # Private method handling the mouse wheel
+    def _wheel(self, event):
+        """
+        Scroll in response to the mouse wheel.
+        Args:
+            event (tk.Event): The mouse wheel event.
+        """
+        direction = -1 if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0 else 1
+        self._scroll_to(self.top + 3 * direction)
+
+    # Private method to select the topic in a row
+    def _select_row(self, row):
+        """
+        Select the topic shown in a row.
+        Args:
+            row (int): The row that was clicked.
+        """
+        if self.top + row < len(self.matches):
+            self.selected = self.top + row
+            self._render()
+
+    # Private method to move the selection with the keyboard
+    def _move_selection(self, step):
+        """
+        Move the selection up or down and scroll it into view.
+        Args:
+            step (int): 1 to move down, -1 to move up.
+        """
+        if not self.matches:
+            return
+        position = self.top if self.selected is None else self.selected + step  # Start with the first visible topic
+        position = max(0, min(position, len(self.matches) - 1))
+        self.selected = position
+        if position < self.top:  # Scroll the selection into view
+            self._scroll_to(position)
+        elif position >= self.top + len(self.row_labels):
+            self._scroll_to(position - len(self.row_labels) + 1)
+        else:
+            self._render()
+
+    # Private method to activate a topic
+    def _activate(self, row=None):
+        """
+        Select the topic in a row (or keep the current selection) and call the activation callback.
+        Args:
+            row (int, optional): The row that was double-clicked.
+        """
+        if row is not None:
+            self._select_row(row)
+        if self.on_activate is not None and self.get() is not None:
+            self.on_activate()
+
+
+if __name__ == "__main__":
+    import time  # Import the time module for the measurement
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000  # Number of synthetic topics
+    topics = [f"Topic {number:06d} {('history', 'biology', 'physics', 'music')[number % 4]}"
+              for number in range(count)]
+    start = time.perf_counter()
+    index = TopicIndex(topics)  # Build the index
+    print(f"Index of {count} topics built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for query in ("", "t", "topic 0001", "bio", "biol", "biolo", "000123"):  # Typing letter by letter
+        start = time.perf_counter()
+        matches = index.search(query)
+        print(f"search({query!r}): {len(matches)} matches in {(time.perf_counter() - start) * 1000:.2f} ms")